@@ -0,0 +1,46 @@
+"""
+alembic/env.py
+Entorno de migraciones: URL y metadata de la aplicación
+
+La base de datos existía antes de las migraciones; las revisiones solo
+agregan cambios sobre ese esquema (no hay revisión inicial con todas las tablas).
+"""
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.core.database import Base, Settings, engine
+from app.modulos import cargar_modelos
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Todos los modelos registrados (para --autogenerate)
+cargar_modelos()
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Generar el SQL sin conectarse (alembic upgrade head --sql)"""
+    context.configure(
+        url=Settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,59 @@
+"""Índices compuestos de login_logs y bitacora
+
+Bloqueo de cuentas (AuthRepository.contar_intentos_fallidos /
+verificar_cuenta_bloqueada) y filtros, listados y estadísticas de auditoría.
+Los mismos índices están declarados en usuario_models.py; si la tabla ya los
+tiene (p. ej. creada con create_all), no se vuelven a crear.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDICES = (
+    ("login_logs", "ix_login_logs_usuario_estado_fecha", ["id_usuario", "estado", "fecha_hora"]),
+    ("login_logs", "ix_login_logs_estado_fecha", ["estado", "fecha_hora"]),
+    ("login_logs", "ix_login_logs_fecha_hora", ["fecha_hora"]),
+    ("bitacora", "ix_bitacora_admin_fecha", ["id_usuario_admin", "fecha_hora"]),
+    ("bitacora", "ix_bitacora_objetivo_fecha", ["tipo_objetivo", "id_objetivo", "fecha_hora"]),
+    ("bitacora", "ix_bitacora_accion_fecha", ["accion", "fecha_hora"]),
+    ("bitacora", "ix_bitacora_fecha_hora", ["fecha_hora"]),
+)
+
+# MySQL descarta el índice automático de la FK al existir uno compuesto que la cubre:
+# al bajar, se deja uno simple antes de borrar el compuesto
+INDICES_FK = {
+    "ix_login_logs_usuario_estado_fecha": ("ix_login_logs_id_usuario", ["id_usuario"]),
+    "ix_bitacora_admin_fecha": ("ix_bitacora_id_usuario_admin", ["id_usuario_admin"]),
+}
+
+
+def _existentes(tabla: str) -> set:
+    return {indice["name"] for indice in sa.inspect(op.get_bind()).get_indexes(tabla)}
+
+
+def upgrade() -> None:
+    for tabla, nombre, columnas in INDICES:
+        if op.get_context().as_sql or nombre not in _existentes(tabla):
+            op.create_index(nombre, tabla, columnas)
+
+
+def downgrade() -> None:
+    sql = op.get_context().as_sql
+    for tabla, nombre, _ in reversed(INDICES):
+        if not sql and nombre not in _existentes(tabla):
+            continue
+        if nombre in INDICES_FK and op.get_context().dialect.name == "mysql":
+            simple, columnas = INDICES_FK[nombre]
+            if sql or simple not in _existentes(tabla):
+                op.create_index(simple, tabla, columnas)
+        op.drop_index(nombre, table_name=tabla)
@@ -0,0 +1,105 @@
+"""Resúmenes diarios de esquelas (rankings de reportes)
+
+Crea resumen_esquelas_diario y resumen_codigos_diario y los llena desde
+esquelas/esquelas_codigos, con la misma agregación que
+ResumenRepository.reconstruir. Desde aquí los mantiene EsquelaRepository.
+Si una tabla ya existe (p. ej. creada con `manage.py reconstruir-resumenes`),
+no se toca.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Igual que app/modules/reportes/models/resumen_models.TIPO_TODOS
+TIPO_TODOS = "*"
+
+esquelas = sa.table(
+    "esquelas",
+    sa.column("id_esquela", sa.Integer),
+    sa.column("id_estudiante", sa.Integer),
+    sa.column("id_registrador", sa.Integer),
+    sa.column("fecha", sa.Date),
+)
+esquelas_codigos = sa.table(
+    "esquelas_codigos",
+    sa.column("id_esquela", sa.Integer),
+    sa.column("id_codigo", sa.Integer),
+)
+codigos_esquelas = sa.table(
+    "codigos_esquelas",
+    sa.column("id_codigo", sa.Integer),
+    sa.column("tipo", sa.String),
+)
+
+
+def _existe(tabla: str) -> bool:
+    return not op.get_context().as_sql and sa.inspect(op.get_bind()).has_table(tabla)
+
+
+def _base(*columnas):
+    return sa.select(*columnas).select_from(
+        esquelas.join(esquelas_codigos, esquelas_codigos.c.id_esquela == esquelas.c.id_esquela).join(
+            codigos_esquelas, codigos_esquelas.c.id_codigo == esquelas_codigos.c.id_codigo
+        )
+    )
+
+
+def _llenar_esquelas(tabla) -> None:
+    e = esquelas.c
+    grupo = (e.fecha, e.id_estudiante, e.id_registrador)
+    medidas = (sa.func.count(sa.distinct(e.id_esquela)), sa.func.count())
+    columnas = ["fecha", "id_estudiante", "id_registrador", "tipo", "esquelas", "codigos"]
+    op.execute(tabla.insert().from_select(
+        columnas, _base(*grupo, codigos_esquelas.c.tipo, *medidas).group_by(*grupo, codigos_esquelas.c.tipo)
+    ))
+    op.execute(tabla.insert().from_select(
+        columnas, _base(*grupo, sa.literal(TIPO_TODOS), *medidas).group_by(*grupo)
+    ))
+
+
+def _llenar_codigos(tabla) -> None:
+    grupo = (esquelas.c.fecha, esquelas_codigos.c.id_codigo)
+    op.execute(tabla.insert().from_select(
+        ["fecha", "id_codigo", "aplicaciones"], _base(*grupo, sa.func.count()).group_by(*grupo)
+    ))
+
+
+def upgrade() -> None:
+    if not _existe("resumen_esquelas_diario"):
+        tabla = op.create_table(
+            "resumen_esquelas_diario",
+            sa.Column("fecha", sa.Date, primary_key=True),
+            sa.Column("id_estudiante", sa.Integer, primary_key=True),
+            sa.Column("id_registrador", sa.Integer, primary_key=True),
+            sa.Column("tipo", sa.String(50), primary_key=True),
+            sa.Column("esquelas", sa.Integer, nullable=False),
+            sa.Column("codigos", sa.Integer, nullable=False),
+        )
+        op.create_index("ix_resumen_esquelas_tipo_fecha", "resumen_esquelas_diario", ["tipo", "fecha"])
+        op.create_index("ix_resumen_esquelas_estudiante", "resumen_esquelas_diario", ["id_estudiante"])
+        _llenar_esquelas(tabla)
+
+    if not _existe("resumen_codigos_diario"):
+        tabla = op.create_table(
+            "resumen_codigos_diario",
+            sa.Column("fecha", sa.Date, primary_key=True),
+            sa.Column("id_codigo", sa.Integer, primary_key=True),
+            sa.Column("aplicaciones", sa.Integer, nullable=False),
+        )
+        op.create_index("ix_resumen_codigos_codigo", "resumen_codigos_diario", ["id_codigo"])
+        _llenar_codigos(tabla)
+
+
+def downgrade() -> None:
+    op.drop_table("resumen_codigos_diario")
+    op.drop_table("resumen_esquelas_diario")
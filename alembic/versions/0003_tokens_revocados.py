@@ -0,0 +1,35 @@
+"""Tabla tokens_revocados (revocación de JWT compartida entre workers)
+
+Usada por TOKEN_REVOCATION_BACKEND=database sin TOKEN_REVOCATION_URL.
+Si la tabla ya existe (antes se creaba al primer uso), no se toca.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not op.get_context().as_sql and sa.inspect(op.get_bind()).has_table("tokens_revocados"):
+        return
+    op.create_table(
+        "tokens_revocados",
+        sa.Column("token_id", sa.String(64), primary_key=True),
+        sa.Column("expira", sa.DateTime, nullable=False),
+        sa.Column("created_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_tokens_revocados_expira", "tokens_revocados", ["expira"])
+    op.create_index("ix_tokens_revocados_created_at", "tokens_revocados", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("tokens_revocados")
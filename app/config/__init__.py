@@ -1,7 +1,15 @@
 # app/config/__init__.py
+#
+# `engine`, `Base`, `SessionLocal` y `current_config` se resuelven al usarlos,
+# para que importar `app.config.config` no cree el engine de la BD.
 
-from app.core.database import engine, Base, SessionLocal
-from app.config.config import config
 
-# Selecciona la configuración deseada
-current_config = config['default']  # o 'development', 'production', etc.
+def __getattr__(nombre):
+    if nombre in ("engine", "Base", "SessionLocal"):
+        from app.core import database
+        return getattr(database, nombre)
+    if nombre == "current_config":
+        from app.config.config import config
+        # Selecciona la configuración deseada
+        return config['default']  # o 'development', 'production', etc.
+    raise AttributeError(f"module 'app.config' has no attribute '{nombre}'")
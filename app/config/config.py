@@ -11,20 +11,110 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = int(os.environ.get('JWT_ACCESS_TOKEN_EXPIRES', 3600))
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:3000').split(',')
     
+    # Módulos cuyos routers registra create_app (separados por coma; vacío = todos, ver app/modulos.py)
+    APP_MODULES = [m.strip() for m in os.environ.get('APP_MODULES', '').split(',') if m.strip()]
+
     # Base de datos - SOLO desde .env
     DATABASE_URL = os.environ.get('DATABASE_URL')
 
+    # Pool de conexiones (por worker)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # < wait_timeout de MySQL
+    DB_PRE_PING = os.environ.get('DB_PRE_PING', 'idle')  # 'always', 'idle' o 'never'
+    DB_PRE_PING_IDLE_SECONDS = float(os.environ.get('DB_PRE_PING_IDLE_SECONDS', 30))
+    DB_POOL_WAIT_WARN_MS = float(os.environ.get('DB_POOL_WAIT_WARN_MS', 200))
+
+    # Réplicas de lectura (separadas por coma) y ventana de lectura de lo escrito
+    DATABASE_REPLICA_URLS = [u.strip() for u in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if u.strip()]
+    DB_READ_YOUR_WRITES_SECONDS = float(os.environ.get('DB_READ_YOUR_WRITES_SECONDS', 5))
+
+    # Engine asíncrono (AsyncSession); por defecto DATABASE_URL con driver aiomysql.
+    # Tiene su propio pool: cada worker abre hasta
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW + DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW conexiones al primario
+    ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL')
+    DB_ASYNC_POOL_SIZE = int(os.environ.get('DB_ASYNC_POOL_SIZE', 5))
+    DB_ASYNC_MAX_OVERFLOW = int(os.environ.get('DB_ASYNC_MAX_OVERFLOW', 5))
+
+    # Access log estructurado: muestreo de respuestas 2xx/3xx (errores y lentas siempre)
+    ACCESS_LOG_SAMPLE_RATE = float(os.environ.get('ACCESS_LOG_SAMPLE_RATE', 0.1))
+    ACCESS_LOG_SLOW_MS = float(os.environ.get('ACCESS_LOG_SLOW_MS', 1000))
+
+    # Instrumentación SQL por petición: headers X-DB-* y umbral del detector de N+1 (0 = apagado)
+    DB_METRICS_HEADERS = os.environ.get('DB_METRICS_HEADERS', 'true').lower() == 'true'
+    DB_N1_THRESHOLD = int(os.environ.get('DB_N1_THRESHOLD', 5))
+
+    # /metrics con varios workers: directorio compartido para las instantáneas (vacío = solo este worker)
+    METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR')
+    METRICS_FLUSH_SECONDS = float(os.environ.get('METRICS_FLUSH_SECONDS', 5))
+
+    # Readiness: segundos que se reutiliza el resultado de las probes de dependencias
+    HEALTH_CACHE_SECONDS = float(os.environ.get('HEALTH_CACHE_SECONDS', 2))
+
+    # Auditoría (Bitácora, LoginLog): 'async' = cola + escritor por lotes, 'sync' = en la petición
+    AUDIT_MODE = os.environ.get('AUDIT_MODE', 'async').lower()
+    AUDIT_QUEUE_SIZE = int(os.environ.get('AUDIT_QUEUE_SIZE', 10000))
+    AUDIT_BATCH_SIZE = int(os.environ.get('AUDIT_BATCH_SIZE', 200))
+    AUDIT_FLUSH_SECONDS = float(os.environ.get('AUDIT_FLUSH_SECONDS', 1.0))
+    AUDIT_ENQUEUE_TIMEOUT = float(os.environ.get('AUDIT_ENQUEUE_TIMEOUT', 0.05))
+    # Acciones de bitácora que siempre se escriben en la transacción de la petición
+    AUDIT_SYNC_ACTIONS = frozenset(
+        a.strip().upper() for a in os.environ.get('AUDIT_SYNC_ACTIONS', 'CAMBIAR_PASSWORD,RESTABLECER_PASSWORD').split(',') if a.strip()
+    )
+
+    # Retención de auditoría: meses en las tablas calientes (0 = sin tarea programada)
+    RETENTION_MONTHS = int(os.environ.get('RETENTION_MONTHS', 0))
+    RETENTION_INTERVAL_HOURS = float(os.environ.get('RETENTION_INTERVAL_HOURS', 24))
+    RETENTION_BATCH_SIZE = int(os.environ.get('RETENTION_BATCH_SIZE', 5000))
+
+    # Listados con total "limitado"/"aproximado": máximo de filas que se cuentan
+    TOTAL_COUNT_CAP = int(os.environ.get('TOTAL_COUNT_CAP', 10000))
+
+    # Vistas de auditoría: LRU por worker de id_usuario -> nombre para mostrar
+    AUDIT_NAME_CACHE_MAXSIZE = int(os.environ.get('AUDIT_NAME_CACHE_MAXSIZE', 2048))
+    AUDIT_NAME_CACHE_TTL = int(os.environ.get('AUDIT_NAME_CACHE_TTL', 300))
+
+    # Caché de usuario autenticado (por worker)
+    PRINCIPAL_CACHE_TTL = int(os.environ.get('PRINCIPAL_CACHE_TTL', 60))
+    PRINCIPAL_CACHE_MAXSIZE = int(os.environ.get('PRINCIPAL_CACHE_MAXSIZE', 1024))
+
+    # Revocación de tokens (logout): 'memory' (por worker) o 'database' (compartido)
+    TOKEN_REVOCATION_BACKEND = os.environ.get('TOKEN_REVOCATION_BACKEND', 'memory')
+    TOKEN_REVOCATION_URL = os.environ.get('TOKEN_REVOCATION_URL')  # Por defecto, DATABASE_URL
+    TOKEN_REVOCATION_SYNC_SECONDS = float(os.environ.get('TOKEN_REVOCATION_SYNC_SECONDS', 5))
+    TOKEN_REVOCATION_PURGE_SECONDS = float(os.environ.get('TOKEN_REVOCATION_PURGE_SECONDS', 300))
+
+    # Rankings de esquelas desde resúmenes diarios (ver `python manage.py reconstruir-resumenes`)
+    REPORTES_USAR_RESUMENES = os.environ.get('REPORTES_USAR_RESUMENES', 'true').lower() == 'true'
+
+    # Caché de resultados de /api/reports (por worker, invalidado por tablas)
+    REPORTES_CACHE_TTL = float(os.environ.get('REPORTES_CACHE_TTL', 300))
+    REPORTES_CACHE_MAXSIZE = int(os.environ.get('REPORTES_CACHE_MAXSIZE', 256))
+
+    # Distribución por edad: edad de inicio de cada rango (0-4, 5-7, ..., 17+)
+    REPORTES_EDAD_LIMITES = tuple(
+        int(limite) for limite in os.environ.get('REPORTES_EDAD_LIMITES', '5,8,11,14,17').split(',') if limite.strip()
+    )
+
 class DevelopmentConfig(Config):
     """Configuración para desarrollo"""
     DEBUG = True
+    ACCESS_LOG_SAMPLE_RATE = float(os.environ.get('ACCESS_LOG_SAMPLE_RATE', 1.0))
 
 class ProductionConfig(Config):
     """Configuración para producción"""
     DEBUG = False
+    DB_METRICS_HEADERS = os.environ.get('DB_METRICS_HEADERS', 'false').lower() == 'true'
 
 class TestingConfig(Config):
     """Configuración para testing"""
     TESTING = True
+    AUDIT_MODE = os.environ.get('AUDIT_MODE', 'sync').lower()
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 2))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 2))
+    DB_ASYNC_POOL_SIZE = int(os.environ.get('DB_ASYNC_POOL_SIZE', 2))
+    DB_ASYNC_MAX_OVERFLOW = int(os.environ.get('DB_ASYNC_MAX_OVERFLOW', 2))
     # Usar TEST_DATABASE_URL si existe, sino usar DATABASE_URL
     DATABASE_URL = os.environ.get('TEST_DATABASE_URL') or os.environ.get('DATABASE_URL')
 
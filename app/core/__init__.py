@@ -1,13 +1,23 @@
-# Core utilities and extensionsfrom .database import get_db
-from .database import engine, get_db
-
+# Core utilities and extensions
 # app/core/__init__.py
+#
+# Sin imports al cargar el paquete: importar cualquier `app.core.*` no crea el
+# engine ni lee la configuración. Los nombres históricos se resuelven al usarlos.
+
+ALGORITHM = "HS256"  # o lo que uses en tu JWT
 
-from app.config.config import DevelopmentConfig
+_CONFIG = {
+    "SECRET_KEY": "SECRET_KEY",
+    "DATABASE_URL": "DATABASE_URL",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "JWT_ACCESS_TOKEN_EXPIRES",
+}
 
 
-# Variables de configuración que antes fallaban
-SECRET_KEY = DevelopmentConfig.SECRET_KEY
-DATABASE_URL = DevelopmentConfig.DATABASE_URL
-ACCESS_TOKEN_EXPIRE_MINUTES = DevelopmentConfig.JWT_ACCESS_TOKEN_EXPIRES
-ALGORITHM = "HS256"  # o lo que uses en tu JWT
+def __getattr__(nombre):
+    if nombre in ("engine", "get_db"):
+        from app.core import database
+        return getattr(database, nombre)
+    if nombre in _CONFIG:
+        from app.config.config import DevelopmentConfig
+        return getattr(DevelopmentConfig, _CONFIG[nombre])
+    raise AttributeError(f"module 'app.core' has no attribute '{nombre}'")
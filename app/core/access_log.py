@@ -0,0 +1,75 @@
+"""
+app/core/access_log.py
+Access log estructurado (un registro JSON por petición) con muestreo
+
+- El logger `app.access` escribe en una `QueueHandler`; un `QueueListener`
+  (hilo en segundo plano) serializa y emite los registros, así que la
+  petición solo encola.
+- Las respuestas 2xx/3xx se muestrean con ACCESS_LOG_SAMPLE_RATE; los errores
+  (>= 400) y las peticiones lentas (>= ACCESS_LOG_SLOW_MS) siempre se registran.
+"""
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+import json
+import logging
+import queue
+import random
+
+access_logger = logging.getLogger("app.access")
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[QueueHandler] = None
+
+
+class FormatoJSON(logging.Formatter):
+    """Serializa el dict `acceso` del registro como una línea JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        datos = {"ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"), "nivel": record.levelname}
+        datos.update(getattr(record, "acceso", None) or {"mensaje": record.getMessage()})
+        return json.dumps(datos, ensure_ascii=False, default=str)
+
+
+def configurar_access_log(settings, handler: Optional[logging.Handler] = None) -> None:
+    """Conectar `app.access` a la cola y arrancar el hilo que escribe (idempotente)"""
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    salida = handler or logging.StreamHandler()
+    salida.setFormatter(FormatoJSON())
+
+    cola = queue.SimpleQueue()
+    _handler = QueueHandler(cola)
+    access_logger.addHandler(_handler)
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False  # no duplicar en el logger raíz
+
+    _listener = QueueListener(cola, salida, respect_handler_level=True)
+    _listener.start()
+
+
+def detener_access_log() -> None:
+    """Vaciar la cola, detener el hilo y desconectar `app.access` de la cola (shutdown)"""
+    global _listener, _handler
+    if _handler is not None:
+        # Sin listener nadie lee la cola: quitar el handler antes de vaciarla
+        access_logger.removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def debe_registrar(status: int, duracion_ms: float, settings) -> bool:
+    """Errores y lentas siempre; el resto según la tasa de muestreo"""
+    if status >= 400 or duracion_ms >= settings.ACCESS_LOG_SLOW_MS:
+        return True
+    tasa = settings.ACCESS_LOG_SAMPLE_RATE
+    return tasa >= 1 or random.random() < tasa
+
+
+def registrar_acceso(datos: dict) -> None:
+    """Encolar el registro de una petición (WARNING si es error de servidor o lenta)"""
+    nivel = logging.WARNING if datos["status"] >= 500 or datos.get("lenta") else logging.INFO
+    access_logger.log(nivel, "acceso", extra={"acceso": datos})
@@ -0,0 +1,253 @@
+"""
+app/core/audit_writer.py
+Escritura de auditoría (Bitácora, LoginLog) fuera de la petición
+
+- `registrar_auditoria(db, Modelo, valores)` no inserta: deja el evento en la
+  sesión. Si la sesión hace commit, el evento pasa a una cola acotada; si hace
+  rollback, se descarta (igual que antes, cuando la fila viajaba en la misma
+  transacción).
+- Un hilo en segundo plano vacía la cola en INSERT de varias filas por tabla,
+  cuando junta AUDIT_BATCH_SIZE eventos o pasan AUDIT_FLUSH_SECONDS.
+- Durabilidad: los eventos críticos (`durable=True`, p. ej. logins fallidos,
+  de los que depende el bloqueo de cuentas) y todo con AUDIT_MODE=sync se
+  insertan en la transacción de la petición, como siempre.
+- Contrapresión: con la cola llena, quien encola espera hasta
+  AUDIT_ENQUEUE_TIMEOUT y luego escribe él mismo el lote (no se pierden
+  eventos, solo se paga la latencia).
+- Shutdown: `detener_escritor_auditoria()` escribe lo pendiente antes de salir.
+
+Lo encolado vive en memoria: si el proceso muere sin shutdown, se pierde.
+"""
+from threading import Lock, Thread
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+import queue
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Eventos a la espera del commit de la sesión (en Session.info)
+_CLAVE_PENDIENTES = "auditoria_pendiente"
+_FIN = object()
+
+Evento = Tuple[Any, Dict[str, Any]]  # (Modelo, valores de columnas)
+
+_escritor: Optional["EscritorAuditoria"] = None
+
+
+class EscritorAuditoria:
+    """Cola acotada + hilo que inserta los eventos por lotes"""
+
+    def __init__(
+        self,
+        engine,
+        maxsize: int = 10000,
+        lote: int = 200,
+        intervalo_segundos: float = 1.0,
+        timeout_encolado: float = 0.05
+    ):
+        self.engine = engine
+        self.lote = max(1, lote)
+        self.intervalo_segundos = intervalo_segundos
+        self.timeout_encolado = timeout_encolado
+        self._cola: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._hilo: Optional[Thread] = None
+        self._lock = Lock()
+        self.encolados = 0
+        self.escritos = 0
+        self.lotes = 0
+        self.directos = 0
+        self.descartados = 0
+
+    @property
+    def activo(self) -> bool:
+        return self._hilo is not None and self._hilo.is_alive()
+
+    def iniciar(self) -> None:
+        self._hilo = Thread(target=self._bucle, name="escritor-auditoria", daemon=True)
+        self._hilo.start()
+
+    def encolar(self, eventos: Iterable[Evento]) -> None:
+        """Encolar eventos ya confirmados; si la cola sigue llena, escribirlos aquí"""
+        rebalse = []
+        for evento in eventos:
+            try:
+                self._cola.put(evento, timeout=self.timeout_encolado)
+                self.encolados += 1
+            except queue.Full:
+                rebalse.append(evento)
+        if rebalse:
+            logger.warning("Cola de auditoría llena: %d eventos escritos en la petición", len(rebalse))
+            self.directos += len(rebalse)
+            self.escribir(rebalse)
+
+    def detener(self, timeout: Optional[float] = 10.0) -> None:
+        """Escribir lo pendiente y terminar el hilo"""
+        if self._hilo is None:
+            return
+        self._cola.put(_FIN)
+        self._hilo.join(timeout)
+        if self._hilo.is_alive():
+            logger.error("El escritor de auditoría no terminó en %ss; quedan %d eventos", timeout, self._cola.qsize())
+        self._hilo = None
+
+    def escribir(self, eventos: List[Evento]) -> None:
+        """INSERT de varias filas por tabla en una transacción; si falla, fila por fila"""
+        if not eventos:
+            return
+        por_tabla: Dict[Any, List[Dict[str, Any]]] = {}
+        for modelo, valores in eventos:
+            por_tabla.setdefault(modelo.__table__, []).append(valores)
+
+        try:
+            with self.engine.begin() as conexion:
+                for tabla, filas in por_tabla.items():
+                    conexion.execute(tabla.insert(), filas)
+        except Exception as e:
+            logger.error("Error al escribir lote de auditoría (%d eventos): %s", len(eventos), e)
+            self._escribir_uno_a_uno(por_tabla)
+            return
+
+        with self._lock:
+            self.escritos += len(eventos)
+            self.lotes += 1
+
+    def _escribir_uno_a_uno(self, por_tabla: Dict[Any, List[Dict[str, Any]]]) -> None:
+        # Aislar la fila inválida para no perder el resto del lote
+        for tabla, filas in por_tabla.items():
+            for fila in filas:
+                try:
+                    with self.engine.begin() as conexion:
+                        conexion.execute(tabla.insert(), [fila])
+                    with self._lock:
+                        self.escritos += 1
+                except Exception as e:
+                    with self._lock:
+                        self.descartados += 1
+                    logger.error("Evento de auditoría descartado (%s): %s - %s", tabla.name, fila, e)
+
+    def _bucle(self) -> None:
+        pendientes: List[Evento] = []
+        vence = 0.0
+        while True:
+            espera = self.intervalo_segundos if not pendientes else max(0.0, vence - time.monotonic())
+            try:
+                evento = self._cola.get(timeout=espera)
+            except queue.Empty:
+                evento = None
+
+            if evento is _FIN:
+                while True:
+                    try:
+                        restante = self._cola.get_nowait()
+                    except queue.Empty:
+                        break
+                    if restante is not _FIN:
+                        pendientes.append(restante)
+                self._escribir_seguro(pendientes)
+                return
+
+            if evento is not None:
+                if not pendientes:
+                    vence = time.monotonic() + self.intervalo_segundos
+                pendientes.append(evento)
+
+            if pendientes and (len(pendientes) >= self.lote or time.monotonic() >= vence):
+                self._escribir_seguro(pendientes)
+                pendientes = []
+
+    def _escribir_seguro(self, eventos: List[Evento]) -> None:
+        # El hilo no debe morir por un error de escritura
+        try:
+            self.escribir(eventos)
+        except Exception:
+            logger.exception("Error inesperado en el escritor de auditoría")
+
+    def estadisticas(self) -> Dict[str, int]:
+        return {
+            "en_cola": self._cola.qsize(),
+            "maxsize": self._cola.maxsize,
+            "encolados": self.encolados,
+            "escritos": self.escritos,
+            "lotes": self.lotes,
+            "directos": self.directos,
+            "descartados": self.descartados
+        }
+
+
+# ========================= API =========================
+
+def registrar_auditoria(db: Session, modelo, valores: Dict[str, Any], durable: bool = False):
+    """
+    Registrar un evento de auditoría.
+
+    Con `durable` (o sin escritor en marcha: AUDIT_MODE=sync, scripts) se
+    inserta en la transacción de `db` y se devuelve la fila (flush, sin commit).
+    Si no, queda a la espera del commit de `db` y se devuelve None.
+    """
+    if durable or _escritor is None or not _escritor.activo:
+        fila = modelo(**valores)
+        db.add(fila)
+        db.flush()
+        return fila
+    db.info.setdefault(_CLAVE_PENDIENTES, []).append((modelo, valores))
+    return None
+
+
+def accion_durable(accion: str) -> bool:
+    """Acciones de bitácora que se escriben siempre en la petición (AUDIT_SYNC_ACTIONS)"""
+    from app.core.database import Settings
+    return (accion or "").upper() in getattr(Settings, "AUDIT_SYNC_ACTIONS", ())
+
+
+@event.listens_for(Session, "after_commit")
+def _tras_commit(session: Session) -> None:
+    eventos = session.info.pop(_CLAVE_PENDIENTES, None)
+    if not eventos:
+        return
+    if _escritor is not None and _escritor.activo:
+        _escritor.encolar(eventos)
+    else:
+        # El escritor se detuvo entre el registro y el commit (shutdown)
+        from app.core.database import engine
+        EscritorAuditoria(engine).escribir(eventos)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _tras_rollback(session: Session, transaccion_previa) -> None:
+    if transaccion_previa.parent is None:
+        session.info.pop(_CLAVE_PENDIENTES, None)
+
+
+def iniciar_escritor_auditoria(settings, engine=None) -> None:
+    """Arrancar el hilo escritor si AUDIT_MODE=async (idempotente)"""
+    global _escritor
+    if _escritor is not None or getattr(settings, "AUDIT_MODE", "async") != "async":
+        return
+    if engine is None:
+        from app.core.database import engine
+    _escritor = EscritorAuditoria(
+        engine,
+        maxsize=settings.AUDIT_QUEUE_SIZE,
+        lote=settings.AUDIT_BATCH_SIZE,
+        intervalo_segundos=settings.AUDIT_FLUSH_SECONDS,
+        timeout_encolado=settings.AUDIT_ENQUEUE_TIMEOUT
+    )
+    _escritor.iniciar()
+    logger.info("Escritor de auditoría iniciado (lotes de %d, cada %ss)", _escritor.lote, _escritor.intervalo_segundos)
+
+
+def detener_escritor_auditoria(timeout: Optional[float] = 10.0) -> None:
+    """Escribir lo encolado y detener el hilo (shutdown)"""
+    global _escritor
+    escritor, _escritor = _escritor, None
+    if escritor is not None:
+        escritor.detener(timeout)
+        logger.info("Escritor de auditoría detenido: %s", escritor.estadisticas())
+
+
+def estadisticas_auditoria() -> Optional[Dict[str, int]]:
+    return _escritor.estadisticas() if _escritor is not None else None
@@ -2,28 +2,49 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config.config import config
+from app.core.pool import opciones_engine, configurar_metricas, configurar_pre_ping, estadisticas_pool
+from app.core.db_routing import RoutingSession, RoutingSessionLectura, configurar_replicas
+from app.core.db_instrumentation import instrumentar_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session
-from typing import Generator
+from typing import Dict, Generator
 import os
 
 # Seleccionar configuración según ENV
 env = os.environ.get("ENV", "development")
 Settings = config.get(env, config['default'])
 
-# Engine y Session
+# Engine y Session (pool configurado desde DB_POOL_* / DB_PRE_PING)
 engine = create_engine(
     Settings.DATABASE_URL,
     echo=False,
-    pool_pre_ping=True,
-    connect_args={"charset": "utf8mb4"} 
+    **opciones_engine(Settings, Settings.DATABASE_URL)
 )
+configurar_metricas(engine, Settings)
+configurar_pre_ping(engine, Settings)
+instrumentar_engine(engine)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Réplicas de solo lectura (opcional, DATABASE_REPLICA_URLS)
+replica_engines = []
+for _url_replica in Settings.DATABASE_REPLICA_URLS:
+    _replica = create_engine(_url_replica, echo=False, **opciones_engine(Settings, _url_replica))
+    configurar_metricas(_replica, Settings)
+    configurar_pre_ping(_replica, Settings)
+    instrumentar_engine(_replica)
+    replica_engines.append(_replica)
+configurar_replicas(replica_engines, Settings.DB_READ_YOUR_WRITES_SECONDS)
+
+# Sesión normal (siempre primario) y sesión de lectura (réplica si hay)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+SessionLectura = sessionmaker(class_=RoutingSessionLectura, autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 def get_db() -> Generator[Session, None, None]:
-    """Dependencia para inyectar sesión de DB en FastAPI"""
+    """
+    Dependencia para inyectar sesión de DB en FastAPI.
+    La sesión no toma conexión del pool hasta la primera consulta
+    (autobegin), así que los endpoints que no consultan no ocupan el pool.
+    """
     db = SessionLocal()
     try:
         yield db
@@ -31,6 +52,40 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def estadisticas_db() -> dict:
+    """Métricas del pool principal y de las réplicas (checkouts, esperas, timeouts, saturación)"""
+    estadisticas = estadisticas_pool(engine)
+    if replica_engines:
+        estadisticas["replicas"] = [estadisticas_pool(replica) for replica in replica_engines]
+    return estadisticas
+
+
+def estadisticas_pools() -> Dict[str, dict]:
+    """Estadísticas de cada pool del proceso por nombre: primario, replica_N y async (si se creó)"""
+    from app.core.database_async import engine_async_creado
+
+    pools = {"primario": estadisticas_pool(engine)}
+    for numero, replica in enumerate(replica_engines, 1):
+        pools[f"replica_{numero}"] = estadisticas_pool(replica)
+    engine_async = engine_async_creado()
+    if engine_async is not None:
+        pools["async"] = estadisticas_pool(engine_async.sync_engine)
+    return pools
+
+
+def get_db_lectura() -> Generator[Session, None, None]:
+    """
+    Dependencia para endpoints de solo lectura (reportes, estadísticas).
+    Los SELECT van a una réplica salvo que la petición haya escrito hace poco;
+    el SQL textual (text()) va siempre al primario.
+    """
+    db = SessionLectura()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 # Funciones de inicialización/reseteo opcionales
 def init_database():
     """Crear todas las tablas en la DB"""
@@ -0,0 +1,97 @@
+"""
+app/core/database_async.py
+Capa de datos asíncrona (SQLAlchemy AsyncSession)
+
+Convive con `app/core/database.py`: mismos modelos (misma `Base`), otro engine.
+Los endpoints `async def` que leen mucho usan `get_async_db` para no bloquear
+el event loop; el resto sigue con `get_db` (sesión síncrona en el threadpool).
+
+Driver: `mysql+pymysql://` se traduce a `mysql+aiomysql://` (o se puede fijar
+ASYNC_DATABASE_URL). El engine se crea en el primer uso, de modo que la
+aplicación arranca aunque el driver asíncrono no esté instalado.
+
+Pool propio (DB_ASYNC_POOL_SIZE / DB_ASYNC_MAX_OVERFLOW), aparte del síncrono:
+las conexiones por worker son la suma de ambos pools.
+"""
+from typing import AsyncGenerator, Optional
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Settings
+from app.core.db_instrumentation import instrumentar_engine
+from app.core.pool import PoolMedidoAsync, configurar_metricas
+
+logger = logging.getLogger(__name__)
+
+# Driver síncrono -> driver asíncrono equivalente
+DRIVERS_ASYNC = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql+mysqldb": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker] = None
+
+
+def url_async(url: str) -> str:
+    """Traducir la URL síncrona al driver asíncrono"""
+    esquema, separador, resto = url.partition("://")
+    return DRIVERS_ASYNC.get(esquema, esquema) + separador + resto
+
+
+def get_async_engine() -> AsyncEngine:
+    """Engine asíncrono (perezoso, uno por proceso)"""
+    global _engine, _session_factory
+    if _engine is None:
+        url = getattr(Settings, "ASYNC_DATABASE_URL", None) or url_async(Settings.DATABASE_URL)
+        opciones = {}
+        if not url.startswith("sqlite"):
+            opciones = {
+                "poolclass": PoolMedidoAsync,
+                "pool_size": Settings.DB_ASYNC_POOL_SIZE,
+                "max_overflow": Settings.DB_ASYNC_MAX_OVERFLOW,
+                "pool_timeout": Settings.DB_POOL_TIMEOUT,
+                "pool_recycle": Settings.DB_POOL_RECYCLE,
+                "pool_pre_ping": Settings.DB_PRE_PING == "always",
+            }
+        if url.startswith("mysql"):
+            opciones["connect_args"] = {"charset": "utf8mb4"}
+
+        _engine = create_async_engine(url, echo=False, **opciones)
+        instrumentar_engine(_engine.sync_engine)
+        configurar_metricas(_engine.sync_engine, Settings)
+        _session_factory = async_sessionmaker(_engine, expire_on_commit=False, autoflush=False)
+        logger.info("Engine asíncrono creado (%s)", _engine.url.drivername)
+    return _engine
+
+
+def engine_async_creado() -> Optional[AsyncEngine]:
+    """Engine asíncrono si ya se creó (sin crearlo: para métricas)"""
+    return _engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Nueva AsyncSession (equivalente a SessionLocal)"""
+    get_async_engine()
+    return _session_factory()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependencia para inyectar una AsyncSession en endpoints async"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Cerrar las conexiones del engine asíncrono (shutdown)"""
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+        _session_factory = None
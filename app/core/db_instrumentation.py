@@ -0,0 +1,98 @@
+"""
+app/core/db_instrumentation.py
+Instrumentación SQL por petición: cantidad de sentencias, tiempo de BD y detector de N+1
+
+Los eventos `before_cursor_execute` / `after_cursor_execute` del engine suman
+en el `MetricasDB` de la petición actual (ContextVar que abre el middleware de
+access log). Fuera de una petición (scripts, jobs) no se registra nada.
+
+Detector de N+1: si la misma sentencia (mismo SQL con parámetros ligados, es
+decir, la misma forma) se ejecuta `umbral_n1` veces en una petición, se guarda
+el sitio de la llamada (primer frame del código de la app) y al terminar la
+petición se emite una advertencia.
+"""
+from contextvars import ContextVar
+from typing import Dict, Optional
+import logging
+import sys
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Módulos propios que no cuentan como sitio de la llamada
+_MODULOS_INFRAESTRUCTURA = ("app.core.db_instrumentation", "app.core.database", "app.core.db_routing")
+
+
+class MetricasDB:
+    """Acumulado de sentencias SQL de una petición"""
+    __slots__ = ("consultas", "tiempo", "formas", "sospechosas", "umbral_n1")
+
+    def __init__(self, umbral_n1: int = 0):
+        self.consultas = 0
+        self.tiempo = 0.0
+        self.umbral_n1 = umbral_n1  # 0 = detector desactivado
+        self.formas: Dict[str, int] = {}
+        self.sospechosas: Dict[str, str] = {}  # sentencia -> sitio de la llamada
+
+    def registrar(self, sentencia: str, duracion: float) -> None:
+        self.consultas += 1
+        self.tiempo += duracion
+        if not self.umbral_n1:
+            return
+        veces = self.formas.get(sentencia, 0) + 1
+        self.formas[sentencia] = veces
+        if veces == self.umbral_n1:
+            self.sospechosas[sentencia] = sitio_llamada()
+
+    def reportar_n1(self, metodo: str, ruta: str) -> None:
+        """Advertir las sentencias repetidas (posibles N+1) de la petición"""
+        for sentencia, sitio in self.sospechosas.items():
+            logger.warning(
+                "Posible N+1 en %s %s: %d ejecuciones de la misma sentencia desde %s: %s",
+                metodo, ruta, self.formas[sentencia], sitio, " ".join(sentencia.split())[:300]
+            )
+
+
+# Igual que EstadoPeticion: el objeto se comparte con los hilos del threadpool
+metricas_db: ContextVar[Optional[MetricasDB]] = ContextVar("metricas_db", default=None)
+
+
+def sitio_llamada() -> str:
+    """Primer frame de la app (fuera de SQLAlchemy y de la capa de BD) en la pila actual"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        modulo = frame.f_globals.get("__name__", "")
+        if modulo.startswith("app.") and not modulo.startswith(_MODULOS_INFRAESTRUCTURA):
+            return f"{frame.f_code.co_filename}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "desconocido"
+
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    if metricas_db.get() is not None:
+        conn.info.setdefault("inicio_sentencia", []).append(time.perf_counter())
+
+
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    metricas = metricas_db.get()
+    inicios = conn.info.get("inicio_sentencia")
+    if metricas is None or not inicios:
+        return
+    metricas.registrar(statement, time.perf_counter() - inicios.pop())
+
+
+def _error(contexto):
+    # La sentencia falló: no habrá after_cursor_execute
+    conn = contexto.connection
+    if conn is not None and conn.info.get("inicio_sentencia"):
+        conn.info["inicio_sentencia"].pop()
+
+
+def instrumentar_engine(engine: Engine) -> None:
+    """Registrar los eventos de medición en un engine (sync o `AsyncEngine.sync_engine`)"""
+    event.listen(engine, "before_cursor_execute", _antes)
+    event.listen(engine, "after_cursor_execute", _despues)
+    event.listen(engine, "handle_error", _error)
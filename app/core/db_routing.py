@@ -0,0 +1,132 @@
+"""
+app/core/db_routing.py
+Separación lectura/escritura con réplicas (opcional)
+
+- `RoutingSession` envía los SELECT de las sesiones de solo lectura
+  (`RoutingSessionLectura`: `SessionLectura` / `get_db_lectura`) a una réplica; todo lo demás
+  (escrituras, flush, SELECT ... FOR UPDATE, SQL textual) va al primario.
+- Lectura de lo escrito: si una sesión ya escribió, sigue en el primario.
+  Además, si en la misma petición se hizo commit de una escritura, las
+  lecturas de cualquier sesión van al primario durante DB_READ_YOUR_WRITES_SECONDS
+  (la petición lleva un `EstadoPeticion` que el middleware pone en un ContextVar).
+- Entre peticiones: `lecturas_en_primario()` fuerza el primario en un bloque.
+  El caché de reportes lo usa al recalcular un reporte cuyas tablas se
+  invalidaron hace menos de la ventana, para no volver a cachear lo que la
+  réplica todavía no recibió.
+- El SQL textual (`text()`) nunca va a la réplica, ni en sesiones de lectura:
+  no se puede saber si escribe. Las consultas de reportes que deban ir a la
+  réplica tienen que construirse con select().
+- Sin réplicas configuradas, todas las sesiones usan el primario.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Sequence
+import logging
+import random
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+logger = logging.getLogger(__name__)
+
+
+class EstadoPeticion:
+    """Estado mutable compartido por todas las sesiones de una petición"""
+    __slots__ = ("ultima_escritura",)
+
+    def __init__(self):
+        self.ultima_escritura: Optional[float] = None
+
+
+# El objeto se comparte entre el event loop y los hilos del threadpool
+# (que reciben una copia del contexto con la misma referencia)
+estado_peticion: ContextVar[Optional[EstadoPeticion]] = ContextVar("estado_peticion", default=None)
+
+# Bloque que debe leer del primario aunque la sesión sea de lectura
+_primario_forzado: ContextVar[bool] = ContextVar("primario_forzado", default=False)
+
+
+class RoutingSession(Session):
+    """Session que elige primario o réplica en cada sentencia"""
+
+    replicas: List[Engine] = []
+    ventana_lectura_escritura: float = 5.0
+    solo_lectura = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.escribio = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._usar_replica(clause):
+            return random.choice(self.replicas)
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+    def _usar_replica(self, clause) -> bool:
+        if not self.replicas or not self.solo_lectura:
+            return False
+        if self._flushing or self.escribio:
+            return False
+        # Solo SELECT sin bloqueo; SQL textual o DML siempre al primario
+        if isinstance(clause, TextClause):
+            logger.debug("SQL textual en sesión de lectura: va al primario (%.80s)", clause.text)
+            return False
+        if clause is None or not getattr(clause, "is_select", False):
+            return False
+        if getattr(clause, "_for_update_arg", None) is not None:
+            return False
+        return not _primario_forzado.get() and not escritura_reciente()
+
+
+class RoutingSessionLectura(RoutingSession):
+    """Sesión de solo lectura: sus SELECT pueden ir a una réplica"""
+    solo_lectura = True
+
+
+def escritura_reciente() -> bool:
+    """¿Hubo un commit con escrituras en esta petición dentro de la ventana?"""
+    estado = estado_peticion.get()
+    if estado is None or estado.ultima_escritura is None:
+        return False
+    return time.monotonic() - estado.ultima_escritura < RoutingSession.ventana_lectura_escritura
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _marcar_escritura(session, flush_context):
+    session.escribio = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _marcar_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.escribio = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _registrar_commit(session):
+    if not getattr(session, "escribio", False):
+        return
+    estado = estado_peticion.get()
+    if estado is not None:
+        estado.ultima_escritura = time.monotonic()
+
+
+@contextmanager
+def lecturas_en_primario() -> Iterator[None]:
+    """Dentro del bloque, las sesiones de lectura consultan el primario"""
+    token = _primario_forzado.set(True)
+    try:
+        yield
+    finally:
+        _primario_forzado.reset(token)
+
+
+def configurar_replicas(replicas: Sequence[Engine], ventana: float) -> None:
+    """Registrar las réplicas disponibles para las sesiones de lectura"""
+    RoutingSession.replicas = list(replicas)
+    RoutingSession.ventana_lectura_escritura = ventana
+    if replicas:
+        logger.info("Réplicas de lectura configuradas: %d", len(replicas))
@@ -14,7 +14,7 @@ router = APIRouter()
 
 
 @router.post("/register", response_model=dict)
-async def registrar(
+def registrar(
     registro: RegistroDTO,
     db: Session = Depends(get_db)
 ) -> dict:
@@ -39,7 +39,7 @@ async def registrar(
 
 
 @router.post("/login", response_model=dict)
-async def login(
+def login(
     login: LoginDTO,
     request: Request,
     db: Session = Depends(get_db)
@@ -64,7 +64,7 @@ async def login(
 
 
 @router.get("/me", response_model=dict)
-async def obtener_usuario_actual(
+def obtener_usuario_actual(
     token_data: dict = Depends(verify_token),
     db: Session = Depends(get_db)
 ) -> dict:
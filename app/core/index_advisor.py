@@ -0,0 +1,136 @@
+"""
+app/core/index_advisor.py
+Asesor de índices: EXPLAIN de las consultas críticas registradas
+
+Cada módulo registra sus consultas calientes con `@registrar_consulta(nombre)`
+(una función que devuelve el SELECT con valores de ejemplo). El comando
+`python manage.py asesor-indices` ejecuta EXPLAIN de cada una contra el
+esquema actual e informa recorridos completos de tabla, índice usado y
+ordenamientos en memoria (filesort).
+
+Motores: MySQL (EXPLAIN) y SQLite (EXPLAIN QUERY PLAN).
+"""
+from dataclasses import dataclass, field
+from importlib import import_module
+from typing import Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Módulos que registran consultas al importarse
+MODULOS_CONSULTAS = (
+    "app.modules.auth.repositories.auth_repository",
+    "app.modules.bitacora.repositories.bitacora_repository",
+)
+
+
+@dataclass(frozen=True)
+class ConsultaCritica:
+    nombre: str
+    construir: Callable[[], object]
+
+
+@dataclass
+class AccesoTabla:
+    """Una fila del plan: cómo se lee una tabla"""
+    tabla: str
+    tipo: str
+    indice: Optional[str] = None
+    filas: Optional[int] = None
+    completo: bool = False
+    filesort: bool = False
+
+
+@dataclass
+class Diagnostico:
+    consulta: str
+    sql: str
+    accesos: List[AccesoTabla] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def recorridos_completos(self) -> List[AccesoTabla]:
+        return [a for a in self.accesos if a.completo]
+
+
+CONSULTAS: Dict[str, ConsultaCritica] = {}
+
+
+def registrar_consulta(nombre: str):
+    """Decorador: registrar una función que construye una consulta crítica"""
+    def decorador(construir):
+        CONSULTAS[nombre] = ConsultaCritica(nombre, construir)
+        return construir
+    return decorador
+
+
+def cargar_consultas() -> Dict[str, ConsultaCritica]:
+    for modulo in MODULOS_CONSULTAS:
+        import_module(modulo)
+    return CONSULTAS
+
+
+def _sql_literal(stmt, dialecto) -> str:
+    # Valores en línea: EXPLAIN no admite parámetros en todos los drivers
+    return str(stmt.compile(dialect=dialecto, compile_kwargs={"literal_binds": True}))
+
+
+def _plan_mysql(conexion, sql: str) -> List[AccesoTabla]:
+    accesos = []
+    for fila in conexion.exec_driver_sql("EXPLAIN " + sql).mappings():
+        tipo = (fila.get("type") or "").upper()
+        extra = fila.get("Extra") or ""
+        accesos.append(AccesoTabla(
+            tabla=fila.get("table") or "",
+            tipo=tipo or "-",
+            indice=fila.get("key"),
+            filas=fila.get("rows"),
+            # ALL = tabla completa; INDEX + "Using index" = índice completo.
+            # INDEX sin "Using index" es lectura en orden del índice que corta el LIMIT
+            completo=tipo == "ALL" or (tipo == "INDEX" and "Using index" in extra),
+            filesort="filesort" in extra
+        ))
+    return accesos
+
+
+def _plan_sqlite(conexion, sql: str) -> List[AccesoTabla]:
+    accesos = []
+    for fila in conexion.exec_driver_sql("EXPLAIN QUERY PLAN " + sql).mappings():
+        detalle = fila["detail"]
+        if detalle.startswith(("SCAN", "SEARCH")):
+            # "SCAN t", "SEARCH t USING INDEX ix (...)" (versiones viejas: "SCAN TABLE t")
+            partes = [p for p in detalle.split() if p != "TABLE"]
+            indice = detalle.split(" USING ", 1)[1] if " USING " in detalle else None
+            accesos.append(AccesoTabla(
+                tabla=partes[1],
+                tipo=partes[0],
+                indice=indice,
+                # SCAN sin índice o con índice cubriente = todo; USING INDEX = en orden (LIMIT)
+                completo=partes[0] == "SCAN" and (indice is None or indice.startswith("COVERING")),
+            ))
+        elif "TEMP B-TREE" in detalle and accesos:
+            accesos[-1].filesort = True
+    return accesos
+
+
+def diagnosticar(engine, consultas: Optional[Dict[str, ConsultaCritica]] = None) -> List[Diagnostico]:
+    """EXPLAIN de cada consulta registrada contra el esquema actual"""
+    dialecto = engine.dialect
+    if dialecto.name == "mysql":
+        plan = _plan_mysql
+    elif dialecto.name == "sqlite":
+        plan = _plan_sqlite
+    else:
+        raise ValueError(f"Motor no soportado por el asesor de índices: {dialecto.name}")
+
+    diagnosticos = []
+    with engine.connect() as conexion:
+        for consulta in (consultas or cargar_consultas()).values():
+            sql = _sql_literal(consulta.construir(), dialecto)
+            diagnostico = Diagnostico(consulta.nombre, sql)
+            try:
+                diagnostico.accesos = plan(conexion, sql)
+            except Exception as e:
+                diagnostico.error = str(e).splitlines()[0]
+            diagnosticos.append(diagnostico)
+    return diagnosticos
@@ -0,0 +1,421 @@
+"""
+app/core/metrics.py
+Métricas en formato de exposición de Prometheus (texto), sin servicios externos
+
+- Peticiones por (método, plantilla de ruta, status), histograma de latencia por
+  (método, ruta) y peticiones en curso. Se actualizan solo desde el event loop
+  (middleware), así que no llevan lock.
+- Logins por resultado (exitoso / fallido / error); se cuentan desde el
+  threadpool, con un lock propio (camino poco frecuente).
+- Pools de BD (app/core/pool.py) con la etiqueta `engine`: primario,
+  replica_N y async. Cachés registrados con `registrar_cache`.
+
+Varios workers (METRICS_MULTIPROC_DIR): cada worker vuelca su instantánea a
+`<dir>/metricas_<pid>_<marca>.json` cada METRICS_FLUSH_SECONDS y `/metrics`
+suma los archivos de todos. La marca es única por arranque, así que un worker
+nuevo que reutiliza el pid de uno muerto no pisa su archivo. Los gauges solo
+cuentan workers vivos. Un worker muerto (pid inexistente o archivo sin
+actualizar en ARCHIVO_VENCIDO_INTERVALOS intervalos) deja de tener archivo:
+un worker vivo lo reclama, hereda sus contadores (los contadores no
+retroceden) y lo borra. El directorio debe vaciarse al desplegar, igual que
+con prometheus_client.
+"""
+from bisect import bisect_left
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import glob
+import json
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Campos de `estadisticas_pool` que son contadores (el resto son gauges del momento)
+CONTADORES_POOL = ("checkouts", "timeouts", "esperas_lentas", "pings", "pings_fallidos")
+GAUGES_POOL = ("size", "max_overflow", "en_uso", "disponibles", "overflow")
+
+# Un archivo sin actualizar en tantos intervalos de volcado es de un worker muerto
+ARCHIVO_VENCIDO_INTERVALOS = 3
+
+_proceso: Tuple[int, str] = (0, "")
+
+
+def id_proceso() -> str:
+    """pid + marca única del arranque (se renueva si el proceso hace fork)"""
+    global _proceso
+    pid = os.getpid()
+    if _proceso[0] != pid:
+        _proceso = (pid, f"{pid}_{uuid.uuid4().hex[:12]}")
+    return _proceso[1]
+
+
+class _Agregado:
+    """Suma de instantáneas de varios workers (los gauges solo de los vivos)"""
+
+    def __init__(self):
+        self.peticiones: Dict[tuple, int] = {}
+        self.latencias: Dict[tuple, List[float]] = {}
+        self.logins: Dict[str, int] = {}
+        self.caches: Dict[str, Dict[str, float]] = {}
+        self.pools: Dict[str, Dict[str, float]] = {}
+        self.en_curso = 0
+        self.workers = 0
+
+    def sumar(self, datos: dict, vivo: bool) -> None:
+        for metodo, ruta, status, n in datos["peticiones"]:
+            self.peticiones[(metodo, ruta, status)] = self.peticiones.get((metodo, ruta, status), 0) + n
+        for metodo, ruta, histograma in datos["latencias"]:
+            acumulado = self.latencias.setdefault((metodo, ruta), [0] * len(histograma[:-1]) + [0.0])
+            for i, valor in enumerate(histograma):
+                acumulado[i] += valor
+        for resultado, n in datos["logins"].items():
+            self.logins[resultado] = self.logins.get(resultado, 0) + n
+        for nombre, estadisticas in datos["caches"].items():
+            total = self.caches.setdefault(nombre, {"hits": 0, "misses": 0, "size": 0})
+            total["hits"] += estadisticas.get("hits", 0)
+            total["misses"] += estadisticas.get("misses", 0)
+            if vivo:
+                total["size"] += estadisticas.get("size", 0)
+        for motor, valores in datos["pool"].items():
+            total = self.pools.setdefault(motor, dict.fromkeys(CONTADORES_POOL + GAUGES_POOL, 0))
+            for clave, valor in valores.items():
+                if clave in total and (vivo or clave in CONTADORES_POOL):
+                    total[clave] += valor
+        if vivo:
+            self.workers += 1
+            self.en_curso += datos["en_curso"]
+        if datos.get("heredado"):
+            self.sumar(datos["heredado"], vivo=False)
+
+    @property
+    def vacio(self) -> bool:
+        return not (self.peticiones or self.latencias or self.logins or self.caches or self.pools)
+
+    def contadores(self) -> dict:
+        """Solo los contadores, con el formato de una instantánea"""
+        return {
+            "peticiones": [[*clave, n] for clave, n in self.peticiones.items()],
+            "latencias": [[*clave, list(h)] for clave, h in self.latencias.items()],
+            "en_curso": 0,
+            "logins": dict(self.logins),
+            "pool": {motor: {k: total[k] for k in CONTADORES_POOL} for motor, total in self.pools.items()},
+            "caches": {nombre: {"hits": t["hits"], "misses": t["misses"]} for nombre, t in self.caches.items()},
+        }
+
+
+class RegistroMetricas:
+    """Contadores de un worker"""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS_LATENCIA):
+        self.buckets = buckets
+        self.peticiones: Dict[Tuple[str, str, str], int] = {}
+        # (metodo, ruta) -> [conteo por bucket..., conteo +Inf, suma de segundos]
+        self.latencias: Dict[Tuple[str, str], List[float]] = {}
+        self.en_curso = 0
+        self.logins: Dict[str, int] = {}
+        self._lock_logins = Lock()
+        self._caches: Dict[str, Callable[[], dict]] = {}
+        # Contadores de workers muertos cuyo archivo reclamó este worker
+        self._heredado = _Agregado()
+        self._lock_heredado = Lock()
+
+    # ---- Camino caliente (event loop) ----
+    def observar_peticion(self, metodo: str, ruta: str, status: int, duracion: float) -> None:
+        clave = (metodo, ruta, str(status))
+        self.peticiones[clave] = self.peticiones.get(clave, 0) + 1
+
+        histograma = self.latencias.get((metodo, ruta))
+        if histograma is None:
+            histograma = self.latencias[(metodo, ruta)] = [0] * (len(self.buckets) + 1) + [0.0]
+        histograma[bisect_left(self.buckets, duracion)] += 1
+        histograma[-1] += duracion
+
+    # ---- Otros hilos ----
+    def registrar_login(self, resultado: str) -> None:
+        with self._lock_logins:
+            self.logins[resultado] = self.logins.get(resultado, 0) + 1
+
+    def registrar_cache(self, nombre: str, estadisticas: Callable[[], dict]) -> None:
+        self._caches[nombre] = estadisticas
+
+    def heredar(self, datos: dict) -> None:
+        """Sumar los contadores de la instantánea de un worker muerto"""
+        with self._lock_heredado:
+            self._heredado.sumar(datos, vivo=False)
+
+    def instantanea(self) -> dict:
+        """Estado serializable del worker (para /metrics o el archivo multiproceso)"""
+        from app.core.database import estadisticas_pools
+
+        with self._lock_heredado:
+            heredado = None if self._heredado.vacio else self._heredado.contadores()
+        return {
+            "pid": os.getpid(),
+            "proceso": id_proceso(),
+            "peticiones": [[*clave, n] for clave, n in list(self.peticiones.items())],
+            "latencias": [[*clave, list(h)] for clave, h in list(self.latencias.items())],
+            "en_curso": self.en_curso,
+            "logins": dict(self.logins),
+            "pool": {
+                motor: {k: pool[k] for k in CONTADORES_POOL + GAUGES_POOL if k in pool}
+                for motor, pool in estadisticas_pools().items()
+                if "checkouts" in pool  # solo pools medidos (SQLite usa el suyo)
+            },
+            "caches": {nombre: estadisticas() for nombre, estadisticas in self._caches.items()},
+            "heredado": heredado,
+        }
+
+
+# Instancia del proceso
+metricas = RegistroMetricas()
+
+
+def registrar_cache(nombre: str, estadisticas: Callable[[], dict]) -> None:
+    """Exponer los hits/misses de un caché (objeto con `estadisticas()`)"""
+    metricas.registrar_cache(nombre, estadisticas)
+
+
+def registrar_login(resultado: str) -> None:
+    metricas.registrar_login(resultado)
+
+
+# ========================= MULTIPROCESO =========================
+
+class _Volcador(Thread):
+    """Hilo que escribe la instantánea del worker en el directorio compartido"""
+
+    def __init__(self, directorio: str, intervalo: float):
+        super().__init__(name="metricas-volcado", daemon=True)
+        self.directorio = directorio
+        self.intervalo = intervalo
+        self._parar = Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            volcar_instantanea(self.directorio)
+            try:
+                reclamar_muertos(self.directorio, self.intervalo)
+            except Exception:
+                logger.exception("Error al reclamar métricas de workers terminados")
+
+    def detener(self):
+        self._parar.set()
+        volcar_instantanea(self.directorio)
+
+
+_volcador: Optional[_Volcador] = None
+
+
+def volcar_instantanea(directorio: str) -> None:
+    """Escribir la instantánea de este worker (reemplazo atómico)"""
+    destino = os.path.join(directorio, f"metricas_{id_proceso()}.json")
+    temporal = destino + ".tmp"
+    try:
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(metricas.instantanea(), archivo)
+        os.replace(temporal, destino)
+    except Exception as e:
+        logger.warning(f"No se pudo volcar métricas en {directorio}: {e}")
+
+
+def iniciar_metricas(settings) -> None:
+    """Arrancar el volcado periódico si hay modo multiproceso (startup)"""
+    global _volcador
+    directorio = settings.METRICS_MULTIPROC_DIR
+    if not directorio or _volcador is not None:
+        return
+    os.makedirs(directorio, exist_ok=True)
+    _volcador = _Volcador(directorio, settings.METRICS_FLUSH_SECONDS)
+    _volcador.start()
+
+
+def detener_metricas() -> None:
+    """Último volcado y fin del hilo (shutdown)"""
+    global _volcador
+    if _volcador is not None:
+        _volcador.detener()
+        _volcador = None
+
+
+def _proceso_vivo(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _vivo(ruta: str, datos: dict, intervalo: Optional[float]) -> bool:
+    """El worker existe y sigue volcando (un pid reutilizado no actualiza el archivo ajeno)"""
+    if not _proceso_vivo(datos["pid"]):
+        return False
+    if intervalo is None:
+        return True
+    try:
+        return time.time() - os.path.getmtime(ruta) <= intervalo * ARCHIVO_VENCIDO_INTERVALOS
+    except OSError:
+        return False
+
+
+def _leer_archivos(directorio: str, intervalo: Optional[float]) -> Iterable[Tuple[str, dict, bool]]:
+    """(ruta, instantánea, vivo) de los archivos de otros workers"""
+    propio = id_proceso()
+    for ruta in glob.glob(os.path.join(directorio, "metricas_*.json")):
+        try:
+            with open(ruta, encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+        except (OSError, ValueError):
+            continue
+        if datos.get("proceso") == propio:
+            continue
+        yield ruta, datos, _vivo(ruta, datos, intervalo)
+
+
+def reclamar_muertos(directorio: str, intervalo: Optional[float] = None) -> int:
+    """
+    Heredar los contadores de los workers muertos y borrar sus archivos.
+    El archivo se renombra antes de leerlo: si dos workers lo intentan a la
+    vez, solo uno lo consigue y los contadores no se suman dos veces.
+    """
+    reclamados = 0
+    for ruta, _, vivo in list(_leer_archivos(directorio, intervalo)):
+        if vivo:
+            continue
+        reclamo = f"{ruta}.{id_proceso()}.reclamo"
+        try:
+            os.rename(ruta, reclamo)
+            with open(reclamo, encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+        except (OSError, ValueError):
+            continue
+        metricas.heredar(datos)
+        reclamados += 1
+        # Volcar antes de borrar: los contadores heredados no desaparecen de /metrics
+        volcar_instantanea(directorio)
+        try:
+            os.remove(reclamo)
+        except OSError:
+            pass
+    if intervalo is not None:
+        _borrar_temporales(directorio, intervalo * ARCHIVO_VENCIDO_INTERVALOS)
+    return reclamados
+
+
+def _borrar_temporales(directorio: str, antiguedad: float) -> None:
+    # .tmp y reclamos que quedaron de workers que murieron a mitad de escritura
+    limite = time.time() - antiguedad
+    for patron in ("metricas_*.json.tmp", "metricas_*.reclamo"):
+        for ruta in glob.glob(os.path.join(directorio, patron)):
+            try:
+                if os.path.getmtime(ruta) < limite:
+                    os.remove(ruta)
+            except OSError:
+                pass
+
+
+def _instantaneas(directorio: Optional[str], intervalo: Optional[float] = None) -> Iterable[Tuple[dict, bool]]:
+    """(instantánea, vivo) de cada worker; la propia siempre fresca"""
+    yield metricas.instantanea(), True
+    if not directorio:
+        return
+    for _, datos, vivo in _leer_archivos(directorio, intervalo):
+        yield datos, vivo
+
+
+# ========================= EXPOSICIÓN =========================
+
+def _etiquetas(**valores) -> str:
+    partes = []
+    for nombre, valor in valores.items():
+        valor = str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        partes.append(f'{nombre}="{valor}"')
+    return "{" + ",".join(partes) + "}"
+
+
+def generar_exposicion(directorio: Optional[str] = None, intervalo: Optional[float] = None) -> str:
+    """
+    Texto de /metrics (formato de exposición 0.0.4), agregado entre workers.
+    Con `intervalo` (METRICS_FLUSH_SECONDS), un archivo vencido cuenta como worker muerto.
+    """
+    buckets = metricas.buckets
+    agregado = _Agregado()
+    for datos, vivo in _instantaneas(directorio, intervalo):
+        agregado.sumar(datos, vivo)
+    peticiones, latencias, logins, caches = agregado.peticiones, agregado.latencias, agregado.logins, agregado.caches
+    en_curso, workers = agregado.en_curso, agregado.workers
+
+    lineas = [
+        "# HELP http_requests_total Peticiones HTTP por método, ruta y status",
+        "# TYPE http_requests_total counter",
+    ]
+    for (metodo, ruta, status), n in sorted(peticiones.items()):
+        lineas.append(f"http_requests_total{_etiquetas(method=metodo, route=ruta, status=status)} {n}")
+
+    lineas += [
+        "# HELP http_request_duration_seconds Latencia de las peticiones HTTP",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for (metodo, ruta), histograma in sorted(latencias.items()):
+        acumulado = 0
+        for limite, n in zip(buckets, histograma):
+            acumulado += n
+            lineas.append(
+                f"http_request_duration_seconds_bucket{_etiquetas(method=metodo, route=ruta, le=limite)} {acumulado}"
+            )
+        acumulado += histograma[len(buckets)]
+        lineas.append(f"http_request_duration_seconds_bucket{_etiquetas(method=metodo, route=ruta, le='+Inf')} {acumulado}")
+        lineas.append(f"http_request_duration_seconds_sum{_etiquetas(method=metodo, route=ruta)} {histograma[-1]!r}")
+        lineas.append(f"http_request_duration_seconds_count{_etiquetas(method=metodo, route=ruta)} {acumulado}")
+
+    lineas += [
+        "# HELP http_requests_in_flight Peticiones en curso",
+        "# TYPE http_requests_in_flight gauge",
+        f"http_requests_in_flight {en_curso}",
+        "# HELP app_workers Workers vivos que reportan métricas",
+        "# TYPE app_workers gauge",
+        f"app_workers {workers}",
+        "# HELP auth_logins_total Intentos de login por resultado",
+        "# TYPE auth_logins_total counter",
+    ]
+    for resultado, n in sorted(logins.items()):
+        lineas.append(f"auth_logins_total{_etiquetas(result=resultado)} {n}")
+
+    lineas += [
+        "# HELP cache_requests_total Consultas a cachés por resultado",
+        "# TYPE cache_requests_total counter",
+    ]
+    for nombre, total in sorted(caches.items()):
+        lineas.append(f"cache_requests_total{_etiquetas(cache=nombre, result='hit')} {total['hits']}")
+        lineas.append(f"cache_requests_total{_etiquetas(cache=nombre, result='miss')} {total['misses']}")
+    lineas += ["# HELP cache_hit_ratio Proporción de aciertos", "# TYPE cache_hit_ratio gauge"]
+    for nombre, total in sorted(caches.items()):
+        consultas = total["hits"] + total["misses"]
+        lineas.append(f"cache_hit_ratio{_etiquetas(cache=nombre)} {total['hits'] / consultas if consultas else 0.0!r}")
+    lineas += ["# HELP cache_entries Entradas en caché", "# TYPE cache_entries gauge"]
+    for nombre, total in sorted(caches.items()):
+        lineas.append(f"cache_entries{_etiquetas(cache=nombre)} {total['size']}")
+
+    pools = sorted(agregado.pools.items())
+    for clave in CONTADORES_POOL:
+        lineas.append(f"# TYPE db_pool_{clave}_total counter")
+        for motor, pool in pools:
+            lineas.append(f"db_pool_{clave}_total{_etiquetas(engine=motor)} {pool[clave]}")
+    for clave in GAUGES_POOL:
+        lineas.append(f"# TYPE db_pool_{clave} gauge")
+        for motor, pool in pools:
+            lineas.append(f"db_pool_{clave}{_etiquetas(engine=motor)} {pool[clave]}")
+    lineas += [
+        "# HELP db_pool_saturation Conexiones en uso / capacidad (todos los workers)",
+        "# TYPE db_pool_saturation gauge",
+    ]
+    for motor, pool in pools:
+        capacidad = pool["size"] + pool["max_overflow"]
+        lineas.append(f"db_pool_saturation{_etiquetas(engine=motor)} {pool['en_uso'] / capacidad if capacidad else 0.0!r}")
+
+    return "\n".join(lineas) + "\n"
@@ -0,0 +1,27 @@
+"""
+app/core/middleware/db_routing_middleware.py
+Middleware ASGI que abre el estado de lectura/escritura de cada petición
+
+Todas las sesiones de la petición comparten el mismo `EstadoPeticion`: tras un
+commit con escrituras, las sesiones de lectura vuelven al primario durante la
+ventana configurada (ver app/core/db_routing.py).
+"""
+from app.core.db_routing import EstadoPeticion, estado_peticion
+
+
+class LecturaTrasEscrituraMiddleware:
+    """Middleware ASGI puro (sin copiar la respuesta)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = estado_peticion.set(EstadoPeticion())
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            estado_peticion.reset(token)
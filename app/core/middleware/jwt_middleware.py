@@ -1,16 +1,17 @@
 """
 app/core/middleware/jwt_middleware.py
 
+Middleware ASGI puro: no envuelve la respuesta en una tarea extra ni copia
+el stream (a diferencia de BaseHTTPMiddleware).
 """
 
-from fastapi import Request, HTTPException, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Callable
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from fastapi import status
+from typing import Optional
 import logging
-
-from app.modules.auth.services.auth_service import AuthService
-from app.core.database import get_db
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +27,19 @@ PUBLIC_ROUTES = [
 ]
 
 
-class JWTMiddleware(BaseHTTPMiddleware):
+def compilar_rutas_publicas(rutas) -> "re.Pattern":
+    """
+    Una sola regex de prefijos (misma semántica que path.startswith(ruta)).
+    Los prefijos más largos van primero para que la alternancia corte antes.
+    """
+    prefijos = sorted(set(rutas), key=len, reverse=True)
+    return re.compile("|".join(re.escape(prefijo) for prefijo in prefijos))
+
+
+_RUTAS_PUBLICAS = compilar_rutas_publicas(PUBLIC_ROUTES)
+
+
+class JWTMiddleware:
     """
     Middleware para validar JWT en todas las rutas protegidas
     
@@ -36,23 +49,32 @@ class JWTMiddleware(BaseHTTPMiddleware):
     - Inyecta usuario autenticado en request.state
     - Registra IP del cliente
     """
-    
-    async def dispatch(self, request: Request, call_next: Callable):
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Procesar request y validar JWT"""
-        
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # CRÍTICO: Permitir peticiones OPTIONS sin autenticación (CORS preflight)
-        if request.method == "OPTIONS":
-            return await call_next(request)
+        if scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
         
         # 1. Verificar si la ruta es pública
-        if self._is_public_route(request.url.path):
-            return await call_next(request)
+        if self._is_public_route(scope["path"]):
+            await self.app(scope, receive, send)
+            return
         
         # 2. Extraer token del header Authorization
-        token = self._extract_token(request)
+        headers = Headers(scope=scope)
+        token = self._extract_token(headers)
         
         if not token:
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={
                     "success": False,
@@ -61,22 +83,24 @@ class JWTMiddleware(BaseHTTPMiddleware):
                 },
                 headers={"WWW-Authenticate": "Bearer"}
             )
+            await response(scope, receive, send)
+            return
         
-        # 3. Validar token y obtener usuario
-        request.state.token = token
-        request.state.client_ip = self._get_client_ip(request)
+        # 3. Guardar token e IP en request.state
+        estado = scope.setdefault("state", {})
+        estado["token"] = token
+        estado["client_ip"] = self._get_client_ip(scope, headers)
         
         # 4. Continuar con la request
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
     
     def _is_public_route(self, path: str) -> bool:
         """Verificar si la ruta es pública"""
-        return any(path.startswith(route) for route in PUBLIC_ROUTES)
+        return _RUTAS_PUBLICAS.match(path) is not None
     
-    def _extract_token(self, request: Request) -> str:
+    def _extract_token(self, headers: Headers) -> Optional[str]:
         """Extraer token del header Authorization"""
-        auth_header = request.headers.get("Authorization")
+        auth_header = headers.get("authorization")
         
         if not auth_header:
             return None
@@ -89,16 +113,17 @@ class JWTMiddleware(BaseHTTPMiddleware):
         
         return parts[1]
     
-    def _get_client_ip(self, request: Request) -> str:
+    def _get_client_ip(self, scope: Scope, headers: Headers) -> str:
         """Obtener IP del cliente (considerando proxies)"""
         # Intentar obtener IP real detrás de proxies
-        forwarded = request.headers.get("X-Forwarded-For")
+        forwarded = headers.get("x-forwarded-for")
         if forwarded:
             return forwarded.split(",")[0].strip()
         
-        real_ip = request.headers.get("X-Real-IP")
+        real_ip = headers.get("x-real-ip")
         if real_ip:
             return real_ip
         
         # Fallback a IP directa
-        return request.client.host if request.client else "unknown"
\ No newline at end of file
+        client = scope.get("client")
+        return client[0] if client else "unknown"
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+app/core/middleware/logging_middleware.py
+Access log estructurado: un registro por petición
+
+Middleware ASGI puro: toma el status del mensaje `http.response.start`
+sin copiar el cuerpo, mide la duración y el tiempo de BD de la petición
+(app/core/db_instrumentation.py) y decide con muestreo si se registra
+(app/core/access_log.py). La misma medición alimenta las métricas de
+/metrics (app/core/metrics.py).
+
+Fuera de producción (DB_METRICS_HEADERS) agrega `X-DB-Queries` y `X-DB-Time` (ms)
+a la respuesta; cuentan las sentencias ejecutadas hasta que empieza la respuesta.
+"""
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import time
+
+from app.core.access_log import debe_registrar, registrar_acceso
+from app.core.db_instrumentation import MetricasDB, metricas_db
+from app.core.metrics import metricas as metricas_app
+
+
+def plantilla_ruta(scope: Scope) -> str:
+    """Plantilla de la ruta resuelta (/api/usuarios/{id}), no la URL concreta"""
+    ruta = scope.get("route")
+    if ruta is None:
+        return "sin_ruta"
+    return getattr(ruta, "path_format", None) or getattr(ruta, "path", "sin_ruta")
+
+
+class RequestLoggingMiddleware:
+    """Mide cada petición y encola su registro de acceso"""
+
+    def __init__(self, app: ASGIApp, settings=None):
+        if settings is None:
+            from app.core.database import Settings as settings
+        self.app = app
+        self.settings = settings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        metricas = MetricasDB(umbral_n1=self.settings.DB_N1_THRESHOLD)
+        token = metricas_db.set(metricas)
+        status = 500  # si la app falla antes de responder
+        metricas_app.en_curso += 1
+
+        async def send_con_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.settings.DB_METRICS_HEADERS:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-DB-Queries", str(metricas.consultas))
+                    headers.append("X-DB-Time", f"{metricas.tiempo * 1000:.2f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_con_status)
+        finally:
+            metricas_db.reset(token)
+            duracion = time.perf_counter() - inicio
+            duracion_ms = duracion * 1000
+            ruta = plantilla_ruta(scope)
+            metricas_app.en_curso -= 1
+            metricas_app.observar_peticion(scope["method"], ruta, status, duracion)
+            if metricas.sospechosas:
+                metricas.reportar_n1(scope["method"], ruta)
+            if debe_registrar(status, duracion_ms, self.settings):
+                cliente = scope.get("client")
+                registrar_acceso({
+                    "metodo": scope["method"],
+                    "ruta": ruta,
+                    "status": status,
+                    "duracion_ms": round(duracion_ms, 2),
+                    "db_ms": round(metricas.tiempo * 1000, 2),
+                    "db_consultas": metricas.consultas,
+                    "ip": cliente[0] if cliente else None,
+                    "lenta": duracion_ms >= self.settings.ACCESS_LOG_SLOW_MS,
+                })
@@ -0,0 +1,184 @@
+"""
+app/core/pool.py
+Pool de conexiones configurable y con métricas
+
+- Tamaño, overflow, timeout y reciclado salen de la clase de configuración (DB_POOL_*).
+- Estrategia de pre-ping (DB_PRE_PING):
+    'always' -> SELECT 1 en cada checkout (pool_pre_ping de SQLAlchemy)
+    'idle'   -> SELECT 1 solo si la conexión estuvo inactiva más de DB_PRE_PING_IDLE_SECONDS
+    'never'  -> sin ping; se confía en DB_POOL_RECYCLE
+- Cada checkout mide cuánto esperó por una conexión; los timeouts del pool
+  y la saturación (conexiones en uso / capacidad) quedan en `estadisticas_pool`.
+  El engine asíncrono usa `PoolMedidoAsync` (misma medición, cola de asyncio).
+"""
+from threading import Lock
+from typing import Any, Dict
+import logging
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+PRE_PING_ESTRATEGIAS = ("always", "idle", "never")
+
+
+class MetricasPool:
+    """Contadores de checkout de un pool (por proceso)"""
+
+    def __init__(self, espera_alerta: float = 0.2):
+        self.espera_alerta = espera_alerta
+        self._lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.esperas_lentas = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+        self.pings = 0
+        self.pings_fallidos = 0
+        self._ultima_alerta = 0.0
+
+    def registrar_checkout(self, espera: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.espera_total += espera
+            if espera > self.espera_max:
+                self.espera_max = espera
+            lenta = espera >= self.espera_alerta
+            if lenta:
+                self.esperas_lentas += 1
+                # Una advertencia cada 10 s como máximo
+                avisar = time.monotonic() - self._ultima_alerta > 10
+                if avisar:
+                    self._ultima_alerta = time.monotonic()
+        if lenta and avisar:
+            logger.warning("Pool de BD saturado: checkout esperó %.0f ms", espera * 1000)
+
+    def registrar_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        logger.error("Pool de BD agotado: timeout esperando conexión")
+
+    def registrar_ping(self, ok: bool) -> None:
+        with self._lock:
+            self.pings += 1
+            if not ok:
+                self.pings_fallidos += 1
+
+
+class PoolMedido(QueuePool):
+    """QueuePool que mide la espera de cada checkout y cuenta los timeouts"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # create_engine no acepta argumentos propios del pool: ver configurar_metricas
+        self.metricas = MetricasPool()
+        self.max_overflow = kwargs.get("max_overflow", 10)
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super().connect()
+        except exc.TimeoutError:
+            self.metricas.registrar_timeout()
+            raise
+        self.metricas.registrar_checkout(time.perf_counter() - inicio)
+        return conexion
+
+    def recreate(self):
+        # Conservar las métricas cuando el pool se recrea tras una desconexión
+        nuevo = super().recreate()
+        nuevo.metricas = self.metricas
+        return nuevo
+
+
+class PoolMedidoAsync(PoolMedido, AsyncAdaptedQueuePool):
+    """PoolMedido para create_async_engine"""
+
+
+def opciones_engine(settings, url: str) -> Dict[str, Any]:
+    """Argumentos de create_engine según la configuración y el motor"""
+    if url.startswith("sqlite"):
+        # SQLite usa su propio pool (sin overflow ni timeout)
+        return {}
+
+    estrategia = getattr(settings, "DB_PRE_PING", "idle")
+    if estrategia not in PRE_PING_ESTRATEGIAS:
+        raise ValueError(f"DB_PRE_PING debe ser uno de {PRE_PING_ESTRATEGIAS}: {estrategia!r}")
+
+    opciones = {
+        "poolclass": PoolMedido,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": estrategia == "always",
+    }
+    if url.startswith("mysql"):
+        opciones["connect_args"] = {"charset": "utf8mb4"}
+    return opciones
+
+
+def configurar_metricas(engine: Engine, settings) -> None:
+    """Umbral de alerta de espera del pool (DB_POOL_WAIT_WARN_MS), tras crear el engine"""
+    if isinstance(engine.pool, PoolMedido):
+        engine.pool.metricas = MetricasPool(espera_alerta=settings.DB_POOL_WAIT_WARN_MS / 1000)
+
+
+def configurar_pre_ping(engine: Engine, settings) -> None:
+    """Registrar el ping por inactividad si la estrategia es 'idle'"""
+    if getattr(settings, "DB_PRE_PING", "idle") != "idle" or not isinstance(engine.pool, PoolMedido):
+        return
+
+    limite = settings.DB_PRE_PING_IDLE_SECONDS
+
+    @event.listens_for(engine, "checkin")
+    def _marcar_inactiva(dbapi_connection, connection_record):
+        connection_record.info["devuelta"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_si_inactiva(dbapi_connection, connection_record, connection_proxy):
+        devuelta = connection_record.info.get("devuelta")
+        if devuelta is None or time.monotonic() - devuelta < limite:
+            return  # Conexión nueva o usada hace poco: sin ida y vuelta extra
+
+        metricas = engine.pool.metricas
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+            metricas.registrar_ping(True)
+        except Exception:
+            metricas.registrar_ping(False)
+            # El pool descarta la conexión y reintenta con una nueva
+            raise exc.DisconnectionError()
+        finally:
+            cursor.close()
+
+
+def estadisticas_pool(engine: Engine) -> Dict[str, Any]:
+    """Estado y contadores del pool del engine"""
+    pool = engine.pool
+    if not isinstance(pool, PoolMedido):
+        return {"pool": type(pool).__name__, "estado": pool.status()}
+
+    metricas = pool.metricas
+    capacidad = pool.size() + pool.max_overflow
+    en_uso = pool.checkedout()
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool.max_overflow,
+        "en_uso": en_uso,
+        "disponibles": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "saturacion": round(en_uso / capacidad, 3) if capacidad > 0 else 0.0,
+        "checkouts": metricas.checkouts,
+        "timeouts": metricas.timeouts,
+        "esperas_lentas": metricas.esperas_lentas,
+        "espera_promedio_ms": round(metricas.espera_total / metricas.checkouts * 1000, 3) if metricas.checkouts else 0.0,
+        "espera_max_ms": round(metricas.espera_max * 1000, 3),
+        "pings": metricas.pings,
+        "pings_fallidos": metricas.pings_fallidos,
+    }
@@ -1,35 +1,38 @@
 # app/main.py
-from fastapi import FastAPI
+"""
+Ensamblado de la aplicación (factory)
+
+- `uvicorn app.main:app`: app con los módulos de APP_MODULES (vacío = todos);
+  se crea la primera vez que se pide `app.main.app`, no al importar el módulo
+- `uvicorn app.main:create_app --factory`: una app nueva por llamada
+- `create_app(["auth", "reportes"])`: solo esos routers (ver app/modulos.py)
+
+Los controladores se importan dentro de `create_app`, solo los de los módulos
+seleccionados. Para medir el arranque: `python manage.py perfil-importacion`.
+"""
+from typing import Iterable, Optional
+from fastapi import Depends, FastAPI, Header
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 import os
 from dotenv import load_dotenv
+from sqlalchemy.orm import Session
 
 # Middleware JWT
 from app.core.middleware.jwt_middleware import JWTMiddleware
+from app.core.middleware.db_routing_middleware import LecturaTrasEscrituraMiddleware
+from app.core.middleware.logging_middleware import RequestLoggingMiddleware
+from app.core.access_log import configurar_access_log, detener_access_log
+from app.core.audit_writer import iniciar_escritor_auditoria, detener_escritor_auditoria
+from app.core.metrics import generar_exposicion, iniciar_metricas, detener_metricas
+from app.core.database import Settings, get_db
+from app.shared.fast_json import FastJSONResponse
 
 # Exception handlers
 from app.shared.exceptions.custom_exceptions import register_exception_handlers
 
-# Routers
-from app.modules.auth.controllers import auth_controller
-from app.modules.usuarios.controllers import usuario_controller
-from app.modules.bitacora.controllers import bitacora_controller
-from app.modules.esquelas.controllers import esquela_controller, codigo_esquela_controller
-from app.modules.administracion.controllers import curso_controller
-from app.modules.administracion.controllers import administrativo_controller
-from app.modules.reportes.controllers import reporte_controller
-
-# Retiros Tempranos
-from app.modules.retiros_tempranos.controllers.autorizacion_retiro_controller import router as autorizacion_router
-from app.modules.retiros_tempranos.controllers.motivo_retiro_controller import router as motivo_router
-from app.modules.retiros_tempranos.controllers.registro_salida_controller import router as registro_router
-from app.modules.retiros_tempranos.controllers.solicitud_retiro_controller import router as solicitud_router
-from app.modules.retiros_tempranos.controllers.estudiante_apoderado_controller import router as estudiante_apoderado_router
-from app.core.extensions import router as extensions_router  # <- add this import
-
-# Situaciones Áreas e Incidentes SIA
-from app.modules.incidentes.controllers import controllers_incidentes
+# Routers (importados al registrar cada módulo)
+from app.modulos import cargar_modelos, registrar_routers, resolver_modulos
 
 load_dotenv()
 
@@ -40,106 +43,143 @@ logging.basicConfig(
 )
 logger = logging.getLogger("uvicorn")
 
-# ========================= APP =========================
-app = FastAPI(
-    title=os.getenv("API_TITLE", "API Bienestar Estudiantil"),
-    version=os.getenv("API_VERSION", "1.0.0"),
-    description="Sistema de gestión de usuarios, roles, permisos y bitácora",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-from fastapi import Request
-
-# ... (existing imports)
-
-# ========================= MIDDLEWARE =========================
 
-# Middleware de Logging para Debugging
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    logger.info(f"Incoming request: {request.method} {request.url.path}")
-    response = await call_next(request)
-    logger.info(f"Response status: {response.status_code}")
-    return response
-
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# JWT Middleware (DESPUÉS de CORS)
-app.add_middleware(JWTMiddleware)
-
-# ========================= EXCEPTION HANDLERS =========================
-register_exception_handlers(app)
-
-# ========================= ROUTERS =========================
-app.include_router(auth_controller.router, prefix="/api/auth", tags=["Autenticación"])
-app.include_router(usuario_controller.router, prefix="/api/usuarios", tags=["Usuarios"])
-app.include_router(bitacora_controller.router, prefix="/api/bitacora", tags=["Bitácora"])
-# Routes SIA
-app.include_router(controllers_incidentes.router, prefix="/api/incidentes", tags=["Incidentes"])
-
-# Nuevos módulos
-app.include_router(esquela_controller.router, prefix="/api") 
-app.include_router(codigo_esquela_controller.router, prefix="/api")
-app.include_router(curso_controller.router, prefix="/api")
-app.include_router(administrativo_controller.router)
-app.include_router(reporte_controller.router, prefix="/api")
-
-# Retiros Tempranos (ya tienen prefix="/api/..." en sus routers)
-app.include_router(autorizacion_router, tags=["Retiros Tempranos - Autorizaciones"])
-app.include_router(motivo_router, tags=["Retiros Tempranos - Motivos"])
-app.include_router(registro_router, tags=["Retiros Tempranos - Registros"])
-app.include_router(solicitud_router, tags=["Retiros Tempranos - Solicitudes"])
-app.include_router(estudiante_apoderado_router, tags=["Retiros Tempranos - Relaciones"])
-
-# Auth extensiones (registro/login/me/validate-token desde app/core/extensions.py)
-app.include_router(extensions_router, prefix="/api/auth-ext", tags=["Autenticación Ext"])
-
-# ========================= ROOT =========================
-@app.get("/")
-def root():
-    return {
-        "status": "success",
-        "message": "Bienvenido a la API de Bienestar Estudiantil",
-        "version": os.getenv("API_VERSION", "1.0.0")
-    }
-
-# ========================= HEALTH CHECK =========================
-@app.get("/health", tags=["Health"])
-def health_check():
-    return {"status": "ok", "message": "API funcionando"}
-
-# ========================= STARTUP/SHUTDOWN =========================
-@app.on_event("startup")
-async def startup_event():
-    logger.info("🚀 Iniciando API Bienestar Estudiantil")
-    logger.info("🔐 Middleware JWT cargado")
-    logger.info("📦 Routers cargados correctamente")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("🛑 API cerrándose")
-
-# ========================= DEBUG TOKEN (Opcional para desarrollo) =========================
-from fastapi import Depends, Header
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.modules.auth.services.auth_service import AuthService
+def create_app(modulos: Optional[Iterable[str]] = None) -> FastAPI:
+    """
+    Crear la aplicación FastAPI
+
+    Args:
+        modulos: Módulos a registrar (None = APP_MODULES; vacío = todos)
+
+    Returns:
+        FastAPI: Aplicación con middlewares, handlers y los routers seleccionados
+    """
+    nombres = resolver_modulos(Settings.APP_MODULES if modulos is None else modulos)
+
+    # ========================= APP =========================
+    app = FastAPI(
+        title=os.getenv("API_TITLE", "API Bienestar Estudiantil"),
+        version=os.getenv("API_VERSION", "1.0.0"),
+        description="Sistema de gestión de usuarios, roles, permisos y bitácora",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        default_response_class=FastJSONResponse
+    )
+    app.state.modulos = nombres
+
+    # ========================= MIDDLEWARE =========================
+    # Middlewares ASGI puros (el último agregado es el más externo)
+
+    # Lectura de lo escrito con réplicas (el más interno: envuelve solo la app)
+    app.add_middleware(LecturaTrasEscrituraMiddleware)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-DB-Queries", "X-DB-Time"],
+    )
+
+    # JWT Middleware (DESPUÉS de CORS)
+    app.add_middleware(JWTMiddleware)
+
+    # Access log y /metrics (el más externo: incluye preflights de CORS y 401 del JWT)
+    app.add_middleware(RequestLoggingMiddleware, settings=Settings)
+
+    # ========================= EXCEPTION HANDLERS =========================
+    register_exception_handlers(app)
+
+    # ========================= ROUTERS =========================
+    cargar_modelos()
+    registrar_routers(app, nombres)
+
+    # ========================= ROOT =========================
+    @app.get("/")
+    def root():
+        return {
+            "status": "success",
+            "message": "Bienvenido a la API de Bienestar Estudiantil",
+            "version": os.getenv("API_VERSION", "1.0.0")
+        }
+
+    # ========================= HEALTH CHECK =========================
+    @app.get("/health", tags=["Health"])
+    def health_check():
+        return {"status": "ok", "message": "API funcionando"}
+
+    # /health/live, /health/ready (probes de dependencias) y /status
+    from app.modules.health import health_router
+    app.include_router(health_router)
+
+    @app.get("/health/db-pool", tags=["Health"])
+    def health_db_pool():
+        """Métricas del pool de conexiones de este worker"""
+        from app.core.database import estadisticas_db
+        return {"status": "ok", "pool": estadisticas_db()}
+
+    # ========================= MÉTRICAS =========================
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    def metrics():
+        """Métricas en formato de exposición de Prometheus (todos los workers en modo multiproceso)"""
+        from fastapi.responses import PlainTextResponse
+        return PlainTextResponse(
+            generar_exposicion(Settings.METRICS_MULTIPROC_DIR, Settings.METRICS_FLUSH_SECONDS),
+            media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    # ========================= STARTUP/SHUTDOWN =========================
+    @app.on_event("startup")
+    async def startup_event():
+        configurar_access_log(Settings)
+        iniciar_metricas(Settings)
+        iniciar_escritor_auditoria(Settings)
+        from app.modules.bitacora.services.retencion import cargar_indice_archivos
+        cargar_indice_archivos(Settings)
+        if Settings.RETENTION_MONTHS > 0:
+            from app.modules.bitacora.services.retencion import iniciar_retencion
+            iniciar_retencion(Settings)
+        logger.info("🚀 Iniciando API Bienestar Estudiantil")
+        logger.info("🔐 Middleware JWT cargado")
+        logger.info(f"📦 Routers cargados correctamente ({', '.join(nombres)})")
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        # Escribir la auditoría encolada antes de cerrar conexiones
+        if Settings.RETENTION_MONTHS > 0:
+            from app.modules.bitacora.services.retencion import detener_retencion
+            detener_retencion()
+        detener_escritor_auditoria()
+        from app.modules.auth.services.token_revocation import detener_revocation_store
+        detener_revocation_store()
+        from app.core.database_async import dispose_async_engine
+        await dispose_async_engine()
+        logger.info("🛑 API cerrándose")
+        detener_metricas()
+        detener_access_log()
+
+    # ========================= DEBUG TOKEN (Opcional para desarrollo) =========================
+    @app.get("/debug-token")
+    def debug_token(authorization: str = Header(None), db: Session = Depends(get_db)):
+        from app.modules.auth.services.auth_service import AuthService
+        token = authorization.replace("Bearer ", "")
+        user = AuthService.get_current_user(db, token)
+        return {"user": user.usuario}
+
+    return app
+
+
+def __getattr__(nombre):
+    # `app.main.app` perezosa: importar el módulo (manage.py, benchmarks) no arma la app
+    if nombre == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
 
-@app.get("/debug-token")
-def debug_token(authorization: str = Header(None), db: Session = Depends(get_db)):
-    token = authorization.replace("Bearer ", "")
-    user = AuthService.get_current_user(db, token)
-    return {"user": user.usuario}
 
 # ========================= RUN SERVER (dev) =========================
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(create_app(), host="0.0.0.0", port=8000, reload=True)
@@ -1,18 +1,22 @@
 """Módulo de Administración de Personas (Estudiantes, Profesores, Registradores, Administrativos)
 
-Expone los routers para que puedan ser importados desde app.modules.administracion
+Expone los routers para que puedan ser importados desde app.modules.administracion.
+Los controladores se importan al pedir un router, no al importar el paquete.
 """
 
-from .controllers.persona_controller import (
-    estudiantes_router,
-    profesores_router,
-    registradores_router
-)
-from .controllers.administrativo_controller import router as administrativos_router
-
 __all__ = [
     "estudiantes_router",
     "profesores_router",
     "registradores_router",
     "administrativos_router"
 ]
+
+
+def __getattr__(nombre):
+    if nombre in ("estudiantes_router", "profesores_router", "registradores_router"):
+        from .controllers import persona_controller
+        return getattr(persona_controller, nombre)
+    if nombre == "administrativos_router":
+        from .controllers.administrativo_controller import router
+        return router
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
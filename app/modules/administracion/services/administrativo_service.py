@@ -14,6 +14,8 @@ from app.modules.administracion.dto.administrativo_dto import (
 from app.modules.administracion.repositories.administrativo_repository import (
     AdministrativoRepository
 )
+from app.modules.reportes.services.reporte_cache import invalidar_tablas
+from app.modules.bitacora.services.hidratacion import invalidar_nombres_persona
 
 
 # ============ ADMINISTRATIVO SERVICE ============
@@ -177,6 +179,7 @@ class AdministrativoService:
             
             # Si llegamos aquí, el DTO es válido - ahora hacer commit
             db.commit()
+            invalidar_tablas("personas")
             
             # Retornar el DTO validado
             return dto
@@ -297,6 +300,10 @@ class AdministrativoService:
                 administrativo_data['observaciones'] = data.observaciones
             
             admin_dict = AdministrativoRepository.update(db, id_persona, persona_data, administrativo_data)
+            invalidar_tablas("personas")
+            if persona_data.keys() & {'nombres', 'apellido_paterno', 'apellido_materno'}:
+                # Nombre mostrado en /api/bitacora/auditoria
+                invalidar_nombres_persona(db, id_persona)
             if not admin_dict:
                 return None
             return AdministrativoReadDTO(**admin_dict)
@@ -342,6 +349,7 @@ class AdministrativoService:
         # Proceder con la eliminación
         try:
             admin_eliminado = AdministrativoRepository.delete(db, id_persona)
+            invalidar_tablas("personas")
             if not admin_eliminado:
                 raise HTTPException(status_code=404, detail="No se pudo eliminar el administrativo")
             return AdministrativoReadDTO(**admin_eliminado)
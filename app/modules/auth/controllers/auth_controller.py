@@ -21,6 +21,8 @@ import logging
 from app.modules.usuarios.models.usuario_models import Persona1, Rol, Usuario
 from app.modules.auth.dto.auth_dto import LoginDTO, RegistroDTO, CambiarPasswordDTO
 from app.modules.auth.services.auth_service import AuthService, get_current_user_dependency
+from app.modules.auth.services.principal_cache import principal_cache
+from app.modules.bitacora.services.hidratacion import nombres_cache
 from app.core.utils import success_response
 from app.modules.usuarios.services.usuario_service import PersonaService
 from app.core.database import get_db
@@ -59,7 +61,7 @@ def get_token_from_request(request: Request) -> str:
 # ==================== AUTENTICACIÓN ====================
 
 @router.post("/login", response_model=dict, status_code=status.HTTP_200_OK)
-async def login(
+def login(
     login_dto: LoginDTO,
     request: Request,
     db: Session = Depends(get_db)
@@ -86,7 +88,7 @@ async def login(
 
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
-async def logout(
+def logout(
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency),
     request: Request = None  #  Opcional para evitar error 422 en tests
@@ -117,7 +119,7 @@ async def logout(
 
 
 @router.get("/me", response_model=dict, status_code=status.HTTP_200_OK)
-async def obtener_usuario_actual(
+def obtener_usuario_actual(
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
@@ -134,7 +136,7 @@ async def obtener_usuario_actual(
 
 
 @router.post("/refresh", response_model=dict)
-async def refresh_token(
+def refresh_token(
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
@@ -162,7 +164,7 @@ async def refresh_token(
 
 @router.post("/usuarios", status_code=status.HTTP_201_CREATED)
 @requires_permission('crear_usuario')
-async def crear_usuario_para_persona(
+def crear_usuario_para_persona(
     usuario_dto: UsuarioCreateDTO,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -280,7 +282,7 @@ async def crear_usuario_para_persona(
 
 @router.post("/usuarios/{id_usuario}/restablecer-password", status_code=status.HTTP_200_OK)
 @requires_permission('editar_usuario')
-async def restablecer_password(
+def restablecer_password(
     id_usuario: int,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -362,7 +364,7 @@ async def restablecer_password(
         )
 
 @router.post("/cambiar-password", status_code=status.HTTP_200_OK)
-async def cambiar_password(
+def cambiar_password(
     password_dto: CambiarPasswordDTO,
     request: Request,
     db: Session = Depends(get_db),
@@ -432,7 +434,7 @@ async def cambiar_password(
       
 @router.get("/usuarios", response_model=dict)
 @requires_permission('ver_usuario')
-async def listar_usuarios(
+def listar_usuarios(
     skip: int = Query(0, ge=0),
     limit: int = Query(1000, ge=1, le=1000),
     db: Session = Depends(get_db),
@@ -474,7 +476,7 @@ async def listar_usuarios(
 
 @router.get("/usuarios/{id_usuario}", response_model=dict)
 @requires_permission('ver_usuario')
-async def obtener_usuario(
+def obtener_usuario(
     id_usuario: int,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -494,7 +496,7 @@ async def obtener_usuario(
 
 @router.put("/usuarios/{id_usuario}", response_model=dict)
 @requires_permission('editar_usuario')
-async def actualizar_usuario(
+def actualizar_usuario(
     id_usuario: int,
     usuario_update: UsuarioUpdateDTO,
     db: Session = Depends(get_db),
@@ -600,6 +602,8 @@ async def actualizar_usuario(
         )
         
         db.commit()
+        principal_cache.invalidar_usuario(id_usuario)
+        nombres_cache.invalidar(id_usuario)
         db.refresh(usuario)
         
         logger.info(f"✅ Usuario actualizado: {usuario.usuario}")
@@ -630,7 +634,7 @@ async def actualizar_usuario(
 
 @router.delete("/usuarios/{id_usuario}", response_model=dict)
 @requires_permission('eliminar_usuario')
-async def eliminar_usuario(
+def eliminar_usuario(
     id_usuario: int,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -652,7 +656,7 @@ async def eliminar_usuario(
 
 @router.post("/roles", response_model=dict, status_code=status.HTTP_201_CREATED)
 @requires_permission('crear_rol')
-async def crear_rol(
+def crear_rol(
     rol_create: RolCreateDTO,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -679,7 +683,7 @@ async def crear_rol(
 
 @router.get("/roles", response_model=dict)
 @requires_permission('ver_rol') 
-async def listar_roles(
+def listar_roles(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     current_user: Usuario = Depends(get_current_user_dependency),
@@ -707,7 +711,7 @@ async def listar_roles(
 
 @router.get("/roles/{id_rol}", response_model=dict)
 @requires_permission('ver_rol')
-async def obtener_rol(
+def obtener_rol(
     id_rol: int,
     current_user: Usuario = Depends(get_current_user_dependency),
     db: Session = Depends(get_db)
@@ -726,7 +730,7 @@ async def obtener_rol(
 
 @router.put("/roles/{id_rol}")
 @requires_permission("editar_rol")
-async def actualizar_rol(
+def actualizar_rol(
     id_rol: int,
     rol_update: RolUpdateDTO,
     db: Session = Depends(get_db),
@@ -759,7 +763,7 @@ async def actualizar_rol(
 
 @router.delete("/roles/{id_rol}")
 @requires_permission("eliminar_rol")
-async def eliminar_rol(
+def eliminar_rol(
     id_rol: int,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -795,7 +799,7 @@ async def eliminar_rol(
 
 @router.post("/usuarios/{id_usuario}/roles/{id_rol}", response_model=dict)
 @requires_permission('asignar_permisos')
-async def asignar_rol_usuario(
+def asignar_rol_usuario(
     id_usuario: int,
     id_rol: int,
     db: Session = Depends(get_db),
@@ -811,7 +815,7 @@ async def asignar_rol_usuario(
 
 @router.post("/roles/{id_rol}/permisos", response_model=dict)
 @requires_permission('asignar_permisos')
-async def asignar_permisos_rol(
+def asignar_permisos_rol(
     id_rol: int,
     permisos_ids: list[int],
     db: Session = Depends(get_db),
@@ -826,7 +830,7 @@ async def asignar_permisos_rol(
 
 @router.get("/roles/{id_rol}/usuarios", response_model=dict)
 @requires_permission('ver_rol')
-async def obtener_usuarios_rol(
+def obtener_usuarios_rol(
     id_rol: int,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -895,7 +899,7 @@ async def obtener_usuarios_rol(
 
 @router.get("/permisos", response_model=dict)
 @requires_permission('ver_rol')
-async def listar_permisos(
+def listar_permisos(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     modulo: Optional[str] = None,
@@ -912,7 +916,7 @@ async def listar_permisos(
 
 @router.get("/permisos/{id_permiso}", response_model=dict)
 @requires_permission('ver_rol')
-async def obtener_permiso(
+def obtener_permiso(
     id_permiso: int,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -929,7 +933,7 @@ async def obtener_permiso(
 
 @router.get("/permisos/{id_permiso}/roles", response_model=dict)
 @requires_permission('ver_rol')
-async def obtener_roles_con_permiso(
+def obtener_roles_con_permiso(
     id_permiso: int,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -954,7 +958,7 @@ async def obtener_roles_con_permiso(
 # ---------------- ENDPOINTS DE PERMISOS con nivel de acceso--------------------
 
 @router.get("/me/permisos", response_model=dict, status_code=status.HTTP_200_OK)
-async def obtener_mis_permisos(
+def obtener_mis_permisos(
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
@@ -1023,7 +1027,7 @@ async def obtener_mis_permisos(
 
 
 @router.get("/me/puede-acceder/{modulo}", response_model=dict, status_code=status.HTTP_200_OK)
-async def verificar_acceso_modulo(
+def verificar_acceso_modulo(
     modulo: str,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -1060,7 +1064,7 @@ async def verificar_acceso_modulo(
 
 
 @router.post("/me/verificar-permiso", response_model=dict, status_code=status.HTTP_200_OK)
-async def verificar_permiso_especifico(
+def verificar_permiso_especifico(
     accion: str,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -1103,7 +1107,7 @@ async def verificar_permiso_especifico(
 
 @router.get("/logs-acceso", response_model=dict)
 @requires_permission('ver_rol')
-async def listar_logs_acceso(
+def listar_logs_acceso(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     db: Session = Depends(get_db),
@@ -1147,7 +1151,7 @@ async def listar_logs_acceso(
 
 @router.get("/personas")
 @requires_permission("ver_personas")
-async def listar_personas(
+def listar_personas(
     # Paginación
     skip: int = Query(0, ge=0, description="Registros a saltar"),
     limit: int = Query(50, ge=1, le=1000, description="Límite de registros"),  
@@ -1203,7 +1207,7 @@ async def listar_personas(
                 item["usuario_activo"] = None
 
         #  ASEGURAR que la respuesta tenga la estructura correcta
-        return ResponseModel.success(
+        return ResponseModel.success_json(
             message=f"Personas listadas exitosamente ({resultado['total']} total, mostrando {len(resultado['items'])})",
             data={
                 "items": resultado["items"],
@@ -1231,7 +1235,7 @@ async def listar_personas(
 # 2 OBTENER PERSONA 
 
 @router.get("/id/{persona_id}", response_model=dict, status_code=status.HTTP_200_OK)
-async def obtener_persona_por_id(
+def obtener_persona_por_id(
     persona_id: int,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -1259,7 +1263,7 @@ async def obtener_persona_por_id(
 
 
 @router.get("/ci/{ci}", response_model=dict, status_code=status.HTTP_200_OK)
-async def obtener_persona_por_ci(
+def obtener_persona_por_ci(
     ci: str,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -1290,7 +1294,7 @@ async def obtener_persona_por_ci(
 
 @router.get("/personas/estadisticas")
 @requires_permission("ver_personas")
-async def obtener_estadisticas(
+def obtener_estadisticas(
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
 ) -> dict:
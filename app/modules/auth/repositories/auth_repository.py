@@ -3,14 +3,17 @@ auth_repository.py - VERSIÓN COMPLETA
 Repositorio de autenticación con todos los métodos necesarios
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, select
 from app.modules.usuarios.models.usuario_models import (
     Usuario, Persona1, LoginLog, Bitacora
 )
-from typing import Optional
+from typing import Dict, Iterable, Optional
 from datetime import datetime, timedelta
 import logging
 
+from app.core.audit_writer import accion_durable, registrar_auditoria
+from app.core.index_advisor import registrar_consulta
+
 logger = logging.getLogger(__name__)
 
 # Constantes
@@ -74,23 +77,25 @@ class AuthRepository:
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
         estado: str = 'exitoso'
-    ) -> LoginLog:
+    ) -> Optional[LoginLog]:
         """
         Registrar intento de login en LoginLog
-        USA FLUSH, NO COMMIT (commit lo hace el servicio)
+        SIN COMMIT (commit lo hace el servicio)
+        
+        Los fallidos se insertan en la transacción (flush): el bloqueo de
+        cuentas los cuenta. Los exitosos van al escritor de auditoría tras
+        el commit y se devuelve None (ver app/core/audit_writer.py).
         """
         if estado not in ['exitoso', 'fallido']:
             estado = 'fallido'
         
-        login_log = LoginLog(
-            id_usuario=id_usuario,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            estado=estado,
-            fecha_hora=datetime.now()
-        )
-        db.add(login_log)
-        db.flush()
+        login_log = registrar_auditoria(db, LoginLog, {
+            "id_usuario": id_usuario,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "estado": estado,
+            "fecha_hora": datetime.now()
+        }, durable=estado == 'fallido')
         logger.info(f"LoginLog registrado para usuario {id_usuario}: {estado}")
         return login_log
     
@@ -102,21 +107,20 @@ class AuthRepository:
         tipo_objetivo: Optional[str] = None,
         id_objetivo: Optional[int] = None,
         descripcion: Optional[str] = None
-    ) -> Bitacora:
+    ) -> Optional[Bitacora]:
         """
         Registrar acción en Bitácora
-        USA FLUSH, NO COMMIT
+        SIN COMMIT: en la transacción si la acción está en AUDIT_SYNC_ACTIONS
+        (devuelve la fila); si no, se escribe tras el commit (devuelve None)
         """
-        bitacora = Bitacora(
-            id_usuario_admin=usuario_id,
-            accion=accion,
-            tipo_objetivo=tipo_objetivo,
-            id_objetivo=id_objetivo,
-            descripcion=descripcion,
-            fecha_hora=datetime.now()
-        )
-        db.add(bitacora)
-        db.flush()
+        bitacora = registrar_auditoria(db, Bitacora, {
+            "id_usuario_admin": usuario_id,
+            "accion": accion,
+            "tipo_objetivo": tipo_objetivo,
+            "id_objetivo": id_objetivo,
+            "descripcion": descripcion,
+            "fecha_hora": datetime.now()
+        }, durable=accion_durable(accion))
         logger.info(f"Bitácora registrada: {accion} por usuario {usuario_id}")
         return bitacora
     
@@ -203,6 +207,41 @@ class AuthRepository:
         
         return False, None
     
+    @staticmethod
+    def cuentas_bloqueadas(
+        db: Session,
+        usuario_ids: Iterable[int],
+        max_intentos: int = MAX_INTENTOS_FALLIDOS,
+        minutos_bloqueo: int = TIEMPO_BLOQUEO_MINUTOS
+    ) -> Dict[int, datetime]:
+        """
+        Versión por lotes de `verificar_cuenta_bloqueada` (una consulta agrupada)
+        
+        Returns:
+            {usuario_id: fecha_desbloqueo} solo de las cuentas bloqueadas
+        """
+        ahora = datetime.now()
+        tiempo_limite = ahora - timedelta(minutes=minutos_bloqueo)
+        
+        # El último fallido de un usuario con intentos en la ventana está dentro de ella
+        filas = db.query(
+            LoginLog.id_usuario,
+            func.count(LoginLog.id_log),
+            func.max(LoginLog.fecha_hora)
+        ).filter(
+            LoginLog.id_usuario.in_(list(usuario_ids)),
+            LoginLog.estado == 'fallido',
+            LoginLog.fecha_hora >= tiempo_limite
+        ).group_by(LoginLog.id_usuario).all()
+        
+        bloqueadas = {}
+        for usuario_id, intentos, ultimo in filas:
+            if intentos >= max_intentos and ultimo:
+                fecha_desbloqueo = ultimo + timedelta(minutes=minutos_bloqueo)
+                if ahora < fecha_desbloqueo:
+                    bloqueadas[usuario_id] = fecha_desbloqueo
+        return bloqueadas
+    
     @staticmethod
     def limpiar_intentos_fallidos(db: Session, usuario_id: int):
         """
@@ -218,22 +257,59 @@ class AuthRepository:
     
     # ==================== BLACKLIST DE TOKENS ====================
     
-    # Nota: En producción, usar Redis para blacklist
-    _token_blacklist = set()
+    # Delegan en el almacén de revocación (ver auth/services/token_revocation.py)
     
     @staticmethod
     def agregar_token_blacklist(token: str):
         """Agregar token a la blacklist (logout)"""
-        AuthRepository._token_blacklist.add(token)
-        logger.info(f"Token agregado a blacklist. Total: {len(AuthRepository._token_blacklist)}")
+        from app.modules.auth.services.auth_service import AuthService
+        AuthService.invalidate_token(token)
     
     @staticmethod
     def verificar_token_blacklist(token: str) -> bool:
         """Verificar si un token está en la blacklist"""
-        return token in AuthRepository._token_blacklist
+        from jose import JWTError, jwt
+        from app.modules.auth.services.auth_service import SECRET_KEY, ALGORITHM
+        from app.modules.auth.services.token_revocation import get_revocation_store, token_id_revocacion
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            return False
+        return get_revocation_store().esta_revocado(token_id_revocacion(payload, token))
     
     @staticmethod
     def limpiar_blacklist():
         """Limpiar blacklist (para tests o mantenimiento)"""
-        AuthRepository._token_blacklist.clear()
-        logger.info("Blacklist de tokens limpiada")
\ No newline at end of file
+        from app.modules.auth.services.token_revocation import get_revocation_store
+        get_revocation_store().limpiar()
+        logger.info("Blacklist de tokens limpiada")
+
+
+# ==================== CONSULTAS CRÍTICAS (asesor de índices) ====================
+
+@registrar_consulta("login: intentos fallidos en la ventana de bloqueo")
+def _consulta_intentos_fallidos():
+    return select(func.count()).select_from(LoginLog).where(
+        LoginLog.id_usuario == 1,
+        LoginLog.estado == 'fallido',
+        LoginLog.fecha_hora >= datetime.now() - timedelta(minutes=TIEMPO_BLOQUEO_MINUTOS)
+    )
+
+
+@registrar_consulta("login: último intento fallido")
+def _consulta_ultimo_fallido():
+    return select(LoginLog).where(
+        LoginLog.id_usuario == 1,
+        LoginLog.estado == 'fallido'
+    ).order_by(LoginLog.fecha_hora.desc()).limit(1)
+
+
+@registrar_consulta("login-logs: bloqueos de una página (agrupado)")
+def _consulta_cuentas_bloqueadas():
+    return select(
+        LoginLog.id_usuario, func.count(LoginLog.id_log), func.max(LoginLog.fecha_hora)
+    ).where(
+        LoginLog.id_usuario.in_([1, 2, 3]),
+        LoginLog.estado == 'fallido',
+        LoginLog.fecha_hora >= datetime.now() - timedelta(minutes=TIEMPO_BLOQUEO_MINUTOS)
+    ).group_by(LoginLog.id_usuario)
\ No newline at end of file
@@ -20,9 +20,16 @@ from app.shared.exceptions import Unauthorized, NotFound
 
 from app.config.config import config
 from app.core.database import get_db
+from app.core.database_async import get_async_db
+from app.core.metrics import registrar_login
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
 
 from app.modules.auth.repositories.auth_repository import AuthRepository, MAX_INTENTOS_FALLIDOS, TIEMPO_BLOQUEO_MINUTOS
+from app.modules.auth.services.principal_cache import (
+    UsuarioPrincipal, principal_cache, cargar_principal, cargar_principal_async, token_id_de_payload
+)
+from app.modules.auth.services.token_revocation import get_revocation_store, token_id_revocacion
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +40,6 @@ SECRET_KEY = getattr(Settings, "SECRET_KEY", "dev-secret-key-change-in-productio
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = getattr(Settings, "JWT_ACCESS_TOKEN_EXPIRE_MINUTES", 60)
 
-# Blacklist de tokens (usar Redis en producción)
-token_blacklist = set()
-
 
 class AuthService:
     """Servicio de autenticación con JWT"""
@@ -59,11 +63,12 @@ class AuthService:
     def decode_token(token: str) -> Dict:
         """Decodificar y validar token JWT"""
         try:
-            # Verificar blacklist
-            if token in token_blacklist:
-                raise Unauthorized("Token inválido (sesión cerrada)")
-            
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+
+            # Verificar revocación (logout) por jti
+            if get_revocation_store().esta_revocado(token_id_revocacion(payload, token)):
+                raise Unauthorized("Token inválido (sesión cerrada)")
+
             usuario_id: int = payload.get("usuario_id") or payload.get("sub")
             if usuario_id is None:
                 raise Unauthorized("Token inválido")
@@ -73,9 +78,16 @@ class AuthService:
 
     @staticmethod
     def invalidate_token(token: str):
-        """Agregar token a la blacklist"""
-        token_blacklist.add(token)
-        logger.info(f"Token agregado a blacklist. Total tokens: {len(token_blacklist)}")
+        """Revocar token hasta su expiración"""
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            # Token ya expirado o inválido: no hace falta revocarlo
+            return
+
+        store = get_revocation_store()
+        store.revocar(token_id_revocacion(payload, token), payload["exp"])
+        logger.info(f"Token revocado. Revocaciones activas: {len(store)}")
 
     @staticmethod
     def registrar_login_log(
@@ -84,26 +96,15 @@ class AuthService:
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
         estado: str = 'exitoso'
-    ) -> LoginLog:
+    ) -> Optional[LoginLog]:
         """
         Registrar intento de login en LoginLog
-        USA FLUSH, NO COMMIT
+        SIN COMMIT (ver AuthRepository.registrar_login_log)
         """
         try:
-            if estado not in ['exitoso', 'fallido']:
-                estado = 'fallido'
-            
-            login_log = LoginLog(
-                id_usuario=id_usuario,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                estado=estado,
-                fecha_hora=datetime.now()
+            return AuthRepository.registrar_login_log(
+                db, id_usuario, ip_address=ip_address, user_agent=user_agent, estado=estado
             )
-            db.add(login_log)
-            db.flush() 
-            logger.info(f"LoginLog registrado para usuario {id_usuario}: {estado}")
-            return login_log
         except Exception as e:
             logger.error(f"Error al registrar LoginLog: {str(e)}")
             raise
@@ -116,24 +117,20 @@ class AuthService:
         tipo_objetivo: Optional[str] = None,
         id_objetivo: Optional[int] = None,
         descripcion: Optional[str] = None
-    ) -> Bitacora:
+    ) -> Optional[Bitacora]:
         """
         Registrar acción en Bitacora
-        ✅ USA FLUSH, NO COMMIT
+        ✅ SIN COMMIT (ver AuthRepository.registrar_bitacora)
         """
         try:
-            bitacora = Bitacora(
-                id_usuario_admin=usuario_id,
+            return AuthRepository.registrar_bitacora(
+                db,
+                usuario_id=usuario_id,
                 accion=accion,
                 tipo_objetivo=tipo_objetivo,
                 id_objetivo=id_objetivo,
-                descripcion=descripcion,
-                fecha_hora=datetime.now()
+                descripcion=descripcion
             )
-            db.add(bitacora)
-            db.flush() 
-            logger.info(f"Bitácora registrada: {accion} por usuario {usuario_id}")
-            return bitacora
         except Exception as e:
             logger.error(f"Error al registrar en Bitácora: {str(e)}")
             raise
@@ -307,6 +304,7 @@ class AuthService:
             )
             
             logger.info(f"✅ Login exitoso: {usuario.usuario} desde IP {ip_address}")
+            registrar_login("exitoso")
             
  
             # 9️ RETORNAR TOKEN DTO
@@ -329,11 +327,13 @@ class AuthService:
             
         except Unauthorized:
             # Re-lanzar errores de autenticación sin modificar
+            registrar_login("fallido")
             raise
             
         except Exception as e:
             # Rollback en caso de error inesperado
             db.rollback()
+            registrar_login("error")
             logger.error(f"❌ Error inesperado en login: {str(e)}", exc_info=True)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -354,8 +354,8 @@ class AuthService:
             # Invalidar token
             AuthService.invalidate_token(token)
             
-            # ✅ Registrar en Bitácora (con flush interno)
-            bitacora = AuthService.registrar_bitacora(
+            # ✅ Registrar en Bitácora (se escribe tras el commit)
+            AuthService.registrar_bitacora(
                 db,
                 usuario_id=usuario_id,
                 accion='LOGOUT',
@@ -367,9 +367,6 @@ class AuthService:
             # Commit explícito para persistir
             db.commit()
             
-            # Refrescar el objeto para que tenga el ID asignado
-            db.refresh(bitacora)
-            
             logger.info(f"Logout exitoso para usuario {usuario_id}")
             
             return {
@@ -386,20 +383,53 @@ class AuthService:
             )
 
     @staticmethod
-    def get_current_user(db: Session, token: str) -> Usuario:
-        """Obtener usuario actual desde token JWT"""
+    def get_current_user(db: Session, token: str) -> UsuarioPrincipal:
+        """
+        Obtener usuario actual desde token JWT
+
+        Retorna un snapshot inmutable (roles y permisos activos incluidos)
+        servido desde `principal_cache`; solo consulta la BD en un miss.
+        """
         try:
             payload = AuthService.decode_token(token)
             usuario_id: int = payload.get("usuario_id") or payload.get("sub")
+            if isinstance(usuario_id, str) and usuario_id.isdigit():
+                usuario_id = int(usuario_id)
+            token_id = token_id_de_payload(payload)
 
-            usuario = db.query(Usuario).filter(
-                Usuario.id_usuario == usuario_id, 
-                Usuario.is_active == True
-            ).first()
-            
+            usuario = principal_cache.obtener(usuario_id, token_id)
+            if usuario is not None:
+                return usuario
+
+            usuario = cargar_principal(db, usuario_id)
+            if not usuario:
+                raise NotFound("Usuario", usuario_id)
+
+            principal_cache.guardar(usuario_id, token_id, usuario)
+            return usuario
+        except Exception as e:
+            logger.error(f"Error al obtener usuario del token: {str(e)}")
+            raise Unauthorized("No autorizado")
+
+    @staticmethod
+    async def get_current_user_async(db: AsyncSession, token: str) -> UsuarioPrincipal:
+        """Igual que `get_current_user`, pero el miss de caché se lee con AsyncSession"""
+        try:
+            payload = AuthService.decode_token(token)
+            usuario_id: int = payload.get("usuario_id") or payload.get("sub")
+            if isinstance(usuario_id, str) and usuario_id.isdigit():
+                usuario_id = int(usuario_id)
+            token_id = token_id_de_payload(payload)
+
+            usuario = principal_cache.obtener(usuario_id, token_id)
+            if usuario is not None:
+                return usuario
+
+            usuario = await cargar_principal_async(db, usuario_id)
             if not usuario:
                 raise NotFound("Usuario", usuario_id)
 
+            principal_cache.guardar(usuario_id, token_id, usuario)
             return usuario
         except Exception as e:
             logger.error(f"Error al obtener usuario del token: {str(e)}")
@@ -640,11 +670,11 @@ class AuthService:
 def get_current_user_dependency(
     request: Request,
     db: Session = Depends(get_db)
-) -> Usuario:
+) -> UsuarioPrincipal:
 
     auth_header = request.headers.get("Authorization", "")
     token = auth_header.replace("Bearer ", "").strip()
-    
+
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -654,9 +684,35 @@ def get_current_user_dependency(
 
     usuario = AuthService.get_current_user(db, token)
 
-    usuario._token = token
-    usuario._ip = request.headers.get("X-Forwarded-For", "").split(",")[0].strip() or (
+    # El principal es inmutable: token e IP viajan en request.state
+    request.state.token = token
+    request.state.client_ip = request.headers.get("X-Forwarded-For", "").split(",")[0].strip() or (
+        request.client.host if request.client else "unknown"
+    )
+
+    return usuario
+
+
+async def get_current_user_dependency_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+) -> UsuarioPrincipal:
+    """Variante de `get_current_user_dependency` para endpoints con AsyncSession"""
+    auth_header = request.headers.get("Authorization", "")
+    token = auth_header.replace("Bearer ", "").strip()
+
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token no proporcionado",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    usuario = await AuthService.get_current_user_async(db, token)
+
+    request.state.token = token
+    request.state.client_ip = request.headers.get("X-Forwarded-For", "").split(",")[0].strip() or (
         request.client.host if request.client else "unknown"
     )
-    
+
     return usuario
@@ -0,0 +1,276 @@
+"""
+app/modules/auth/services/principal_cache.py
+Caché de principales autenticados (snapshot inmutable del usuario)
+
+Evita repetir `db.query(Usuario)` + carga perezosa de roles/permisos en cada
+request autenticado. La clave es (usuario_id, jti/iat del token), de modo que
+un token nuevo siempre fuerza una lectura fresca.
+
+El caché es por proceso (un worker de uvicorn); el TTL acota cuánto tiempo
+puede quedar desactualizado un worker que no recibió la invalidación.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Dict, FrozenSet, Hashable, Optional, Tuple
+import time
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.core.metrics import registrar_cache
+from app.modules.usuarios.models.usuario_models import Usuario, Rol
+
+logger = logging.getLogger(__name__)
+
+
+# ================ SNAPSHOTS INMUTABLES ================
+
+@dataclass(frozen=True, slots=True)
+class PermisoSnapshot:
+    """Permiso activo de un rol (compatible con el modelo Permiso)"""
+    id_permiso: int
+    nombre: str
+    modulo: str
+    is_active: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class RolSnapshot:
+    """Rol activo del usuario con sus permisos activos"""
+    id_rol: int
+    nombre: str
+    permisos: Tuple[PermisoSnapshot, ...] = ()
+    is_active: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class PersonaSnapshot:
+    """Datos mínimos de la persona asociada al usuario"""
+    id_persona: int
+    nombres: str
+    apellido_paterno: str
+    apellido_materno: Optional[str]
+    tipo_persona: str
+
+    @property
+    def nombre_completo(self) -> str:
+        return f"{self.nombres} {self.apellido_paterno} {self.apellido_materno}"
+
+
+@dataclass(frozen=True, slots=True)
+class UsuarioPrincipal:
+    """
+    Snapshot inmutable del usuario autenticado.
+
+    Expone los mismos atributos que usan los controladores y
+    `permission_mapper` sobre `Usuario` (id_usuario, usuario, id_persona,
+    is_active, roles[].permisos[], persona), por lo que puede usarse como
+    `current_user` sin tocar la sesión de base de datos.
+    """
+    id_usuario: int
+    id_persona: int
+    usuario: str
+    correo: str
+    is_active: bool
+    roles: Tuple[RolSnapshot, ...]
+    persona: Optional[PersonaSnapshot]
+    nombres_roles: FrozenSet[str] = field(default=frozenset())
+    permisos: FrozenSet[Tuple[str, str]] = field(default=frozenset())
+
+    @classmethod
+    def desde_usuario(cls, usuario: Usuario) -> "UsuarioPrincipal":
+        """Construir snapshot a partir de un Usuario ORM (solo roles/permisos activos)"""
+        roles = tuple(
+            RolSnapshot(
+                id_rol=rol.id_rol,
+                nombre=rol.nombre,
+                permisos=tuple(
+                    PermisoSnapshot(
+                        id_permiso=permiso.id_permiso,
+                        nombre=permiso.nombre,
+                        modulo=permiso.modulo
+                    )
+                    for permiso in rol.permisos
+                    if permiso.is_active
+                )
+            )
+            for rol in usuario.roles
+            if rol.is_active
+        )
+
+        persona = None
+        if usuario.persona is not None:
+            persona = PersonaSnapshot(
+                id_persona=usuario.persona.id_persona,
+                nombres=usuario.persona.nombres,
+                apellido_paterno=usuario.persona.apellido_paterno,
+                apellido_materno=usuario.persona.apellido_materno,
+                tipo_persona=usuario.persona.tipo_persona
+            )
+
+        return cls(
+            id_usuario=usuario.id_usuario,
+            id_persona=usuario.id_persona,
+            usuario=usuario.usuario,
+            correo=usuario.correo,
+            is_active=bool(usuario.is_active),
+            roles=roles,
+            persona=persona,
+            nombres_roles=frozenset(rol.nombre for rol in roles),
+            permisos=frozenset(
+                (permiso.nombre, permiso.modulo)
+                for rol in roles
+                for permiso in rol.permisos
+            )
+        )
+
+
+# ================ CACHÉ TTL + LRU ================
+
+class PrincipalCache:
+    """
+    Caché LRU con expiración por TTL para `UsuarioPrincipal`.
+
+    - Clave: (usuario_id, identificador del token)
+    - Invalidación por usuario (cambio de roles, borrado) o por rol
+      (cambio de permisos de un rol)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_segundos: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl_segundos = ttl_segundos
+        self._datos: "OrderedDict[Tuple[int, Hashable], Tuple[float, UsuarioPrincipal]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def obtener(self, usuario_id: int, token_id: Hashable) -> Optional[UsuarioPrincipal]:
+        """Obtener principal si existe y no expiró"""
+        clave = (usuario_id, token_id)
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return None
+
+            expira, principal = entrada
+            if expira < time.monotonic():
+                del self._datos[clave]
+                self.misses += 1
+                return None
+
+            self._datos.move_to_end(clave)
+            self.hits += 1
+            return principal
+
+    def guardar(self, usuario_id: int, token_id: Hashable, principal: UsuarioPrincipal) -> None:
+        """Guardar principal, desalojando el menos usado si se supera maxsize"""
+        if self.maxsize <= 0:
+            return
+        clave = (usuario_id, token_id)
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + self.ttl_segundos, principal)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+
+    def invalidar_usuario(self, usuario_id: int) -> int:
+        """Eliminar todas las entradas de un usuario (todas sus sesiones)"""
+        with self._lock:
+            claves = [clave for clave in self._datos if clave[0] == usuario_id]
+            for clave in claves:
+                del self._datos[clave]
+        if claves:
+            logger.debug("Principal cache: %d entradas invalidadas para usuario %s", len(claves), usuario_id)
+        return len(claves)
+
+    def invalidar_rol(self, rol_id: int) -> int:
+        """Eliminar las entradas de usuarios que tienen el rol indicado"""
+        with self._lock:
+            claves = [
+                clave for clave, (_, principal) in self._datos.items()
+                if any(rol.id_rol == rol_id for rol in principal.roles)
+            ]
+            for clave in claves:
+                del self._datos[clave]
+        if claves:
+            logger.debug("Principal cache: %d entradas invalidadas para rol %s", len(claves), rol_id)
+        return len(claves)
+
+    def limpiar(self) -> None:
+        """Vaciar el caché (tests o mantenimiento)"""
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def estadisticas(self) -> Dict[str, float]:
+        """Contadores de uso del caché"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._datos),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0
+        }
+
+
+def token_id_de_payload(payload: Dict) -> Hashable:
+    """
+    Identificador estable del token para la clave del caché.
+    Prioriza `jti`, luego `iat` y, para tokens antiguos, `exp`.
+    """
+    return payload.get("jti") or payload.get("iat") or payload.get("exp")
+
+
+def cargar_principal(db: Session, usuario_id: int) -> Optional[UsuarioPrincipal]:
+    """Cargar usuario activo con roles, permisos y persona en consultas acotadas"""
+    usuario = db.query(Usuario).options(
+        joinedload(Usuario.persona),
+        selectinload(Usuario.roles).selectinload(Rol.permisos)
+    ).filter(
+        Usuario.id_usuario == usuario_id,
+        Usuario.is_active == True
+    ).first()
+
+    if not usuario:
+        return None
+
+    return UsuarioPrincipal.desde_usuario(usuario)
+
+
+async def cargar_principal_async(db: AsyncSession, usuario_id: int) -> Optional[UsuarioPrincipal]:
+    """Versión asíncrona de `cargar_principal` (mismas cargas ansiosas)"""
+    resultado = await db.execute(
+        select(Usuario).options(
+            joinedload(Usuario.persona),
+            selectinload(Usuario.roles).selectinload(Rol.permisos)
+        ).where(
+            Usuario.id_usuario == usuario_id,
+            Usuario.is_active == True
+        )
+    )
+    usuario = resultado.unique().scalars().first()
+
+    if not usuario:
+        return None
+
+    return UsuarioPrincipal.desde_usuario(usuario)
+
+
+def _crear_cache() -> PrincipalCache:
+    from app.core.database import Settings
+    return PrincipalCache(
+        maxsize=getattr(Settings, "PRINCIPAL_CACHE_MAXSIZE", 1024),
+        ttl_segundos=getattr(Settings, "PRINCIPAL_CACHE_TTL", 60)
+    )
+
+
+# Instancia compartida por el proceso
+principal_cache = _crear_cache()
+registrar_cache("principal", principal_cache.estadisticas)
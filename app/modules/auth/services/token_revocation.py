@@ -0,0 +1,257 @@
+"""
+app/modules/auth/services/token_revocation.py
+Almacén de revocación de tokens JWT (logout)
+
+Reemplaza el `set` de tokens completos que crecía sin límite:
+- La clave es el `jti` del token (o sha256 del token si no trae `jti`)
+- Cada entrada expira junto con el `exp` del token: pasado ese instante el
+  JWT ya es rechazado por `jwt.decode`, así que no hace falta recordarlo
+- La verificación es un `dict.get` en memoria (O(1), sin I/O)
+
+Backends:
+- "memory":   por proceso, se pierde al reiniciar
+- "database": tabla `tokens_revocados` (MySQL o un SQLite compartido) con
+              sincronización periódica hacia la copia local de cada worker.
+              La sincronización corre en un hilo en segundo plano: verificar
+              un token nunca consulta la BD. La tabla la crea la migración
+              0003 (`alembic upgrade head`); con TOKEN_REVOCATION_URL (BD
+              dedicada, fuera de las migraciones) se crea al iniciar.
+"""
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+from typing import Dict, Optional
+import hashlib
+import logging
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.modules.usuarios.models.usuario_models import TokenRevocado
+
+logger = logging.getLogger(__name__)
+
+
+def token_id_revocacion(payload: Dict, token: str) -> str:
+    """Clave de revocación: jti, o hash del token para tokens sin jti"""
+    jti = payload.get("jti")
+    if jti:
+        return jti
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class MemoryRevocationStore:
+    """Revocaciones en memoria del proceso, purgadas al expirar"""
+
+    def __init__(self, intervalo_purga: float = 300.0):
+        self.intervalo_purga = intervalo_purga
+        self._revocados: Dict[str, float] = {}  # token_id -> exp (epoch)
+        self._lock = Lock()
+        self._ultima_purga = time.time()
+
+    def revocar(self, token_id: str, exp: float) -> None:
+        """Registrar un token revocado hasta su expiración"""
+        if exp <= time.time():
+            return
+        with self._lock:
+            self._revocados[token_id] = exp
+        self._purgar_si_corresponde()
+
+    def esta_revocado(self, token_id: str) -> bool:
+        """Verificar si el token está revocado (camino caliente)"""
+        exp = self._revocados.get(token_id)
+        return exp is not None and exp > time.time()
+
+    def purgar(self) -> int:
+        """Eliminar entradas cuyo token ya expiró"""
+        ahora = time.time()
+        with self._lock:
+            expirados = [token_id for token_id, exp in self._revocados.items() if exp <= ahora]
+            for token_id in expirados:
+                del self._revocados[token_id]
+            self._ultima_purga = ahora
+        return len(expirados)
+
+    def limpiar(self) -> None:
+        """Vaciar el almacén (tests o mantenimiento)"""
+        with self._lock:
+            self._revocados.clear()
+
+    def verificar(self) -> None:
+        """Comprobar que el backend responde (readiness); en memoria siempre"""
+
+    def iniciar(self) -> None:
+        """Arrancar tareas en segundo plano (en memoria no hay)"""
+
+    def detener(self) -> None:
+        """Detener tareas en segundo plano (shutdown)"""
+
+    def __len__(self) -> int:
+        return len(self._revocados)
+
+    def _purgar_si_corresponde(self) -> None:
+        if time.time() - self._ultima_purga >= self.intervalo_purga:
+            purgados = self.purgar()
+            if purgados:
+                logger.debug("Revocación: %d tokens expirados purgados", purgados)
+
+
+class DatabaseRevocationStore(MemoryRevocationStore):
+    """
+    Revocaciones persistidas en la tabla `tokens_revocados`.
+
+    Cada worker mantiene la copia en memoria del padre y un hilo la
+    sincroniza con la tabla cada `intervalo_sync` segundos, de modo que la
+    verificación sigue siendo un lookup local y un logout en otro worker se
+    propaga en, como máximo, ese intervalo.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        intervalo_sync: float = 5.0,
+        intervalo_purga: float = 300.0
+    ):
+        super().__init__(intervalo_purga=intervalo_purga)
+        self._session_factory = session_factory
+        self.intervalo_sync = intervalo_sync
+        self._ultima_sync: Optional[datetime] = None
+        self._sync_lock = Lock()
+        self._hilo: Optional[Thread] = None
+        self._parar = Event()
+
+    def revocar(self, token_id: str, exp: float) -> None:
+        if exp <= time.time():
+            return
+        db = self._session_factory()
+        try:
+            db.merge(TokenRevocado(
+                token_id=token_id,
+                expira=datetime.utcfromtimestamp(exp),
+                created_at=datetime.utcnow()
+            ))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error al persistir token revocado: {str(e)}")
+        finally:
+            db.close()
+        super().revocar(token_id, exp)
+
+    def iniciar(self) -> None:
+        """Carga inicial y arranque del hilo de sincronización (idempotente)"""
+        if self._hilo is not None:
+            return
+        self.sincronizar()
+        self._parar.clear()
+        self._hilo = Thread(target=self._bucle, name="sync-tokens-revocados", daemon=True)
+        self._hilo.start()
+
+    def detener(self) -> None:
+        if self._hilo is None:
+            return
+        self._parar.set()
+        self._hilo.join(timeout=5)
+        self._hilo = None
+
+    def _bucle(self) -> None:
+        while not self._parar.wait(self.intervalo_sync):
+            self.sincronizar()
+            self._purgar_si_corresponde()
+
+    def sincronizar(self) -> None:
+        """Traer revocaciones nuevas de otros workers"""
+        if not self._sync_lock.acquire(blocking=False):
+            return  # Otro hilo ya está sincronizando
+        try:
+            ahora = datetime.utcnow()
+            db = self._session_factory()
+            try:
+                query = db.query(TokenRevocado.token_id, TokenRevocado.expira).filter(
+                    TokenRevocado.expira > ahora
+                )
+                if self._ultima_sync is not None:
+                    # Margen para relojes desfasados entre workers
+                    query = query.filter(TokenRevocado.created_at >= self._ultima_sync - timedelta(seconds=5))
+                filas = query.all()
+            finally:
+                db.close()
+
+            with self._lock:
+                for token_id, expira in filas:
+                    self._revocados[token_id] = (expira - datetime(1970, 1, 1)).total_seconds()
+            self._ultima_sync = ahora
+        except Exception as e:
+            # Sin BD se sigue usando la copia local
+            logger.error(f"Error al sincronizar tokens revocados: {str(e)}")
+        finally:
+            self._sync_lock.release()
+
+    def verificar(self) -> None:
+        """Consulta mínima a la tabla de revocaciones; lanza si la BD no responde"""
+        db = self._session_factory()
+        try:
+            db.query(TokenRevocado.token_id).limit(1).all()
+        finally:
+            db.close()
+
+    def purgar(self) -> int:
+        purgados = super().purgar()
+        db = self._session_factory()
+        try:
+            db.query(TokenRevocado).filter(
+                TokenRevocado.expira <= datetime.utcnow()
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error al purgar tokens revocados: {str(e)}")
+        finally:
+            db.close()
+        return purgados
+
+
+def crear_revocation_store(settings) -> MemoryRevocationStore:
+    """Construir el backend configurado en TOKEN_REVOCATION_BACKEND"""
+    backend = getattr(settings, "TOKEN_REVOCATION_BACKEND", "memory")
+    intervalo_purga = getattr(settings, "TOKEN_REVOCATION_PURGE_SECONDS", 300)
+
+    if backend == "database":
+        url = getattr(settings, "TOKEN_REVOCATION_URL", None)
+        if url:
+            # BD dedicada (ej: sqlite:////var/run/brisa/revocados.db compartido por los workers),
+            # no la cubren las migraciones
+            engine = create_engine(url, pool_pre_ping=True)
+            TokenRevocado.__table__.create(bind=engine, checkfirst=True)
+        else:
+            from app.core.database import engine
+        store = DatabaseRevocationStore(
+            sessionmaker(autocommit=False, autoflush=False, bind=engine),
+            intervalo_sync=getattr(settings, "TOKEN_REVOCATION_SYNC_SECONDS", 5),
+            intervalo_purga=intervalo_purga
+        )
+        store.iniciar()
+        return store
+
+    return MemoryRevocationStore(intervalo_purga=intervalo_purga)
+
+
+_store: Optional[MemoryRevocationStore] = None
+_store_lock = Lock()
+
+
+def get_revocation_store() -> MemoryRevocationStore:
+    """Instancia única del almacén (se crea en el primer uso)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from app.core.database import Settings
+                _store = crear_revocation_store(Settings)
+    return _store
+
+
+def detener_revocation_store() -> None:
+    """Detener la sincronización en segundo plano (shutdown), si el almacén existe"""
+    if _store is not None:
+        _store.detener()
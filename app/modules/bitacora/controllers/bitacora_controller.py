@@ -3,16 +3,24 @@ app/modules/bitacora/controllers/bitacora_controller.py
 Controlador completo: LoginLog (autenticación) + Bitácora (auditoría general)
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, and_, desc
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime, timedelta
 import logging
 
-from app.core.database import get_db
+from app.core.database import Settings, get_db, get_db_lectura
+from app.core.database_async import get_async_db
 from app.shared.response import ResponseModel
 from app.shared.permissions import requires_permission
-from app.modules.auth.services.auth_service import get_current_user_dependency
+from app.modules.auth.services.auth_service import get_current_user_dependency, get_current_user_dependency_async
+from app.modules.bitacora.repositories.bitacora_repository import LoginLogRepository
+from app.modules.bitacora.repositories.bitacora_repository_async import BitacoraRepositoryAsync
+from app.modules.bitacora.services.retencion import entidad_auditoria
+from app.modules.bitacora.services.hidratacion import bloqueos_por_id, nombres_por_id_async, usuarios_por_id
+from app.shared.paginacion import ModoTotal, decodificar_cursor
 from app.modules.usuarios.models.usuario_models import Usuario, LoginLog, Bitacora
 
 logger = logging.getLogger(__name__)
@@ -35,6 +43,33 @@ async def raiz_bitacora():
     }
 
 
+# ============================================================
+# PAGINACIÓN (offset o cursor) Y TOTALES
+# ============================================================
+
+_DESCRIPCION_TOTAL = (
+    "exacto | aproximado | limitado | ninguno "
+    "(por defecto: exacto con offset, aproximado con cursor)"
+)
+
+
+def _texto_total(total: Optional[int], exacto: bool) -> str:
+    """Sufijo del mensaje: ' (120 total)', ' (~120 total)' o nada"""
+    if total is None:
+        return ""
+    return f" ({total} total)" if exacto else f" (~{total} total)"
+
+
+def _leer_cursor(cursor: Optional[str]):
+    """Cursor recibido -> Cursor (o None); 400 si no es válido"""
+    if not cursor:
+        return None
+    try:
+        return decodificar_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido")
+
+
 # ============================================================
 # CU-07: CONSULTAR AUDITORÍA GENERAL (Tabla Bitácora)
 # ============================================================
@@ -53,9 +88,12 @@ async def consultar_auditoria(
     # Paginación
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor/prev_cursor de la respuesta anterior)"),
+    paginacion: Literal["offset", "cursor"] = Query("offset", description="offset (skip/limit) o cursor (keyset)"),
+    modo_total: Optional[ModoTotal] = Query(None, alias="total", description=_DESCRIPCION_TOTAL),
     
-    db: Session = Depends(get_db),
-    current_user: Usuario = Depends(get_current_user_dependency)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Usuario = Depends(get_current_user_dependency_async)
 ) -> dict:
     """
     📋 CU-07: Consultar Auditoría General
@@ -65,28 +103,21 @@ async def consultar_auditoria(
     - Asignación/revocación de roles
     - Cambios de permisos
     - Todas las acciones administrativas
+
+    Usa AsyncSession: las consultas no bloquean el event loop.
+
+    Con `paginacion=cursor` (o un `cursor`) se pagina por (fecha_hora, id_bitacora):
+    la respuesta trae `next_cursor`/`prev_cursor` y el total es aproximado por defecto.
     """
+    # Fuera del try: los errores de abajo responden 200 con success=False
+    corte = _leer_cursor(cursor)
     try:
-        # CU-07 Paso 5: Consultar tabla Bitácora
-        query = db.query(Bitacora)
-        
-        # Aplicar filtros
-        if usuario_admin:
-            query = query.filter(Bitacora.id_usuario_admin == usuario_admin)
-        
-        if accion:
-            query = query.filter(Bitacora.accion.ilike(f"%{accion}%"))
-        
-        if tipo_objetivo:
-            query = query.filter(Bitacora.tipo_objetivo == tipo_objetivo)
-        
-        if id_objetivo:
-            query = query.filter(Bitacora.id_objetivo == id_objetivo)
-        
+        fecha_inicio_dt = None
+        fecha_fin_dt = None
+
         if fecha_inicio:
             try:
                 fecha_inicio_dt = datetime.fromisoformat(fecha_inicio)
-                query = query.filter(Bitacora.fecha_hora >= fecha_inicio_dt)
             except ValueError:
                 return ResponseModel.error(
                     message="Formato de fecha_inicio inválido. Use YYYY-MM-DD",
@@ -97,32 +128,55 @@ async def consultar_auditoria(
             try:
                 fecha_fin_dt = datetime.fromisoformat(fecha_fin)
                 fecha_fin_dt = fecha_fin_dt.replace(hour=23, minute=59, second=59)
-                query = query.filter(Bitacora.fecha_hora <= fecha_fin_dt)
             except ValueError:
                 return ResponseModel.error(
                     message="Formato de fecha_fin inválido. Use YYYY-MM-DD",
                     status_code=400
                 )
         
-        # CU-07 Paso 5: Contar total
-        total = query.count()
-        
-        # CU-07 Paso 6: Ordenar por fecha descendente
-        registros = query.order_by(desc(Bitacora.fecha_hora)).offset(skip).limit(limit).all()
+        filtros = {
+            "usuario_admin": usuario_admin,
+            "accion": accion,
+            "tipo_objetivo": tipo_objetivo,
+            "id_objetivo": id_objetivo,
+            "fecha_inicio": fecha_inicio_dt,
+            "fecha_fin": fecha_fin_dt
+        }
+        usar_cursor = paginacion == "cursor" or cursor is not None
+
+        # Tabla caliente, o unida a los archivos mensuales si el rango llega a ellos.
+        # En el threadpool: refrescar el índice de archivos es un listado síncrono
+        entidad = await run_in_threadpool(entidad_auditoria, db.sync_session, Bitacora, fecha_inicio_dt, fecha_fin_dt)
+
+        # CU-07 Paso 5-6: Página ordenada por fecha descendente y total
+        if usar_cursor:
+            registros, cursores = await BitacoraRepositoryAsync.listar_auditoria_keyset(
+                db, corte, limit, entidad=entidad, **filtros
+            )
+        else:
+            registros = await BitacoraRepositoryAsync.pagina_auditoria(db, skip, limit, entidad=entidad, **filtros)
+
+        total, total_exacto = await BitacoraRepositoryAsync.contar_auditoria(
+            db,
+            modo_total or ("aproximado" if usar_cursor else "exacto"),
+            Settings.TOTAL_COUNT_CAP,
+            entidad=entidad,
+            **filtros
+        )
+
+        # Nombres de los usuarios de la página (caché por proceso + una consulta por los faltantes)
+        nombres = await nombres_por_id_async(db, (registro.id_usuario_admin for registro in registros))
         
         # CU-07 Paso 7: Formatear respuesta
         items = []
         for registro in registros:
-            # Obtener info del usuario
-            usuario = db.query(Usuario).filter(
-                Usuario.id_usuario == registro.id_usuario_admin
-            ).first()
+            nombre = nombres.get(registro.id_usuario_admin)
             
             items.append({
                 "id_bitacora": registro.id_bitacora,
                 "id_usuario_admin": registro.id_usuario_admin,
-                "usuario": usuario.usuario if usuario else "Sistema",
-                "nombre_completo": usuario.persona.nombre_completo if usuario and usuario.persona else "Sistema",
+                "usuario": nombre.usuario if nombre else "Sistema",
+                "nombre_completo": nombre.nombre_completo if nombre and nombre.nombre_completo else "Sistema",
                 "accion": registro.accion,
                 "descripcion": registro.descripcion,
                 "fecha_hora": registro.fecha_hora.isoformat() if registro.fecha_hora else None,
@@ -132,29 +186,47 @@ async def consultar_auditoria(
                 "icono": _obtener_icono_accion(registro.accion)
             })
         
+        filtros_aplicados = {
+            "usuario_admin": usuario_admin,
+            "accion": accion,
+            "tipo_objetivo": tipo_objetivo,
+            "id_objetivo": id_objetivo,
+            "fecha_inicio": fecha_inicio,
+            "fecha_fin": fecha_fin
+        }
+        mensaje = f"Registros de auditoría obtenidos{_texto_total(total, total_exacto)}"
+
+        if usar_cursor:
+            return ResponseModel.success(
+                message=mensaje,
+                data={
+                    "items": items,
+                    "total": total,
+                    "total_exacto": total_exacto,
+                    "limit": limit,
+                    **cursores,
+                    "filtros_aplicados": filtros_aplicados
+                },
+                status_code=200
+            )
+
         # Calcular paginación
         import math
-        pages = math.ceil(total / limit) if limit > 0 else 1
+        pages = math.ceil(total / limit) if total is not None and limit > 0 else None
         current_page = (skip // limit) + 1 if limit > 0 else 1
         
         return ResponseModel.success(
-            message=f"Registros de auditoría obtenidos ({total} total)",
+            message=mensaje,
             data={
                 "items": items,
                 "total": total,
+                "total_exacto": total_exacto,
                 "page": current_page,
                 "pages": pages,
                 "skip": skip,
                 "limit": limit,
-                "has_more": current_page < pages,
-                "filtros_aplicados": {
-                    "usuario_admin": usuario_admin,
-                    "accion": accion,
-                    "tipo_objetivo": tipo_objetivo,
-                    "id_objetivo": id_objetivo,
-                    "fecha_inicio": fecha_inicio,
-                    "fecha_fin": fecha_fin
-                }
+                "has_more": skip + len(items) < total if total_exacto else len(items) == limit,
+                "filtros_aplicados": filtros_aplicados
             },
             status_code=200
         )
@@ -174,9 +246,9 @@ async def consultar_auditoria(
 
 @router.get("/auditoria/estadisticas", response_model=dict)
 @requires_permission('ver_bitacora')
-async def estadisticas_auditoria(
+def estadisticas_auditoria(
     dias: int = Query(7, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ) -> dict:
     """
@@ -189,43 +261,44 @@ async def estadisticas_auditoria(
     """
     try:
         fecha_inicio = datetime.now() - timedelta(days=dias)
+        entidad = entidad_auditoria(db, Bitacora, fecha_inicio)
         
         # Total de registros
-        total_registros = db.query(Bitacora).filter(
-            Bitacora.fecha_hora >= fecha_inicio
+        total_registros = db.query(entidad).filter(
+            entidad.fecha_hora >= fecha_inicio
         ).count()
         
         # Acciones más comunes
         acciones_comunes = db.query(
-            Bitacora.accion,
-            func.count(Bitacora.id_bitacora).label('cantidad')
+            entidad.accion,
+            func.count(entidad.id_bitacora).label('cantidad')
         ).filter(
-            Bitacora.fecha_hora >= fecha_inicio
+            entidad.fecha_hora >= fecha_inicio
         ).group_by(
-            Bitacora.accion
+            entidad.accion
         ).order_by(desc('cantidad')).limit(10).all()
         
         # Usuarios más activos
         usuarios_activos = db.query(
             Usuario.usuario,
-            func.count(Bitacora.id_bitacora).label('cantidad')
+            func.count(entidad.id_bitacora).label('cantidad')
         ).join(
-            Bitacora, Usuario.id_usuario == Bitacora.id_usuario_admin
+            entidad, Usuario.id_usuario == entidad.id_usuario_admin
         ).filter(
-            Bitacora.fecha_hora >= fecha_inicio
+            entidad.fecha_hora >= fecha_inicio
         ).group_by(
             Usuario.usuario
         ).order_by(desc('cantidad')).limit(10).all()
         
         # Distribución por tipo de objetivo
         por_tipo = db.query(
-            Bitacora.tipo_objetivo,
-            func.count(Bitacora.id_bitacora).label('cantidad')
+            entidad.tipo_objetivo,
+            func.count(entidad.id_bitacora).label('cantidad')
         ).filter(
-            Bitacora.fecha_hora >= fecha_inicio,
-            Bitacora.tipo_objetivo.isnot(None)
+            entidad.fecha_hora >= fecha_inicio,
+            entidad.tipo_objetivo.isnot(None)
         ).group_by(
-            Bitacora.tipo_objetivo
+            entidad.tipo_objetivo
         ).order_by(desc('cantidad')).all()
         
         return ResponseModel.success(
@@ -270,8 +343,8 @@ async def estadisticas_auditoria(
 
 @router.get("/auditoria/acciones", response_model=dict)
 @requires_permission('ver_bitacora')
-async def listar_tipos_acciones(
-    db: Session = Depends(get_db),
+def listar_tipos_acciones(
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ) -> dict:
     """
@@ -308,7 +381,7 @@ async def listar_tipos_acciones(
 
 @router.get("/login-logs", response_model=dict)
 @requires_permission('ver_bitacora')
-async def obtener_login_logs(
+def obtener_login_logs(
     usuario_id: Optional[int] = Query(None),
     estado: Optional[str] = Query(None),
     ip_address: Optional[str] = Query(None),
@@ -316,34 +389,32 @@ async def obtener_login_logs(
     fecha_fin: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor opaco (next_cursor/prev_cursor de la respuesta anterior)"),
+    paginacion: Literal["offset", "cursor"] = Query("offset", description="offset (skip/limit) o cursor (keyset)"),
+    modo_total: Optional[ModoTotal] = Query(None, alias="total", description=_DESCRIPCION_TOTAL),
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
 ) -> dict:
     """
     🔐 Logs de autenticación (LOGIN/LOGOUT)
     Vista específica para seguridad
+
+    Con `paginacion=cursor` (o un `cursor`) se pagina por (fecha_hora, id_log).
     """
+    corte = _leer_cursor(cursor)
     try:
-        query = db.query(LoginLog)
-        
-        if usuario_id:
-            query = query.filter(LoginLog.id_usuario == usuario_id)
-        
-        if estado:
-            if estado not in ['exitoso', 'fallido']:
-                return ResponseModel.error(
-                    message="Estado inválido. Use 'exitoso' o 'fallido'",
-                    status_code=400
-                )
-            query = query.filter(LoginLog.estado == estado)
-        
-        if ip_address:
-            query = query.filter(LoginLog.ip_address.contains(ip_address))
+        fecha_inicio_dt = None
+        fecha_fin_dt = None
+
+        if estado and estado not in ['exitoso', 'fallido']:
+            return ResponseModel.error(
+                message="Estado inválido. Use 'exitoso' o 'fallido'",
+                status_code=400
+            )
         
         if fecha_inicio:
             try:
                 fecha_inicio_dt = datetime.fromisoformat(fecha_inicio)
-                query = query.filter(LoginLog.fecha_hora >= fecha_inicio_dt)
             except ValueError:
                 return ResponseModel.error(
                     message="Formato de fecha_inicio inválido",
@@ -354,32 +425,46 @@ async def obtener_login_logs(
             try:
                 fecha_fin_dt = datetime.fromisoformat(fecha_fin)
                 fecha_fin_dt = fecha_fin_dt.replace(hour=23, minute=59, second=59)
-                query = query.filter(LoginLog.fecha_hora <= fecha_fin_dt)
             except ValueError:
                 return ResponseModel.error(
                     message="Formato de fecha_fin inválido",
                     status_code=400
                 )
         
-        total = query.count()
-        logs = query.order_by(desc(LoginLog.fecha_hora)).offset(skip).limit(limit).all()
+        entidad = entidad_auditoria(db, LoginLog, fecha_inicio_dt, fecha_fin_dt)
+        condiciones = LoginLogRepository.filtros(
+            usuario_id, estado, ip_address, fecha_inicio_dt, fecha_fin_dt, entidad=entidad
+        )
+        usar_cursor = paginacion == "cursor" or cursor is not None
+
+        if usar_cursor:
+            logs, cursores = LoginLogRepository.listar_keyset(db, condiciones, corte, limit, entidad=entidad)
+        else:
+            logs = LoginLogRepository.listar(db, condiciones, skip, limit, entidad=entidad)
+
+        total, total_exacto = LoginLogRepository.contar(
+            db,
+            condiciones,
+            modo_total or ("aproximado" if usar_cursor else "exacto"),
+            Settings.TOTAL_COUNT_CAP,
+            entidad=entidad
+        )
+        
+        # Usuarios y bloqueos de la página: una consulta cada uno
+        usuarios = usuarios_por_id(db, (log.id_usuario for log in logs))
+        bloqueos = bloqueos_por_id(db, (log.id_usuario for log in logs if log.estado == 'fallido'))
         
         logs_data = []
         for log in logs:
-            usuario = db.query(Usuario).filter(
-                Usuario.id_usuario == log.id_usuario
-            ).first()
-            
-            from app.modules.auth.repositories.auth_repository import AuthRepository
-            bloqueado, fecha_desbloqueo = AuthRepository.verificar_cuenta_bloqueada(
-                db, log.id_usuario
-            ) if log.estado == 'fallido' else (False, None)
+            usuario = usuarios.get(log.id_usuario)
+            fecha_desbloqueo = bloqueos.get(log.id_usuario) if log.estado == 'fallido' else None
+            bloqueado = fecha_desbloqueo is not None
             
             logs_data.append({
                 "id_log": log.id_log,
                 "usuario_id": log.id_usuario,
-                "usuario": usuario.usuario if usuario else "N/A",
-                "nombre_completo": usuario.persona.nombre_completo if usuario and usuario.persona else "N/A",
+                "usuario": usuario.nombre.usuario if usuario else "N/A",
+                "nombre_completo": usuario.nombre.nombre_completo if usuario and usuario.nombre.nombre_completo else "N/A",
                 "fecha_hora": log.fecha_hora.isoformat() if log.fecha_hora else None,
                 "estado": log.estado,
                 "ip_address": log.ip_address or "N/A",
@@ -392,16 +477,25 @@ async def obtener_login_logs(
                 "sistema_operativo": _extraer_sistema_operativo(log.user_agent)
             })
         
-        estadisticas = _calcular_estadisticas_login(db, fecha_inicio, fecha_fin)
+        estadisticas = _calcular_estadisticas_login(db, fecha_inicio, fecha_fin, entidad)
+
+        if usar_cursor:
+            paginado = {"limit": limit, **cursores}
+        else:
+            paginado = {
+                "skip": skip,
+                "limit": limit,
+                "paginas": (total + limit - 1) // limit if total is not None and limit > 0 else None,
+                "has_more": skip + len(logs) < total if total_exacto else len(logs) == limit
+            }
         
         return ResponseModel.success(
-            message="Login logs obtenidos",
+            message=f"Login logs obtenidos{_texto_total(total, total_exacto)}",
             data={
                 "logs": logs_data,
                 "total": total,
-                "skip": skip,
-                "limit": limit,
-                "paginas": (total + limit - 1) // limit if limit > 0 else 1,
+                "total_exacto": total_exacto,
+                **paginado,
                 "estadisticas": estadisticas
             },
             status_code=200
@@ -418,21 +512,22 @@ async def obtener_login_logs(
 
 @router.get("/login-logs/estadisticas", response_model=dict)
 @requires_permission('ver_bitacora')
-async def obtener_estadisticas_login(
+def obtener_estadisticas_login(
     dias: int = Query(7, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ) -> dict:
     """📊 Estadísticas de autenticación"""
     try:
         fecha_inicio = datetime.now() - timedelta(days=dias)
+        entidad = entidad_auditoria(db, LoginLog, fecha_inicio)
         
-        total_exitosos = db.query(LoginLog).filter(
-            and_(LoginLog.estado == 'exitoso', LoginLog.fecha_hora >= fecha_inicio)
+        total_exitosos = db.query(entidad).filter(
+            and_(entidad.estado == 'exitoso', entidad.fecha_hora >= fecha_inicio)
         ).count()
         
-        total_fallidos = db.query(LoginLog).filter(
-            and_(LoginLog.estado == 'fallido', LoginLog.fecha_hora >= fecha_inicio)
+        total_fallidos = db.query(entidad).filter(
+            and_(entidad.estado == 'fallido', entidad.fecha_hora >= fecha_inicio)
         ).count()
         
         total_intentos = total_exitosos + total_fallidos
@@ -459,7 +554,7 @@ async def obtener_estadisticas_login(
 
 @router.get("/login-logs/usuario/{usuario_id}", response_model=dict)
 @requires_permission('ver_bitacora')
-async def obtener_historial_login_usuario(
+def obtener_historial_login_usuario(
     usuario_id: int,
     limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
@@ -512,17 +607,22 @@ def _obtener_icono_accion(accion: str) -> str:
         return "🟡"
     return "⚪"
 
-def _calcular_estadisticas_login(db: Session, fecha_inicio: Optional[str], fecha_fin: Optional[str]) -> dict:
-    """Calcular estadísticas de login"""
-    query = db.query(LoginLog)
+def _calcular_estadisticas_login(
+    db: Session,
+    fecha_inicio: Optional[str],
+    fecha_fin: Optional[str],
+    entidad=LoginLog
+) -> dict:
+    """Calcular estadísticas de login (`entidad`: LoginLog o alias con archivos)"""
+    query = db.query(entidad)
     if fecha_inicio:
-        query = query.filter(LoginLog.fecha_hora >= datetime.fromisoformat(fecha_inicio))
+        query = query.filter(entidad.fecha_hora >= datetime.fromisoformat(fecha_inicio))
     if fecha_fin:
-        query = query.filter(LoginLog.fecha_hora <= datetime.fromisoformat(fecha_fin))
+        query = query.filter(entidad.fecha_hora <= datetime.fromisoformat(fecha_fin))
     
     total = query.count()
-    exitosos = query.filter(LoginLog.estado == 'exitoso').count()
-    fallidos = query.filter(LoginLog.estado == 'fallido').count()
+    exitosos = query.filter(entidad.estado == 'exitoso').count()
+    fallidos = query.filter(entidad.estado == 'fallido').count()
     
     return {
         "total_intentos": total,
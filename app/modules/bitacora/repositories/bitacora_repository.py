@@ -1,7 +1,14 @@
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime
-from app.modules.usuarios.models.usuario_models import Bitacora
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import json
+from app.core.audit_writer import accion_durable, registrar_auditoria
+from app.core.index_advisor import registrar_consulta
+from app.modules.usuarios.models.usuario_models import Bitacora, LoginLog
+from app.shared.paginacion import (
+    Cursor, ModoTotal, STMT_FILAS_ESTIMADAS_MYSQL, aplicar_keyset, cortar_pagina, plan_total, stmt_conteo
+)
 
 class BitacoraRepository:
     """Repositorio para operaciones de bitácora"""
@@ -17,22 +24,30 @@ class BitacoraRepository:
         estado_anterior: Optional[dict] = None,
         estado_nuevo: Optional[dict] = None,
         ip_address: Optional[str] = None
-    ) -> Bitacora:
-        """Registrar una acción en la bitácora"""
-        bitacora = Bitacora(
-            id_usuario_admin=id_usuario_admin,
-            accion=accion,
-            descripcion=descripcion,
-            id_objetivo=id_objetivo,
-            tipo_objetivo=tipo_objetivo,
-            estado_anterior=estado_anterior,
-            estado_nuevo=estado_nuevo,
-            ip_address=ip_address,
-            fecha_hora=datetime.utcnow()
-        )
-        db.add(bitacora)
-        db.commit()
-        return bitacora
+    ) -> Optional[Bitacora]:
+        """
+        Registrar una acción en la bitácora (sin commit: ver app/core/audit_writer.py)
+        
+        La tabla no tiene columnas para los estados ni la IP: se agregan a la descripción.
+        """
+        extras = []
+        if estado_anterior is not None:
+            extras.append(f"antes: {json.dumps(estado_anterior, default=str, ensure_ascii=False)}")
+        if estado_nuevo is not None:
+            extras.append(f"después: {json.dumps(estado_nuevo, default=str, ensure_ascii=False)}")
+        if ip_address:
+            extras.append(f"IP {ip_address}")
+        if extras:
+            descripcion = f"{descripcion} ({'; '.join(extras)})" if descripcion else "; ".join(extras)
+        
+        return registrar_auditoria(db, Bitacora, {
+            "id_usuario_admin": id_usuario_admin,
+            "accion": accion,
+            "descripcion": descripcion,
+            "id_objetivo": id_objetivo,
+            "tipo_objetivo": tipo_objetivo,
+            "fecha_hora": datetime.utcnow()
+        }, durable=accion_durable(accion))
     
     @staticmethod
     def obtener_por_id(db: Session, id_bitacora: int) -> Optional[Bitacora]:
@@ -53,3 +68,121 @@ class BitacoraRepository:
     @staticmethod
     def contar_registros(db: Session) -> int:
         return db.query(Bitacora).count()
+
+
+class LoginLogRepository:
+    """
+    Listado de logs de autenticación (offset o cursor keyset sobre fecha_hora, id_log)
+    `entidad`: LoginLog o el alias con los archivos mensuales (ver services/retencion.py)
+    """
+
+    @staticmethod
+    def filtros(
+        usuario_id: Optional[int] = None,
+        estado: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        fecha_inicio: Optional[datetime] = None,
+        fecha_fin: Optional[datetime] = None,
+        entidad=LoginLog
+    ) -> list:
+        condiciones = []
+        if usuario_id:
+            condiciones.append(entidad.id_usuario == usuario_id)
+        if estado:
+            condiciones.append(entidad.estado == estado)
+        if ip_address:
+            condiciones.append(entidad.ip_address.contains(ip_address))
+        if fecha_inicio:
+            condiciones.append(entidad.fecha_hora >= fecha_inicio)
+        if fecha_fin:
+            condiciones.append(entidad.fecha_hora <= fecha_fin)
+        return condiciones
+
+    @staticmethod
+    def contar(
+        db: Session,
+        condiciones: list,
+        modo: ModoTotal = "exacto",
+        tope: int = 10000,
+        entidad=LoginLog
+    ) -> Tuple[Optional[int], bool]:
+        """Total filtrado según `modo`: (total o None, si es exacto)"""
+        plan, tope = plan_total(modo, db.get_bind().dialect.name, bool(condiciones), tope)
+
+        if plan == "ninguno":
+            return None, False
+        if plan == "estimado":
+            filas = db.scalar(STMT_FILAS_ESTIMADAS_MYSQL, {"tabla": LoginLog.__tablename__})
+            if filas is not None:
+                return int(filas), False
+
+        total = int(db.scalar(stmt_conteo(entidad, condiciones, tope)) or 0)
+        return total, tope is None or total < tope
+
+    @staticmethod
+    def listar(db: Session, condiciones: list, skip: int = 0, limit: int = 50, entidad=LoginLog) -> List[LoginLog]:
+        """Página por offset (más recientes primero)"""
+        return list(db.scalars(
+            select(entidad).where(*condiciones)
+            .order_by(entidad.fecha_hora.desc(), entidad.id_log.desc()).offset(skip).limit(limit)
+        ).all())
+
+    @staticmethod
+    def listar_keyset(
+        db: Session,
+        condiciones: list,
+        cursor: Optional[Cursor],
+        limit: int = 50,
+        entidad=LoginLog
+    ) -> Tuple[List[LoginLog], Dict[str, Any]]:
+        """Página después/antes del cursor y sus cursores next/prev"""
+        stmt = aplicar_keyset(
+            select(entidad).where(*condiciones), entidad.fecha_hora, entidad.id_log, cursor, limit
+        )
+        return cortar_pagina(db.scalars(stmt).all(), cursor, limit, "fecha_hora", "id_log")
+
+
+# ==================== CONSULTAS CRÍTICAS (asesor de índices) ====================
+
+def _hace_dias(dias: int) -> datetime:
+    return datetime.now() - timedelta(days=dias)
+
+
+@registrar_consulta("auditoria: primera página (keyset)")
+def _consulta_auditoria_pagina():
+    return aplicar_keyset(select(Bitacora), Bitacora.fecha_hora, Bitacora.id_bitacora, None, 50)
+
+
+@registrar_consulta("auditoria: por administrador y rango de fechas")
+def _consulta_auditoria_admin():
+    return aplicar_keyset(
+        select(Bitacora).where(Bitacora.id_usuario_admin == 1, Bitacora.fecha_hora >= _hace_dias(30)),
+        Bitacora.fecha_hora, Bitacora.id_bitacora, None, 50
+    )
+
+
+@registrar_consulta("auditoria: por objeto afectado")
+def _consulta_auditoria_objetivo():
+    return aplicar_keyset(
+        select(Bitacora).where(Bitacora.tipo_objetivo == 'Usuario', Bitacora.id_objetivo == 1),
+        Bitacora.fecha_hora, Bitacora.id_bitacora, None, 50
+    )
+
+
+@registrar_consulta("auditoria: estadísticas por acción (7 días)")
+def _consulta_auditoria_estadisticas():
+    return select(Bitacora.accion, func.count(Bitacora.id_bitacora)).where(
+        Bitacora.fecha_hora >= _hace_dias(7)
+    ).group_by(Bitacora.accion)
+
+
+@registrar_consulta("login-logs: primera página (keyset)")
+def _consulta_login_logs_pagina():
+    return aplicar_keyset(select(LoginLog), LoginLog.fecha_hora, LoginLog.id_log, None, 50)
+
+
+@registrar_consulta("login-logs: estadísticas por estado (7 días)")
+def _consulta_login_logs_estadisticas():
+    return select(func.count()).select_from(LoginLog).where(
+        LoginLog.estado == 'fallido', LoginLog.fecha_hora >= _hace_dias(7)
+    )
@@ -0,0 +1,115 @@
+"""
+app/modules/bitacora/repositories/bitacora_repository_async.py
+Consultas de bitácora con AsyncSession (listado de auditoría)
+
+Dos formas de paginar, ambas por (fecha_hora DESC, id_bitacora DESC):
+- offset/limit (`listar_auditoria`), la original
+- cursor keyset (`listar_auditoria_keyset`), costo constante en cualquier página
+El total se pide aparte (`contar_auditoria`) y puede ser exacto, limitado o estimado.
+`entidad` es Bitacora o el alias que incluye los archivos mensuales
+(ver app/modules/bitacora/services/retencion.py).
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.usuarios.models.usuario_models import Bitacora
+from app.shared.paginacion import (
+    Cursor, ModoTotal, STMT_FILAS_ESTIMADAS_MYSQL, aplicar_keyset, cortar_pagina, plan_total, stmt_conteo
+)
+
+
+class BitacoraRepositoryAsync:
+    """Lecturas de bitácora para endpoints async"""
+
+    @staticmethod
+    def _filtros(
+        entidad=Bitacora,
+        usuario_admin: Optional[int] = None,
+        accion: Optional[str] = None,
+        tipo_objetivo: Optional[str] = None,
+        id_objetivo: Optional[int] = None,
+        fecha_inicio: Optional[datetime] = None,
+        fecha_fin: Optional[datetime] = None
+    ) -> list:
+        condiciones = []
+        if usuario_admin:
+            condiciones.append(entidad.id_usuario_admin == usuario_admin)
+        if accion:
+            condiciones.append(entidad.accion.ilike(f"%{accion}%"))
+        if tipo_objetivo:
+            condiciones.append(entidad.tipo_objetivo == tipo_objetivo)
+        if id_objetivo:
+            condiciones.append(entidad.id_objetivo == id_objetivo)
+        if fecha_inicio:
+            condiciones.append(entidad.fecha_hora >= fecha_inicio)
+        if fecha_fin:
+            condiciones.append(entidad.fecha_hora <= fecha_fin)
+        return condiciones
+
+    @staticmethod
+    async def contar_auditoria(
+        db: AsyncSession,
+        modo: ModoTotal = "exacto",
+        tope: int = 10000,
+        entidad=Bitacora,
+        **filtros
+    ) -> Tuple[Optional[int], bool]:
+        """Total filtrado según `modo`: (total o None, si es exacto)"""
+        condiciones = BitacoraRepositoryAsync._filtros(entidad, **filtros)
+        plan, tope = plan_total(modo, db.get_bind().dialect.name, bool(condiciones), tope)
+
+        if plan == "ninguno":
+            return None, False
+        if plan == "estimado":
+            filas = await db.scalar(STMT_FILAS_ESTIMADAS_MYSQL, {"tabla": Bitacora.__tablename__})
+            if filas is not None:
+                return int(filas), False
+
+        total = int(await db.scalar(stmt_conteo(entidad, condiciones, tope)) or 0)
+        return total, tope is None or total < tope
+
+    @staticmethod
+    async def listar_auditoria(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 50,
+        **filtros
+    ) -> Tuple[int, List[Bitacora]]:
+        """Total filtrado y página de registros (más recientes primero)"""
+        total, _ = await BitacoraRepositoryAsync.contar_auditoria(db, "exacto", **filtros)
+        return total, await BitacoraRepositoryAsync.pagina_auditoria(db, skip, limit, **filtros)
+
+    @staticmethod
+    async def pagina_auditoria(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 50,
+        entidad=Bitacora,
+        **filtros
+    ) -> List[Bitacora]:
+        """Página por offset (más recientes primero)"""
+        condiciones = BitacoraRepositoryAsync._filtros(entidad, **filtros)
+        resultado = await db.execute(
+            select(entidad).where(*condiciones)
+            .order_by(desc(entidad.fecha_hora), desc(entidad.id_bitacora)).offset(skip).limit(limit)
+        )
+        return list(resultado.scalars().all())
+
+    @staticmethod
+    async def listar_auditoria_keyset(
+        db: AsyncSession,
+        cursor: Optional[Cursor],
+        limit: int = 50,
+        entidad=Bitacora,
+        **filtros
+    ) -> Tuple[List[Bitacora], Dict[str, Any]]:
+        """Página después/antes del cursor y sus cursores next/prev"""
+        condiciones = BitacoraRepositoryAsync._filtros(entidad, **filtros)
+        stmt = aplicar_keyset(
+            select(entidad).where(*condiciones), entidad.fecha_hora, entidad.id_bitacora, cursor, limit
+        )
+        resultado = await db.execute(stmt)
+        return cortar_pagina(resultado.scalars().all(), cursor, limit, "fecha_hora", "id_bitacora")
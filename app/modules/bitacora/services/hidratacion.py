@@ -0,0 +1,185 @@
+"""
+app/modules/bitacora/services/hidratacion.py
+Hidratación por lotes de las páginas de auditoría
+
+Una página de bitácora o de login logs se completa con una consulta por
+tipo de dato, no por fila:
+- usuarios + persona de los ids distintos de la página (solo columnas)
+- estado de bloqueo de los usuarios con intentos fallidos (consulta agrupada)
+
+Los nombres para mostrar (usuario, nombre completo) se guardan además en un
+LRU por proceso con TTL: en `/auditoria` los pocos administradores que
+aparecen suelen estar ya en memoria y la página no consulta usuarios.
+`is_active` y el bloqueo no se cachean (siempre frescos).
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import time
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.metrics import registrar_cache
+from app.modules.auth.repositories.auth_repository import AuthRepository
+from app.modules.usuarios.models.usuario_models import Persona1, Usuario
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class NombreUsuario:
+    """Datos para mostrar de un usuario en las vistas de auditoría"""
+    usuario: str
+    nombre_completo: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class UsuarioLog:
+    """Usuario de una fila de login log (nombre cacheable + estado fresco)"""
+    nombre: NombreUsuario
+    is_active: bool
+
+
+# ================ LRU DE NOMBRES ================
+
+class NombresCache:
+    """LRU con TTL id_usuario -> NombreUsuario (por worker)"""
+
+    def __init__(self, maxsize: int = 2048, ttl_segundos: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl_segundos = ttl_segundos
+        self._datos: "OrderedDict[int, Tuple[float, NombreUsuario]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def obtener_varios(self, ids: Iterable[int]) -> Tuple[Dict[int, NombreUsuario], Set[int]]:
+        """Nombres en caché y los ids que faltan"""
+        encontrados: Dict[int, NombreUsuario] = {}
+        faltantes: Set[int] = set()
+        ahora = time.monotonic()
+        with self._lock:
+            for id_usuario in ids:
+                entrada = self._datos.get(id_usuario)
+                if entrada is None or entrada[0] < ahora:
+                    self._datos.pop(id_usuario, None)
+                    faltantes.add(id_usuario)
+                    continue
+                self._datos.move_to_end(id_usuario)
+                encontrados[id_usuario] = entrada[1]
+            self.hits += len(encontrados)
+            self.misses += len(faltantes)
+        return encontrados, faltantes
+
+    def guardar_varios(self, nombres: Dict[int, NombreUsuario]) -> None:
+        if self.maxsize <= 0 or not nombres:
+            return
+        expira = time.monotonic() + self.ttl_segundos
+        with self._lock:
+            for id_usuario, nombre in nombres.items():
+                self._datos[id_usuario] = (expira, nombre)
+                self._datos.move_to_end(id_usuario)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+
+    def invalidar(self, id_usuario: int) -> None:
+        """Quitar un usuario (cambio de nombre de usuario o de persona: ver invalidar_nombres_persona)"""
+        with self._lock:
+            self._datos.pop(id_usuario, None)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def estadisticas(self) -> Dict[str, float]:
+        """Contadores de uso del caché"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._datos),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0
+        }
+
+
+def _crear_cache() -> NombresCache:
+    from app.core.database import Settings
+    return NombresCache(
+        maxsize=getattr(Settings, "AUDIT_NAME_CACHE_MAXSIZE", 2048),
+        ttl_segundos=getattr(Settings, "AUDIT_NAME_CACHE_TTL", 300)
+    )
+
+
+# Instancia compartida por el proceso
+nombres_cache = _crear_cache()
+registrar_cache("nombres_auditoria", nombres_cache.estadisticas)
+
+
+def invalidar_nombres_persona(db: Session, id_persona: int) -> None:
+    """Quitar del caché los usuarios de una persona (cambio de nombres o apellidos)"""
+    for id_usuario in db.scalars(select(Usuario.id_usuario).where(Usuario.id_persona == id_persona)):
+        nombres_cache.invalidar(id_usuario)
+
+
+# ================ CONSULTAS POR LOTE ================
+
+def _stmt_usuarios(ids: Iterable[int]):
+    """Usuarios y nombre de su persona, solo las columnas que se muestran"""
+    return select(
+        Usuario.id_usuario,
+        Usuario.usuario,
+        Usuario.is_active,
+        Persona1.nombres,
+        Persona1.apellido_paterno,
+        Persona1.apellido_materno
+    ).outerjoin(
+        Persona1, Persona1.id_persona == Usuario.id_persona
+    ).where(Usuario.id_usuario.in_(ids))
+
+
+def _usuario_de_fila(fila) -> UsuarioLog:
+    nombre_completo = None
+    if fila.nombres is not None:
+        # Mismo formato que Persona1.nombre_completo
+        nombre_completo = f"{fila.nombres} {fila.apellido_paterno} {fila.apellido_materno}"
+    return UsuarioLog(NombreUsuario(fila.usuario, nombre_completo), bool(fila.is_active))
+
+
+def _ids_distintos(ids: Iterable[Optional[int]]) -> List[int]:
+    return sorted({i for i in ids if i is not None})
+
+
+async def nombres_por_id_async(db: AsyncSession, ids: Iterable[Optional[int]]) -> Dict[int, NombreUsuario]:
+    """Nombres de los usuarios de una página de bitácora (caché + una consulta por los faltantes)"""
+    nombres, faltantes = nombres_cache.obtener_varios(_ids_distintos(ids))
+    if faltantes:
+        resultado = await db.execute(_stmt_usuarios(faltantes))
+        cargados = {fila.id_usuario: _usuario_de_fila(fila).nombre for fila in resultado}
+        nombres_cache.guardar_varios(cargados)
+        nombres.update(cargados)
+    return nombres
+
+
+def usuarios_por_id(db: Session, ids: Iterable[Optional[int]]) -> Dict[int, UsuarioLog]:
+    """Usuarios de una página de login logs en una consulta (refresca el caché de nombres)"""
+    ids = _ids_distintos(ids)
+    if not ids:
+        return {}
+    usuarios = {fila.id_usuario: _usuario_de_fila(fila) for fila in db.execute(_stmt_usuarios(ids))}
+    nombres_cache.guardar_varios({i: u.nombre for i, u in usuarios.items()})
+    return usuarios
+
+
+def bloqueos_por_id(db: Session, ids: Iterable[Optional[int]]) -> Dict[int, datetime]:
+    """Fecha de desbloqueo de los usuarios bloqueados (una consulta agrupada)"""
+    ids = _ids_distintos(ids)
+    return AuthRepository.cuentas_bloqueadas(db, ids) if ids else {}
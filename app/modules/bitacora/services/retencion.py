@@ -0,0 +1,332 @@
+"""
+app/modules/bitacora/services/retencion.py
+Retención de auditoría: archivo mensual de bitacora y login_logs
+
+- `archivar(engine, meses)` mueve las filas anteriores al primer día del mes
+  de hace `meses` meses a tablas mensuales con el mismo esquema
+  (`bitacora_AAAA_MM`, `login_logs_AAAA_MM`), por lotes: cada lote se copia y
+  se borra de la tabla caliente en una misma transacción, así que un corte a
+  mitad de camino no pierde ni duplica filas y se puede volver a ejecutar.
+- `entidad_auditoria(db, Modelo, desde, hasta)` devuelve el modelo (solo
+  tabla caliente) o un alias ORM sobre `tabla caliente UNION ALL archivos`
+  de los meses que toca el rango. Los listados y estadísticas de auditoría
+  la usan en lugar del modelo: sin `desde` anterior al archivo, no cambia nada.
+  Los meses archivados se listan al arrancar (`cargar_indice_archivos`) con
+  una conexión propia, nunca con la de la petición. Sin archivos ni
+  RETENTION_MONTHS no se vuelven a consultar; con retención se releen cada
+  pocos minutos y tras cada ciclo de la tarea.
+- Tarea programada (RETENTION_MONTHS > 0): un hilo por worker ejecuta
+  `archivar` cada RETENTION_INTERVAL_HOURS; en MySQL un GET_LOCK evita que
+  varios workers archiven a la vez.
+
+Uso manual: python manage.py archivar-auditoria --meses 6
+"""
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+import re
+import time
+
+from sqlalchemy import Column, Index, MetaData, Table, delete, func, inspect, select, text, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.modules.usuarios.models.usuario_models import Bitacora, LoginLog
+
+logger = logging.getLogger(__name__)
+
+# Tablas con archivo: modelo -> columna de id (orden de los lotes)
+TABLAS_ARCHIVABLES = {
+    Bitacora.__tablename__: (Bitacora, "id_bitacora"),
+    LoginLog.__tablename__: (LoginLog, "id_log"),
+}
+
+_metadata_archivo = MetaData()
+_tablas_archivo: Dict[str, Table] = {}
+_lock_tablas = Lock()
+
+Mes = Tuple[int, int]
+
+
+# ========================= TABLAS MENSUALES =========================
+
+def nombre_archivo(tabla: str, mes: Mes) -> str:
+    return f"{tabla}_{mes[0]:04d}_{mes[1]:02d}"
+
+
+def _siguiente_mes(mes: Mes) -> Mes:
+    return (mes[0] + 1, 1) if mes[1] == 12 else (mes[0], mes[1] + 1)
+
+
+def _inicio_mes(mes: Mes) -> datetime:
+    return datetime(mes[0], mes[1], 1)
+
+
+def mes_de_corte(meses: int, hoy: Optional[datetime] = None) -> Mes:
+    """Primer mes que se conserva en la tabla caliente (el actual menos `meses`)"""
+    hoy = hoy or datetime.now()
+    indice = hoy.year * 12 + (hoy.month - 1) - meses
+    return indice // 12, indice % 12 + 1
+
+
+def tabla_archivo(modelo, mes: Mes) -> Table:
+    """Tabla mensual con las columnas del modelo (sin FKs: el archivo sobrevive a los usuarios)"""
+    caliente = modelo.__table__
+    nombre = nombre_archivo(caliente.name, mes)
+    with _lock_tablas:
+        tabla = _tablas_archivo.get(nombre)
+        if tabla is None:
+            tabla = Table(
+                nombre,
+                _metadata_archivo,
+                *[
+                    Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable, autoincrement=False)
+                    for c in caliente.columns
+                ],
+                Index(f"ix_{nombre}_fecha_hora", "fecha_hora")
+            )
+            _tablas_archivo[nombre] = tabla
+        return tabla
+
+
+class _IndiceArchivos:
+    """
+    Meses archivados por tabla, leídos con una conexión del engine (no de la sesión).
+    Con `refrescar` el listado vence cada `ttl_segundos`; sin él queda fijo
+    hasta `invalidar()` (archivado en este proceso).
+    """
+
+    def __init__(self, ttl_segundos: float = 300.0):
+        self.ttl_segundos = ttl_segundos
+        self._engine = None
+        self._meses: Optional[Dict[str, List[Mes]]] = None
+        self._refrescar = True
+        self._expira = 0.0
+        self._lock = Lock()
+
+    def cargar(self, engine, refrescar: bool) -> Dict[str, List[Mes]]:
+        with self._lock:
+            self._engine = engine
+            self._meses = self._leer(engine)
+            # Si ya hay archivos, otro proceso (manage.py) puede sumar más
+            self._refrescar = refrescar or bool(self._meses)
+            self._expira = time.monotonic() + self.ttl_segundos
+            return self._meses
+
+    def meses(self, tabla: str) -> List[Mes]:
+        with self._lock:
+            if self._meses is None or (self._refrescar and time.monotonic() >= self._expira):
+                if self._engine is None:
+                    from app.core.database import engine
+                    self._engine = engine
+                self._meses = self._leer(self._engine)
+                self._expira = time.monotonic() + self.ttl_segundos
+            return self._meses.get(tabla, [])
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._refrescar = True
+            self._expira = 0.0
+
+    @staticmethod
+    def _leer(engine) -> Dict[str, List[Mes]]:
+        patron = re.compile(rf"^({'|'.join(map(re.escape, TABLAS_ARCHIVABLES))})_(\d{{4}})_(\d{{2}})$")
+        meses: Dict[str, List[Mes]] = {}
+        for nombre in inspect(engine).get_table_names():
+            coincidencia = patron.match(nombre)
+            if coincidencia:
+                tabla, anio, mes = coincidencia.groups()
+                meses.setdefault(tabla, []).append((int(anio), int(mes)))
+        for lista in meses.values():
+            lista.sort()
+        return meses
+
+
+indice_archivos = _IndiceArchivos()
+
+
+def cargar_indice_archivos(settings, engine=None) -> None:
+    """Listar los archivos una vez al arrancar (si falla, se listan en el primer uso)"""
+    if engine is None:
+        from app.core.database import engine
+    try:
+        meses = indice_archivos.cargar(engine, refrescar=settings.RETENTION_MONTHS > 0)
+    except Exception as e:
+        logger.warning("No se pudieron listar los archivos de auditoría: %s", e)
+        return
+    logger.info("Archivos de auditoría: %s", {tabla: len(lista) for tabla, lista in meses.items()} or "ninguno")
+
+
+# ========================= CONSULTA A TRAVÉS DEL ARCHIVO =========================
+
+def meses_en_rango(
+    archivados: Sequence[Mes],
+    desde: Optional[datetime],
+    hasta: Optional[datetime] = None
+) -> List[Mes]:
+    """Meses archivados que se solapan con [desde, hasta] (sin `desde`: ninguno)"""
+    if desde is None:
+        return []
+    return [
+        mes for mes in archivados
+        if _inicio_mes(_siguiente_mes(mes)) > desde and (hasta is None or _inicio_mes(mes) <= hasta)
+    ]
+
+
+def entidad_auditoria(db: Session, modelo, desde: Optional[datetime], hasta: Optional[datetime] = None):
+    """
+    Entidad para consultar `modelo` en el rango: el propio modelo o un alias
+    sobre la unión con los archivos mensuales que alcanza el rango.
+    No usa la conexión de `db`: los meses salen de `indice_archivos`. Puede
+    releer el listado de tablas (síncrono), así que desde código async se llama
+    con `run_in_threadpool(entidad_auditoria, db.sync_session, ...)`.
+    """
+    if desde is None:
+        return modelo
+    meses = meses_en_rango(indice_archivos.meses(modelo.__tablename__), desde, hasta)
+    if not meses:
+        return modelo
+
+    caliente = modelo.__table__
+    columnas = [c.name for c in caliente.columns]
+    partes = [select(*[caliente.c[n] for n in columnas])]
+    for mes in meses:
+        archivo = tabla_archivo(modelo, mes)
+        partes.append(select(*[archivo.c[n] for n in columnas]))
+    return aliased(modelo, union_all(*partes).subquery(f"{caliente.name}_con_archivo"))
+
+
+# ========================= ARCHIVADO =========================
+
+def archivar_tabla(engine, tabla: str, corte: Mes, lote: int = 5000, simular: bool = False) -> Dict[str, int]:
+    """Mover a archivos mensuales las filas de `tabla` anteriores al mes `corte`"""
+    modelo, columna_id = TABLAS_ARCHIVABLES[tabla]
+    caliente = modelo.__table__
+    id_col = caliente.c[columna_id]
+    limite = _inicio_mes(corte)
+
+    with engine.connect() as conexion:
+        mas_antigua = conexion.scalar(select(func.min(caliente.c.fecha_hora)))
+    if mas_antigua is None or mas_antigua >= limite:
+        return {}
+
+    movidas: Dict[str, int] = {}
+    mes = (mas_antigua.year, mas_antigua.month)
+    while mes < corte:
+        inicio, fin = _inicio_mes(mes), _inicio_mes(_siguiente_mes(mes))
+        rango = (caliente.c.fecha_hora >= inicio, caliente.c.fecha_hora < fin)
+        archivo = tabla_archivo(modelo, mes)
+
+        if simular:
+            with engine.connect() as conexion:
+                cantidad = conexion.scalar(select(func.count()).select_from(caliente).where(*rango)) or 0
+        else:
+            archivo.create(bind=engine, checkfirst=True)
+            cantidad = 0
+            while True:
+                with engine.begin() as conexion:
+                    ids = conexion.scalars(select(id_col).where(*rango).order_by(id_col).limit(lote)).all()
+                    if not ids:
+                        break
+                    conexion.execute(archivo.insert().from_select(
+                        [c.name for c in caliente.columns],
+                        select(*caliente.columns).where(id_col.in_(ids))
+                    ))
+                    conexion.execute(delete(caliente).where(id_col.in_(ids)))
+                cantidad += len(ids)
+
+        if cantidad:
+            movidas[archivo.name] = cantidad
+            logger.info("Retención: %d filas de %s -> %s%s", cantidad, tabla, archivo.name, " (simulado)" if simular else "")
+        mes = _siguiente_mes(mes)
+
+    indice_archivos.invalidar()
+    return movidas
+
+
+def archivar(
+    engine,
+    meses: int,
+    tablas: Optional[Sequence[str]] = None,
+    lote: int = 5000,
+    simular: bool = False
+) -> Dict[str, int]:
+    """Archivar todas las tablas de auditoría conservando `meses` meses en caliente"""
+    if meses < 1:
+        raise ValueError("La retención debe ser de al menos 1 mes")
+    corte = mes_de_corte(meses)
+    movidas: Dict[str, int] = {}
+    for tabla in tablas or TABLAS_ARCHIVABLES:
+        if tabla not in TABLAS_ARCHIVABLES:
+            raise ValueError(f"Tabla no archivable: {tabla}. Disponibles: {', '.join(TABLAS_ARCHIVABLES)}")
+        movidas.update(archivar_tabla(engine, tabla, corte, lote, simular))
+    return movidas
+
+
+# ========================= TAREA PROGRAMADA =========================
+
+_NOMBRE_LOCK = "brisa_retencion_auditoria"
+
+
+def _archivar_con_lock(engine, meses: int, lote: int) -> None:
+    # Un solo worker a la vez (MySQL); en otros motores los lotes son idempotentes igual
+    if engine.dialect.name != "mysql":
+        archivar(engine, meses, lote=lote)
+        return
+    with engine.connect() as conexion:
+        if not conexion.scalar(text("SELECT GET_LOCK(:nombre, 0)"), {"nombre": _NOMBRE_LOCK}):
+            logger.info("Retención: otro worker está archivando")
+            return
+        try:
+            archivar(engine, meses, lote=lote)
+        finally:
+            conexion.execute(text("SELECT RELEASE_LOCK(:nombre)"), {"nombre": _NOMBRE_LOCK})
+
+
+class _TareaRetencion(Thread):
+    """Hilo que archiva periódicamente (primera ejecución tras un intervalo)"""
+
+    def __init__(self, engine, meses: int, lote: int, intervalo: float):
+        super().__init__(name="retencion-auditoria", daemon=True)
+        self.engine = engine
+        self.meses = meses
+        self.lote = lote
+        self.intervalo = intervalo
+        self._parar = Event()
+
+    def run(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                _archivar_con_lock(self.engine, self.meses, self.lote)
+            except Exception:
+                logger.exception("Error en la tarea de retención de auditoría")
+            # También en los workers que no archivaron (GET_LOCK ocupado)
+            indice_archivos.invalidar()
+
+    def detener(self):
+        self._parar.set()
+
+
+_tarea: Optional[_TareaRetencion] = None
+
+
+def iniciar_retencion(settings, engine=None) -> None:
+    """Arrancar la tarea programada si RETENTION_MONTHS > 0 (startup)"""
+    global _tarea
+    if _tarea is not None or settings.RETENTION_MONTHS <= 0:
+        return
+    if engine is None:
+        from app.core.database import engine
+    _tarea = _TareaRetencion(
+        engine, settings.RETENTION_MONTHS, settings.RETENTION_BATCH_SIZE, settings.RETENTION_INTERVAL_HOURS * 3600
+    )
+    _tarea.start()
+    logger.info("Retención de auditoría: %d meses en caliente, cada %sh", settings.RETENTION_MONTHS, settings.RETENTION_INTERVAL_HOURS)
+
+
+def detener_retencion() -> None:
+    """Detener la tarea (shutdown); un lote en curso termina su transacción"""
+    global _tarea
+    if _tarea is not None:
+        _tarea.detener()
+        _tarea = None
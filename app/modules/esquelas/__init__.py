@@ -1,11 +1,18 @@
 """Paquete del módulo Esquelas (Reconocimiento y Orientación).
 
 Expone el router principal del módulo como `esquelas_router` para que pueda
-ser importado desde `app.modules.esquelas`.
+ser importado desde `app.modules.esquelas`. Los controladores se importan al
+pedir el router, no al importar el paquete (p. ej. para cargar solo los modelos).
 """
 
-# Importar y exponer el router del controlador principal
-from .controllers.esquela_controller import router as esquelas_router
-from .controllers.codigo_esquela_controller import router as codigos_esquelas_router
-
 __all__ = ["esquelas_router", "codigos_esquelas_router"]
+
+
+def __getattr__(nombre):
+    if nombre == "esquelas_router":
+        from .controllers.esquela_controller import router
+        return router
+    if nombre == "codigos_esquelas_router":
+        from .controllers.codigo_esquela_controller import router
+        return router
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
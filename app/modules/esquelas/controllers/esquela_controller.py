@@ -7,7 +7,9 @@ from datetime import date
 
 # Fuente correcta del dependency de BD
 from app.core.database import get_db
-from app.modules.auth.services.auth_service import get_current_user_dependency
+from app.core.database_async import get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.modules.auth.services.auth_service import get_current_user_dependency, get_current_user_dependency_async
 from app.modules.usuarios.models.usuario_models import Usuario
 from app.shared.decorators.auth_decorators import require_esquela_access, require_permissions
 from app.shared.permission_mapper import puede_ver_todas_esquelas
@@ -40,8 +42,8 @@ async def listar_esquelas(
     month: Optional[int] = Query(None, ge=1, le=12, description="Filtrar por mes (1-12)"),
     page: int = Query(1, ge=1, description="Número de página"),
     page_size: int = Query(10, ge=1, le=100, description="Tamaño de página"),
-    current_user: Usuario = Depends(get_current_user_dependency),
-    db: Session = Depends(get_db)
+    current_user: Usuario = Depends(get_current_user_dependency_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Lista esquelas con filtros avanzados y paginación.
@@ -66,7 +68,7 @@ async def listar_esquelas(
     GET /api/esquelas?name=Juan&course=5&year=2024&page=1&page_size=20
     ```
     """
-    return EsquelaService.listar_esquelas_con_filtros(
+    return await EsquelaService.listar_esquelas_con_filtros_async(
         db=db,
         name=name,
         course_id=course,
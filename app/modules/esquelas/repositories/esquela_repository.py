@@ -5,6 +5,7 @@ from app.modules.esquelas.models.esquela_models import Esquela, CodigoEsquela
 from app.modules.administracion.models.persona_models import Estudiante, estudiantes_cursos
 from app.shared.models.persona import Persona
 from app.modules.estudiantes.models.Curso import Curso
+from app.modules.reportes.repositories.resumen_repository import ResumenRepository
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any
 
@@ -271,6 +272,11 @@ class EsquelaRepository:
                 text("INSERT INTO esquelas_codigos (id_esquela, id_codigo) VALUES (:id_esquela, :id_codigo)"),
                 {"id_esquela": esquela.id_esquela, "id_codigo": cid}
             )
+
+        # Resúmenes diarios para reportes (misma transacción)
+        ResumenRepository.aplicar_esquela(
+            db, esquela.fecha, esquela.id_estudiante, esquela.id_registrador, codigo_ids
+        )
         db.commit()
         db.refresh(esquela)  # Refrescar para cargar las relaciones
         return esquela
@@ -279,7 +285,11 @@ class EsquelaRepository:
     def delete(db: Session, id: int):
         esquela = db.query(Esquela).filter(Esquela.id_esquela == id).first()
         if esquela:
+            codigo_ids = [c.id_codigo for c in esquela.codigos]
             db.delete(esquela)
+            ResumenRepository.aplicar_esquela(
+                db, esquela.fecha, esquela.id_estudiante, esquela.id_registrador, codigo_ids, signo=-1
+            )
             db.commit()
         return esquela
 
@@ -0,0 +1,91 @@
+# app/modules/esquelas/repositories/esquela_repository_async.py
+from sqlalchemy import select, func, or_, extract
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from app.modules.esquelas.models.esquela_models import Esquela, CodigoEsquela
+from app.modules.administracion.models.persona_models import Estudiante, estudiantes_cursos
+from datetime import date
+from typing import Optional
+
+
+class EsquelaRepositoryAsync:
+    """Listado de esquelas con AsyncSession"""
+
+    @staticmethod
+    async def get_with_filters(
+        db: AsyncSession,
+        name: Optional[str] = None,
+        course_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 10,
+        id_profesor: Optional[int] = None
+    ):
+        """
+        Misma semántica que EsquelaRepository.get_with_filters.
+        Primero se pagina sobre los IDs y luego se cargan solo esas esquelas
+        con sus códigos, estudiante y profesor (selectinload).
+        """
+        filtrado = select(Esquela.id_esquela, Esquela.fecha)
+
+        if id_profesor:
+            filtrado = filtrado.where(Esquela.id_profesor == id_profesor)
+
+        if name:
+            filtrado = filtrado.join(Esquela.estudiante).where(
+                or_(
+                    Estudiante.nombres.ilike(f'%{name}%'),
+                    Estudiante.apellido_paterno.ilike(f'%{name}%'),
+                    Estudiante.apellido_materno.ilike(f'%{name}%')
+                )
+            )
+
+        if course_id:
+            estudiantes_del_curso = select(estudiantes_cursos.c.id_estudiante).where(
+                estudiantes_cursos.c.id_curso == course_id
+            )
+            filtrado = filtrado.where(Esquela.id_estudiante.in_(estudiantes_del_curso))
+
+        if tipo:
+            filtrado = filtrado.join(Esquela.codigos).where(CodigoEsquela.tipo == tipo).distinct()
+
+        if fecha_desde:
+            filtrado = filtrado.where(Esquela.fecha >= fecha_desde)
+        if fecha_hasta:
+            filtrado = filtrado.where(Esquela.fecha <= fecha_hasta)
+        if year:
+            filtrado = filtrado.where(extract('year', Esquela.fecha) == year)
+        if month:
+            filtrado = filtrado.where(extract('month', Esquela.fecha) == month)
+
+        total = await db.scalar(select(func.count()).select_from(filtrado.subquery()))
+        total = int(total or 0)
+
+        offset = (page - 1) * page_size
+        ids = (await db.execute(
+            filtrado.order_by(Esquela.fecha.desc(), Esquela.id_esquela.desc()).offset(offset).limit(page_size)
+        )).scalars().all()
+
+        esquelas = []
+        if ids:
+            resultado = await db.execute(
+                select(Esquela).options(
+                    selectinload(Esquela.codigos),
+                    selectinload(Esquela.estudiante),
+                    selectinload(Esquela.profesor)
+                ).where(Esquela.id_esquela.in_(ids))
+            )
+            por_id = {e.id_esquela: e for e in resultado.scalars().all()}
+            esquelas = [por_id[i] for i in ids if i in por_id]
+
+        return {
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": (total + page_size - 1) // page_size if total > 0 else 0,
+            "data": esquelas
+        }
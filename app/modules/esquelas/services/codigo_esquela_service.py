@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from typing import List
 from app.modules.esquelas.models.esquela_models import CodigoEsquela
 from app.modules.esquelas.repositories.codigo_esquela_repository import CodigoEsquelaRepository
+from app.modules.reportes.repositories.resumen_repository import ResumenRepository
 from app.modules.esquelas.dto.codigo_esquela_dto import (
     CodigoEsquelaCreateDTO,
     CodigoEsquelaUpdateDTO
@@ -78,6 +79,8 @@ class CodigoEsquelaService:
                 detail="Código de esquela no encontrado"
             )
 
+        tipo_anterior = codigo.tipo
+
         # Actualizar campos si se proporcionan
         if codigo_data.tipo is not None:
             if codigo_data.tipo not in ['reconocimiento', 'orientacion']:
@@ -100,15 +103,24 @@ class CodigoEsquelaService:
         if codigo_data.descripcion is not None:
             codigo.descripcion = codigo_data.descripcion
 
+        # Los resúmenes diarios agrupan por tipo: si cambió, se recalculan solo
+        # las filas de las esquelas con este código, en la misma transacción
+        if codigo.tipo != tipo_anterior:
+            db.flush()
+            ResumenRepository.recalcular_codigo(db, id_codigo, (tipo_anterior, codigo.tipo))
+
         return CodigoEsquelaRepository.update(db, codigo)
 
     @staticmethod
     def eliminar_codigo(db: Session, id_codigo: int) -> CodigoEsquela:
         """Eliminar un código de esquela"""
-        codigo = CodigoEsquelaRepository.delete(db, id_codigo)
-        if not codigo:
+        if not CodigoEsquelaRepository.get_by_id(db, id_codigo):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Código de esquela no encontrado"
             )
-        return codigo
+
+        # Las esquelas que lo usaban pierden el código: ajustar los resúmenes
+        # en la misma transacción que el borrado
+        ResumenRepository.quitar_codigo(db, id_codigo)
+        return CodigoEsquelaRepository.delete(db, id_codigo)
@@ -1,8 +1,10 @@
 # app/modules/esquelas/services/esquela_service.py
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.modules.esquelas.models.esquela_models import Esquela
 from app.modules.esquelas.repositories.esquela_repository import EsquelaRepository
+from app.modules.esquelas.repositories.esquela_repository_async import EsquelaRepositoryAsync
 from app.modules.esquelas.dto.esquela_dto import EsquelaBaseDTO
 from app.modules.usuarios.models.usuario_models import Usuario
 from app.shared.permission_mapper import puede_ver_esquela, puede_ver_todas_esquelas
@@ -78,6 +80,47 @@ class EsquelaService:
             id_profesor=id_profesor_filtro
         )
 
+    @staticmethod
+    async def listar_esquelas_con_filtros_async(
+        db: AsyncSession,
+        name: Optional[str] = None,
+        course_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        year: Optional[int] = None,
+        month: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 10,
+        current_user: Usuario = None
+    ):
+        """
+        Igual que listar_esquelas_con_filtros, con AsyncSession.
+        """
+        if not current_user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Usuario no autenticado"
+            )
+
+        id_profesor_filtro = None
+        if not puede_ver_todas_esquelas(current_user):
+            id_profesor_filtro = current_user.id_persona
+
+        return await EsquelaRepositoryAsync.get_with_filters(
+            db=db,
+            name=name,
+            course_id=course_id,
+            tipo=tipo,
+            fecha_desde=fecha_desde,
+            fecha_hasta=fecha_hasta,
+            year=year,
+            month=month,
+            page=page,
+            page_size=page_size,
+            id_profesor=id_profesor_filtro
+        )
+
     @staticmethod
     def obtener_esquela(db: Session, id: int, current_user: Usuario = None):
         """Obtiene una esquela validando permisos"""
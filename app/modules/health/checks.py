@@ -0,0 +1,140 @@
+"""
+app/modules/health/checks.py
+Probes de dependencias para readiness, con caché corto
+
+Cada probe mide su latencia y devuelve un `ResultadoProbe`. Los resultados se
+cachean HEALTH_CACHE_SECONDS: un balanceador que consulta cada segundo no
+genera un SELECT por consulta, y mientras un hilo refresca los demás reciben
+el último resultado en vez de esperar.
+
+- pool:       saturación del pool principal; agotado = no listo (y no se
+              intenta un checkout que esperaría DB_POOL_TIMEOUT)
+- db:         SELECT 1 contra el primario (y las réplicas, no críticas)
+- revocacion: backend de revocación de tokens (tabla si es "database")
+- uploads:    directorio de adjuntos de incidentes escribible (no crítico)
+"""
+from dataclasses import asdict, dataclass
+from threading import Lock
+from typing import Callable, List, Optional, Tuple
+import os
+import tempfile
+import time
+
+from sqlalchemy import text
+
+from app.core.database import Settings, engine, estadisticas_db, replica_engines
+from app.modules.auth.services.token_revocation import get_revocation_store
+from app.modules.incidentes.services.services_adjuntos import UPLOAD_DIR
+
+
+@dataclass
+class ResultadoProbe:
+    """Resultado de una dependencia"""
+    nombre: str
+    ok: bool
+    critico: bool
+    latencia_ms: float
+    detalle: Optional[str] = None
+
+
+def _medir(nombre: str, critico: bool, probe: Callable[[], Optional[str]]) -> ResultadoProbe:
+    """Ejecutar un probe; cualquier excepción lo marca como fallido"""
+    inicio = time.perf_counter()
+    try:
+        detalle = probe()
+        ok = True
+    except Exception as e:
+        detalle = f"{type(e).__name__}: {e}"
+        ok = False
+    return ResultadoProbe(nombre, ok, critico, round((time.perf_counter() - inicio) * 1000, 2), detalle)
+
+
+def _probe_pool() -> Optional[str]:
+    estadisticas = estadisticas_db()
+    if "size" not in estadisticas:
+        return estadisticas.get("pool")
+    capacidad = estadisticas["size"] + estadisticas["max_overflow"]
+    if estadisticas["en_uso"] >= capacidad:
+        raise RuntimeError(f"pool agotado ({estadisticas['en_uso']}/{capacidad} conexiones en uso)")
+    return f"{estadisticas['en_uso']}/{capacidad} en uso, {estadisticas['timeouts']} timeouts"
+
+
+def _probe_engine(engine_probe) -> Callable[[], Optional[str]]:
+    def probe():
+        with engine_probe.connect() as conexion:
+            conexion.execute(text("SELECT 1"))
+    return probe
+
+
+def _probe_revocacion() -> Optional[str]:
+    store = get_revocation_store()
+    store.verificar()
+    return f"{type(store).__name__}, {len(store)} revocados"
+
+
+def _probe_uploads() -> Optional[str]:
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=UPLOAD_DIR, prefix=".health-"):
+        pass
+    return os.path.abspath(UPLOAD_DIR)
+
+
+def ejecutar_probes() -> List[ResultadoProbe]:
+    """Todas las probes, sin caché"""
+    pool = _medir("pool", True, _probe_pool)
+    if pool.ok:
+        db = _medir("db", True, _probe_engine(engine))
+    else:
+        db = ResultadoProbe("db", False, True, 0.0, "omitido: pool agotado")
+
+    resultados = [pool, db]
+    for i, replica in enumerate(replica_engines):
+        resultados.append(_medir(f"db_replica_{i}", False, _probe_engine(replica)))
+    resultados.append(_medir("revocacion", True, _probe_revocacion))
+    resultados.append(_medir("uploads", False, _probe_uploads))
+    return resultados
+
+
+class CacheProbes:
+    """Último resultado de las probes, válido `ttl` segundos"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = Lock()
+        self._resultado: Optional[Tuple[float, List[ResultadoProbe]]] = None
+
+    def obtener(self) -> Tuple[List[ResultadoProbe], float]:
+        """(resultados, antigüedad en segundos)"""
+        actual = self._resultado
+        if actual is not None and time.monotonic() - actual[0] < self.ttl:
+            return actual[1], time.monotonic() - actual[0]
+
+        # Un solo hilo refresca; el resto devuelve el último resultado si existe
+        if not self._lock.acquire(blocking=actual is None):
+            return actual[1], time.monotonic() - actual[0]
+        try:
+            actual = self._resultado
+            if actual is None or time.monotonic() - actual[0] >= self.ttl:
+                actual = self._resultado = (time.monotonic(), ejecutar_probes())
+        finally:
+            self._lock.release()
+        return actual[1], time.monotonic() - actual[0]
+
+
+cache_probes = CacheProbes(getattr(Settings, "HEALTH_CACHE_SECONDS", 2.0))
+
+
+def estado_readiness() -> Tuple[str, dict]:
+    """("ready" | "degraded" | "not_ready", detalle por dependencia)"""
+    resultados, antiguedad = cache_probes.obtener()
+    if any(r.critico and not r.ok for r in resultados):
+        estado = "not_ready"
+    elif any(not r.ok for r in resultados):
+        estado = "degraded"
+    else:
+        estado = "ready"
+    return estado, {
+        "status": estado,
+        "cache_age_s": round(antiguedad, 3),
+        "checks": {r.nombre: asdict(r) for r in resultados},
+    }
@@ -1,31 +1,34 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from datetime import datetime
 import os
 from app.core.utils import success_response
+from app.modules.health.checks import estado_readiness
 
 # Crear router para health
 health_router = APIRouter(tags=["Health"])
 
-@health_router.get('/health')
-def health_check():
+@health_router.get('/health/live')
+async def liveness():
     """
-    Endpoint para verificar el estado de la API
+    Liveness: el proceso y su event loop responden (sin consultar dependencias)
+    """
+    return {'status': 'alive', 'timestamp': datetime.utcnow().isoformat()}
+
+@health_router.get('/health/ready')
+def readiness():
+    """
+    Readiness: BD, saturación del pool, revocación de tokens y directorio de adjuntos.
+    Responde 503 si falla una dependencia crítica (p. ej. pool agotado).
+    Los resultados se cachean unos segundos (HEALTH_CACHE_SECONDS).
     
     Returns:
-        JSON: Estado de la API y información del sistema
+        JSON: Estado global y latencia de cada dependencia
     """
-    health_data = {
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
-        'version': '1.0.0',
-        'service': 'BRISA Backend API',
-        'environment': os.environ.get('ENV', 'development'),
-        'uptime': 'running'
-    }
-    
-    return success_response(
-        data=health_data,
-        message="API is running successfully"
+    estado, detalle = estado_readiness()
+    return JSONResponse(
+        status_code=503 if estado == "not_ready" else 200,
+        content=detalle
     )
 
 @health_router.get('/status')
@@ -6,6 +6,8 @@ import os, shutil
 from typing import Optional, List
 import traceback
 from app.core.extensions import get_db
+from app.core.database_async import get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.incidentes.dto.dto_areas import AreaCreateDTO, AreaUpdateDTO
 from app.modules.incidentes.dto.dto_situaciones import SituacionCreateDTO, SituacionUpdateDTO
@@ -47,7 +49,7 @@ from app.modules.incidentes.dto.dto_detalles import IncidenteDetalles
 from app.modules.incidentes.services.services_derivaciones import DerivacionService
 from app.modules.incidentes.dto.dto_derivaciones import DerivacionCreate, DerivacionRead
 
-from app.modules.incidentes.services.services_notificaciones import NotificacionService
+from app.modules.incidentes.services.services_notificaciones import NotificacionService, NotificacionServiceAsync
 from app.modules.incidentes.dto.dto_notificaiones import (
     NotificacionCreateDTO,
     NotificacionOutDTO
@@ -240,14 +242,14 @@ def crear_derivacion(id_incidente: int, data: DerivacionCreate, db: Session = De
 
 #----NOTIFICACIONES----
 @router.get("/notificaciones/{id_usuario}", response_model=list[NotificacionOutDTO])
-def listar_notificaciones(
+async def listar_notificaciones(
     id_usuario: int,
     solo_no_leidas: bool = False,
     limit: int | None = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    service = NotificacionService(db)
-    return service.listar_por_usuario(id_usuario, solo_no_leidas, limit)
+    service = NotificacionServiceAsync(db)
+    return await service.listar_por_usuario(id_usuario, solo_no_leidas, limit)
 
 
 @router.patch("/notificaciones/{id_notificacion}/leer", response_model=NotificacionOutDTO)
@@ -0,0 +1,33 @@
+# app/modules/incidentes/repositories/repositories_notificaciones_async.py
+
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.incidentes.models.models_incidentes import Notificacion
+
+
+class NotificacionRepositoryAsync:
+    """Lecturas de notificaciones con AsyncSession"""
+
+    async def get_by_usuario(
+        self,
+        db: AsyncSession,
+        id_usuario: int,
+        solo_no_leidas: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Notificacion]:
+        query = select(Notificacion).where(Notificacion.id_usuario == id_usuario)
+
+        if solo_no_leidas:
+            query = query.where(Notificacion.leido == False)  # noqa: E712
+
+        # Ordenar de la más nueva a la más antigua
+        query = query.order_by(Notificacion.fecha.desc())
+
+        if limit is not None:
+            query = query.limit(limit)
+
+        resultado = await db.execute(query)
+        return list(resultado.scalars().all())
@@ -3,9 +3,11 @@ from typing import List, Optional
 
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.incidentes.models.models_incidentes import Notificacion
 from app.modules.incidentes.repositories.repositories_notificaciones import NotificacionRepository
+from app.modules.incidentes.repositories.repositories_notificaciones_async import NotificacionRepositoryAsync
 from app.modules.incidentes.dto.dto_notificaiones import NotificacionCreateDTO
 
 
@@ -65,3 +67,25 @@ class NotificacionService:
     #   MARCAR TODAS LAS NOTIFICACIONES LEÍDAS
     def marcar_todas_como_leidas(self, id_usuario: int) -> int:
         return self.repo.marcar_todas_como_leidas(self.db, id_usuario)
+
+
+class NotificacionServiceAsync:
+    """Lecturas de notificaciones para endpoints async (AsyncSession)"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = NotificacionRepositoryAsync()
+
+    #   LISTAR NOTIFICACIONES DE USUARIO
+    async def listar_por_usuario(
+        self,
+        id_usuario: int,
+        solo_no_leidas: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Notificacion]:
+        return await self.repo.get_by_usuario(
+            self.db,
+            id_usuario=id_usuario,
+            solo_no_leidas=solo_no_leidas,
+            limit=limit,
+        )
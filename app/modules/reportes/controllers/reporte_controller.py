@@ -1,12 +1,14 @@
 """Controlador (router) para el módulo de Reportes."""
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 from typing import Optional, Literal
 from datetime import date
 
-from app.core.extensions import get_db
+from app.core.database import get_db_lectura
 from app.modules.reportes.services.reporte_service import ReporteService
+from app.modules.reportes.services.reporte_cache import servir_reporte
+from app.modules.reportes.services.reporte_export import exportar_reporte
 from app.modules.reportes.dto.reporte_dto import (
     RankingResponseDTO,
     EstudianteListadoDTO,
@@ -28,16 +30,30 @@ from app.modules.auth.services.auth_service import get_current_user_dependency
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
+# Tablas que lee cada reporte (etiquetas para invalidar el caché)
+TABLAS_ESQUELAS = ("esquelas", "esquelas_codigos", "codigos_esquelas")
+TABLAS_RANKING = TABLAS_ESQUELAS + ("estudiantes", "estudiantes_cursos", "cursos")
+TABLAS_ESQUELAS_DETALLE = TABLAS_ESQUELAS + ("estudiantes", "personas")
+TABLAS_CODIGOS = TABLAS_ESQUELAS
+TABLAS_ESTUDIANTES = ("estudiantes",)
+TABLAS_ESTUDIANTES_CURSOS = ("estudiantes", "estudiantes_cursos", "cursos")
+TABLAS_CURSOS = ("cursos", "estudiantes_cursos")
+TABLAS_MATERIAS = ("materias",)
+TABLAS_ACADEMICO = ("personas", "profesores_cursos_materias", "cursos", "materias")
+
 
 @router.get("/ranking", response_model=RankingResponseDTO)
 def obtener_ranking(
+    request: Request,
+    response: Response,
     metric: Literal["student", "course"] = Query(..., description="Métrica: 'student' o 'course'"),
     type: Optional[Literal["reconocimiento", "orientacion"]] = Query(None, description="Tipo de esquela (opcional)"),
     limit: int = Query(10, ge=1, le=100, description="Cantidad máxima de resultados"),
     from_date: Optional[date] = Query(None, alias="from", description="Fecha desde (YYYY-MM-DD)"),
     to_date: Optional[date] = Query(None, alias="to", description="Fecha hasta (YYYY-MM-DD)"),
     registrador_id: Optional[int] = Query(None, description="ID del usuario (profesor/regente) para filtrar esquelas asignadas por él"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -82,8 +98,7 @@ def obtener_ranking(
     if registrador_id is None and current_user.persona.tipo_persona == 'profesor':
         registrador_id = current_user.id_persona
 
-    return ReporteService.obtener_ranking(
-        db=db,
+    parametros = dict(
         metric=metric,
         tipo=type,
         limit=limit,
@@ -91,6 +106,12 @@ def obtener_ranking(
         fecha_hasta=to_date,
         id_registrador=registrador_id
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_ranking", parametros)
+    return servir_reporte(
+        request, response, "obtener_ranking", parametros, TABLAS_RANKING,
+        lambda: ReporteService.obtener_ranking(db=db, **parametros)
+    )
 
 
 # ================================
@@ -99,10 +120,13 @@ def obtener_ranking(
 
 @router.get("/students", response_model=EstudianteListadoDTO)
 def obtener_listado_estudiantes(
+    request: Request,
+    response: Response,
     curso_id: Optional[int] = Query(None, description="ID del curso para filtrar"),
     nivel: Optional[Literal["inicial", "primaria", "secundaria"]] = Query(None, description="Nivel educativo"),
     gestion: Optional[str] = Query(None, description="Año de gestión (ej: '2024')"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -123,18 +147,26 @@ def obtener_listado_estudiantes(
     ```
     """
 
-    return ReporteService.obtener_listado_estudiantes(
-        db=db,
+    parametros = dict(
         id_curso=curso_id,
         nivel=nivel,
         gestion=gestion
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_listado_estudiantes", parametros)
+    return servir_reporte(
+        request, response, "obtener_listado_estudiantes", parametros, TABLAS_ESTUDIANTES_CURSOS,
+        lambda: ReporteService.obtener_listado_estudiantes(db=db, **parametros)
+    )
 
 
 @router.get("/students/guardians", response_model=EstudiantesApoderadosResponseDTO)
 def obtener_estudiantes_apoderados(
+    request: Request,
+    response: Response,
     con_apoderados: Optional[bool] = Query(None, description="True=con apoderados, False=sin apoderados, None=todos"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -154,18 +186,26 @@ def obtener_estudiantes_apoderados(
     ```
     """
 
-    return ReporteService.obtener_estudiantes_por_apoderados(
-        db=db,
+    parametros = dict(
         con_apoderados=con_apoderados
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_estudiantes_por_apoderados", parametros)
+    return servir_reporte(
+        request, response, "obtener_estudiantes_por_apoderados", parametros, TABLAS_ESTUDIANTES,
+        lambda: ReporteService.obtener_estudiantes_por_apoderados(db=db, **parametros)
+    )
 
 
 @router.get("/students/guardian-contacts", response_model=ContactosApoderadosResponseDTO)
 def obtener_contactos_apoderados(
+    request: Request,
+    response: Response,
     curso_id: Optional[int] = Query(None, description="ID del curso para filtrar"),
     nivel: Optional[Literal["inicial", "primaria", "secundaria"]] = Query(None, description="Nivel educativo"),
     gestion: Optional[str] = Query(None, description="Año de gestión (ej: '2024')"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -187,26 +227,34 @@ def obtener_contactos_apoderados(
     ```
     """
 
-    return ReporteService.obtener_contactos_apoderados(
-        db=db,
+    parametros = dict(
         id_curso=curso_id,
         nivel=nivel,
         gestion=gestion
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_contactos_apoderados", parametros)
+    return servir_reporte(
+        request, response, "obtener_contactos_apoderados", parametros, TABLAS_ESTUDIANTES_CURSOS,
+        lambda: ReporteService.obtener_contactos_apoderados(db=db, **parametros)
+    )
 
 
 @router.get("/students/age-distribution", response_model=DistribucionEdadResponseDTO)
 def obtener_distribucion_edad(
+    request: Request,
+    response: Response,
     curso_id: Optional[int] = Query(None, description="ID del curso para filtrar"),
     nivel: Optional[Literal["inicial", "primaria", "secundaria"]] = Query(None, description="Nivel educativo"),
     gestion: Optional[str] = Query(None, description="Año de gestión (ej: '2024')"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
     Obtiene distribución de estudiantes por rangos de edad.
     
-    Los rangos de edad son:
+    Los rangos de edad son (por defecto, configurables con REPORTES_EDAD_LIMITES):
     - 0-4 años
     - 5-7 años
     - 8-10 años
@@ -227,24 +275,26 @@ def obtener_distribucion_edad(
     GET /api/reports/students/age-distribution
     ```
     """
-    print(ReporteService.obtener_distribucion_edad(
-        db=db,
-        id_curso=curso_id,
-        nivel=nivel,
-        gestion=gestion
-    ))
-    return ReporteService.obtener_distribucion_edad(
-        db=db,
+    parametros = dict(
         id_curso=curso_id,
         nivel=nivel,
         gestion=gestion
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_distribucion_edad", parametros)
+    return servir_reporte(
+        request, response, "obtener_distribucion_edad", parametros, TABLAS_ESTUDIANTES_CURSOS,
+        lambda: ReporteService.obtener_distribucion_edad(db=db, **parametros)
+    )
 
 
 @router.get("/students/course-history", response_model=HistorialCursosResponseDTO)
 def obtener_historial_cursos(
+    request: Request,
+    response: Response,
     estudiante_id: Optional[int] = Query(None, description="ID del estudiante (opcional, si no se especifica retorna todos)"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -264,14 +314,15 @@ def obtener_historial_cursos(
     GET /api/reports/students/course-history
     ```
     """
-    print(ReporteService.obtener_historial_cursos(
-        db=db,
-        id_estudiante=estudiante_id
-    ))
-    return ReporteService.obtener_historial_cursos(
-        db=db,
+    parametros = dict(
         id_estudiante=estudiante_id
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_historial_cursos", parametros)
+    return servir_reporte(
+        request, response, "obtener_historial_cursos", parametros, TABLAS_ESTUDIANTES_CURSOS,
+        lambda: ReporteService.obtener_historial_cursos(db=db, **parametros)
+    )
 
 
 # ================================
@@ -280,11 +331,14 @@ def obtener_historial_cursos(
 
 @router.get("/academic/professors", response_model=ProfesoresAsignadosResponseDTO)
 def obtener_profesores_asignados(
+    request: Request,
+    response: Response,
     curso_id: Optional[int] = Query(None, description="ID del curso"),
     materia_id: Optional[int] = Query(None, description="ID de la materia"),
     nivel: Optional[Literal["inicial", "primaria", "secundaria"]] = Query(None, description="Nivel educativo"),
     gestion: Optional[str] = Query(None, description="Año de gestión (ej: '2024')"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -325,19 +379,27 @@ def obtener_profesores_asignados(
     ```
     """
 
-    return ReporteService.obtener_profesores_asignados(
-        db=db,
+    parametros = dict(
         id_curso=curso_id,
         id_materia=materia_id,
         nivel=nivel,
         gestion=gestion
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_profesores_asignados", parametros)
+    return servir_reporte(
+        request, response, "obtener_profesores_asignados", parametros, TABLAS_ACADEMICO,
+        lambda: ReporteService.obtener_profesores_asignados(db=db, **parametros)
+    )
 
 
 @router.get("/academic/subjects", response_model=MateriasPorNivelResponseDTO)
 def obtener_materias_por_nivel(
+    request: Request,
+    response: Response,
     nivel: Optional[Literal["inicial", "primaria", "secundaria"]] = Query(None, description="Nivel educativo"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -375,17 +437,25 @@ def obtener_materias_por_nivel(
     ```
     """
 
-    return ReporteService.obtener_materias_por_nivel(
-        db=db,
+    parametros = dict(
         nivel=nivel
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_materias_por_nivel", parametros)
+    return servir_reporte(
+        request, response, "obtener_materias_por_nivel", parametros, TABLAS_MATERIAS,
+        lambda: ReporteService.obtener_materias_por_nivel(db=db, **parametros)
+    )
 
 
 @router.get("/academic/workload", response_model=CargaAcademicaResponseDTO)
 def obtener_carga_academica(
+    request: Request,
+    response: Response,
     profesor_id: Optional[int] = Query(None, description="ID del profesor (opcional)"),
     gestion: Optional[str] = Query(None, description="Año de gestión (ej: '2024')"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -440,18 +510,26 @@ def obtener_carga_academica(
     }
     ```
     """
-    return ReporteService.obtener_carga_academica(
-        db=db,
+    parametros = dict(
         id_profesor=profesor_id,
         gestion=gestion
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_carga_academica", parametros)
+    return servir_reporte(
+        request, response, "obtener_carga_academica", parametros, TABLAS_ACADEMICO,
+        lambda: ReporteService.obtener_carga_academica(db=db, **parametros)
+    )
 
 
 @router.get("/academic/courses", response_model=CursosPorGestionResponseDTO)
 def obtener_cursos_por_gestion(
+    request: Request,
+    response: Response,
     gestion: Optional[str] = Query(None, description="Año de gestión (ej: '2024')"),
     nivel: Optional[Literal["inicial", "primaria", "secundaria"]] = Query(None, description="Nivel educativo"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -493,11 +571,16 @@ def obtener_cursos_por_gestion(
     }
     ```
     """
-    return ReporteService.obtener_cursos_por_gestion(
-        db=db,
+    parametros = dict(
         gestion=gestion,
         nivel=nivel
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_cursos_por_gestion", parametros)
+    return servir_reporte(
+        request, response, "obtener_cursos_por_gestion", parametros, TABLAS_CURSOS,
+        lambda: ReporteService.obtener_cursos_por_gestion(db=db, **parametros)
+    )
 
 
 # ================================
@@ -506,10 +589,13 @@ def obtener_cursos_por_gestion(
 
 @router.get("/esquelas/by-professor", response_model=EsquelasPorProfesorResponseDTO)
 def obtener_esquelas_por_profesor(
+    request: Request,
+    response: Response,
     profesor_id: Optional[int] = Query(None, description="ID del profesor (opcional)"),
     fecha_desde: Optional[date] = Query(None, alias="from", description="Fecha desde (YYYY-MM-DD)"),
     fecha_hasta: Optional[date] = Query(None, alias="to", description="Fecha hasta (YYYY-MM-DD)"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -562,20 +648,28 @@ def obtener_esquelas_por_profesor(
     }
     ```
     """
-    return ReporteService.obtener_esquelas_por_profesor(
-        db=db,
+    parametros = dict(
         id_profesor=profesor_id,
         fecha_desde=fecha_desde,
         fecha_hasta=fecha_hasta
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_esquelas_por_profesor", parametros)
+    return servir_reporte(
+        request, response, "obtener_esquelas_por_profesor", parametros, TABLAS_ESQUELAS_DETALLE,
+        lambda: ReporteService.obtener_esquelas_por_profesor(db=db, **parametros)
+    )
 
 
 @router.get("/esquelas/by-date", response_model=EsquelasPorFechaResponseDTO)
 def obtener_esquelas_por_fecha(
+    request: Request,
+    response: Response,
     fecha_desde: Optional[date] = Query(None, alias="from", description="Fecha desde (YYYY-MM-DD)"),
     fecha_hasta: Optional[date] = Query(None, alias="to", description="Fecha hasta (YYYY-MM-DD)"),
     tipo: Optional[Literal["reconocimiento", "orientacion"]] = Query(None, description="Tipo de esquela (opcional)"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -616,21 +710,29 @@ def obtener_esquelas_por_fecha(
     }
     ```
     """
-    return ReporteService.obtener_esquelas_por_fecha(
-        db=db,
+    parametros = dict(
         fecha_desde=fecha_desde,
         fecha_hasta=fecha_hasta,
         tipo=tipo
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_esquelas_por_fecha", parametros)
+    return servir_reporte(
+        request, response, "obtener_esquelas_por_fecha", parametros, TABLAS_ESQUELAS_DETALLE,
+        lambda: ReporteService.obtener_esquelas_por_fecha(db=db, **parametros)
+    )
 
 
 @router.get("/esquelas/frequent-codes", response_model=CodigosFrecuentesResponseDTO)
 def obtener_codigos_frecuentes(
+    request: Request,
+    response: Response,
     tipo: Optional[Literal["reconocimiento", "orientacion"]] = Query(None, description="Tipo de código (opcional)"),
     limit: int = Query(10, ge=1, le=50, description="Cantidad máxima de códigos a retornar"),
     fecha_desde: Optional[date] = Query(None, alias="from", description="Fecha desde (YYYY-MM-DD)"),
     fecha_hasta: Optional[date] = Query(None, alias="to", description="Fecha hasta (YYYY-MM-DD)"),
-    db: Session = Depends(get_db),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Exportar en streaming: 'csv' o 'ndjson' (requiere permiso exportar_reportes)"),
+    db: Session = Depends(get_db_lectura),
     current_user: Usuario = Depends(get_current_user_dependency)
 ):
     """
@@ -676,10 +778,15 @@ def obtener_codigos_frecuentes(
     }
     ```
     """
-    return ReporteService.obtener_codigos_frecuentes(
-        db=db,
+    parametros = dict(
         tipo=tipo,
         limit=limit,
         fecha_desde=fecha_desde,
         fecha_hasta=fecha_hasta
     )
+    if format:
+        return exportar_reporte(current_user, format, "obtener_codigos_frecuentes", parametros)
+    return servir_reporte(
+        request, response, "obtener_codigos_frecuentes", parametros, TABLAS_CODIGOS,
+        lambda: ReporteService.obtener_codigos_frecuentes(db=db, **parametros)
+    )
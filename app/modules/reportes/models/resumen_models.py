@@ -0,0 +1,52 @@
+# app/modules/reportes/models/resumen_models.py
+"""
+Resúmenes diarios materializados de esquelas (tablas de rollup)
+
+Se crean y llenan con la migración 0002 (`alembic upgrade head`), se
+mantienen incrementalmente desde EsquelaRepository.create/delete y
+CodigoEsquelaService (cambio de tipo, eliminación) y se regeneran con
+`python manage.py reconstruir-resumenes`.
+
+- resumen_esquelas_diario: por (fecha, estudiante, registrador, tipo).
+  `esquelas` = esquelas distintas con al menos un código del tipo,
+  `codigos` = códigos aplicados de ese tipo. La fila con tipo TIPO_TODOS
+  cuenta cada esquela una sola vez aunque combine ambos tipos, para que
+  COUNT(DISTINCT) se reduzca a una suma.
+- resumen_codigos_diario: aplicaciones por (fecha, código).
+
+El curso no forma parte de la clave: las esquelas no lo guardan y la
+inscripción (estudiantes_cursos) cambia por su cuenta; se resuelve al leer.
+"""
+from sqlalchemy import Column, Integer, String, Date, Index
+from app.core.database import Base
+
+# Tipo comodín: agrega todas las esquelas del día sin importar el tipo
+TIPO_TODOS = "*"
+
+
+class ResumenEsquelasDiario(Base):
+    __tablename__ = "resumen_esquelas_diario"
+
+    fecha = Column(Date, primary_key=True)
+    id_estudiante = Column(Integer, primary_key=True)
+    id_registrador = Column(Integer, primary_key=True)
+    tipo = Column(String(50), primary_key=True)
+    esquelas = Column(Integer, nullable=False, default=0)
+    codigos = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_resumen_esquelas_tipo_fecha", "tipo", "fecha"),
+        Index("ix_resumen_esquelas_estudiante", "id_estudiante"),
+    )
+
+
+class ResumenCodigosDiario(Base):
+    __tablename__ = "resumen_codigos_diario"
+
+    fecha = Column(Date, primary_key=True)
+    id_codigo = Column(Integer, primary_key=True)
+    aplicaciones = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_resumen_codigos_codigo", "id_codigo"),
+    )
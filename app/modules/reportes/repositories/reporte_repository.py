@@ -1,14 +1,83 @@
 # app/modules/reportes/repositories/reporte_repository.py
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case, or_, and_
+from sqlalchemy import func, case, or_, and_, literal_column
 from app.modules.esquelas.models.esquela_models import Esquela, CodigoEsquela, EsquelaCodigo
 from app.modules.administracion.models.persona_models import (
     Estudiante, estudiantes_cursos, profesores_cursos_materias
 )
 from app.modules.estudiantes.models import Curso, Materia
 from app.shared.models.persona import Persona
-from datetime import date, datetime
-from typing import Optional, Literal, List
+from app.modules.reportes.models.resumen_models import (
+    ResumenEsquelasDiario, ResumenCodigosDiario, TIPO_TODOS
+)
+from app.core.database import Settings
+from bisect import bisect_right
+from datetime import date, datetime, time
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Optional, Literal, List, Sequence
+
+
+def _nombre_completo(nombres: str, apellido_paterno: str, apellido_materno: Optional[str]) -> str:
+    """Nombre para reportes: 'Nombres Paterno Materno' sin espacios sobrantes"""
+    return f"{nombres} {apellido_paterno} {apellido_materno or ''}".strip()
+
+
+def _personas(nombre: str):
+    """
+    Alias de la tabla personas para unirla dos veces (emisor y registrador).
+    Se usa la tabla y no aliased(Persona): personas se declara en más de un
+    modelo (extend_existing) y las columnas del mapper de Persona pueden no ser
+    las de la tabla, con lo que el alias ORM no se aplica a las condiciones.
+    """
+    return Persona.__table__.alias(nombre)
+
+
+def _calcular_edad(fecha_nacimiento: Optional[date], hoy: date) -> Optional[int]:
+    """Edad cumplida a la fecha `hoy` (None si no hay fecha de nacimiento)"""
+    if not fecha_nacimiento:
+        return None
+    return hoy.year - fecha_nacimiento.year - (
+        (hoy.month, hoy.day) < (fecha_nacimiento.month, fecha_nacimiento.day)
+    )
+
+
+def _etiquetas_rangos_edad(limites: Sequence[int]) -> List[str]:
+    """Etiquetas a partir de las edades de inicio: [5, 8] -> 0-4, 5-7, 8+ años"""
+    inicios = [0] + list(limites)
+    etiquetas = [f"{desde}-{hasta - 1} años" for desde, hasta in zip(inicios, inicios[1:])]
+    etiquetas.append(f"{inicios[-1]}+ años")
+    return etiquetas
+
+
+def _usar_resumenes(*fechas) -> bool:
+    """
+    Los rankings se leen de los resúmenes diarios si están habilitados y el
+    rango cae en límites de día (fechas, o datetimes a medianoche)
+    """
+    if not Settings.REPORTES_USAR_RESUMENES:
+        return False
+    return all(
+        f is None or not isinstance(f, datetime) or f.time() == time.min
+        for f in fechas
+    )
+
+
+def _tipos_resumen(tipo: Optional[str]) -> List[str]:
+    """Filas del resumen que participan según el filtro de tipo"""
+    if tipo:
+        return [tipo]
+    return [TIPO_TODOS, 'reconocimiento', 'orientacion']
+
+
+def _medidas_resumen(tipo: Optional[str]):
+    """total (esquelas distintas), reconocimiento y orientación (códigos) sobre el resumen"""
+    clave = tipo or TIPO_TODOS
+    return (
+        func.sum(case((ResumenEsquelasDiario.tipo == clave, ResumenEsquelasDiario.esquelas), else_=0)),
+        func.sum(case((ResumenEsquelasDiario.tipo == 'reconocimiento', ResumenEsquelasDiario.codigos), else_=0)),
+        func.sum(case((ResumenEsquelasDiario.tipo == 'orientacion', ResumenEsquelasDiario.codigos), else_=0)),
+    )
 
 
 class ReporteRepository:
@@ -25,6 +94,34 @@ class ReporteRepository:
         """
         Obtiene ranking de estudiantes por cantidad de esquelas
         """
+        if _usar_resumenes(fecha_desde, fecha_hasta):
+            results = ReporteRepository._ranking_estudiantes_resumen(
+                db, tipo, limit, fecha_desde, fecha_hasta, id_registrador
+            )
+        else:
+            results = ReporteRepository._ranking_estudiantes_detalle(
+                db, tipo, limit, fecha_desde, fecha_hasta, id_registrador
+            )
+
+        # Formatear resultados
+        ranking = []
+        for idx, (id_est, nombres, ap_pat, ap_mat, total, reconocimiento, orientacion) in enumerate(results, 1):
+            apellidos = f"{ap_pat} {ap_mat or ''}".strip()
+            nombre_completo = f"{nombres} {apellidos}"
+            ranking.append({
+                "id": id_est,
+                "nombre": nombre_completo,
+                "total": int(total or 0),
+                "reconocimiento": int(reconocimiento or 0),
+                "orientacion": int(orientacion or 0),
+                "posicion": idx
+            })
+
+        return ranking
+
+    @staticmethod
+    def _ranking_estudiantes_detalle(db, tipo, limit, fecha_desde, fecha_hasta, id_registrador):
+        """Ranking de estudiantes calculado sobre esquelas/esquelas_codigos"""
         # Join con esquelas_codigos explícitamente
         query = db.query(
             Estudiante.id_estudiante,
@@ -67,23 +164,40 @@ class ReporteRepository:
             Estudiante.apellido_materno
         ).order_by(func.count(func.distinct(Esquela.id_esquela)).desc()).limit(limit)
 
-        results = query.all()
+        return query.all()
 
-        # Formatear resultados
-        ranking = []
-        for idx, (id_est, nombres, ap_pat, ap_mat, total, reconocimiento, orientacion) in enumerate(results, 1):
-            apellidos = f"{ap_pat} {ap_mat or ''}".strip()
-            nombre_completo = f"{nombres} {apellidos}"
-            ranking.append({
-                "id": id_est,
-                "nombre": nombre_completo,
-                "total": int(total or 0),
-                "reconocimiento": int(reconocimiento or 0),
-                "orientacion": int(orientacion or 0),
-                "posicion": idx
-            })
+    @staticmethod
+    def _ranking_estudiantes_resumen(db, tipo, limit, fecha_desde, fecha_hasta, id_registrador):
+        """Ranking de estudiantes leído de resumen_esquelas_diario"""
+        total, reconocimiento, orientacion = _medidas_resumen(tipo)
 
-        return ranking
+        query = db.query(
+            Estudiante.id_estudiante,
+            Estudiante.nombres,
+            Estudiante.apellido_paterno,
+            Estudiante.apellido_materno,
+            total,
+            reconocimiento,
+            orientacion
+        ).join(
+            ResumenEsquelasDiario, ResumenEsquelasDiario.id_estudiante == Estudiante.id_estudiante
+        ).filter(
+            ResumenEsquelasDiario.tipo.in_(_tipos_resumen(tipo))
+        )
+
+        if fecha_desde:
+            query = query.filter(ResumenEsquelasDiario.fecha >= fecha_desde)
+        if fecha_hasta:
+            query = query.filter(ResumenEsquelasDiario.fecha <= fecha_hasta)
+        if id_registrador:
+            query = query.filter(ResumenEsquelasDiario.id_registrador == id_registrador)
+
+        return query.group_by(
+            Estudiante.id_estudiante,
+            Estudiante.nombres,
+            Estudiante.apellido_paterno,
+            Estudiante.apellido_materno
+        ).having(total > 0).order_by(total.desc()).limit(limit).all()
 
     @staticmethod
     def get_ranking_cursos(
@@ -97,6 +211,28 @@ class ReporteRepository:
         Obtiene ranking de cursos por cantidad de esquelas
         NOTA: Join a través de estudiantes_cursos porque no hay id_curso en esquelas
         """
+        if _usar_resumenes(fecha_desde, fecha_hasta):
+            results = ReporteRepository._ranking_cursos_resumen(db, tipo, limit, fecha_desde, fecha_hasta)
+        else:
+            results = ReporteRepository._ranking_cursos_detalle(db, tipo, limit, fecha_desde, fecha_hasta)
+
+        # Formatear resultados
+        ranking = []
+        for idx, (id_curso, nombre_curso, total, reconocimiento, orientacion) in enumerate(results, 1):
+            ranking.append({
+                "id": id_curso,
+                "nombre": nombre_curso,
+                "total": int(total or 0),
+                "reconocimiento": int(reconocimiento or 0),
+                "orientacion": int(orientacion or 0),
+                "posicion": idx
+            })
+
+        return ranking
+
+    @staticmethod
+    def _ranking_cursos_detalle(db, tipo, limit, fecha_desde, fecha_hasta):
+        """Ranking de cursos calculado sobre esquelas/esquelas_codigos"""
         query = db.query(
             Curso.id_curso,
             Curso.nombre_curso,
@@ -134,21 +270,40 @@ class ReporteRepository:
             Curso.nombre_curso
         ).order_by(func.count(func.distinct(Esquela.id_esquela)).desc()).limit(limit)
 
-        results = query.all()
+        return query.all()
 
-        # Formatear resultados
-        ranking = []
-        for idx, (id_curso, nombre_curso, total, reconocimiento, orientacion) in enumerate(results, 1):
-            ranking.append({
-                "id": id_curso,
-                "nombre": nombre_curso,
-                "total": int(total or 0),
-                "reconocimiento": int(reconocimiento or 0),
-                "orientacion": int(orientacion or 0),
-                "posicion": idx
-            })
+    @staticmethod
+    def _ranking_cursos_resumen(db, tipo, limit, fecha_desde, fecha_hasta):
+        """
+        Ranking de cursos leído de resumen_esquelas_diario
+        Las esquelas de un estudiante son disjuntas, así que sumar por
+        estudiante inscrito equivale al COUNT(DISTINCT) por curso.
+        """
+        total, reconocimiento, orientacion = _medidas_resumen(tipo)
 
-        return ranking
+        query = db.query(
+            Curso.id_curso,
+            Curso.nombre_curso,
+            total,
+            reconocimiento,
+            orientacion
+        ).select_from(Curso).join(
+            estudiantes_cursos, Curso.id_curso == estudiantes_cursos.c.id_curso
+        ).join(
+            ResumenEsquelasDiario, ResumenEsquelasDiario.id_estudiante == estudiantes_cursos.c.id_estudiante
+        ).filter(
+            ResumenEsquelasDiario.tipo.in_(_tipos_resumen(tipo))
+        )
+
+        if fecha_desde:
+            query = query.filter(ResumenEsquelasDiario.fecha >= fecha_desde)
+        if fecha_hasta:
+            query = query.filter(ResumenEsquelasDiario.fecha <= fecha_hasta)
+
+        return query.group_by(
+            Curso.id_curso,
+            Curso.nombre_curso
+        ).having(total > 0).order_by(total.desc()).limit(limit).all()
 
 
     # ================================
@@ -165,58 +320,73 @@ class ReporteRepository:
         """
         Obtiene listado de estudiantes filtrado por curso, nivel y/o gestión
         """
-        query = db.query(Estudiante).join(
+        return list(ReporteRepository.iter_estudiantes_por_filtros(db, id_curso, nivel, gestion))
+
+    @staticmethod
+    def iter_estudiantes_por_filtros(
+        db: Session,
+        id_curso: Optional[int] = None,
+        nivel: Optional[str] = None,
+        gestion: Optional[str] = None,
+        lote: int = 500
+    ):
+        """
+        Genera los estudiantes filtrados con sus cursos (filtrados por nivel/gestión)
+
+        Una sola consulta estudiante + cursos ordenada por estudiante, leída con
+        cursor del lado del servidor y agrupada al vuelo.
+        """
+        filtrados = db.query(Estudiante.id_estudiante).join(
             estudiantes_cursos, Estudiante.id_estudiante == estudiantes_cursos.c.id_estudiante
         ).join(
             Curso, Curso.id_curso == estudiantes_cursos.c.id_curso
         )
 
         if id_curso:
-            query = query.filter(Curso.id_curso == id_curso)
+            filtrados = filtrados.filter(Curso.id_curso == id_curso)
         if nivel:
-            query = query.filter(Curso.nivel == nivel)
+            filtrados = filtrados.filter(Curso.nivel == nivel)
         if gestion:
-            query = query.filter(Curso.gestion == gestion)
+            filtrados = filtrados.filter(Curso.gestion == gestion)
 
-        # Obtener estudiantes únicos
-        estudiantes = query.distinct().all()
+        query = db.query(
+            Estudiante.id_estudiante,
+            Estudiante.ci,
+            Estudiante.nombres,
+            Estudiante.apellido_paterno,
+            Estudiante.apellido_materno,
+            Estudiante.fecha_nacimiento,
+            Curso.nombre_curso,
+            Curso.gestion
+        ).join(
+            estudiantes_cursos, Estudiante.id_estudiante == estudiantes_cursos.c.id_estudiante
+        ).join(
+            Curso, Curso.id_curso == estudiantes_cursos.c.id_curso
+        ).filter(
+            Estudiante.id_estudiante.in_(filtrados)
+        )
 
-        # Formatear resultados con sus cursos
-        resultado = []
-        for est in estudiantes:
-            # Calcular edad si hay fecha de nacimiento
-            edad = None
-            if est.fecha_nacimiento:
-                hoy = date.today()
-                edad = hoy.year - est.fecha_nacimiento.year
-                if hoy.month < est.fecha_nacimiento.month or (
-                    hoy.month == est.fecha_nacimiento.month and hoy.day < est.fecha_nacimiento.day
-                ):
-                    edad -= 1
-
-            # Obtener cursos del estudiante (filtrados si aplica)
-            cursos_query = db.query(Curso).join(
-                estudiantes_cursos, Curso.id_curso == estudiantes_cursos.c.id_curso
-            ).filter(estudiantes_cursos.c.id_estudiante == est.id_estudiante)
-            
-            if nivel:
-                cursos_query = cursos_query.filter(Curso.nivel == nivel)
-            if gestion:
-                cursos_query = cursos_query.filter(Curso.gestion == gestion)
-            
-            cursos = cursos_query.all()
-            cursos_nombres = [f"{c.nombre_curso} ({c.gestion})" for c in cursos]
+        # Cursos del estudiante (filtrados si aplica)
+        if nivel:
+            query = query.filter(Curso.nivel == nivel)
+        if gestion:
+            query = query.filter(Curso.gestion == gestion)
 
-            resultado.append({
-                "id_estudiante": est.id_estudiante,
-                "ci": est.ci,
-                "nombre_completo": est.nombre_completo,
-                "fecha_nacimiento": est.fecha_nacimiento,
-                "edad": edad,
-                "cursos": cursos_nombres
-            })
+        # Edades con la misma fecha de referencia para todo el listado
+        hoy = date.today()
 
-        return resultado
+        filas = query.order_by(Estudiante.id_estudiante).yield_per(lote)
+        for (id_est, ci, nombres, ap_pat, ap_mat, fecha_nac), cursos in groupby(
+            filas, key=itemgetter(0, 1, 2, 3, 4, 5)
+        ):
+            yield {
+                "id_estudiante": id_est,
+                "ci": ci,
+                "nombre_completo": _nombre_completo(nombres, ap_pat, ap_mat),
+                "fecha_nacimiento": fecha_nac,
+                "edad": _calcular_edad(fecha_nac, hoy),
+                "cursos": [f"{nom_curso} ({gest})" for *_, nom_curso, gest in cursos]
+            }
 
     @staticmethod
     def get_estudiantes_por_apoderados(
@@ -227,12 +397,20 @@ class ReporteRepository:
         Obtiene estudiantes con o sin apoderados registrados
         con_apoderados: True (con apoderados), False (sin apoderados), None (todos)
         """
-        query = db.query(Estudiante)
+        return list(ReporteRepository.iter_estudiantes_por_apoderados(db, con_apoderados))
 
-        estudiantes = query.all()
-        resultado = []
+    @staticmethod
+    def iter_estudiantes_por_apoderados(
+        db: Session,
+        con_apoderados: Optional[bool] = None,
+        lote: int = 500
+    ):
+        """
+        Genera los estudiantes con su estado de apoderados (cursor del lado del servidor)
+        """
+        query = db.query(Estudiante).order_by(Estudiante.id_estudiante)
 
-        for est in estudiantes:
+        for est in query.yield_per(lote):
             # Verificar si tiene apoderados
             tiene_padre = bool(est.nombre_padre and est.nombre_padre.strip())
             tiene_madre = bool(est.nombre_madre and est.nombre_madre.strip())
@@ -261,15 +439,13 @@ class ReporteRepository:
                     "telefono": est.telefono_madre
                 })
 
-            resultado.append({
+            yield {
                 "id_estudiante": est.id_estudiante,
                 "ci": est.ci,
                 "nombre_completo": est.nombre_completo,
                 "apoderados": apoderados,
                 "tiene_apoderados": tiene_apoderados
-            })
-
-        return resultado
+            }
 
     @staticmethod
     def get_contactos_apoderados(
@@ -281,6 +457,19 @@ class ReporteRepository:
         """
         Obtiene datos de contacto de apoderados con filtros opcionales
         """
+        return list(ReporteRepository.iter_contactos_apoderados(db, id_curso, nivel, gestion))
+
+    @staticmethod
+    def iter_contactos_apoderados(
+        db: Session,
+        id_curso: Optional[int] = None,
+        nivel: Optional[str] = None,
+        gestion: Optional[str] = None,
+        lote: int = 500
+    ):
+        """
+        Genera los contactos de apoderados (cursor del lado del servidor)
+        """
         query = db.query(Estudiante)
 
         # Aplicar filtros si se especifican
@@ -300,106 +489,79 @@ class ReporteRepository:
             
             query = query.distinct()
 
-        estudiantes = query.all()
-        contactos = []
-
-        for est in estudiantes:
+        for est in query.order_by(Estudiante.id_estudiante).yield_per(lote):
             # Agregar contacto del padre si existe
             if est.nombre_padre and est.telefono_padre:
                 nombre_padre = f"{est.nombre_padre or ''} {est.apellido_paterno_padre or ''} {est.apellido_materno_padre or ''}".strip()
-                contactos.append({
+                yield {
                     "id_estudiante": est.id_estudiante,
                     "estudiante_nombre": est.nombre_completo,
                     "estudiante_ci": est.ci,
                     "tipo_apoderado": "padre",
                     "apoderado_nombre": nombre_padre,
                     "telefono": est.telefono_padre
-                })
+                }
 
             # Agregar contacto de la madre si existe
             if est.nombre_madre and est.telefono_madre:
                 nombre_madre = f"{est.nombre_madre or ''} {est.apellido_paterno_madre or ''} {est.apellido_materno_madre or ''}".strip()
-                contactos.append({
+                yield {
                     "id_estudiante": est.id_estudiante,
                     "estudiante_nombre": est.nombre_completo,
                     "estudiante_ci": est.ci,
                     "tipo_apoderado": "madre",
                     "apoderado_nombre": nombre_madre,
                     "telefono": est.telefono_madre
-                })
-
-        return contactos
+                }
 
     @staticmethod
     def get_distribucion_por_edad(
         db: Session,
         id_curso: Optional[int] = None,
         nivel: Optional[str] = None,
-        gestion: Optional[str] = None
+        gestion: Optional[str] = None,
+        limites: Optional[Sequence[int]] = None
     ):
         """
         Obtiene distribución de estudiantes por rangos de edad
+
+        Los rangos se definen por sus edades de inicio (`REPORTES_EDAD_LIMITES`).
+        En MySQL el conteo se hace en SQL (TIMESTAMPDIFF + GROUP BY); en otros
+        motores (SQLite en pruebas) se cuentan en Python sobre la sola columna
+        de fecha de nacimiento, sin cargar entidades.
         """
-        query = db.query(Estudiante)
+        limites = sorted(limites or Settings.REPORTES_EDAD_LIMITES)
 
-        # Aplicar filtros si se especifican
+        query = db.query(Estudiante.fecha_nacimiento)
+
+        # Aplicar filtros si se especifican (subconsulta: sin duplicados por curso)
         if id_curso or nivel or gestion:
-            query = query.join(
-                estudiantes_cursos, Estudiante.id_estudiante == estudiantes_cursos.c.id_estudiante
-            ).join(
+            filtrados = db.query(estudiantes_cursos.c.id_estudiante).join(
                 Curso, Curso.id_curso == estudiantes_cursos.c.id_curso
             )
-            
             if id_curso:
-                query = query.filter(Curso.id_curso == id_curso)
+                filtrados = filtrados.filter(Curso.id_curso == id_curso)
             if nivel:
-                query = query.filter(Curso.nivel == nivel)
+                filtrados = filtrados.filter(Curso.nivel == nivel)
             if gestion:
-                query = query.filter(Curso.gestion == gestion)
-            
-            query = query.distinct()
+                filtrados = filtrados.filter(Curso.gestion == gestion)
 
-        estudiantes = query.all()
-
-        # Calcular edades y agrupar por rangos
-        rangos = {
-            "0-4 años": 0,
-            "5-7 años": 0,
-            "8-10 años": 0,
-            "11-13 años": 0,
-            "14-16 años": 0,
-            "17+ años": 0,
-            "Sin fecha": 0
-        }
+            query = query.filter(Estudiante.id_estudiante.in_(filtrados))
 
-        for est in estudiantes:
-            if est.fecha_nacimiento:
-                hoy = date.today()
-                edad = hoy.year - est.fecha_nacimiento.year
-                if hoy.month < est.fecha_nacimiento.month or (
-                    hoy.month == est.fecha_nacimiento.month and hoy.day < est.fecha_nacimiento.day
-                ):
-                    edad -= 1
-
-                if edad < 5:
-                    rangos["0-4 años"] += 1
-                elif edad <= 7:
-                    rangos["5-7 años"] += 1
-                elif edad <= 10:
-                    rangos["8-10 años"] += 1
-                elif edad <= 13:
-                    rangos["11-13 años"] += 1
-                elif edad <= 16:
-                    rangos["14-16 años"] += 1
-                else:
-                    rangos["17+ años"] += 1
-            else:
-                rangos["Sin fecha"] += 1
+        if db.get_bind().dialect.name == "mysql":
+            conteos = ReporteRepository._conteo_edades_sql(query, limites)
+        else:
+            conteos = ReporteRepository._conteo_edades_python(query, limites)
+
+        # Índice de rango -> cantidad; -1 = sin fecha de nacimiento
+        etiquetas = _etiquetas_rangos_edad(limites)
+        rangos = [(etiquetas[i], conteos.get(i, 0)) for i in range(len(etiquetas))]
+        rangos.append(("Sin fecha", conteos.get(-1, 0)))
 
-        total = len(estudiantes)
+        total = sum(conteos.values())
         distribucion = []
-        
-        for rango, cantidad in rangos.items():
+
+        for rango, cantidad in rangos:
             if cantidad > 0:  # Solo incluir rangos con estudiantes
                 porcentaje = (cantidad / total * 100) if total > 0 else 0
                 distribucion.append({
@@ -413,6 +575,30 @@ class ReporteRepository:
             "total_estudiantes": total
         }
 
+    @staticmethod
+    def _conteo_edades_sql(query, limites: Sequence[int]) -> Dict[int, int]:
+        """GROUP BY sobre el índice de rango calculado en MySQL"""
+        edad = func.timestampdiff(literal_column("YEAR"), Estudiante.fecha_nacimiento, func.curdate())
+        indice = case(
+            (Estudiante.fecha_nacimiento.is_(None), -1),
+            *[(edad < limite, i) for i, limite in enumerate(limites)],
+            else_=len(limites)
+        ).label("indice")
+
+        filas = query.with_entities(indice, func.count()).group_by(indice).all()
+        return {int(i): int(cantidad) for i, cantidad in filas}
+
+    @staticmethod
+    def _conteo_edades_python(query, limites: Sequence[int], lote: int = 1000) -> Dict[int, int]:
+        """Respaldo portable: solo lee la columna fecha_nacimiento (tuplas)"""
+        hoy = date.today()
+        conteos: Dict[int, int] = {}
+        for (fecha_nac,) in query.yield_per(lote):
+            edad = _calcular_edad(fecha_nac, hoy)
+            i = -1 if edad is None else bisect_right(limites, edad)
+            conteos[i] = conteos.get(i, 0) + 1
+        return conteos
+
     @staticmethod
     def get_historial_cursos_estudiante(
         db: Session,
@@ -422,40 +608,61 @@ class ReporteRepository:
         Obtiene historial de cursos por estudiante
         Si no se especifica id_estudiante, retorna historial de todos
         """
-        query = db.query(Estudiante)
-        
+        return list(ReporteRepository.iter_historial_cursos_estudiante(db, id_estudiante))
+
+    @staticmethod
+    def iter_historial_cursos_estudiante(
+        db: Session,
+        id_estudiante: Optional[int] = None,
+        lote: int = 500
+    ):
+        """
+        Genera el historial de cursos estudiante por estudiante
+
+        Una sola consulta (estudiante LEFT JOIN inscripciones) ordenada por
+        estudiante y gestión, leída con cursor del lado del servidor.
+        """
+        query = db.query(
+            Estudiante.id_estudiante,
+            Estudiante.ci,
+            Estudiante.nombres,
+            Estudiante.apellido_paterno,
+            Estudiante.apellido_materno,
+            Curso.id_curso,
+            Curso.nombre_curso,
+            Curso.nivel,
+            Curso.gestion
+        ).outerjoin(
+            estudiantes_cursos, Estudiante.id_estudiante == estudiantes_cursos.c.id_estudiante
+        ).outerjoin(
+            Curso, Curso.id_curso == estudiantes_cursos.c.id_curso
+        )
+
         if id_estudiante:
             query = query.filter(Estudiante.id_estudiante == id_estudiante)
 
-        estudiantes = query.all()
-        historiales = []
-
-        for est in estudiantes:
-            # Obtener cursos del estudiante ordenados por gestión
-            cursos = db.query(Curso).join(
-                estudiantes_cursos, Curso.id_curso == estudiantes_cursos.c.id_curso
-            ).filter(
-                estudiantes_cursos.c.id_estudiante == est.id_estudiante
-            ).order_by(Curso.gestion.desc(), Curso.nivel).all()
-
-            cursos_lista = []
-            for curso in cursos:
-                cursos_lista.append({
-                    "id_curso": curso.id_curso,
-                    "nombre_curso": curso.nombre_curso,
-                    "nivel": curso.nivel,
-                    "gestion": curso.gestion
-                })
+        filas = query.order_by(
+            Estudiante.id_estudiante, Curso.gestion.desc(), Curso.nivel
+        ).yield_per(lote)
 
-            historiales.append({
-                "id_estudiante": est.id_estudiante,
-                "nombre_completo": est.nombre_completo,
-                "ci": est.ci,
+        for (id_est, ci, nombres, ap_pat, ap_mat), cursos in groupby(filas, key=itemgetter(0, 1, 2, 3, 4)):
+            cursos_lista = [
+                {
+                    "id_curso": id_curso,
+                    "nombre_curso": nombre_curso,
+                    "nivel": nivel,
+                    "gestion": gestion
+                }
+                for *_, id_curso, nombre_curso, nivel, gestion in cursos
+                if id_curso is not None
+            ]
+            yield {
+                "id_estudiante": id_est,
+                "nombre_completo": _nombre_completo(nombres, ap_pat, ap_mat),
+                "ci": ci,
                 "cursos": cursos_lista,
                 "total_cursos": len(cursos_lista)
-            })
-
-        return historiales
+            }
 
 
     # ================================
@@ -473,6 +680,20 @@ class ReporteRepository:
         """
         Obtiene profesores asignados por curso y materia
         """
+        return list(ReporteRepository.iter_profesores_asignados(db, id_curso, id_materia, nivel, gestion))
+
+    @staticmethod
+    def iter_profesores_asignados(
+        db: Session,
+        id_curso: Optional[int] = None,
+        id_materia: Optional[int] = None,
+        nivel: Optional[str] = None,
+        gestion: Optional[str] = None,
+        lote: int = 500
+    ):
+        """
+        Genera las asignaciones profesor-curso-materia (cursor del lado del servidor)
+        """
         query = db.query(
             Persona.id_persona,
             Persona.ci,
@@ -507,22 +728,16 @@ class ReporteRepository:
         if gestion:
             query = query.filter(Curso.gestion == gestion)
 
-        resultados = query.all()
-        
-        profesores = []
-        for id_p, ci, nombres, ap_pat, ap_mat, tel, correo, nom_curso, gest, nom_mat in resultados:
-            nombre_completo = f"{nombres} {ap_pat} {ap_mat or ''}".strip()
-            profesores.append({
+        for id_p, ci, nombres, ap_pat, ap_mat, tel, correo, nom_curso, gest, nom_mat in query.yield_per(lote):
+            yield {
                 "id_profesor": id_p,
                 "ci": ci,
-                "nombre_completo": nombre_completo,
+                "nombre_completo": _nombre_completo(nombres, ap_pat, ap_mat),
                 "telefono": tel,
                 "correo": correo,
                 "curso": f"{nom_curso} ({gest})",
                 "materia": nom_mat
-            })
-
-        return profesores
+            }
 
     @staticmethod
     def get_materias_por_nivel(
@@ -558,41 +773,66 @@ class ReporteRepository:
         """
         Obtiene carga académica de profesores
         """
-        query = db.query(Persona).filter(Persona.tipo_persona == 'profesor')
+        return list(ReporteRepository.iter_carga_academica_profesores(db, id_profesor, gestion))
 
-        if id_profesor:
-            query = query.filter(Persona.id_persona == id_profesor)
+    @staticmethod
+    def iter_carga_academica_profesores(
+        db: Session,
+        id_profesor: Optional[int] = None,
+        gestion: Optional[str] = None,
+        lote: int = 500
+    ):
+        """
+        Genera la carga académica profesor por profesor
 
-        profesores = query.all()
-        resultado = []
+        Una sola consulta (profesor LEFT JOIN asignaciones) ordenada por profesor
+        y leída con cursor del lado del servidor (`yield_per`); solo se retienen
+        en memoria las asignaciones del profesor en curso.
+        """
+        condicion_curso = Curso.id_curso == profesores_cursos_materias.c.id_curso
+        if gestion:
+            # En el ON para conservar profesores sin asignaciones en esa gestión
+            condicion_curso = and_(condicion_curso, Curso.gestion == gestion)
 
-        for prof in profesores:
-            # Obtener asignaciones del profesor
-            asig_query = db.query(
-                Curso.nombre_curso,
-                Curso.nivel,
-                Curso.gestion,
-                Materia.nombre_materia
-            ).join(
-                profesores_cursos_materias,
-                Curso.id_curso == profesores_cursos_materias.c.id_curso
-            ).join(
-                Materia,
-                Materia.id_materia == profesores_cursos_materias.c.id_materia
-            ).filter(
-                profesores_cursos_materias.c.id_profesor == prof.id_persona
-            )
+        query = db.query(
+            Persona.id_persona,
+            Persona.ci,
+            Persona.nombres,
+            Persona.apellido_paterno,
+            Persona.apellido_materno,
+            Persona.telefono,
+            Persona.correo,
+            Curso.nombre_curso,
+            Curso.nivel,
+            Curso.gestion,
+            Materia.nombre_materia
+        ).outerjoin(
+            profesores_cursos_materias,
+            Persona.id_persona == profesores_cursos_materias.c.id_profesor
+        ).outerjoin(
+            Curso, condicion_curso
+        ).outerjoin(
+            Materia,
+            Materia.id_materia == profesores_cursos_materias.c.id_materia
+        ).filter(
+            Persona.tipo_persona == 'profesor'
+        )
 
-            if gestion:
-                asig_query = asig_query.filter(Curso.gestion == gestion)
+        if id_profesor:
+            query = query.filter(Persona.id_persona == id_profesor)
 
-            asignaciones = asig_query.all()
+        filas = query.order_by(Persona.id_persona).yield_per(lote)
 
+        for (id_p, ci, nombres, ap_pat, ap_mat, tel, correo), asignaciones in groupby(
+            filas, key=itemgetter(0, 1, 2, 3, 4, 5, 6)
+        ):
             asignaciones_lista = []
             cursos_set = set()
             materias_set = set()
 
-            for nom_curso, nivel, gest, nom_mat in asignaciones:
+            for *_, nom_curso, nivel, gest, nom_mat in asignaciones:
+                if nom_curso is None or nom_mat is None:
+                    continue  # Sin asignaciones (o fuera de la gestión pedida)
                 asignaciones_lista.append({
                     "curso": nom_curso,
                     "nivel": nivel,
@@ -602,21 +842,17 @@ class ReporteRepository:
                 cursos_set.add(f"{nom_curso}-{gest}")
                 materias_set.add(nom_mat)
 
-            nombre_completo = f"{prof.nombres} {prof.apellido_paterno} {prof.apellido_materno or ''}".strip()
-
-            resultado.append({
-                "id_profesor": prof.id_persona,
-                "ci": prof.ci,
-                "nombre_completo": nombre_completo,
-                "telefono": prof.telefono,
-                "correo": prof.correo,
+            yield {
+                "id_profesor": id_p,
+                "ci": ci,
+                "nombre_completo": _nombre_completo(nombres, ap_pat, ap_mat),
+                "telefono": tel,
+                "correo": correo,
                 "asignaciones": asignaciones_lista,
                 "total_asignaciones": len(asignaciones_lista),
                 "cursos_distintos": len(cursos_set),
                 "materias_distintas": len(materias_set)
-            })
-
-        return resultado
+            }
 
     @staticmethod
     def get_cursos_por_gestion(
@@ -679,83 +915,111 @@ class ReporteRepository:
         """
         Obtiene esquelas agrupadas por profesor emisor
         """
-        query = db.query(Persona).filter((Persona.tipo_persona == 'profesor') | (Persona.tipo_persona == 'regente') | (Persona.tipo_persona == 'administrativo'))
-
-        if id_profesor:
-            query = query.filter(Persona.ci == id_profesor)
+        return list(ReporteRepository.iter_esquelas_por_profesor(db, id_profesor, fecha_desde, fecha_hasta))
 
-        profesores = query.all()
-        resultado = []
+    @staticmethod
+    def iter_esquelas_por_profesor(
+        db: Session,
+        id_profesor: Optional[int] = None,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        lote: int = 500
+    ):
+        """
+        Genera las esquelas agrupadas por profesor emisor
 
-        for prof in profesores:
-            # Obtener esquelas del profesor
-            esq_query = db.query(Esquela).filter(
-                Esquela.id_profesor == prof.id_persona
-            )
+        Una sola consulta (esquela + estudiante + emisor + registrador + códigos)
+        ordenada por emisor y esquela, leída con cursor del lado del servidor;
+        el anidamiento se arma en una pasada.
+        """
+        Profesor = _personas("profesor")
+        Registrador = _personas("registrador")
 
-            if fecha_desde:
-                esq_query = esq_query.filter(Esquela.fecha >= fecha_desde)
-            if fecha_hasta:
-                esq_query = esq_query.filter(Esquela.fecha <= fecha_hasta)
+        query = db.query(
+            Profesor.c.id_persona,
+            Profesor.c.ci,
+            Profesor.c.nombres,
+            Profesor.c.apellido_paterno,
+            Profesor.c.apellido_materno,
+            Esquela.id_esquela,
+            Esquela.fecha,
+            Esquela.observaciones,
+            Estudiante.ci,
+            Estudiante.nombres,
+            Estudiante.apellido_paterno,
+            Estudiante.apellido_materno,
+            Registrador.c.nombres,
+            Registrador.c.apellido_paterno,
+            Registrador.c.apellido_materno,
+            CodigoEsquela.codigo,
+            CodigoEsquela.descripcion,
+            CodigoEsquela.tipo
+        ).select_from(Esquela).join(
+            Profesor, Profesor.c.id_persona == Esquela.id_profesor
+        ).join(
+            Estudiante, Estudiante.id_estudiante == Esquela.id_estudiante
+        ).join(
+            Registrador, Registrador.c.id_persona == Esquela.id_registrador
+        ).outerjoin(
+            EsquelaCodigo, EsquelaCodigo.id_esquela == Esquela.id_esquela
+        ).outerjoin(
+            CodigoEsquela, CodigoEsquela.id_codigo == EsquelaCodigo.id_codigo
+        ).filter(
+            Profesor.c.tipo_persona.in_(['profesor', 'regente', 'administrativo'])
+        )
 
-            esquelas = esq_query.all()
+        if id_profesor:
+            query = query.filter(Profesor.c.ci == id_profesor)
+        if fecha_desde:
+            query = query.filter(Esquela.fecha >= fecha_desde)
+        if fecha_hasta:
+            query = query.filter(Esquela.fecha <= fecha_hasta)
 
-            if not esquelas:  # Solo incluir profesores con esquelas
-                continue
+        filas = query.order_by(Profesor.c.id_persona, Esquela.id_esquela).yield_per(lote)
 
+        for (id_prof, prof_ci, prof_nom, prof_ap_pat, prof_ap_mat), filas_prof in groupby(
+            filas, key=itemgetter(0, 1, 2, 3, 4)
+        ):
+            prof_nombre = _nombre_completo(prof_nom, prof_ap_pat, prof_ap_mat)
             esquelas_lista = []
             reconocimientos = 0
             orientaciones = 0
 
-            for esq in esquelas:
-                # Obtener estudiante
-                estudiante = esq.estudiante
-                est_nombre = f"{estudiante.nombres} {estudiante.apellido_paterno} {estudiante.apellido_materno or ''}".strip()
-
-                # Obtener registrador
-                registrador = esq.registrador
-                reg_nombre = f"{registrador.nombres} {registrador.apellido_paterno} {registrador.apellido_materno or ''}".strip()
+            for _, filas_esq in groupby(filas_prof, key=itemgetter(5)):
+                filas_esq = list(filas_esq)
+                primera = filas_esq[0]
 
-                # Obtener códigos
-                codigos_query = db.query(CodigoEsquela).join(
-                    EsquelaCodigo,
-                    CodigoEsquela.id_codigo == EsquelaCodigo.id_codigo
-                ).filter(EsquelaCodigo.id_esquela == esq.id_esquela)
-
-                codigos_objs = codigos_query.all()
                 codigos = []
-                
-                for cod in codigos_objs:
-                    codigos.append(f"{cod.codigo} - {cod.descripcion}")
-                    if cod.tipo == 'reconocimiento':
+                for fila in filas_esq:
+                    codigo, descripcion, tipo_codigo = fila[15], fila[16], fila[17]
+                    if codigo is None:
+                        continue
+                    codigos.append(f"{codigo} - {descripcion}")
+                    if tipo_codigo == 'reconocimiento':
                         reconocimientos += 1
                     else:
                         orientaciones += 1
 
                 esquelas_lista.append({
-                    "id_esquela": esq.id_esquela,
-                    "fecha": esq.fecha,
-                    "estudiante_nombre": est_nombre,
-                    "estudiante_ci": estudiante.ci,
-                    "profesor_nombre": f"{prof.nombres} {prof.apellido_paterno} {prof.apellido_materno or ''}".strip(),
-                    "registrador_nombre": reg_nombre,
+                    "id_esquela": primera[5],
+                    "fecha": primera[6],
+                    "estudiante_nombre": _nombre_completo(primera[9], primera[10], primera[11]),
+                    "estudiante_ci": primera[8],
+                    "profesor_nombre": prof_nombre,
+                    "registrador_nombre": _nombre_completo(primera[12], primera[13], primera[14]),
                     "codigos": codigos,
-                    "observaciones": esq.observaciones
+                    "observaciones": primera[7]
                 })
 
-            prof_nombre = f"{prof.nombres} {prof.apellido_paterno} {prof.apellido_materno or ''}".strip()
-
-            resultado.append({
-                "id_profesor": prof.id_persona,
+            yield {
+                "id_profesor": id_prof,
                 "profesor_nombre": prof_nombre,
-                "profesor_ci": prof.ci,
+                "profesor_ci": prof_ci,
                 "total_esquelas": len(esquelas_lista),
                 "reconocimientos": reconocimientos,
                 "orientaciones": orientaciones,
                 "esquelas": esquelas_lista
-            })
-
-        return resultado
+            }
 
     @staticmethod
     def get_esquelas_por_fecha(
@@ -767,81 +1031,124 @@ class ReporteRepository:
         """
         Obtiene esquelas por rango de fechas
         """
-        query = db.query(Esquela)
-
-        if fecha_desde:
-            query = query.filter(Esquela.fecha >= fecha_desde)
-        if fecha_hasta:
-            query = query.filter(Esquela.fecha <= fecha_hasta)
-
-        esquelas = query.order_by(Esquela.fecha.desc()).all()
-
         resultado = []
         reconocimientos = 0
         orientaciones = 0
 
-        for esq in esquelas:
-            # Obtener estudiante
-            estudiante = esq.estudiante
-            est_nombre = f"{estudiante.nombres} {estudiante.apellido_paterno} {estudiante.apellido_materno or ''}".strip()
+        for esquela, tiene_reconocimiento, tiene_orientacion in ReporteRepository._iter_esquelas_por_fecha(
+            db, fecha_desde, fecha_hasta, tipo
+        ):
+            resultado.append(esquela)
+            if tiene_reconocimiento:
+                reconocimientos += 1
+            if tiene_orientacion:
+                orientaciones += 1
+
+        return {
+            "esquelas": resultado,
+            "total": len(resultado),
+            "reconocimientos": reconocimientos,
+            "orientaciones": orientaciones
+        }
+
+    @staticmethod
+    def iter_esquelas_por_fecha(
+        db: Session,
+        fecha_desde: Optional[date] = None,
+        fecha_hasta: Optional[date] = None,
+        tipo: Optional[str] = None,
+        lote: int = 500
+    ):
+        """
+        Genera las esquelas por rango de fechas (cursor del lado del servidor)
+        """
+        for esquela, _, _ in ReporteRepository._iter_esquelas_por_fecha(db, fecha_desde, fecha_hasta, tipo, lote):
+            yield esquela
 
-            # Obtener profesor
-            profesor = esq.profesor
-            prof_nombre = f"{profesor.nombres} {profesor.apellido_paterno} {profesor.apellido_materno or ''}".strip()
+    @staticmethod
+    def _iter_esquelas_por_fecha(db, fecha_desde, fecha_hasta, tipo, lote: int = 500):
+        """
+        Genera (esquela, tiene_reconocimiento, tiene_orientacion)
 
-            # Obtener registrador
-            registrador = esq.registrador
-            reg_nombre = f"{registrador.nombres} {registrador.apellido_paterno} {registrador.apellido_materno or ''}".strip()
+        Una sola consulta con los códigos unidos; si se filtra por tipo, el
+        join interno descarta las esquelas sin códigos de ese tipo.
+        """
+        Profesor = _personas("profesor")
+        Registrador = _personas("registrador")
 
-            # Obtener códigos
-            codigos_query = db.query(CodigoEsquela).join(
-                EsquelaCodigo,
-                CodigoEsquela.id_codigo == EsquelaCodigo.id_codigo
-            ).filter(EsquelaCodigo.id_esquela == esq.id_esquela)
+        query = db.query(
+            Esquela.id_esquela,
+            Esquela.fecha,
+            Esquela.observaciones,
+            Estudiante.ci,
+            Estudiante.nombres,
+            Estudiante.apellido_paterno,
+            Estudiante.apellido_materno,
+            Profesor.c.nombres,
+            Profesor.c.apellido_paterno,
+            Profesor.c.apellido_materno,
+            Registrador.c.nombres,
+            Registrador.c.apellido_paterno,
+            Registrador.c.apellido_materno,
+            CodigoEsquela.codigo,
+            CodigoEsquela.descripcion,
+            CodigoEsquela.tipo
+        ).select_from(Esquela).join(
+            Estudiante, Estudiante.id_estudiante == Esquela.id_estudiante
+        ).join(
+            Profesor, Profesor.c.id_persona == Esquela.id_profesor
+        ).join(
+            Registrador, Registrador.c.id_persona == Esquela.id_registrador
+        )
 
-            # Filtrar por tipo si se especifica
-            if tipo:
-                codigos_query = codigos_query.filter(CodigoEsquela.tipo == tipo)
+        if tipo:
+            query = query.join(
+                EsquelaCodigo, EsquelaCodigo.id_esquela == Esquela.id_esquela
+            ).join(
+                CodigoEsquela, CodigoEsquela.id_codigo == EsquelaCodigo.id_codigo
+            ).filter(CodigoEsquela.tipo == tipo)
+        else:
+            query = query.outerjoin(
+                EsquelaCodigo, EsquelaCodigo.id_esquela == Esquela.id_esquela
+            ).outerjoin(
+                CodigoEsquela, CodigoEsquela.id_codigo == EsquelaCodigo.id_codigo
+            )
 
-            codigos_objs = codigos_query.all()
-            
-            # Si se filtró por tipo y no hay códigos de ese tipo, saltar esta esquela
-            if tipo and not codigos_objs:
-                continue
+        if fecha_desde:
+            query = query.filter(Esquela.fecha >= fecha_desde)
+        if fecha_hasta:
+            query = query.filter(Esquela.fecha <= fecha_hasta)
+
+        filas = query.order_by(Esquela.fecha.desc(), Esquela.id_esquela).yield_per(lote)
+
+        for _, filas_esq in groupby(filas, key=itemgetter(0)):
+            filas_esq = list(filas_esq)
+            primera = filas_esq[0]
 
             codigos = []
             tiene_reconocimiento = False
             tiene_orientacion = False
 
-            for cod in codigos_objs:
-                codigos.append(f"{cod.codigo} - {cod.descripcion}")
-                if cod.tipo == 'reconocimiento':
+            for fila in filas_esq:
+                codigo, descripcion, tipo_codigo = fila[13], fila[14], fila[15]
+                if codigo is None:
+                    continue
+                codigos.append(f"{codigo} - {descripcion}")
+                if tipo_codigo == 'reconocimiento':
                     tiene_reconocimiento = True
                 else:
                     tiene_orientacion = True
 
-            if tiene_reconocimiento:
-                reconocimientos += 1
-            if tiene_orientacion:
-                orientaciones += 1
-
-            resultado.append({
-                "id_esquela": esq.id_esquela,
-                "fecha": esq.fecha,
-                "estudiante_nombre": est_nombre,
-                "estudiante_ci": estudiante.ci,
-                "profesor_nombre": prof_nombre,
-                "registrador_nombre": reg_nombre,
+            yield {
+                "id_esquela": primera[0],
+                "fecha": primera[1],
+                "estudiante_nombre": _nombre_completo(primera[4], primera[5], primera[6]),
+                "estudiante_ci": primera[3],
+                "profesor_nombre": _nombre_completo(primera[7], primera[8], primera[9]),
+                "registrador_nombre": _nombre_completo(primera[10], primera[11], primera[12]),
                 "codigos": codigos,
-                "observaciones": esq.observaciones
-            })
-
-        return {
-            "esquelas": resultado,
-            "total": len(resultado),
-            "reconocimientos": reconocimientos,
-            "orientaciones": orientaciones
-        }
+                "observaciones": primera[2]
+            }, tiene_reconocimiento, tiene_orientacion
 
     @staticmethod
     def get_codigos_frecuentes(
@@ -854,6 +1161,34 @@ class ReporteRepository:
         """
         Obtiene los códigos más frecuentemente aplicados
         """
+        if _usar_resumenes(fecha_desde, fecha_hasta):
+            resultados = ReporteRepository._codigos_frecuentes_resumen(db, tipo, limit, fecha_desde, fecha_hasta)
+        else:
+            resultados = ReporteRepository._codigos_frecuentes_detalle(db, tipo, limit, fecha_desde, fecha_hasta)
+
+        # Calcular total de aplicaciones para porcentajes
+        total_aplicaciones = sum(r[4] for r in resultados)
+
+        codigos = []
+        for id_cod, cod, desc, tip, total in resultados:
+            porcentaje = (total / total_aplicaciones * 100) if total_aplicaciones > 0 else 0
+            codigos.append({
+                "id_codigo": id_cod,
+                "codigo": cod,
+                "descripcion": desc,
+                "tipo": tip,
+                "total_aplicaciones": int(total),
+                "porcentaje": round(porcentaje, 2)
+            })
+
+        return {
+            "codigos": codigos,
+            "total_aplicaciones": total_aplicaciones
+        }
+
+    @staticmethod
+    def _codigos_frecuentes_detalle(db, tipo, limit, fecha_desde, fecha_hasta):
+        """Frecuencia de códigos calculada sobre esquelas_codigos"""
         query = db.query(
             CodigoEsquela.id_codigo,
             CodigoEsquela.codigo,
@@ -887,25 +1222,37 @@ class ReporteRepository:
             CodigoEsquela.tipo
         ).order_by(func.count(EsquelaCodigo.id_esquela).desc()).limit(limit)
 
-        resultados = query.all()
+        return query.all()
 
-        # Calcular total de aplicaciones para porcentajes
-        total_aplicaciones = sum(r[4] for r in resultados)
+    @staticmethod
+    def _codigos_frecuentes_resumen(db, tipo, limit, fecha_desde, fecha_hasta):
+        """Frecuencia de códigos leída de resumen_codigos_diario"""
+        total = func.sum(ResumenCodigosDiario.aplicaciones)
 
-        codigos = []
-        for id_cod, cod, desc, tip, total in resultados:
-            porcentaje = (total / total_aplicaciones * 100) if total_aplicaciones > 0 else 0
-            codigos.append({
-                "id_codigo": id_cod,
-                "codigo": cod,
-                "descripcion": desc,
-                "tipo": tip,
-                "total_aplicaciones": int(total),
-                "porcentaje": round(porcentaje, 2)
-            })
+        query = db.query(
+            CodigoEsquela.id_codigo,
+            CodigoEsquela.codigo,
+            CodigoEsquela.descripcion,
+            CodigoEsquela.tipo,
+            total.label('total_aplicaciones')
+        ).join(
+            ResumenCodigosDiario,
+            CodigoEsquela.id_codigo == ResumenCodigosDiario.id_codigo
+        )
 
-        return {
-            "codigos": codigos,
-            "total_aplicaciones": total_aplicaciones
-        }
+        if fecha_desde:
+            query = query.filter(ResumenCodigosDiario.fecha >= fecha_desde)
+        if fecha_hasta:
+            query = query.filter(ResumenCodigosDiario.fecha <= fecha_hasta)
+        if tipo:
+            query = query.filter(CodigoEsquela.tipo == tipo)
+
+        resultados = query.group_by(
+            CodigoEsquela.id_codigo,
+            CodigoEsquela.codigo,
+            CodigoEsquela.descripcion,
+            CodigoEsquela.tipo
+        ).having(total > 0).order_by(total.desc()).limit(limit).all()
 
+        # SUM devuelve Decimal en MySQL
+        return [(id_cod, cod, desc, tip, int(total)) for id_cod, cod, desc, tip, total in resultados]
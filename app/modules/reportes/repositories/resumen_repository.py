@@ -0,0 +1,253 @@
+# app/modules/reportes/repositories/resumen_repository.py
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from sqlalchemy import delete, func, literal, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.modules.esquelas.models.esquela_models import Esquela, CodigoEsquela, EsquelaCodigo
+from app.modules.reportes.models.resumen_models import (
+    ResumenEsquelasDiario, ResumenCodigosDiario, TIPO_TODOS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ResumenRepository:
+    """Mantenimiento de los resúmenes diarios de esquelas (rollups)"""
+
+    # ==================== MANTENIMIENTO INCREMENTAL ====================
+
+    @staticmethod
+    def aplicar_esquela(
+        db: Session,
+        fecha: date,
+        id_estudiante: int,
+        id_registrador: int,
+        codigo_ids: Iterable[int],
+        signo: int = 1
+    ) -> None:
+        """
+        Sumar (signo=1) o restar (signo=-1) una esquela a los resúmenes.
+        No hace commit: se ejecuta dentro de la transacción de la esquela.
+        """
+        codigo_ids = list(codigo_ids)
+        if not codigo_ids:
+            return  # Sin códigos la esquela no aparece en los rankings
+
+        tipos = dict(
+            db.query(CodigoEsquela.id_codigo, CodigoEsquela.tipo).filter(
+                CodigoEsquela.id_codigo.in_(codigo_ids)
+            ).all()
+        )
+        por_tipo = Counter(tipos[cid] for cid in codigo_ids if cid in tipos)
+        por_tipo_total = sum(por_tipo.values())
+        if not por_tipo_total:
+            return
+
+        filas_esquelas = [
+            {
+                "fecha": fecha,
+                "id_estudiante": id_estudiante,
+                "id_registrador": id_registrador,
+                "tipo": tipo,
+                "esquelas": signo,
+                "codigos": signo * cantidad
+            }
+            for tipo, cantidad in list(por_tipo.items()) + [(TIPO_TODOS, por_tipo_total)]
+        ]
+        filas_codigos = [
+            {"fecha": fecha, "id_codigo": cid, "aplicaciones": signo * cantidad}
+            for cid, cantidad in Counter(cid for cid in codigo_ids if cid in tipos).items()
+        ]
+
+        ResumenRepository._incrementar(
+            db, ResumenEsquelasDiario, ("fecha", "id_estudiante", "id_registrador", "tipo"),
+            ("esquelas", "codigos"), filas_esquelas
+        )
+        ResumenRepository._incrementar(
+            db, ResumenCodigosDiario, ("fecha", "id_codigo"), ("aplicaciones",), filas_codigos
+        )
+
+        if signo < 0:
+            # Quitar las filas que quedaron en cero
+            db.query(ResumenEsquelasDiario).filter(
+                ResumenEsquelasDiario.fecha == fecha,
+                ResumenEsquelasDiario.id_estudiante == id_estudiante,
+                ResumenEsquelasDiario.id_registrador == id_registrador,
+                ResumenEsquelasDiario.esquelas <= 0
+            ).delete(synchronize_session=False)
+            db.query(ResumenCodigosDiario).filter(
+                ResumenCodigosDiario.fecha == fecha,
+                ResumenCodigosDiario.id_codigo.in_(list(tipos)),
+                ResumenCodigosDiario.aplicaciones <= 0
+            ).delete(synchronize_session=False)
+
+    @staticmethod
+    def _incrementar(db: Session, modelo, claves, medidas, filas: List[Dict]) -> None:
+        """UPSERT aditivo: inserta la fila o suma las medidas a la existente"""
+        if not filas:
+            return
+        tabla = modelo.__table__
+        dialecto = db.get_bind().dialect.name
+
+        if dialecto == "mysql":
+            from sqlalchemy.dialects.mysql import insert
+            stmt = insert(tabla).values(filas)
+            stmt = stmt.on_duplicate_key_update({m: tabla.c[m] + stmt.inserted[m] for m in medidas})
+            db.execute(stmt)
+        elif dialecto in ("sqlite", "postgresql"):
+            if dialecto == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            stmt = insert(tabla).values(filas)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(claves),
+                set_={m: tabla.c[m] + stmt.excluded[m] for m in medidas}
+            )
+            db.execute(stmt)
+        else:
+            for fila in filas:
+                condicion = [tabla.c[c] == fila[c] for c in claves]
+                resultado = db.execute(
+                    tabla.update().where(*condicion).values({m: tabla.c[m] + fila[m] for m in medidas})
+                )
+                if resultado.rowcount == 0:
+                    db.execute(tabla.insert().values(fila))
+
+    @staticmethod
+    def recalcular_codigo(db: Session, id_codigo: int, tipos: Iterable[str]) -> int:
+        """
+        Recalcular las filas por tipo afectadas por un cambio de tipo de un código.
+        Solo los días/estudiantes/registradores con esquelas que usan el código y
+        solo los tipos indicados (anterior y nuevo); la fila TIPO_TODOS y
+        resumen_codigos_diario no dependen del tipo. No hace commit.
+        """
+        tipos = [t for t in set(tipos) if t is not None]
+        if not tipos:
+            return 0
+
+        clave = (Esquela.fecha, Esquela.id_estudiante, Esquela.id_registrador)
+        afectados = select(*clave).join(
+            EsquelaCodigo, EsquelaCodigo.id_esquela == Esquela.id_esquela
+        ).where(EsquelaCodigo.id_codigo == id_codigo).distinct()
+
+        tabla = ResumenEsquelasDiario.__table__
+        db.execute(delete(tabla).where(
+            tabla.c.tipo.in_(tipos),
+            tuple_(tabla.c.fecha, tabla.c.id_estudiante, tabla.c.id_registrador).in_(afectados)
+        ))
+        por_tipo = select(
+            *clave, CodigoEsquela.tipo, func.count(func.distinct(Esquela.id_esquela)), func.count()
+        ).select_from(Esquela).join(
+            EsquelaCodigo, EsquelaCodigo.id_esquela == Esquela.id_esquela
+        ).join(
+            CodigoEsquela, CodigoEsquela.id_codigo == EsquelaCodigo.id_codigo
+        ).where(
+            CodigoEsquela.tipo.in_(tipos),
+            tuple_(*clave).in_(afectados)
+        ).group_by(*clave, CodigoEsquela.tipo)
+        return db.execute(tabla.insert().from_select(
+            ["fecha", "id_estudiante", "id_registrador", "tipo", "esquelas", "codigos"], por_tipo
+        )).rowcount
+
+    @staticmethod
+    def quitar_codigo(db: Session, id_codigo: int) -> int:
+        """
+        Sacar un código de los resúmenes antes de eliminarlo (sus filas de
+        esquelas_codigos las borra el ORM al eliminar el código). Recalcula
+        todas las filas (cada tipo y TIPO_TODOS) de los días/estudiantes/
+        registradores que lo usaban, sin contar el código. No hace commit.
+        """
+        clave = (Esquela.fecha, Esquela.id_estudiante, Esquela.id_registrador)
+        grupos = [tuple(fila) for fila in db.execute(
+            select(*clave).join(
+                EsquelaCodigo, EsquelaCodigo.id_esquela == Esquela.id_esquela
+            ).where(EsquelaCodigo.id_codigo == id_codigo).distinct()
+        )]
+
+        tabla_codigos = ResumenCodigosDiario.__table__
+        db.execute(delete(tabla_codigos).where(tabla_codigos.c.id_codigo == id_codigo))
+        if not grupos:
+            return 0
+
+        tabla = ResumenEsquelasDiario.__table__
+        db.execute(delete(tabla).where(
+            tuple_(tabla.c.fecha, tabla.c.id_estudiante, tabla.c.id_registrador).in_(grupos)
+        ))
+
+        def restantes(tipo):
+            return select(
+                *clave, tipo, func.count(func.distinct(Esquela.id_esquela)), func.count()
+            ).select_from(Esquela).join(
+                EsquelaCodigo, EsquelaCodigo.id_esquela == Esquela.id_esquela
+            ).join(
+                CodigoEsquela, CodigoEsquela.id_codigo == EsquelaCodigo.id_codigo
+            ).where(
+                EsquelaCodigo.id_codigo != id_codigo,
+                tuple_(*clave).in_(grupos)
+            )
+
+        columnas = ["fecha", "id_estudiante", "id_registrador", "tipo", "esquelas", "codigos"]
+        db.execute(tabla.insert().from_select(
+            columnas, restantes(CodigoEsquela.tipo).group_by(*clave, CodigoEsquela.tipo)
+        ))
+        db.execute(tabla.insert().from_select(
+            columnas, restantes(literal(TIPO_TODOS)).group_by(*clave)
+        ))
+        return len(grupos)
+
+    # ==================== RECONSTRUCCIÓN ====================
+
+    @staticmethod
+    def reconstruir(db: Session, desde: Optional[date] = None) -> Dict[str, int]:
+        """
+        Regenerar los resúmenes desde esquelas/esquelas_codigos.
+        Si se indica `desde`, solo se recalculan los días a partir de esa fecha.
+        """
+        borrar_esquelas = db.query(ResumenEsquelasDiario)
+        borrar_codigos = db.query(ResumenCodigosDiario)
+        if desde:
+            borrar_esquelas = borrar_esquelas.filter(ResumenEsquelasDiario.fecha >= desde)
+            borrar_codigos = borrar_codigos.filter(ResumenCodigosDiario.fecha >= desde)
+        borrar_esquelas.delete(synchronize_session=False)
+        borrar_codigos.delete(synchronize_session=False)
+
+        def base(*columnas):
+            consulta = select(*columnas).select_from(Esquela).join(
+                EsquelaCodigo, EsquelaCodigo.id_esquela == Esquela.id_esquela
+            ).join(
+                CodigoEsquela, CodigoEsquela.id_codigo == EsquelaCodigo.id_codigo
+            )
+            if desde:
+                consulta = consulta.where(Esquela.fecha >= desde)
+            return consulta
+
+        columnas_esquelas = ["fecha", "id_estudiante", "id_registrador", "tipo", "esquelas", "codigos"]
+        por_tipo = base(
+            Esquela.fecha, Esquela.id_estudiante, Esquela.id_registrador, CodigoEsquela.tipo,
+            func.count(func.distinct(Esquela.id_esquela)), func.count()
+        ).group_by(Esquela.fecha, Esquela.id_estudiante, Esquela.id_registrador, CodigoEsquela.tipo)
+        todos = base(
+            Esquela.fecha, Esquela.id_estudiante, Esquela.id_registrador, literal(TIPO_TODOS),
+            func.count(func.distinct(Esquela.id_esquela)), func.count()
+        ).group_by(Esquela.fecha, Esquela.id_estudiante, Esquela.id_registrador)
+        por_codigo = base(
+            Esquela.fecha, EsquelaCodigo.id_codigo, func.count()
+        ).group_by(Esquela.fecha, EsquelaCodigo.id_codigo)
+
+        tabla_esquelas = ResumenEsquelasDiario.__table__
+        tabla_codigos = ResumenCodigosDiario.__table__
+        filas = {
+            "esquelas_por_tipo": db.execute(tabla_esquelas.insert().from_select(columnas_esquelas, por_tipo)).rowcount,
+            "esquelas_totales": db.execute(tabla_esquelas.insert().from_select(columnas_esquelas, todos)).rowcount,
+            "codigos": db.execute(
+                tabla_codigos.insert().from_select(["fecha", "id_codigo", "aplicaciones"], por_codigo)
+            ).rowcount,
+        }
+        db.commit()
+        logger.info("Resúmenes de esquelas reconstruidos (desde=%s): %s", desde, filas)
+        return filas
@@ -0,0 +1,284 @@
+"""
+app/modules/reportes/services/reporte_cache.py
+Caché de resultados de reportes con invalidación por tablas
+
+Cada entrada se guarda bajo (endpoint, parámetros normalizados) y se etiqueta
+con las tablas que lee el reporte. Al hacer commit, cualquier Session que
+escribió (ORM o insert/update/delete por `db.execute`) invalida los reportes
+que dependen de las tablas tocadas; un rollback no invalida nada. Las
+escrituras con `text()` no se detectan: esos caminos llaman a
+`invalidar_tablas(...)` después del commit.
+
+Cada entrada lleva un ETag (hash del contenido) para que el navegador pueda
+revalidar con If-None-Match y recibir un 304 sin cuerpo.
+
+El caché es por proceso (un worker de uvicorn); el TTL acota cuánto tiempo
+puede quedar desactualizado un worker que no recibió la invalidación.
+
+Con réplicas de lectura: un reporte cuyas tablas se invalidaron hace menos
+de DB_READ_YOUR_WRITES_SECONDS se recalcula leyendo del primario, para no
+guardar por todo el TTL datos de una réplica atrasada.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from itertools import chain
+from threading import Lock
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+import hashlib
+import json
+import logging
+import time
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.db_routing import RoutingSession, lecturas_en_primario
+from app.core.metrics import registrar_cache
+
+logger = logging.getLogger(__name__)
+
+ClaveReporte = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+@dataclass(frozen=True)
+class EntradaReporte:
+    """Resultado cacheado de un reporte"""
+    valor: Any
+    etag: str
+    tablas: FrozenSet[str]
+    expira: float
+
+
+def clave_reporte(endpoint: str, parametros: Dict[str, Any]) -> ClaveReporte:
+    """Clave estable: parámetros sin None, ordenados y convertidos a texto"""
+    normalizados = []
+    for nombre, valor in parametros.items():
+        if valor is None:
+            continue
+        if isinstance(valor, Enum):
+            valor = valor.value
+        elif isinstance(valor, date):
+            valor = valor.isoformat()
+        normalizados.append((nombre, str(valor)))
+    return endpoint, tuple(sorted(normalizados))
+
+
+def calcular_etag(valor: Any) -> str:
+    """ETag fuerte a partir del contenido serializado"""
+    contenido = json.dumps(jsonable_encoder(valor), sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha1(contenido.encode("utf-8")).hexdigest() + '"'
+
+
+def etag_coincide(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil de If-None-Match (admite lista, W/ y *)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidatos = (c.strip() for c in if_none_match.split(","))
+    return any((c[2:] if c.startswith("W/") else c) == etag for c in candidatos)
+
+
+class ReporteCache:
+    """
+    Caché LRU con expiración por TTL y un índice tabla -> claves
+    para invalidar por dependencia.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl_segundos: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl_segundos = ttl_segundos
+        self._datos: "OrderedDict[ClaveReporte, EntradaReporte]" = OrderedDict()
+        self._por_tabla: Dict[str, Set[ClaveReporte]] = {}
+        self._invalidada_en: Dict[str, float] = {}
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def obtener(self, clave: ClaveReporte) -> Optional[EntradaReporte]:
+        """Obtener entrada si existe y no expiró"""
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return None
+
+            if entrada.expira < time.monotonic():
+                self._quitar(clave)
+                self.misses += 1
+                return None
+
+            self._datos.move_to_end(clave)
+            self.hits += 1
+            return entrada
+
+    def guardar(self, clave: ClaveReporte, valor: Any, tablas: Iterable[str]) -> EntradaReporte:
+        """Guardar resultado etiquetado con las tablas que lee"""
+        entrada = EntradaReporte(
+            valor=valor,
+            etag=calcular_etag(valor),
+            tablas=frozenset(tablas),
+            expira=time.monotonic() + self.ttl_segundos
+        )
+        if self.maxsize <= 0:
+            return entrada
+
+        with self._lock:
+            if clave in self._datos:
+                self._quitar(clave)
+            self._datos[clave] = entrada
+            for tabla in entrada.tablas:
+                self._por_tabla.setdefault(tabla, set()).add(clave)
+            while len(self._datos) > self.maxsize:
+                self._quitar(next(iter(self._datos)))
+        return entrada
+
+    def invalidar_tablas(self, *tablas: str) -> int:
+        """Eliminar los reportes que dependen de alguna de las tablas"""
+        ahora = time.monotonic()
+        with self._lock:
+            claves = set()
+            for tabla in tablas:
+                self._invalidada_en[tabla] = ahora
+                claves |= self._por_tabla.get(tabla, set())
+            for clave in claves:
+                self._quitar(clave)
+        if claves:
+            logger.debug("Reporte cache: %d entradas invalidadas por %s", len(claves), ", ".join(tablas))
+        return len(claves)
+
+    def invalidada_hace_poco(self, tablas: Iterable[str], ventana: float) -> bool:
+        """¿Alguna de las tablas se invalidó hace menos de `ventana` segundos?"""
+        limite = time.monotonic() - ventana
+        with self._lock:
+            return any(self._invalidada_en.get(tabla, 0.0) > limite for tabla in tablas)
+
+    def limpiar(self) -> None:
+        """Vaciar el caché (tests o mantenimiento)"""
+        with self._lock:
+            self._datos.clear()
+            self._por_tabla.clear()
+            self._invalidada_en.clear()
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def estadisticas(self) -> Dict[str, float]:
+        """Contadores de uso del caché"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._datos),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0
+        }
+
+    def _quitar(self, clave: ClaveReporte) -> None:
+        # Llamar con el lock tomado
+        entrada = self._datos.pop(clave, None)
+        if entrada is None:
+            return
+        for tabla in entrada.tablas:
+            claves = self._por_tabla.get(tabla)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del self._por_tabla[tabla]
+
+
+def _crear_cache() -> ReporteCache:
+    from app.core.database import Settings
+    return ReporteCache(
+        maxsize=getattr(Settings, "REPORTES_CACHE_MAXSIZE", 256),
+        ttl_segundos=getattr(Settings, "REPORTES_CACHE_TTL", 300)
+    )
+
+
+reporte_cache = _crear_cache()
+registrar_cache("reportes", reporte_cache.estadisticas)
+
+
+def invalidar_tablas(*tablas: str) -> int:
+    """Atajo para los servicios que escriben con text() en tablas leídas por reportes"""
+    return reporte_cache.invalidar_tablas(*tablas)
+
+
+# ==================== INVALIDACIÓN AL HACER COMMIT ====================
+
+# Tablas escritas en la transacción en curso (en Session.info)
+_CLAVE_TABLAS = "reportes_tablas_escritas"
+
+
+def _tablas_escritas(session: Session) -> Set[str]:
+    return session.info.setdefault(_CLAVE_TABLAS, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _registrar_flush(session: Session, flush_context) -> None:
+    # En after_flush new/dirty/deleted todavía muestran lo que se escribió
+    tablas = _tablas_escritas(session)
+    for objeto in chain(session.new, session.dirty, session.deleted):
+        tablas.update(tabla.name for tabla in inspect(objeto).mapper.tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _registrar_dml(estado) -> None:
+    # query.update()/delete() y insert/update/delete ejecutados con db.execute
+    if estado.is_insert or estado.is_update or estado.is_delete:
+        tabla = getattr(estado.statement, "table", None)
+        if tabla is not None and getattr(tabla, "name", None):
+            _tablas_escritas(estado.session).add(tabla.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_tras_commit(session: Session) -> None:
+    tablas = session.info.pop(_CLAVE_TABLAS, None)
+    if tablas:
+        reporte_cache.invalidar_tablas(*tablas)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _descartar_tras_rollback(session: Session, transaccion_previa) -> None:
+    if transaccion_previa.parent is None:
+        session.info.pop(_CLAVE_TABLAS, None)
+
+
+def _calcular_fresco(tablas: Iterable[str], calcular: Callable[[], Any]) -> Any:
+    # Tras una escritura reciente, la réplica puede no tenerla todavía
+    tablas = tuple(tablas)
+    if RoutingSession.replicas and reporte_cache.invalidada_hace_poco(
+        tablas, RoutingSession.ventana_lectura_escritura
+    ):
+        with lecturas_en_primario():
+            return calcular()
+    return calcular()
+
+
+def servir_reporte(
+    request: Request,
+    response: Response,
+    endpoint: str,
+    parametros: Dict[str, Any],
+    tablas: Iterable[str],
+    calcular: Callable[[], Any]
+):
+    """
+    Responder un reporte desde caché (o calcularlo y guardarlo) con ETag.
+    Si el cliente ya tiene la versión vigente, responde 304 sin cuerpo.
+    """
+    clave = clave_reporte(endpoint, parametros)
+    entrada = reporte_cache.obtener(clave)
+    if entrada is None:
+        entrada = reporte_cache.guardar(clave, _calcular_fresco(tablas, calcular), tablas)
+
+    cabeceras = {"ETag": entrada.etag, "Cache-Control": "private, no-cache"}
+    if etag_coincide(request.headers.get("if-none-match"), entrada.etag):
+        return Response(status_code=304, headers=cabeceras)
+
+    response.headers.update(cabeceras)
+    return entrada.valor
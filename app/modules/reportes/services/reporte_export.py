@@ -0,0 +1,274 @@
+"""
+app/modules/reportes/services/reporte_export.py
+Exportación de reportes en streaming (CSV / NDJSON)
+
+Los reportes de detalle se leen con los generadores `iter_*` del repositorio
+(cursor del lado del servidor) y se escriben por lotes en un StreamingResponse:
+la memoria no crece con el tamaño del reporte y el primer byte sale enseguida.
+
+Los reportes que ya son agregados pequeños (rankings, distribución, cursos,
+materias, códigos) se exportan desde el resultado del servicio.
+
+Cada exportación abre su propia sesión de lectura (réplica si hay): el generador
+sigue corriendo después de que el endpoint retornó, cuando la sesión de la
+petición ya puede estar cerrada.
+"""
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+import csv
+import io
+import json
+import logging
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.modules.reportes.repositories.reporte_repository import ReporteRepository
+from app.modules.reportes.services.reporte_service import ReporteService
+from app.modules.usuarios.models.usuario_models import Usuario
+from app.shared.decorators.auth_decorators import verificar_permiso
+
+logger = logging.getLogger(__name__)
+
+PERMISO_EXPORTAR = "exportar_reportes"
+FILAS_POR_LOTE = 500
+
+TIPOS_CONTENIDO = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+GeneradorFilas = Callable[..., Iterator[Dict[str, Any]]]
+
+
+# ==================== FILAS POR REPORTE ====================
+
+def _filas_ranking(db: Session, **parametros):
+    yield from ReporteService.obtener_ranking(db=db, **parametros)["data"]
+
+
+def _filas_estudiantes(db: Session, **parametros):
+    yield from ReporteRepository.iter_estudiantes_por_filtros(db, **parametros)
+
+
+def _filas_estudiantes_apoderados(db: Session, **parametros):
+    for est in ReporteRepository.iter_estudiantes_por_apoderados(db, **parametros):
+        apoderados = [
+            f"{a['tipo']}: {a['nombre_completo'] or ''} ({a['telefono'] or ''})"
+            for a in est["apoderados"]
+        ]
+        yield {**est, "apoderados": apoderados}
+
+
+def _filas_contactos(db: Session, **parametros):
+    yield from ReporteRepository.iter_contactos_apoderados(db, **parametros)
+
+
+def _filas_distribucion(db: Session, **parametros):
+    yield from ReporteService.obtener_distribucion_edad(db=db, **parametros)["distribucion"]
+
+
+def _filas_historial(db: Session, **parametros):
+    # Una fila por curso; los estudiantes sin cursos salen con las columnas vacías
+    for est in ReporteRepository.iter_historial_cursos_estudiante(db, **parametros):
+        base = {"id_estudiante": est["id_estudiante"], "nombre_completo": est["nombre_completo"], "ci": est["ci"]}
+        if not est["cursos"]:
+            yield base
+        for curso in est["cursos"]:
+            yield {**base, **curso}
+
+
+def _filas_profesores(db: Session, **parametros):
+    yield from ReporteRepository.iter_profesores_asignados(db, **parametros)
+
+
+def _filas_materias(db: Session, **parametros):
+    yield from ReporteService.obtener_materias_por_nivel(db=db, **parametros)["materias"]
+
+
+def _filas_carga(db: Session, **parametros):
+    # Una fila por asignación
+    for prof in ReporteRepository.iter_carga_academica_profesores(db, **parametros):
+        base = {c: prof[c] for c in ("id_profesor", "ci", "nombre_completo", "telefono", "correo")}
+        if not prof["asignaciones"]:
+            yield base
+        for asignacion in prof["asignaciones"]:
+            yield {**base, **asignacion}
+
+
+def _filas_cursos(db: Session, **parametros):
+    yield from ReporteService.obtener_cursos_por_gestion(db=db, **parametros)["cursos"]
+
+
+def _filas_esquelas_profesor(db: Session, **parametros):
+    # Una fila por esquela, con los datos del emisor repetidos
+    for prof in ReporteRepository.iter_esquelas_por_profesor(db, **parametros):
+        for esquela in prof["esquelas"]:
+            yield {"id_profesor": prof["id_profesor"], "profesor_ci": prof["profesor_ci"], **esquela}
+
+
+def _filas_esquelas_fecha(db: Session, **parametros):
+    yield from ReporteRepository.iter_esquelas_por_fecha(db, **parametros)
+
+
+def _filas_codigos(db: Session, **parametros):
+    yield from ReporteService.obtener_codigos_frecuentes(db=db, **parametros)["codigos"]
+
+
+# Nombre del servicio (el mismo que usa el caché) -> (columnas, generador de filas)
+EXPORTACIONES: Dict[str, Tuple[List[str], GeneradorFilas]] = {
+    "obtener_ranking": (
+        ["posicion", "id", "nombre", "total", "reconocimiento", "orientacion"],
+        _filas_ranking
+    ),
+    "obtener_listado_estudiantes": (
+        ["id_estudiante", "ci", "nombre_completo", "fecha_nacimiento", "edad", "cursos"],
+        _filas_estudiantes
+    ),
+    "obtener_estudiantes_por_apoderados": (
+        ["id_estudiante", "ci", "nombre_completo", "tiene_apoderados", "apoderados"],
+        _filas_estudiantes_apoderados
+    ),
+    "obtener_contactos_apoderados": (
+        ["id_estudiante", "estudiante_nombre", "estudiante_ci", "tipo_apoderado", "apoderado_nombre", "telefono"],
+        _filas_contactos
+    ),
+    "obtener_distribucion_edad": (
+        ["rango_edad", "cantidad", "porcentaje"],
+        _filas_distribucion
+    ),
+    "obtener_historial_cursos": (
+        ["id_estudiante", "nombre_completo", "ci", "id_curso", "nombre_curso", "nivel", "gestion"],
+        _filas_historial
+    ),
+    "obtener_profesores_asignados": (
+        ["id_profesor", "ci", "nombre_completo", "telefono", "correo", "curso", "materia"],
+        _filas_profesores
+    ),
+    "obtener_materias_por_nivel": (
+        ["id_materia", "nombre_materia", "nivel"],
+        _filas_materias
+    ),
+    "obtener_carga_academica": (
+        ["id_profesor", "ci", "nombre_completo", "telefono", "correo", "curso", "nivel", "gestion", "materia"],
+        _filas_carga
+    ),
+    "obtener_cursos_por_gestion": (
+        ["id_curso", "nombre_curso", "nivel", "gestion", "total_estudiantes"],
+        _filas_cursos
+    ),
+    "obtener_esquelas_por_profesor": (
+        ["id_profesor", "profesor_ci", "profesor_nombre", "id_esquela", "fecha", "estudiante_nombre",
+         "estudiante_ci", "registrador_nombre", "codigos", "observaciones"],
+        _filas_esquelas_profesor
+    ),
+    "obtener_esquelas_por_fecha": (
+        ["id_esquela", "fecha", "estudiante_nombre", "estudiante_ci", "profesor_nombre",
+         "registrador_nombre", "codigos", "observaciones"],
+        _filas_esquelas_fecha
+    ),
+    "obtener_codigos_frecuentes": (
+        ["id_codigo", "codigo", "descripcion", "tipo", "total_aplicaciones", "porcentaje"],
+        _filas_codigos
+    ),
+}
+
+
+# ==================== SERIALIZACIÓN ====================
+
+def _valor_csv(valor: Any) -> Any:
+    """Aplanar un valor para una celda CSV"""
+    if valor is None:
+        return ""
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    if isinstance(valor, (list, tuple)):
+        return "; ".join(str(v) for v in valor)
+    return valor
+
+
+def _chunks_csv(filas: Iterator[Dict[str, Any]], columnas: List[str], lote: int) -> Iterator[str]:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+
+    # BOM para que Excel detecte UTF-8; la cabecera sale de inmediato
+    escritor.writerow(columnas)
+    yield "\ufeff" + buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    pendientes = 0
+    for fila in filas:
+        escritor.writerow([_valor_csv(fila.get(c)) for c in columnas])
+        pendientes += 1
+        if pendientes >= lote:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pendientes = 0
+
+    if pendientes:
+        yield buffer.getvalue()
+
+
+def _chunks_ndjson(filas: Iterator[Dict[str, Any]], columnas: List[str], lote: int) -> Iterator[str]:
+    lineas = []
+    primera = True
+    for fila in filas:
+        lineas.append(json.dumps({c: fila.get(c) for c in columnas}, ensure_ascii=False, default=str))
+        # La primera fila se envía sola para no retrasar el primer byte
+        if primera or len(lineas) >= lote:
+            yield "\n".join(lineas) + "\n"
+            lineas = []
+            primera = False
+
+    if lineas:
+        yield "\n".join(lineas) + "\n"
+
+
+SERIALIZADORES = {
+    "csv": _chunks_csv,
+    "ndjson": _chunks_ndjson,
+}
+
+
+def _generar(formato: str, nombre: str, parametros: Dict[str, Any], lote: int) -> Iterator[str]:
+    """Generador del cuerpo: abre su propia sesión y la cierra al terminar o si el cliente corta"""
+    from app.core.database import SessionLectura
+
+    columnas, generador_filas = EXPORTACIONES[nombre]
+    db = SessionLectura()
+    try:
+        yield from SERIALIZADORES[formato](generador_filas(db, **parametros), columnas, lote)
+    except Exception:
+        # Los encabezados ya se enviaron: solo queda registrar y cortar la respuesta
+        logger.exception("Error exportando el reporte %s (%s)", nombre, formato)
+        raise
+    finally:
+        db.close()
+
+
+def exportar_reporte(
+    current_user: Usuario,
+    formato: str,
+    nombre: str,
+    parametros: Dict[str, Any],
+    lote: int = FILAS_POR_LOTE
+) -> StreamingResponse:
+    """
+    Exportar un reporte como CSV o NDJSON en streaming.
+    Requiere el permiso 'exportar_reportes'.
+    """
+    verificar_permiso(current_user, PERMISO_EXPORTAR)
+
+    archivo = f"{nombre.removeprefix('obtener_')}_{date.today():%Y%m%d}.{formato}"
+    logger.info("Usuario %s exporta %s (%s)", current_user.usuario, nombre, formato)
+
+    return StreamingResponse(
+        _generar(formato, nombre, parametros, lote),
+        media_type=TIPOS_CONTENIDO[formato],
+        headers={
+            "Content-Disposition": f'attachment; filename="{archivo}"',
+            "Cache-Control": "no-store",
+        }
+    )
@@ -20,7 +20,7 @@ def get_autorizacion_retiro_service(db: Session = Depends(get_db)) -> Autorizaci
 
 
 @router.post("/", response_model=AutorizacionRetiroResponseDTO, status_code=status.HTTP_201_CREATED)
-async def create_autorizacion(
+def create_autorizacion(
     autorizacion_dto: AutorizacionRetiroCreateDTO,
     service: AutorizacionRetiroService = Depends(get_autorizacion_retiro_service)
 ) -> AutorizacionRetiroResponseDTO:
@@ -29,7 +29,7 @@ async def create_autorizacion(
 
 
 @router.get("/{autorizacion_id}", response_model=AutorizacionRetiroResponseDTO)
-async def get_autorizacion(
+def get_autorizacion(
     autorizacion_id: int,
     service: AutorizacionRetiroService = Depends(get_autorizacion_retiro_service)
 ) -> AutorizacionRetiroResponseDTO:
@@ -38,7 +38,7 @@ async def get_autorizacion(
 
 
 @router.get("/", response_model=List[AutorizacionRetiroResponseDTO])
-async def get_all_autorizaciones(
+def get_all_autorizaciones(
     service: AutorizacionRetiroService = Depends(get_autorizacion_retiro_service)
 ) -> List[AutorizacionRetiroResponseDTO]:
     """Obtener todas las autorizaciones de retiro"""
@@ -46,7 +46,7 @@ async def get_all_autorizaciones(
 
 
 @router.put("/{autorizacion_id}", response_model=AutorizacionRetiroResponseDTO)
-async def update_autorizacion(
+def update_autorizacion(
     autorizacion_id: int,
     autorizacion_dto: AutorizacionRetiroUpdateDTO,
     service: AutorizacionRetiroService = Depends(get_autorizacion_retiro_service)
@@ -56,7 +56,7 @@ async def update_autorizacion(
 
 
 @router.delete("/{autorizacion_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_autorizacion(
+def delete_autorizacion(
     autorizacion_id: int,
     service: AutorizacionRetiroService = Depends(get_autorizacion_retiro_service)
 ):
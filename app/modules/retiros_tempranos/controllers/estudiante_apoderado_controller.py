@@ -19,7 +19,7 @@ def get_estudiante_apoderado_service(db: Session = Depends(get_db)) -> Estudiant
 
 
 @router.post("/", response_model=EstudianteApoderadoResponseDTO, status_code=status.HTTP_201_CREATED)
-async def create_relacion(
+def create_relacion(
     relacion_dto: EstudianteApoderadoCreateDTO,
     service: EstudianteApoderadoService = Depends(get_estudiante_apoderado_service)
 ) -> EstudianteApoderadoResponseDTO:
@@ -28,7 +28,7 @@ async def create_relacion(
 
 
 @router.get("/estudiante/{id_estudiante}/apoderado/{id_apoderado}", response_model=EstudianteApoderadoResponseDTO)
-async def get_relacion(
+def get_relacion(
     id_estudiante: int,
     id_apoderado: int,
     service: EstudianteApoderadoService = Depends(get_estudiante_apoderado_service)
@@ -38,7 +38,7 @@ async def get_relacion(
 
 
 @router.get("/estudiante/{id_estudiante}", response_model=List[EstudianteApoderadoResponseDTO])
-async def get_apoderados_by_estudiante(
+def get_apoderados_by_estudiante(
     id_estudiante: int,
     service: EstudianteApoderadoService = Depends(get_estudiante_apoderado_service)
 ) -> List[EstudianteApoderadoResponseDTO]:
@@ -47,7 +47,7 @@ async def get_apoderados_by_estudiante(
 
 
 @router.get("/apoderado/{id_apoderado}", response_model=List[EstudianteApoderadoResponseDTO])
-async def get_estudiantes_by_apoderado(
+def get_estudiantes_by_apoderado(
     id_apoderado: int,
     service: EstudianteApoderadoService = Depends(get_estudiante_apoderado_service)
 ) -> List[EstudianteApoderadoResponseDTO]:
@@ -56,7 +56,7 @@ async def get_estudiantes_by_apoderado(
 
 
 @router.get("/estudiante/{id_estudiante}/contacto-principal", response_model=EstudianteApoderadoResponseDTO)
-async def get_contacto_principal(
+def get_contacto_principal(
     id_estudiante: int,
     service: EstudianteApoderadoService = Depends(get_estudiante_apoderado_service)
 ) -> EstudianteApoderadoResponseDTO:
@@ -65,7 +65,7 @@ async def get_contacto_principal(
 
 
 @router.put("/estudiante/{id_estudiante}/apoderado/{id_apoderado}/contacto-principal", response_model=EstudianteApoderadoResponseDTO)
-async def set_contacto_principal(
+def set_contacto_principal(
     id_estudiante: int,
     id_apoderado: int,
     service: EstudianteApoderadoService = Depends(get_estudiante_apoderado_service)
@@ -75,7 +75,7 @@ async def set_contacto_principal(
 
 
 @router.put("/estudiante/{id_estudiante}/apoderado/{id_apoderado}", response_model=EstudianteApoderadoResponseDTO)
-async def update_relacion(
+def update_relacion(
     id_estudiante: int,
     id_apoderado: int,
     relacion_dto: EstudianteApoderadoUpdateDTO,
@@ -86,7 +86,7 @@ async def update_relacion(
 
 
 @router.delete("/estudiante/{id_estudiante}/apoderado/{id_apoderado}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_relacion(
+def delete_relacion(
     id_estudiante: int,
     id_apoderado: int,
     service: EstudianteApoderadoService = Depends(get_estudiante_apoderado_service)
@@ -19,7 +19,7 @@ def get_motivo_retiro_service(db: Session = Depends(get_db)) -> MotivoRetiroServ
 
 
 @router.post("/", response_model=MotivoRetiroResponseDTO, status_code=status.HTTP_201_CREATED)
-async def create_motivo(
+def create_motivo(
     motivo_dto: MotivoRetiroCreateDTO,
     service: MotivoRetiroService = Depends(get_motivo_retiro_service)
 ) -> MotivoRetiroResponseDTO:
@@ -28,7 +28,7 @@ async def create_motivo(
 
 
 @router.get("/", response_model=List[MotivoRetiroResponseDTO])
-async def get_all_motivos(
+def get_all_motivos(
     skip: int = 0,
     limit: int = 100,
     service: MotivoRetiroService = Depends(get_motivo_retiro_service)
@@ -38,7 +38,7 @@ async def get_all_motivos(
 
 
 @router.get("/activos", response_model=List[MotivoRetiroResponseDTO])
-async def get_motivos_activos(
+def get_motivos_activos(
     service: MotivoRetiroService = Depends(get_motivo_retiro_service)
 ) -> List[MotivoRetiroResponseDTO]:
     """Obtener los motivos de retiro activos"""
@@ -46,7 +46,7 @@ async def get_motivos_activos(
 
 
 @router.get("/severidad/{severidad}", response_model=List[MotivoRetiroResponseDTO])
-async def get_motivos_by_severidad(
+def get_motivos_by_severidad(
     severidad: str,
     service: MotivoRetiroService = Depends(get_motivo_retiro_service)
 ) -> List[MotivoRetiroResponseDTO]:
@@ -55,7 +55,7 @@ async def get_motivos_by_severidad(
 
 
 @router.get("/{motivo_id:int}", response_model=MotivoRetiroResponseDTO)
-async def get_motivo(
+def get_motivo(
     motivo_id: int,
     service: MotivoRetiroService = Depends(get_motivo_retiro_service)
 ) -> MotivoRetiroResponseDTO:
@@ -64,7 +64,7 @@ async def get_motivo(
 
 
 @router.put("/{motivo_id:int}", response_model=MotivoRetiroResponseDTO)
-async def update_motivo(
+def update_motivo(
     motivo_id: int,
     motivo_dto: MotivoRetiroUpdateDTO,
     service: MotivoRetiroService = Depends(get_motivo_retiro_service)
@@ -74,7 +74,7 @@ async def update_motivo(
 
 
 @router.delete("/{motivo_id:int}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_motivo(
+def delete_motivo(
     motivo_id: int,
     service: MotivoRetiroService = Depends(get_motivo_retiro_service)
 ):
@@ -20,7 +20,7 @@ def get_registro_salida_service(db: Session = Depends(get_db)) -> RegistroSalida
 
 
 @router.post("/", response_model=RegistroSalidaResponseDTO, status_code=status.HTTP_201_CREATED)
-async def create_registro(
+def create_registro(
     registro_dto: RegistroSalidaCreateDTO,
     service: RegistroSalidaService = Depends(get_registro_salida_service)
 ) -> RegistroSalidaResponseDTO:
@@ -29,7 +29,7 @@ async def create_registro(
 
 
 @router.get("/{registro_id}", response_model=RegistroSalidaResponseDTO)
-async def get_registro(
+def get_registro(
     registro_id: int,
     service: RegistroSalidaService = Depends(get_registro_salida_service)
 ) -> RegistroSalidaResponseDTO:
@@ -38,7 +38,7 @@ async def get_registro(
 
 
 @router.get("/", response_model=List[RegistroSalidaResponseDTO])
-async def get_all_registros(
+def get_all_registros(
     service: RegistroSalidaService = Depends(get_registro_salida_service)
 ) -> List[RegistroSalidaResponseDTO]:
     """Obtener todos los registros de salida"""
@@ -46,7 +46,7 @@ async def get_all_registros(
 
 
 @router.get("/estudiante/{estudiante_id}", response_model=List[RegistroSalidaResponseDTO])
-async def get_registros_by_estudiante(
+def get_registros_by_estudiante(
     estudiante_id: int,
     service: RegistroSalidaService = Depends(get_registro_salida_service)
 ) -> List[RegistroSalidaResponseDTO]:
@@ -55,7 +55,7 @@ async def get_registros_by_estudiante(
 
 
 @router.put("/{registro_id}", response_model=RegistroSalidaResponseDTO)
-async def update_registro(
+def update_registro(
     registro_id: int,
     registro_dto: RegistroSalidaUpdateDTO,
     service: RegistroSalidaService = Depends(get_registro_salida_service)
@@ -65,7 +65,7 @@ async def update_registro(
 
 
 @router.delete("/{registro_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_registro(
+def delete_registro(
     registro_id: int,
     service: RegistroSalidaService = Depends(get_registro_salida_service)
 ):
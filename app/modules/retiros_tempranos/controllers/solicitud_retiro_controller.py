@@ -21,7 +21,7 @@ def get_solicitud_retiro_service(db: Session = Depends(get_db)) -> SolicitudReti
 
 
 @router.post("/", response_model=SolicitudRetiroResponseDTO, status_code=status.HTTP_201_CREATED)
-async def create_solicitud(
+def create_solicitud(
     solicitud_dto: SolicitudRetiroCreateDTO,
     service: SolicitudRetiroService = Depends(get_solicitud_retiro_service)
 ) -> SolicitudRetiroResponseDTO:
@@ -30,7 +30,7 @@ async def create_solicitud(
 
 
 @router.get("/", response_model=List[SolicitudRetiroResponseDTO])
-async def get_all_solicitudes(
+def get_all_solicitudes(
     service: SolicitudRetiroService = Depends(get_solicitud_retiro_service)
 ) -> List[SolicitudRetiroResponseDTO]:
     """Obtener todas las solicitudes de retiro"""
@@ -38,7 +38,7 @@ async def get_all_solicitudes(
 
 
 @router.get("/estado/{estado}", response_model=List[SolicitudRetiroResponseDTO])
-async def get_solicitudes_by_estado(
+def get_solicitudes_by_estado(
     estado: EstadoSolicitudEnum,
     service: SolicitudRetiroService = Depends(get_solicitud_retiro_service)
 ) -> List[SolicitudRetiroResponseDTO]:
@@ -47,7 +47,7 @@ async def get_solicitudes_by_estado(
 
 
 @router.get("/{solicitud_id}", response_model=SolicitudRetiroResponseDTO)
-async def get_solicitud(
+def get_solicitud(
     solicitud_id: int,
     service: SolicitudRetiroService = Depends(get_solicitud_retiro_service)
 ) -> SolicitudRetiroResponseDTO:
@@ -56,7 +56,7 @@ async def get_solicitud(
 
 
 @router.get("/estudiante/{estudiante_id}", response_model=List[SolicitudRetiroResponseDTO])
-async def get_solicitudes_by_estudiante(
+def get_solicitudes_by_estudiante(
     estudiante_id: int,
     service: SolicitudRetiroService = Depends(get_solicitud_retiro_service)
 ) -> List[SolicitudRetiroResponseDTO]:
@@ -65,7 +65,7 @@ async def get_solicitudes_by_estudiante(
 
 
 @router.post("/{solicitud_id}/derivar", response_model=SolicitudRetiroResponseDTO)
-async def derivar_solicitud(
+def derivar_solicitud(
     solicitud_id: int,
     derivar_dto: SolicitudRetiroDerivarDTO,
     service: SolicitudRetiroService = Depends(get_solicitud_retiro_service)
@@ -76,7 +76,7 @@ async def derivar_solicitud(
 
 
 @router.put("/{solicitud_id}", response_model=SolicitudRetiroResponseDTO)
-async def update_solicitud(
+def update_solicitud(
     solicitud_id: int,
     solicitud_dto: SolicitudRetiroUpdateDTO,
     service: SolicitudRetiroService = Depends(get_solicitud_retiro_service)
@@ -86,7 +86,7 @@ async def update_solicitud(
 
 
 @router.delete("/{solicitud_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_solicitud(
+def delete_solicitud(
     solicitud_id: int,
     service: SolicitudRetiroService = Depends(get_solicitud_retiro_service)
 ):
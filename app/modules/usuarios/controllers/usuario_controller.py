@@ -2,7 +2,7 @@
 usuario_controller.py 
 Controlador de usuarios, roles y permisos
 """
-from fastapi import APIRouter, Depends, HTTPException, logger, status, Query
+from fastapi import APIRouter, Depends, HTTPException, logger, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -26,7 +26,7 @@ router = APIRouter()
 
 @router.post("", status_code=status.HTTP_201_CREATED)
 @requires_permission("crear_usuario")
-async def crear_usuario(
+def crear_usuario(
     usuario_create: UsuarioCreateDTO,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -56,7 +56,7 @@ async def crear_usuario(
         )
     
 @router.get("/{id_usuario}")
-async def obtener_usuario(
+def obtener_usuario(
     id_usuario: int,
     current_user: Usuario = Depends(get_current_user_dependency),
     db: Session = Depends(get_db)
@@ -79,19 +79,19 @@ async def obtener_usuario(
         )
 
 @router.get("")
-async def listar_usuarios(
+def listar_usuarios(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     estado: Optional[str] = None,
     current_user: Usuario = Depends(get_current_user_dependency),
     db: Session = Depends(get_db)
-) -> dict:
-    """Listar todos los usuarios (RF-01)"""
+) -> Response:
+    """Listar todos los usuarios (RF-01); JSON ya serializado, sin response_model"""
     try:
         usuarios = UsuarioService.listar_usuarios(db, skip, limit, estado)
-        return ResponseModel.success(
+        return ResponseModel.success_json(
             message="Usuarios obtenidos",
-            data=[u.dict() if hasattr(u, 'dict') else u for u in usuarios],
+            data=usuarios,
             status_code=status.HTTP_200_OK
         )
     except Exception as e:
@@ -102,7 +102,7 @@ async def listar_usuarios(
 
 @router.put("/{id_usuario}")
 @requires_permission("editar_usuario")
-async def actualizar_usuario(
+def actualizar_usuario(
     id_usuario: int,
     usuario_update: UsuarioUpdateDTO,
     db: Session = Depends(get_db),
@@ -146,7 +146,7 @@ async def actualizar_usuario(
 
 @router.delete("/{id_usuario}")
 @requires_permission("eliminar_usuario")
-async def eliminar_usuario(
+def eliminar_usuario(
     id_usuario: int,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -189,7 +189,7 @@ async def eliminar_usuario(
 
 @router.post("/roles")
 @requires_permission("crear_rol")
-async def crear_rol(
+def crear_rol(
     rol_create: RolCreateDTO,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -219,7 +219,7 @@ async def crear_rol(
         )
 
 @router.get("/roles")
-async def listar_roles(
+def listar_roles(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     current_user: Usuario = Depends(get_current_user_dependency),
@@ -241,7 +241,7 @@ async def listar_roles(
         )
 
 @router.get("/roles/{id_rol}")
-async def obtener_rol(
+def obtener_rol(
     id_rol: int,
     current_user: Usuario = Depends(get_current_user_dependency),
     db: Session = Depends(get_db)
@@ -266,7 +266,7 @@ async def obtener_rol(
 
 @router.get("/roles/{id_rol}/usuarios", response_model=dict)
 @requires_permission('ver_rol')
-async def obtener_usuarios_rol(
+def obtener_usuarios_rol(
     id_rol: int,
     db: Session = Depends(get_db),
     current_user: Usuario = Depends(get_current_user_dependency)
@@ -334,7 +334,7 @@ async def obtener_usuarios_rol(
 
 @router.post("/{id_usuario}/roles/{id_rol}")
 @requires_permission("asignar_permisos")
-async def asignar_rol_usuario(
+def asignar_rol_usuario(
     id_usuario: int,
     id_rol: int,
     db: Session = Depends(get_db),
@@ -367,7 +367,7 @@ async def asignar_rol_usuario(
 
 @router.delete("/{id_usuario}/roles/{id_rol}")
 @requires_permission("asignar_permisos")
-async def revocar_rol_usuario(
+def revocar_rol_usuario(
     id_usuario: int,
     id_rol: int,
     db: Session = Depends(get_db),
@@ -400,7 +400,7 @@ async def revocar_rol_usuario(
 
 @router.post("/roles/{id_rol}/permisos")
 @requires_permission("asignar_permisos")
-async def asignar_permisos_rol(
+def asignar_permisos_rol(
     id_rol: int,
     permisos_ids: list[int],
     db: Session = Depends(get_db),
@@ -435,7 +435,7 @@ async def asignar_permisos_rol(
 # ==================== ENDPOINTS DE PERMISOS ====================
 
 @router.get("/permisos")
-async def listar_permisos(
+def listar_permisos(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=200),
     modulo: Optional[str] = None,
@@ -458,7 +458,7 @@ async def listar_permisos(
         )
 
 @router.get("/permisos/{id_permiso}")
-async def obtener_permiso(
+def obtener_permiso(
     id_permiso: int,
     current_user: Usuario = Depends(get_current_user_dependency),
     db: Session = Depends(get_db)
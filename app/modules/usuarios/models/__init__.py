@@ -1,3 +1,3 @@
 # Modelos del módulo de usuarios
 
-from .usuario_models import Persona1, Usuario, Rol, Permiso, LoginLog, RolHistorial, Bitacora
+from .usuario_models import Persona1, Usuario, Rol, Permiso, LoginLog, RolHistorial, Bitacora, TokenRevocado
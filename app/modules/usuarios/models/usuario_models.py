@@ -3,7 +3,7 @@ app/modules/usuarios/models/usuario_models.py
 Modelos del Módulo de Usuarios - AJUSTADO A LA BD EXISTENTE
 """
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Date, Enum, ForeignKey, Table, Text, Boolean
+    Column, Integer, String, DateTime, Date, Enum, ForeignKey, Index, Table, Text, Boolean
 )
 # Registrar tabla cargos en el metadata para resolver FK
 from app.shared.models.cargo import Cargo  # noqa: F401
@@ -143,7 +143,15 @@ class Permiso(Base):
 class LoginLog(Base):
     """LoginLog - RF-08"""
     __tablename__ = "login_logs"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Bloqueo de cuentas: intentos fallidos de un usuario en una ventana de tiempo
+        Index("ix_login_logs_usuario_estado_fecha", "id_usuario", "estado", "fecha_hora"),
+        # Estadísticas por estado y período
+        Index("ix_login_logs_estado_fecha", "estado", "fecha_hora"),
+        # Listado por fecha (keyset sobre fecha_hora, id_log) y retención
+        Index("ix_login_logs_fecha_hora", "fecha_hora"),
+        {'extend_existing': True},
+    )
 
     id_log = Column(Integer, primary_key=True, autoincrement=True)
     id_usuario = Column(Integer, ForeignKey('usuarios.id_usuario', ondelete='CASCADE'), nullable=False)
@@ -181,7 +189,15 @@ class RolHistorial(Base):
 class Bitacora(Base):
     """Bitacora - Auditoría"""
     __tablename__ = "bitacora"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Filtros de /auditoria (siempre con orden o rango por fecha)
+        Index("ix_bitacora_admin_fecha", "id_usuario_admin", "fecha_hora"),
+        Index("ix_bitacora_objetivo_fecha", "tipo_objetivo", "id_objetivo", "fecha_hora"),
+        Index("ix_bitacora_accion_fecha", "accion", "fecha_hora"),
+        # Listado por fecha (keyset sobre fecha_hora, id_bitacora), estadísticas y retención
+        Index("ix_bitacora_fecha_hora", "fecha_hora"),
+        {'extend_existing': True},
+    )
 
     id_bitacora = Column(Integer, primary_key=True, autoincrement=True)
     id_usuario_admin = Column(Integer, ForeignKey('usuarios.id_usuario', ondelete='CASCADE'), nullable=False)
@@ -192,4 +208,17 @@ class Bitacora(Base):
     tipo_objetivo = Column(String(50), nullable=True)
 
     def __repr__(self):
-        return f"<Bitacora admin_id={self.id_usuario_admin} accion={self.accion}>"
\ No newline at end of file
+        return f"<Bitacora admin_id={self.id_usuario_admin} accion={self.accion}>"
+
+class TokenRevocado(Base):
+    """Token JWT revocado (logout) - compartido entre workers"""
+    __tablename__ = "tokens_revocados"
+    __table_args__ = {'extend_existing': True}
+
+    # jti del token o sha256 del token completo (tokens sin jti)
+    token_id = Column(String(64), primary_key=True)
+    expira = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<TokenRevocado {self.token_id} expira={self.expira}>"
\ No newline at end of file
@@ -13,6 +13,8 @@ from app.modules.usuarios.models.usuario_models import (
     Usuario, Persona1, Rol, Permiso, LoginLog, RolHistorial, usuario_roles_table
 )
 from app.modules.auth.services.auth_service import AuthService
+from app.modules.auth.services.principal_cache import principal_cache
+from app.modules.bitacora.services.hidratacion import nombres_cache
 from app.modules.usuarios.dto.usuario_dto import (
     PersonaCreateDTO, PersonaUpdateDTO, PersonaResponseDTO,
     UsuarioCreateDTO, UsuarioUpdateDTO, UsuarioResponseDTO,
@@ -482,6 +484,8 @@ class UsuarioService(BaseService):
             usuario.updated_by = current_user.id_usuario
             
             db.commit()
+            principal_cache.invalidar_usuario(usuario_id)
+            nombres_cache.invalidar(usuario_id)
             db.refresh(usuario)
             
             logger.info(f"Usuario actualizado: {usuario.correo} por usuario {current_user.id_usuario}")
@@ -553,6 +557,7 @@ class UsuarioService(BaseService):
             )
             
             db.commit()
+            principal_cache.invalidar_usuario(usuario_id)
             
             logger.info(f"Usuario eliminado: ID {usuario_id} por usuario {current_user.id_usuario}")
             
@@ -620,6 +625,7 @@ class UsuarioService(BaseService):
             )
             
             db.commit()
+            principal_cache.invalidar_usuario(usuario_id)
             
             logger.info(f"Rol {rol.nombre} asignado a usuario {usuario_id}")
             return {"mensaje": f"Rol {rol.nombre} asignado exitosamente"}
@@ -676,6 +682,7 @@ class UsuarioService(BaseService):
                 )
                 
                 db.commit()
+                principal_cache.invalidar_usuario(usuario_id)
             
             logger.info(f"Rol {rol.nombre} revocado de usuario {usuario_id}")
             return {"mensaje": f"Rol {rol.nombre} revocado exitosamente"}
@@ -845,6 +852,7 @@ class RolService:
                 )
             
             db.commit()
+            principal_cache.invalidar_rol(rol_id)
             db.refresh(rol)
             logger.info(f"Rol actualizado: {rol.nombre}")
             
@@ -912,6 +920,7 @@ class RolService:
                 )
             
             db.commit()
+            principal_cache.invalidar_rol(rol_id)
             logger.info(f"Rol eliminado: ID {rol_id}")
             
             return {
@@ -1000,6 +1009,7 @@ class RolService:
                 )
             
             db.commit()
+            principal_cache.invalidar_rol(rol_id)
             db.refresh(rol)
             
             logger.info(f"Permisos asignados al rol {rol_id}")
@@ -1086,6 +1096,7 @@ class RolService:
                 usuario.updated_by = current_user.id_usuario
             
             db.commit()
+            principal_cache.invalidar_usuario(usuario_id)
             
             logger.info(f"Rol {rol_id} removido de usuario {usuario_id}")
             
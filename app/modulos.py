@@ -0,0 +1,115 @@
+"""
+app/modulos.py
+Registro de módulos de la API (routers) y de los modelos SQLAlchemy
+
+`create_app` (app/main.py) importa solo los routers de los módulos
+seleccionados (APP_MODULES o el parámetro `modulos`), de modo que un worker
+de solo reportes o solo autenticación no carga controladores, servicios ni
+DTOs del resto.
+
+Los modelos se cargan siempre todos (`cargar_modelos`): las relaciones entre
+módulos se resuelven por nombre y necesitan todas las clases registradas.
+"""
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RouterModulo:
+    """Router de un módulo, importado recién al registrarlo"""
+    modulo: str
+    atributo: str = "router"
+    prefix: str = ""
+    tags: Tuple[str, ...] = ()
+
+
+# Orden de registro = orden de coincidencia de rutas
+MODULOS: Dict[str, Tuple[RouterModulo, ...]] = {
+    "auth": (
+        RouterModulo("app.modules.auth.controllers.auth_controller", prefix="/api/auth", tags=("Autenticación",)),
+        # Auth extensiones (registro/login/me/validate-token desde app/core/extensions.py)
+        RouterModulo("app.core.extensions", prefix="/api/auth-ext", tags=("Autenticación Ext",)),
+    ),
+    "usuarios": (
+        RouterModulo("app.modules.usuarios.controllers.usuario_controller", prefix="/api/usuarios", tags=("Usuarios",)),
+    ),
+    "bitacora": (
+        RouterModulo("app.modules.bitacora.controllers.bitacora_controller", prefix="/api/bitacora", tags=("Bitácora",)),
+    ),
+    "incidentes": (
+        RouterModulo("app.modules.incidentes.controllers.controllers_incidentes", prefix="/api/incidentes", tags=("Incidentes",)),
+    ),
+    "esquelas": (
+        RouterModulo("app.modules.esquelas.controllers.esquela_controller", prefix="/api"),
+        RouterModulo("app.modules.esquelas.controllers.codigo_esquela_controller", prefix="/api"),
+    ),
+    "administracion": (
+        RouterModulo("app.modules.administracion.controllers.curso_controller", prefix="/api"),
+        RouterModulo("app.modules.administracion.controllers.administrativo_controller"),
+    ),
+    "reportes": (
+        RouterModulo("app.modules.reportes.controllers.reporte_controller", prefix="/api"),
+    ),
+    # Retiros Tempranos (ya tienen prefix="/api/..." en sus routers)
+    "retiros": (
+        RouterModulo("app.modules.retiros_tempranos.controllers.autorizacion_retiro_controller",
+                     tags=("Retiros Tempranos - Autorizaciones",)),
+        RouterModulo("app.modules.retiros_tempranos.controllers.motivo_retiro_controller",
+                     tags=("Retiros Tempranos - Motivos",)),
+        RouterModulo("app.modules.retiros_tempranos.controllers.registro_salida_controller",
+                     tags=("Retiros Tempranos - Registros",)),
+        RouterModulo("app.modules.retiros_tempranos.controllers.solicitud_retiro_controller",
+                     tags=("Retiros Tempranos - Solicitudes",)),
+        RouterModulo("app.modules.retiros_tempranos.controllers.estudiante_apoderado_controller",
+                     tags=("Retiros Tempranos - Relaciones",)),
+    ),
+}
+
+# Módulos con modelos mapeados (paquetes cuyo __init__ ya importa sus modelos)
+MODELOS: Tuple[str, ...] = (
+    "app.shared.models",
+    "app.modules.usuarios.models",
+    "app.modules.administracion.models.persona_models",
+    "app.modules.administracion.models.administrativo_models",
+    "app.modules.estudiantes.models",
+    "app.modules.esquelas.models.esquela_models",
+    "app.modules.incidentes.models.models_incidentes",
+    "app.modules.retiros_tempranos.models",
+    "app.modules.reportes.models.resumen_models",
+)
+
+
+def resolver_modulos(nombres: Optional[Iterable[str]] = None) -> List[str]:
+    """Validar la selección (vacía o None = todos) y devolverla en orden de registro"""
+    seleccion = {n.strip() for n in (nombres or ()) if n and n.strip()}
+    if not seleccion:
+        return list(MODULOS)
+    desconocidos = seleccion - MODULOS.keys()
+    if desconocidos:
+        raise ValueError(
+            f"Módulos desconocidos: {', '.join(sorted(desconocidos))}. "
+            f"Disponibles: {', '.join(MODULOS)}"
+        )
+    return [nombre for nombre in MODULOS if nombre in seleccion]
+
+
+def cargar_modelos() -> None:
+    """Importar todos los modelos para que las relaciones se resuelvan"""
+    for modulo in MODELOS:
+        import_module(modulo)
+
+
+def registrar_routers(app, nombres: Iterable[str]) -> None:
+    """Importar e incluir los routers de los módulos indicados"""
+    for nombre in nombres:
+        for router in MODULOS[nombre]:
+            app.include_router(
+                getattr(import_module(router.modulo), router.atributo),
+                prefix=router.prefix,
+                tags=list(router.tags) or None
+            )
+        logger.debug("Módulo %s registrado", nombre)
@@ -10,7 +10,7 @@ import logging
 from app.modules.usuarios.models.usuario_models import Usuario
 from app.core.database import get_db
 from app.modules.auth.services.auth_service import get_current_user_dependency
-from app.shared.permission_mapper import tiene_permiso, puede_modificar_usuario, puede_eliminar_usuario
+from app.shared.permission_mapper import tiene_permiso, puede_modificar_usuario, puede_eliminar_usuario, motor_permisos
 
 
 
@@ -125,13 +125,12 @@ def require_permissions(*required_permissions: str):
                 )
             
             # Verificar si tiene al menos uno de los permisos requeridos
-            # Usando el sistema de mapeo
-            tiene_permiso_requerido = False
-            for permiso in required_permissions:
-                if tiene_permiso(current_user, permiso):
-                    tiene_permiso_requerido = True
-                    logger.debug(f"✅ Usuario {current_user.usuario} tiene permiso: {permiso}")
-                    break
+            # (máscara del usuario calculada una vez, un AND por acción)
+            mascara, es_admin = motor_permisos.mascara_usuario(current_user)
+            tiene_permiso_requerido = any(
+                motor_permisos.permite(mascara, es_admin, permiso)
+                for permiso in required_permissions
+            )
             
             if not tiene_permiso_requerido:
                 logger.warning(
@@ -167,10 +166,11 @@ def require_all_permissions(*required_permissions: str):
                 )
             
             # Verificar que tenga TODOS los permisos
-            permisos_faltantes = []
-            for permiso in required_permissions:
-                if not tiene_permiso(current_user, permiso):
-                    permisos_faltantes.append(permiso)
+            mascara, es_admin = motor_permisos.mascara_usuario(current_user)
+            permisos_faltantes = [
+                permiso for permiso in required_permissions
+                if not motor_permisos.permite(mascara, es_admin, permiso)
+            ]
             
             if permisos_faltantes:
                 logger.warning(
@@ -0,0 +1,91 @@
+"""
+app/shared/fast_json.py
+Serialización JSON rápida para las respuestas de la API
+
+- `FastJSONResponse`: respuesta por defecto de la app. Usa orjson si está
+  instalado (`pip install orjson`) y, si no, `json` de la stdlib con salida
+  compacta. FastAPI sigue pasando por `jsonable_encoder` lo que devuelven los
+  endpoints como dict; esta clase solo abarata el paso final a bytes.
+- `serializar`: camino rápido que no pasa por `jsonable_encoder`. Los modelos
+  Pydantic v2 (y listas homogéneas de modelos) se serializan en pydantic-core
+  con `model_dump_json` / `TypeAdapter.dump_json`; el resto con el motor JSON.
+  Lo usa `ResponseModel.success_json` en los listados grandes.
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from typing import Any, List
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+    import json
+
+
+def _por_defecto(valor: Any) -> Any:
+    """Tipos que el motor JSON no conoce (mismas conversiones que jsonable_encoder)"""
+    if isinstance(valor, BaseModel):
+        return valor.model_dump(mode="json")
+    if isinstance(valor, (datetime, date, time)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return int(valor) if valor == valor.to_integral_value() else float(valor)
+    if isinstance(valor, Enum):
+        return valor.value
+    if isinstance(valor, UUID):
+        return str(valor)
+    if isinstance(valor, (set, frozenset, tuple)):
+        return list(valor)
+    if isinstance(valor, bytes):
+        return valor.decode("utf-8", errors="replace")
+    raise TypeError(f"Tipo no serializable a JSON: {type(valor).__name__}")
+
+
+if orjson is not None:
+    MOTOR_JSON = "orjson"
+
+    def dumps(valor: Any) -> bytes:
+        return orjson.dumps(valor, default=_por_defecto, option=orjson.OPT_NON_STR_KEYS)
+else:
+    MOTOR_JSON = "json"
+
+    def dumps(valor: Any) -> bytes:
+        return json.dumps(
+            valor, default=_por_defecto, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+@lru_cache(maxsize=256)
+def _adaptador_lista(modelo: type) -> TypeAdapter:
+    return TypeAdapter(List[modelo])
+
+
+def serializar(valor: Any) -> bytes:
+    """JSON de un valor; modelos Pydantic y listas de un mismo modelo sin jsonable_encoder"""
+    if isinstance(valor, BaseModel):
+        return valor.model_dump_json().encode("utf-8")
+    if isinstance(valor, list) and valor and isinstance(valor[0], BaseModel):
+        modelo = type(valor[0])
+        if all(type(item) is modelo for item in valor):
+            return _adaptador_lista(modelo).dump_json(valor)
+    return dumps(valor)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse con orjson (o stdlib compacta) para el render"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class PreSerializedJSONResponse(JSONResponse):
+    """Respuesta cuyo cuerpo ya viene serializado en bytes"""
+
+    def render(self, content: bytes) -> bytes:
+        return content
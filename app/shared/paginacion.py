@@ -0,0 +1,132 @@
+"""
+app/shared/paginacion.py
+Paginación por cursor (keyset) y totales baratos
+
+Los listados ordenados por (fecha DESC, id DESC) avanzan con
+`WHERE (fecha, id) < (última fila)` en vez de `OFFSET`, así que cualquier
+página cuesta lo mismo que la primera (con un índice sobre (fecha, id)).
+
+El cursor es opaco para el cliente: base64 de la fila de corte y la dirección.
+
+Totales (`ModoTotal`):
+- "exacto":     COUNT(*) completo (lo que hacía el paginado por offset)
+- "limitado":   COUNT(*) hasta TOTAL_COUNT_CAP filas; si llega al tope, no es exacto
+- "aproximado": sin filtros y en MySQL, TABLE_ROWS de information_schema;
+                con filtros, igual que "limitado"
+- "ninguno":    no se cuenta
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Literal, Optional, Sequence, Tuple
+import base64
+import json
+
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.sql import Select
+
+ModoTotal = Literal["exacto", "aproximado", "limitado", "ninguno"]
+
+SIGUIENTE = "n"
+ANTERIOR = "p"
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Fila de corte (fecha, id) y dirección de la página pedida"""
+    fecha: datetime
+    id: int
+    direccion: str = SIGUIENTE
+
+
+def codificar_cursor(fecha: datetime, id_fila: int, direccion: str) -> str:
+    datos = json.dumps({"f": fecha.isoformat(), "i": id_fila, "d": direccion}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(datos.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Cursor:
+    """Leer un cursor recibido del cliente; ValueError si no es válido"""
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        direccion = datos.get("d", SIGUIENTE)
+        if direccion not in (SIGUIENTE, ANTERIOR):
+            raise ValueError(direccion)
+        return Cursor(datetime.fromisoformat(datos["f"]), int(datos["i"]), direccion)
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+
+def aplicar_keyset(stmt: Select, columna_fecha, columna_id, cursor: Optional[Cursor], limit: int) -> Select:
+    """
+    Filtro y orden de la página. Se pide una fila más para saber si hay otra página.
+    Hacia atrás se recorre en orden ascendente (luego `cortar_pagina` invierte).
+    """
+    if cursor is None or cursor.direccion == SIGUIENTE:
+        if cursor is not None:
+            stmt = stmt.where(or_(
+                columna_fecha < cursor.fecha,
+                and_(columna_fecha == cursor.fecha, columna_id < cursor.id)
+            ))
+        return stmt.order_by(columna_fecha.desc(), columna_id.desc()).limit(limit + 1)
+
+    stmt = stmt.where(or_(
+        columna_fecha > cursor.fecha,
+        and_(columna_fecha == cursor.fecha, columna_id > cursor.id)
+    ))
+    return stmt.order_by(columna_fecha.asc(), columna_id.asc()).limit(limit + 1)
+
+
+def cortar_pagina(
+    filas: Sequence[Any],
+    cursor: Optional[Cursor],
+    limit: int,
+    atributo_fecha: str,
+    atributo_id: str
+) -> Tuple[List[Any], dict]:
+    """Filas de la página (más recientes primero) y los cursores next/prev"""
+    hay_mas = len(filas) > limit
+    filas = list(filas[:limit])
+    hacia_atras = cursor is not None and cursor.direccion == ANTERIOR
+    if hacia_atras:
+        filas.reverse()
+
+    def _cursor(fila, direccion):
+        return codificar_cursor(getattr(fila, atributo_fecha), getattr(fila, atributo_id), direccion)
+
+    # Hacia adelante: hay anteriores si se llegó con cursor. Hacia atrás: hay siguientes siempre.
+    hay_siguiente = hay_mas if not hacia_atras else True
+    hay_anterior = hay_mas if hacia_atras else cursor is not None
+    return filas, {
+        "next_cursor": _cursor(filas[-1], SIGUIENTE) if filas and hay_siguiente else None,
+        "prev_cursor": _cursor(filas[0], ANTERIOR) if filas and hay_anterior else None,
+        "has_more": bool(filas) and hay_siguiente,
+    }
+
+
+def stmt_conteo(tabla, condiciones: Sequence, tope: Optional[int] = None) -> Select:
+    """COUNT(*) filtrado; con tope, cuenta como máximo `tope` filas"""
+    if tope is None:
+        return select(func.count()).select_from(tabla).where(*condiciones)
+    limitado = select(text("1")).select_from(tabla).where(*condiciones).limit(tope).subquery()
+    return select(func.count()).select_from(limitado)
+
+
+# Filas estimadas por InnoDB (ANALYZE TABLE las actualiza); no requiere recorrer la tabla
+STMT_FILAS_ESTIMADAS_MYSQL = text(
+    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :tabla"
+)
+
+
+def plan_total(modo: ModoTotal, dialecto: str, hay_filtros: bool, tope: int) -> Tuple[str, Optional[int]]:
+    """
+    Qué consulta usar para el total: ("exacto" | "estimado" | "limitado" | "ninguno", tope)
+    El tope acompaña a "estimado" para contar con límite si no hay estadísticas.
+    """
+    if modo == "ninguno":
+        return "ninguno", None
+    if modo == "exacto":
+        return "exacto", None
+    if modo == "aproximado" and not hay_filtros and dialecto == "mysql":
+        return "estimado", tope
+    return "limitado", tope
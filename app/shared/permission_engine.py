@@ -0,0 +1,133 @@
+"""
+app/shared/permission_engine.py
+Motor de autorización compilado (máscaras de bits)
+
+Cada par (permiso, módulo) recibe una posición de bit. Un rol se reduce a la
+OR de los bits de sus permisos activos y una acción de PERMISSION_MAP a la OR
+de los pares que la satisfacen. Verificar una acción es entonces un único AND:
+
+    mascara_usuario & mascara_accion != 0
+"""
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+
+ParPermiso = Tuple[str, str]  # (nombre_permiso, modulo)
+
+
+class PermissionEngine:
+    """Traduce PERMISSION_MAP y roles a máscaras enteras"""
+
+    def __init__(self, permission_map: Dict[str, Tuple[List[str], str]], admin_roles: Iterable[str]):
+        self._lock = Lock()
+        self._bits: Dict[ParPermiso, int] = {}
+        self._pares: List[ParPermiso] = []
+        self.admin_roles: FrozenSet[str] = frozenset(admin_roles)
+        self.acciones: Dict[str, int] = {}
+        self.compilar(permission_map)
+
+    # ==================== COMPILACIÓN ====================
+
+    def compilar(self, permission_map: Dict[str, Tuple[List[str], str]]) -> None:
+        """Asignar bits a todos los pares del mapa y precalcular la máscara de cada acción"""
+        acciones = {}
+        for accion, (permisos_requeridos, modulo) in permission_map.items():
+            mascara = 0
+            for permiso in permisos_requeridos:
+                mascara |= self.bit((permiso, modulo))
+            acciones[accion] = mascara
+        self.acciones = acciones
+        self._mascara_snapshot.cache_clear()
+
+    def bit(self, par: ParPermiso) -> int:
+        """
+        Bit asociado a un par (permiso, módulo).
+        Los pares que no figuran en PERMISSION_MAP reciben un bit nuevo la
+        primera vez que aparecen, para poder reconstruir la lista completa.
+        """
+        posicion = self._bits.get(par)
+        if posicion is None:
+            with self._lock:
+                posicion = self._bits.get(par)
+                if posicion is None:
+                    posicion = len(self._pares)
+                    self._pares.append(par)
+                    self._bits[par] = posicion
+        return 1 << posicion
+
+    # ==================== MÁSCARAS ====================
+
+    def mascara_pares(self, pares: Iterable[ParPermiso]) -> int:
+        """OR de los bits de un conjunto de pares"""
+        mascara = 0
+        for par in pares:
+            mascara |= self.bit(par)
+        return mascara
+
+    def mascara_rol(self, rol) -> int:
+        """Máscara de los permisos activos de un rol"""
+        mascara = 0
+        for permiso in rol.permisos:
+            if permiso.is_active:
+                mascara |= self.bit((permiso.nombre, permiso.modulo))
+        return mascara
+
+    @lru_cache(maxsize=2048)
+    def _mascara_snapshot(self, permisos: FrozenSet[ParPermiso], nombres_roles: FrozenSet[str]) -> Tuple[int, bool]:
+        return self.mascara_pares(permisos), not self.admin_roles.isdisjoint(nombres_roles)
+
+    def mascara_usuario(self, usuario) -> Tuple[int, bool]:
+        """
+        Retorna (mascara, es_admin) del usuario.
+
+        - `UsuarioPrincipal` (inmutable): se memoiza por su conjunto de
+          permisos y roles, por lo que el costo es un lookup en caché.
+        - `Usuario` ORM: se calcula recorriendo roles activos una sola vez
+          y se guarda en la instancia (vive lo que dura el request).
+        """
+        permisos = getattr(usuario, "permisos", None)
+        if isinstance(permisos, frozenset):
+            return self._mascara_snapshot(permisos, usuario.nombres_roles)
+
+        cacheado = usuario.__dict__.get("_mascara_permisos")
+        if cacheado is not None:
+            return cacheado
+
+        mascara = 0
+        es_admin = False
+        for rol in usuario.roles:
+            if not rol.is_active:
+                continue
+            if rol.nombre in self.admin_roles:
+                es_admin = True
+            mascara |= self.mascara_rol(rol)
+
+        resultado = (mascara, es_admin)
+        usuario.__dict__["_mascara_permisos"] = resultado
+        return resultado
+
+    # ==================== CONSULTAS ====================
+
+    def permite(self, mascara: int, es_admin: bool, accion: str) -> bool:
+        """Verificar una acción contra una máscara ya calculada"""
+        if es_admin:
+            return True
+        return bool(mascara & self.acciones.get(accion, 0))
+
+    def acciones_permitidas(self, mascara: int, es_admin: bool) -> List[str]:
+        """Todas las acciones de PERMISSION_MAP que concede la máscara"""
+        if es_admin:
+            return list(self.acciones)
+        return [accion for accion, bits in self.acciones.items() if mascara & bits]
+
+    def pares(self, mascara: int) -> List[ParPermiso]:
+        """Decodificar una máscara a la lista de pares (permiso, módulo)"""
+        pares = []
+        posicion = 0
+        while mascara:
+            if mascara & 1:
+                pares.append(self._pares[posicion])
+            mascara >>= 1
+            posicion += 1
+        return pares
@@ -5,6 +5,7 @@ Mapeo de acciones específicas a permisos genéricos + módulos
 """
 from typing import Dict, List, Set, Tuple
 from app.modules.usuarios.models.usuario_models import Usuario
+from app.shared.permission_engine import PermissionEngine
 import logging
 
 logger = logging.getLogger(__name__)
@@ -83,6 +84,10 @@ ADMIN_ROLES = ["Director", "Admin"]
 ROLES_VER_TODAS_ESQUELAS = ["Director", "Regente", "Admin", "Administrativo", "Administrador"]
 ROLES_VER_PROPIAS_ESQUELAS = ["Profesor"]
 
+# Motor compilado a partir de PERMISSION_MAP (se construye al importar el módulo)
+motor_permisos = PermissionEngine(PERMISSION_MAP, ADMIN_ROLES)
+
+
 def tiene_permiso(usuario: Usuario, accion: str) -> bool:
     """
     Verificar si un usuario tiene permiso para realizar una acción
@@ -101,57 +106,25 @@ def tiene_permiso(usuario: Usuario, accion: str) -> bool:
         3. Verificar que el usuario tenga:
            - Al menos UNO de los permisos genéricos requeridos
            - Y que ese permiso sea del módulo correcto
+    
+    La verificación es un AND de bits entre la máscara del usuario
+    (memoizada) y la máscara precompilada de la acción.
     """
     if not usuario or not hasattr(usuario, 'roles'):
-        logger.warning(f"Usuario sin roles intentando acción: {accion}")
+        logger.warning("Usuario sin roles intentando acción: %s", accion)
         return False
     
-    # DEBUG: Roles del usuario
-    roles_usuario = [r.nombre for r in usuario.roles if r.is_active]
-    logger.debug(f"Usuario {usuario.usuario} tiene roles: {roles_usuario}")
-    
-    # 1. Verificar si tiene un rol de administrador (acceso total)
-    for rol in usuario.roles:
-        if not rol.is_active:
-            continue
-        if rol.nombre in ADMIN_ROLES:
-            logger.debug(f"✅ Usuario {usuario.usuario} tiene rol admin: {rol.nombre}")
-            return True
+    mascara, es_admin = motor_permisos.mascara_usuario(usuario)
+    if motor_permisos.permite(mascara, es_admin, accion):
+        return True
     
-    # 2. Buscar el mapeo de la acción
     mapeo = PERMISSION_MAP.get(accion)
-    
     if not mapeo:
-        logger.warning(f"❌ Acción no mapeada: {accion}")
+        logger.warning("❌ Acción no mapeada: %s", accion)
         return False
     
-    permisos_requeridos, modulo_requerido = mapeo
-    
-    logger.debug(f"Acción '{accion}' requiere:")
-    logger.debug(f"  - Permisos: {permisos_requeridos}")
-    logger.debug(f"  - Módulo: {modulo_requerido}")
-    
-    # 3. Obtener permisos del usuario (con módulo)
-    permisos_usuario: Set[Tuple[str, str]] = set()  # Set de (permiso_nombre, modulo)
-    
-    for rol in usuario.roles:
-        if not rol.is_active:
-            continue
-        for permiso in rol.permisos:
-            if permiso.is_active:
-                permisos_usuario.add((permiso.nombre, permiso.modulo))
-    
-    logger.debug(f"Permisos del usuario: {permisos_usuario}")
-    
-    # 4. Verificar si el usuario tiene el permiso correcto en el módulo correcto
-    for permiso_req in permisos_requeridos:
-        # Buscar tupla (permiso_req, modulo_requerido) en permisos_usuario
-        if (permiso_req, modulo_requerido) in permisos_usuario:
-            logger.debug(f"✅ PERMISO CONCEDIDO: {permiso_req} en módulo {modulo_requerido}")
-            return True
-    
-    logger.warning(f"❌ Usuario {usuario.usuario} NO tiene permisos para: {accion}")
-    logger.warning(f"   Necesita: {permisos_requeridos} en módulo '{modulo_requerido}'")
+    logger.warning("❌ Usuario %s NO tiene permisos para: %s", usuario.usuario, accion)
+    logger.warning("   Necesita: %s en módulo '%s'", mapeo[0], mapeo[1])
     return False
 
 
@@ -173,17 +146,10 @@ def obtener_permisos_usuario(usuario: Usuario) -> List[Dict[str, str]]:
     if not usuario or not hasattr(usuario, 'roles'):
         return []
     
-    permisos: Set[Tuple[str, str]] = set()
-    for rol in usuario.roles:
-        if not rol.is_active:
-            continue
-        for permiso in rol.permisos:
-            if permiso.is_active:
-                permisos.add((permiso.nombre, permiso.modulo))
-    
+    mascara, _ = motor_permisos.mascara_usuario(usuario)
     return [
-        {"permiso": p[0], "modulo": p[1]} 
-        for p in permisos
+        {"permiso": permiso, "modulo": modulo}
+        for permiso, modulo in motor_permisos.pares(mascara)
     ]
 
 
@@ -197,15 +163,11 @@ def obtener_acciones_usuario(usuario: Usuario) -> List[str]:
     Returns:
         Lista de acciones (ej: ["crear_usuario", "ver_incidente"])
     """
-    if not usuario:
+    if not usuario or not hasattr(usuario, 'roles'):
         return []
     
-    acciones = []
-    for accion in PERMISSION_MAP.keys():
-        if tiene_permiso(usuario, accion):
-            acciones.append(accion)
-    
-    return acciones
+    mascara, es_admin = motor_permisos.mascara_usuario(usuario)
+    return motor_permisos.acciones_permitidas(mascara, es_admin)
 
 
 def obtener_modulos_permitidos(usuario: Usuario) -> List[str]:
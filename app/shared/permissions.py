@@ -8,6 +8,7 @@ from typing import Callable
 import inspect
 
 from app.modules.usuarios.models.usuario_models import Usuario
+from app.modules.auth.services.principal_cache import UsuarioPrincipal
 from app.shared.permission_mapper import tiene_permiso
 
 
@@ -51,7 +52,7 @@ def requires_permission(permission_name: str):
                     current_user = kwargs.get('current_user')
                 
                 # Verificar que tenemos un usuario
-                if not current_user or not isinstance(current_user, Usuario):
+                if not current_user or not isinstance(current_user, (Usuario, UsuarioPrincipal)):
                     raise HTTPException(
                         status_code=status.HTTP_401_UNAUTHORIZED,
                         detail="No autorizado - Usuario no autenticado",
@@ -70,8 +71,9 @@ def requires_permission(permission_name: str):
             
             return async_wrapper
         else:
+            # Wrapper síncrono: FastAPI lo ejecuta en el threadpool (la Session bloquea)
             @wraps(func)
-            async def sync_wrapper(*args, **kwargs):
+            def sync_wrapper(*args, **kwargs):
                 # Obtener parámetros de la función
                 sig = inspect.signature(func)
                 bound_args = sig.bind_partial(*args, **kwargs)
@@ -85,7 +87,7 @@ def requires_permission(permission_name: str):
                     current_user = kwargs.get('current_user')
                 
                 # Verificar que tenemos un usuario
-                if not current_user or not isinstance(current_user, Usuario):
+                if not current_user or not isinstance(current_user, (Usuario, UsuarioPrincipal)):
                     raise HTTPException(
                         status_code=status.HTTP_401_UNAUTHORIZED,
                         detail="No autorizado - Usuario no autenticado",
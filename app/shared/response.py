@@ -5,6 +5,8 @@ Compatible con tests de seguridad
 """
 from typing import Any, Optional, List
 
+from starlette.responses import Response
+
 
 class ResponseModel:
     """Modelo de respuesta estándar para toda la API"""
@@ -32,6 +34,26 @@ class ResponseModel:
             "data": data
         }
     
+    @staticmethod
+    def success_json(
+        message: str,
+        data: Any = None,
+        status_code: int = 200
+    ) -> Response:
+        """
+        Respuesta exitosa ya serializada (listados grandes)
+        
+        Misma forma que `success`, pero se devuelve como Response, así que FastAPI
+        no pasa `data` por jsonable_encoder. Los DTO Pydantic (o listas de un
+        mismo DTO) se serializan con model_dump_json; ver app/shared/fast_json.py.
+        
+        Returns:
+            Response: {"success": true, "message": "...", "data": ...}
+        """
+        from app.shared.fast_json import PreSerializedJSONResponse, dumps, serializar
+        cuerpo = b'{"success":true,"message":' + dumps(message) + b',"data":' + serializar(data) + b'}'
+        return PreSerializedJSONResponse(content=cuerpo, status_code=status_code)
+    
     @staticmethod
     def error(
         message: str, 
@@ -9,6 +9,7 @@ from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import os
+import uuid
 import hashlib
 import logging
 
@@ -92,7 +93,12 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     elif "usuario_id" in to_encode:
         to_encode["sub"] = str(to_encode["usuario_id"])
 
-    to_encode.update({"exp": expire})
+    # iat + jti identifican el token (caché de principal y revocación)
+    to_encode.update({
+        "exp": expire,
+        "iat": datetime.utcnow(),
+        "jti": uuid.uuid4().hex
+    })
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -0,0 +1 @@
+# Benchmarks de rendimiento (ejecutar con python -m benchmarks.<nombre>)
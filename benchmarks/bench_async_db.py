@@ -0,0 +1,156 @@
+"""
+benchmarks/bench_async_db.py
+Benchmark: rendimiento por worker de un endpoint de lectura con sesión síncrona vs. AsyncSession
+
+Uso:
+    pip install -r requirements-dev.txt  # aiosqlite
+    python -m benchmarks.bench_async_db [--peticiones 400] [--concurrencia 40] [--latencia-ms 5]
+
+Se usa el listado de notificaciones (mismo modelo y repositorios que la API)
+sobre un archivo SQLite temporal. Cada sentencia SQL espera `--latencia-ms`
+en el hilo que la ejecuta, para simular la ida y vuelta a MySQL:
+
+- async def + Session     (antes): la espera bloquea el event loop
+- def + Session           (threadpool): limitado por los hilos del pool
+- async def + AsyncSession (después): la espera no bloquea el event loop
+
+Las peticiones pasan por la pila ASGI completa (httpx.ASGITransport) en un
+solo proceso, como un worker de uvicorn.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import Depends, FastAPI  # noqa: E402
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+
+from app.modulos import cargar_modelos  # noqa: E402
+from app.modules.incidentes.models.models_incidentes import Notificacion  # noqa: E402
+from app.modules.incidentes.repositories.repositories_notificaciones import NotificacionRepository  # noqa: E402
+from app.modules.incidentes.repositories.repositories_notificaciones_async import (  # noqa: E402
+    NotificacionRepositoryAsync
+)
+
+cargar_modelos()
+
+
+def _crear_base(ruta: str, filas: int) -> None:
+    engine = create_engine(f"sqlite:///{ruta}")
+    Notificacion.__table__.create(bind=engine)
+    with engine.begin() as conexion:
+        conexion.execute(Notificacion.__table__.insert(), [
+            {"id_usuario": 1 + i % 10, "titulo": f"Aviso {i}", "mensaje": "Incidente derivado"}
+            for i in range(filas)
+        ])
+    engine.dispose()
+
+
+def _crear_app(ruta: str, latencia: float) -> FastAPI:
+    def dormir(_sentencia):
+        time.sleep(latencia)
+
+    engine = create_engine(f"sqlite:///{ruta}", pool_size=10, max_overflow=30)
+    engine_async = create_async_engine(f"sqlite+aiosqlite:///{ruta}", pool_size=10, max_overflow=30)
+
+    @event.listens_for(engine, "connect")
+    def _latencia_sync(dbapi_connection, _):
+        dbapi_connection.set_trace_callback(dormir)
+
+    @event.listens_for(engine_async.sync_engine, "connect")
+    def _latencia_async(dbapi_connection, _):
+        # Se ejecuta en el hilo de aiosqlite, igual que la consulta
+        dbapi_connection.run_async(lambda conexion: conexion.set_trace_callback(dormir))
+
+    SessionBench = sessionmaker(bind=engine, autoflush=False)
+    AsyncSessionBench = async_sessionmaker(engine_async, expire_on_commit=False)
+
+    def get_db():
+        db = SessionBench()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionBench() as db:
+            yield db
+
+    repo = NotificacionRepository()
+    repo_async = NotificacionRepositoryAsync()
+    bench = FastAPI()
+
+    @bench.get("/async-sync/{id_usuario}")
+    async def async_con_session(id_usuario: int, db: Session = Depends(get_db)):
+        return len(repo.get_by_usuario(db, id_usuario, limit=20))
+
+    @bench.get("/threadpool/{id_usuario}")
+    def def_con_session(id_usuario: int, db: Session = Depends(get_db)):
+        return len(repo.get_by_usuario(db, id_usuario, limit=20))
+
+    @bench.get("/async/{id_usuario}")
+    async def async_con_async_session(id_usuario: int, db: AsyncSession = Depends(get_async_db)):
+        return len(await repo_async.get_by_usuario(db, id_usuario, limit=20))
+
+    bench.state.engines = (engine, engine_async)
+    return bench
+
+
+async def _medir(bench: FastAPI, ruta: str, peticiones: int, concurrencia: int) -> float:
+    transporte = httpx.ASGITransport(app=bench)
+    semaforo = asyncio.Semaphore(concurrencia)
+
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        async def una(i: int):
+            async with semaforo:
+                respuesta = await cliente.get(f"{ruta}/{1 + i % 10}")
+                respuesta.raise_for_status()
+
+        await asyncio.gather(*(una(i) for i in range(concurrencia)))  # calentar el pool
+        inicio = time.perf_counter()
+        await asyncio.gather(*(una(i) for i in range(peticiones)))
+        return peticiones / (time.perf_counter() - inicio)
+
+
+async def _ejecutar(args) -> None:
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "bench.db")
+        _crear_base(ruta, args.filas)
+        bench = _crear_app(ruta, args.latencia_ms / 1000)
+
+        print(f"{args.peticiones} peticiones, concurrencia {args.concurrencia}, "
+              f"latencia simulada {args.latencia_ms} ms por sentencia")
+        for nombre, ruta_endpoint in (
+            ("async def + Session (antes)", "/async-sync"),
+            ("def + Session (threadpool)", "/threadpool"),
+            ("async def + AsyncSession (después)", "/async"),
+        ):
+            rps = await _medir(bench, ruta_endpoint, args.peticiones, args.concurrencia)
+            print(f"  {nombre:<36} {rps:10.1f} req/s")
+
+        engine, engine_async = bench.state.engines
+        engine.dispose()
+        await engine_async.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--peticiones", type=int, default=400)
+    parser.add_argument("--concurrencia", type=int, default=40)
+    parser.add_argument("--latencia-ms", type=float, default=5.0)
+    parser.add_argument("--filas", type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(_ejecutar(args))
+
+
+if __name__ == "__main__":
+    main()
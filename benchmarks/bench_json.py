@@ -0,0 +1,87 @@
+"""
+benchmarks/bench_json.py
+Benchmark: tiempo de serialización de 10k personas (jsonable_encoder + JSONResponse vs. camino rápido)
+
+Uso:
+    python -m benchmarks.bench_json [--personas 10000] [--repeticiones 5]
+
+Se mide solo la serialización de la respuesta (sin BD ni ASGI), sobre los
+mismos datos en dos formas: DTOs Pydantic (`PersonaResponseDTO`, como
+`listar_usuarios`) y dicts (como `listar_personas`). El motor JSON (orjson o
+json de la stdlib) se informa en la salida.
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.modules.usuarios.dto.usuario_dto import PersonaResponseDTO  # noqa: E402
+from app.shared.fast_json import MOTOR_JSON, FastJSONResponse  # noqa: E402
+from app.shared.response import ResponseModel  # noqa: E402
+
+
+def _personas(n: int):
+    return [
+        PersonaResponseDTO(
+            id_persona=i,
+            ci=f"{1000000 + i}",
+            nombres=f"Nombre {i}",
+            apellido_paterno="Pérez",
+            apellido_materno="Quispe",
+            correo=f"persona{i}@brisa.edu.bo",
+            telefono="70000000",
+            direccion="Av. Siempre Viva 742",
+            tipo_persona="profesor" if i % 3 else "administrativo",
+            is_active=i % 7 != 0,
+            usuario=f"usuario{i}",
+            id_usuario=i,
+            tiene_acceso=True,
+        )
+        for i in range(n)
+    ]
+
+
+def _mejor_tiempo(funcion, repeticiones: int) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--personas", type=int, default=10000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    dtos = _personas(args.personas)
+    dicts = [dto.model_dump() for dto in dtos]
+    mensaje = "Personas obtenidas"
+
+    casos = (
+        ("DTOs: jsonable_encoder + JSONResponse (antes)",
+         lambda: JSONResponse(jsonable_encoder(ResponseModel.success(mensaje, dtos))).body),
+        ("DTOs: jsonable_encoder + FastJSONResponse",
+         lambda: FastJSONResponse(jsonable_encoder(ResponseModel.success(mensaje, dtos))).body),
+        ("DTOs: ResponseModel.success_json",
+         lambda: ResponseModel.success_json(mensaje, dtos).body),
+        ("dicts: jsonable_encoder + JSONResponse (antes)",
+         lambda: JSONResponse(jsonable_encoder(ResponseModel.success(mensaje, dicts))).body),
+        ("dicts: ResponseModel.success_json",
+         lambda: ResponseModel.success_json(mensaje, dicts).body),
+    )
+
+    print(f"{args.personas} personas, mejor de {args.repeticiones} (motor JSON: {MOTOR_JSON})")
+    for nombre, funcion in casos:
+        segundos = _mejor_tiempo(funcion, args.repeticiones)
+        print(f"  {nombre:<48} {segundos * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
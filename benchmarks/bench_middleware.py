@@ -0,0 +1,108 @@
+"""
+benchmarks/bench_middleware.py
+Benchmark: latencia p50/p99 de un endpoint trivial con middlewares BaseHTTPMiddleware vs. ASGI puros
+
+Uso:
+    python -m benchmarks.bench_middleware [--peticiones 5000]
+
+Ambas apps tienen la misma pila (logging + CORS + JWT) y el mismo endpoint;
+solo cambia la implementación de los middlewares de logging y JWT. Las
+peticiones pasan por httpx.ASGITransport (sin red), así que la diferencia es
+el costo propio de los middlewares.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from typing import Callable
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+import httpx  # noqa: E402
+
+from app.core.middleware.jwt_middleware import JWTMiddleware, PUBLIC_ROUTES  # noqa: E402
+from app.core.middleware.logging_middleware import RequestLoggingMiddleware  # noqa: E402
+
+logger = logging.getLogger("bench")
+
+
+class JWTMiddlewareAnterior(BaseHTTPMiddleware):
+    """Implementación anterior (BaseHTTPMiddleware + any(startswith))"""
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        if request.method == "OPTIONS":
+            return await call_next(request)
+        if any(request.url.path.startswith(route) for route in PUBLIC_ROUTES):
+            return await call_next(request)
+
+        auth_header = request.headers.get("Authorization")
+        parts = auth_header.split() if auth_header else []
+        if len(parts) != 2 or parts[0].lower() != "bearer":
+            return JSONResponse(status_code=401, content={"success": False, "message": "Token no proporcionado", "data": None})
+
+        request.state.token = parts[1]
+        request.state.client_ip = request.client.host if request.client else "unknown"
+        return await call_next(request)
+
+
+def _crear_app(anterior: bool) -> FastAPI:
+    bench = FastAPI()
+
+    @bench.get("/api/ping")
+    def ping():
+        return {"ok": True}
+
+    if anterior:
+        @bench.middleware("http")
+        async def log_requests(request: Request, call_next):
+            logger.info(f"Incoming request: {request.method} {request.url.path}")
+            response = await call_next(request)
+            logger.info(f"Response status: {response.status_code}")
+            return response
+    else:
+        bench.add_middleware(RequestLoggingMiddleware)
+
+    bench.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True,
+                         allow_methods=["*"], allow_headers=["*"])
+    bench.add_middleware(JWTMiddlewareAnterior if anterior else JWTMiddleware)
+    return bench
+
+
+async def _medir(bench: FastAPI, peticiones: int):
+    transporte = httpx.ASGITransport(app=bench)
+    cabeceras = {"Authorization": "Bearer token-de-prueba"}
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+        for _ in range(200):  # calentar
+            await cliente.get("/api/ping", headers=cabeceras)
+
+        tiempos = []
+        for _ in range(peticiones):
+            inicio = time.perf_counter()
+            respuesta = await cliente.get("/api/ping", headers=cabeceras)
+            tiempos.append(time.perf_counter() - inicio)
+            assert respuesta.status_code == 200
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--peticiones", type=int, default=5000)
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)  # medir los middlewares, no la salida del log
+
+    print(f"{args.peticiones} peticiones secuenciales a GET /api/ping")
+    for nombre, anterior in (("BaseHTTPMiddleware (antes)", True), ("ASGI puro (después)", False)):
+        tiempos = asyncio.run(_medir(_crear_app(anterior), args.peticiones))
+        percentiles = statistics.quantiles(tiempos, n=100)
+        print(f"  {nombre:<28} p50 {percentiles[49] * 1e6:8.1f} µs   p99 {percentiles[98] * 1e6:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
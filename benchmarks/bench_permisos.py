@@ -0,0 +1,114 @@
+"""
+benchmarks/bench_permisos.py
+Micro-benchmark: verificación de permisos por recorrido de roles vs. máscaras de bits
+
+Uso:
+    python -m benchmarks.bench_permisos [--roles 40] [--permisos 12] [--iteraciones 20000]
+
+No requiere base de datos: los usuarios se construyen en memoria con la misma
+forma que el modelo ORM (roles[].permisos[]) y que el UsuarioPrincipal cacheado.
+"""
+import argparse
+import logging
+import os
+import timeit
+from types import SimpleNamespace
+from typing import Set, Tuple
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.modules.auth.services.principal_cache import UsuarioPrincipal  # noqa: E402
+from app.shared.permission_mapper import (  # noqa: E402
+    PERMISSION_MAP, ADMIN_ROLES, tiene_permiso, obtener_acciones_usuario, motor_permisos
+)
+
+MODULOS = ["usuarios", "esquelas", "incidentes", "retiros_tempranos", "reportes", "profesores", "administracion"]
+PERMISOS = ["Lectura", "Agregar", "Modificar", "Eliminar"]
+
+
+def tiene_permiso_recorrido(usuario, accion: str) -> bool:
+    """Implementación anterior: recorre roles y permisos en cada llamada"""
+    for rol in usuario.roles:
+        if rol.is_active and rol.nombre in ADMIN_ROLES:
+            return True
+
+    mapeo = PERMISSION_MAP.get(accion)
+    if not mapeo:
+        return False
+    permisos_requeridos, modulo_requerido = mapeo
+
+    permisos_usuario: Set[Tuple[str, str]] = set()
+    for rol in usuario.roles:
+        if not rol.is_active:
+            continue
+        for permiso in rol.permisos:
+            if permiso.is_active:
+                permisos_usuario.add((permiso.nombre, permiso.modulo))
+
+    return any((p, modulo_requerido) in permisos_usuario for p in permisos_requeridos)
+
+
+def construir_usuario(n_roles: int, n_permisos: int) -> SimpleNamespace:
+    """Usuario con muchos roles sin privilegio de administrador"""
+    roles = []
+    for i in range(n_roles):
+        permisos = [
+            SimpleNamespace(
+                id_permiso=i * n_permisos + j,
+                nombre=PERMISOS[(i + j) % len(PERMISOS)],
+                modulo=MODULOS[(i * 3 + j) % len(MODULOS)] if j else f"modulo_{i}",
+                is_active=True
+            )
+            for j in range(n_permisos)
+        ]
+        roles.append(SimpleNamespace(id_rol=i, nombre=f"Rol {i}", is_active=True, permisos=permisos))
+    return SimpleNamespace(
+        id_usuario=1, id_persona=1, usuario="bench", correo="bench@brisa.bo",
+        is_active=True, roles=roles, persona=None
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--roles", type=int, default=40)
+    parser.add_argument("--permisos", type=int, default=12)
+    parser.add_argument("--iteraciones", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Las denegaciones registran WARNING; no medir el costo del logging
+    logging.disable(logging.WARNING)
+
+    orm_like = construir_usuario(args.roles, args.permisos)
+    principal = UsuarioPrincipal.desde_usuario(orm_like)
+    acciones = list(PERMISSION_MAP)
+
+    def recorrido():
+        for accion in acciones:
+            tiene_permiso_recorrido(orm_like, accion)
+
+    def bitmap_principal():
+        for accion in acciones:
+            tiene_permiso(principal, accion)
+
+    def bitmap_mascara():
+        mascara, es_admin = motor_permisos.mascara_usuario(principal)
+        for accion in acciones:
+            motor_permisos.permite(mascara, es_admin, accion)
+
+    # Mismo resultado en ambos caminos
+    esperado = [a for a in acciones if tiene_permiso_recorrido(orm_like, a)]
+    assert esperado == obtener_acciones_usuario(principal), "Los resultados no coinciden"
+
+    print(f"Usuario: {args.roles} roles x {args.permisos} permisos, {len(acciones)} acciones por vuelta")
+    for nombre, fn in (
+        ("recorrido de roles (anterior)", recorrido),
+        ("tiene_permiso (bitmap)", bitmap_principal),
+        ("mascara + permite (bitmap)", bitmap_mascara),
+    ):
+        segundos = min(timeit.repeat(fn, number=args.iteraciones // len(acciones) or 1, repeat=5))
+        por_check = segundos / ((args.iteraciones // len(acciones) or 1) * len(acciones)) * 1e9
+        print(f"  {nombre:<32} {por_check:10.1f} ns/verificación")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Comandos de mantenimiento de BRISA Backend
+
+Uso:
+    python manage.py reconstruir-resumenes [--desde AAAA-MM-DD]
+    python manage.py perfil-importacion [--modulos auth,reportes] [--top 25] [--profundidad 3]
+    python manage.py archivar-auditoria --meses 6 [--tablas bitacora,login_logs] [--lote 5000] [--simular]
+    python manage.py asesor-indices [--sql] [--estricto]
+"""
+import argparse
+import logging
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import date
+
+# Línea de `python -X importtime`: "import time:  self |  cumulative | <sangría>modulo"
+_LINEA_IMPORTTIME = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def _cargar_modelos():
+    """Registrar todos los modelos y relaciones (sin armar la aplicación)"""
+    from app.modulos import cargar_modelos
+    cargar_modelos()
+
+
+def reconstruir_resumenes(args):
+    """Regenerar los resúmenes diarios de esquelas desde cero (o desde una fecha)"""
+    _cargar_modelos()
+    from app.core.database import SessionLocal, engine
+    from app.modules.reportes.models.resumen_models import ResumenEsquelasDiario, ResumenCodigosDiario
+    from app.modules.reportes.repositories.resumen_repository import ResumenRepository
+
+    ResumenEsquelasDiario.__table__.create(bind=engine, checkfirst=True)
+    ResumenCodigosDiario.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        filas = ResumenRepository.reconstruir(db, desde=args.desde)
+    finally:
+        db.close()
+
+    for nombre, cantidad in filas.items():
+        print(f"  {nombre:<20} {cantidad} filas")
+
+
+def archivar_auditoria(args):
+    """Mover bitácora y login logs antiguos a tablas de archivo mensuales"""
+    _cargar_modelos()
+    from app.core.database import engine
+    from app.modules.bitacora.services.retencion import archivar
+
+    tablas = [t.strip() for t in (args.tablas or "").split(",") if t.strip()] or None
+    movidas = archivar(engine, args.meses, tablas=tablas, lote=args.lote, simular=args.simular)
+
+    if not movidas:
+        print("  Nada que archivar")
+    for nombre, cantidad in sorted(movidas.items()):
+        print(f"  {nombre:<28} {cantidad} filas{' (simulado)' if args.simular else ''}")
+
+
+def asesor_indices(args):
+    """EXPLAIN de las consultas críticas registradas: recorridos completos e índices usados"""
+    _cargar_modelos()
+    from app.core.database import engine
+    from app.core.index_advisor import diagnosticar
+
+    diagnosticos = diagnosticar(engine)
+    con_recorrido = 0
+    for diagnostico in diagnosticos:
+        if diagnostico.error:
+            print(f"  ?  {diagnostico.consulta}: error en EXPLAIN ({diagnostico.error})")
+            continue
+        completo = bool(diagnostico.recorridos_completos)
+        con_recorrido += completo
+        print(f"  {'✗' if completo else '✓'}  {diagnostico.consulta}")
+        for acceso in diagnostico.accesos:
+            detalles = [acceso.tipo, f"índice: {acceso.indice or '-'}"]
+            if acceso.filas is not None:
+                detalles.append(f"~{acceso.filas} filas")
+            if acceso.completo:
+                detalles.append("RECORRIDO COMPLETO")
+            if acceso.filesort:
+                detalles.append("ordenamiento en memoria")
+            print(f"       {acceso.tabla:<14} {', '.join(detalles)}")
+        if args.sql:
+            print(f"       {diagnostico.sql}")
+
+    print(f"\n{len(diagnosticos)} consultas, {con_recorrido} con recorrido completo ({engine.dialect.name})")
+    if args.estricto and con_recorrido:
+        sys.exit(1)
+
+
+def _grupo_importacion(modulo: str, profundidad: int) -> str:
+    """Paquete al que se atribuye el tiempo: app.<n componentes> o el paquete de primer nivel"""
+    partes = modulo.split(".")
+    return ".".join(partes[:profundidad]) if partes[0] == "app" else partes[0]
+
+
+def perfil_importacion(args):
+    """Desglose del tiempo de importación al crear la app (python -X importtime en un subproceso)"""
+    modulos = [m for m in (args.modulos or "").split(",") if m.strip()]
+    codigo = (
+        "import time; _inicio = time.perf_counter()\n"
+        "from app.main import create_app\n"
+        f"create_app({modulos!r} or None)\n"
+        "print(f'{(time.perf_counter() - _inicio) * 1000:.1f}')\n"
+    )
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if proceso.returncode != 0:
+        print(proceso.stderr[-4000:], file=sys.stderr)
+        sys.exit(proceso.returncode)
+
+    propio_por_grupo = defaultdict(int)
+    acumulado = {}
+    for linea in proceso.stderr.splitlines():
+        coincidencia = _LINEA_IMPORTTIME.match(linea)
+        if not coincidencia:
+            continue
+        propio, total, _, modulo = coincidencia.groups()
+        propio_por_grupo[_grupo_importacion(modulo, args.profundidad)] += int(propio)
+        acumulado[modulo] = int(total)
+
+    total_us = sum(propio_por_grupo.values())
+    print(f"create_app({', '.join(modulos) or 'todos los módulos'}): {proceso.stdout.strip()} ms "
+          f"({len(acumulado)} módulos importados, {total_us / 1000:.1f} ms en imports)")
+
+    print(f"\nTiempo propio por paquete (top {args.top}):")
+    for grupo, micros in sorted(propio_por_grupo.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {grupo:<50} {micros / 1000:9.1f} ms  {micros * 100 / total_us:5.1f} %")
+
+    print(f"\nMódulos con mayor tiempo acumulado (top {args.top}):")
+    for modulo, micros in sorted(acumulado.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {modulo:<60} {micros / 1000:9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comandos de mantenimiento de BRISA Backend")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    resumenes = subparsers.add_parser(
+        "reconstruir-resumenes",
+        help="Regenerar las tablas de resúmenes diarios de esquelas"
+    )
+    resumenes.add_argument(
+        "--desde", type=date.fromisoformat, default=None,
+        help="Recalcular solo desde esta fecha (AAAA-MM-DD)"
+    )
+    resumenes.set_defaults(func=reconstruir_resumenes)
+
+    perfil = subparsers.add_parser(
+        "perfil-importacion",
+        help="Desglose del tiempo de importación del arranque de la app (-X importtime)"
+    )
+    perfil.add_argument(
+        "--modulos", default=None,
+        help="Módulos a registrar, separados por coma (por defecto, todos; ver app/modulos.py)"
+    )
+    perfil.add_argument("--top", type=int, default=25, help="Filas a mostrar en cada tabla")
+    perfil.add_argument(
+        "--profundidad", type=int, default=3,
+        help="Componentes del nombre con que se agrupan los módulos de app (app.modules.<modulo>)"
+    )
+    perfil.set_defaults(func=perfil_importacion)
+
+    archivo = subparsers.add_parser(
+        "archivar-auditoria",
+        help="Mover bitácora y login logs antiguos a tablas mensuales (<tabla>_AAAA_MM)"
+    )
+    archivo.add_argument(
+        "--meses", type=int, required=True,
+        help="Meses que se conservan en las tablas calientes (además del actual)"
+    )
+    archivo.add_argument("--tablas", default=None, help="bitacora,login_logs (por defecto, ambas)")
+    archivo.add_argument("--lote", type=int, default=5000, help="Filas movidas por transacción")
+    archivo.add_argument("--simular", action="store_true", help="Solo contar las filas que se moverían")
+    archivo.set_defaults(func=archivar_auditoria)
+
+    asesor = subparsers.add_parser(
+        "asesor-indices",
+        help="EXPLAIN de las consultas críticas contra el esquema actual (recorridos completos)"
+    )
+    asesor.add_argument("--sql", action="store_true", help="Mostrar el SQL de cada consulta")
+    asesor.add_argument(
+        "--estricto", action="store_true",
+        help="Salir con código 1 si alguna consulta recorre una tabla completa (CI)"
+    )
+    asesor.set_defaults(func=asesor_indices)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
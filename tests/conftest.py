@@ -0,0 +1,11 @@
+"""
+tests/conftest.py
+Configuración común: entorno de testing con SQLite en memoria
+"""
+import os
+
+# Antes de importar la app: la configuración se lee al importar app.core.database
+os.environ.setdefault("ENV", "testing")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("JWT_SECRET_KEY", "test")
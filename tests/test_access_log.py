@@ -0,0 +1,56 @@
+"""
+tests/test_access_log.py
+Access log: ciclo de vida del handler y posición del middleware
+"""
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.core.access_log import access_logger, configurar_access_log, detener_access_log
+from app.core.database import Settings
+from app.core.metrics import metricas
+from app.core.middleware.logging_middleware import RequestLoggingMiddleware
+from app.main import create_app
+
+
+class _Lista(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.registros = []
+
+    def emit(self, record):
+        self.registros.append(record)
+
+
+def test_detener_quita_el_handler_de_la_cola():
+    handlers_previos = list(access_logger.handlers)
+    for _ in range(2):
+        configurar_access_log(Settings, handler=_Lista())
+        assert len(access_logger.handlers) == len(handlers_previos) + 1
+        detener_access_log()
+        assert access_logger.handlers == handlers_previos
+
+
+def test_middleware_de_acceso_es_el_mas_externo():
+    app = create_app()
+    assert app.user_middleware[0].cls is RequestLoggingMiddleware
+
+
+def test_preflight_de_cors_llega_al_access_log_y_a_metricas(monkeypatch):
+    monkeypatch.setattr(Settings, "ACCESS_LOG_SAMPLE_RATE", 1.0)
+    salida = _Lista()
+    configurar_access_log(Settings, handler=salida)
+    clave = ("OPTIONS", "sin_ruta", "200")
+    antes = metricas.peticiones.get(clave, 0)
+    try:
+        respuesta = TestClient(create_app()).options("/api/usuarios", headers={
+            "Origin": "http://localhost:3000",
+            "Access-Control-Request-Method": "GET",
+        })
+    finally:
+        detener_access_log()
+
+    # CORS responde el preflight sin llegar a la app
+    assert respuesta.status_code == 200
+    assert [(r.acceso["metodo"], r.acceso["status"]) for r in salida.registros] == [("OPTIONS", 200)]
+    assert metricas.peticiones.get(clave, 0) == antes + 1
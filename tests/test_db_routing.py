@@ -0,0 +1,68 @@
+"""
+tests/test_db_routing.py
+Sesiones de lectura con réplica (app/core/db_routing.py) y recálculo de reportes tras invalidar
+"""
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, select, text
+from sqlalchemy.orm import DeclarativeBase
+
+from app.core.db_routing import RoutingSession, RoutingSessionLectura, configurar_replicas, lecturas_en_primario
+from app.modules.reportes.services import reporte_cache as modulo_cache
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Origen(_Base):
+    __tablename__ = "origen"
+    id = Column(Integer, primary_key=True)
+    nombre = Column(String(20))
+
+
+def _engine(nombre: str):
+    engine = create_engine("sqlite://")
+    _Base.metadata.create_all(engine)
+    with engine.begin() as conexion:
+        conexion.execute(_Origen.__table__.insert(), {"id": 1, "nombre": nombre})
+    return engine
+
+
+@pytest.fixture
+def motores():
+    anteriores = (RoutingSession.replicas, RoutingSession.ventana_lectura_escritura)
+    primario, replica = _engine("primario"), _engine("replica")
+    configurar_replicas([replica], 5.0)
+    modulo_cache.reporte_cache.limpiar()
+    yield primario, replica
+    RoutingSession.replicas, RoutingSession.ventana_lectura_escritura = anteriores
+    modulo_cache.reporte_cache.limpiar()
+
+
+def _leer(db) -> str:
+    return db.scalar(select(_Origen.nombre))
+
+
+def test_select_va_a_replica_y_text_al_primario(motores):
+    primario, _ = motores
+    with RoutingSessionLectura(bind=primario) as db:
+        assert _leer(db) == "replica"
+        assert db.scalar(text("SELECT nombre FROM origen")) == "primario"
+
+
+def test_lecturas_en_primario(motores):
+    primario, _ = motores
+    with RoutingSessionLectura(bind=primario) as db:
+        with lecturas_en_primario():
+            assert _leer(db) == "primario"
+        assert _leer(db) == "replica"
+
+
+def test_reporte_invalidado_se_recalcula_en_primario(motores):
+    primario, _ = motores
+    with RoutingSessionLectura(bind=primario) as db:
+        assert modulo_cache._calcular_fresco(("origen",), lambda: _leer(db)) == "replica"
+
+        modulo_cache.invalidar_tablas("origen")
+        assert modulo_cache._calcular_fresco(("origen",), lambda: _leer(db)) == "primario"
+        assert modulo_cache._calcular_fresco(("otra",), lambda: _leer(db)) == "replica"
@@ -0,0 +1,52 @@
+"""
+tests/test_hidratacion.py
+Caché de nombres de auditoría: invalidación por persona
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.modulos import cargar_modelos
+from app.modules.bitacora.services.hidratacion import (
+    NombreUsuario, invalidar_nombres_persona, nombres_cache, usuarios_por_id
+)
+from app.modules.usuarios.models.usuario_models import Persona1, Usuario
+
+cargar_modelos()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    nombres_cache.limpiar()
+    with Session(engine) as sesion:
+        sesion.execute(Persona1.__table__.insert(), [
+            {"id_persona": 1, "ci": "1", "nombres": "Ana", "apellido_paterno": "Pérez", "apellido_materno": "Gil",
+             "tipo_persona": "administrativo"},
+            {"id_persona": 2, "ci": "2", "nombres": "Luis", "apellido_paterno": "Rojas", "apellido_materno": "Paz",
+             "tipo_persona": "administrativo"},
+        ])
+        sesion.execute(Usuario.__table__.insert(), [
+            {"id_usuario": 10, "id_persona": 1, "usuario": "ana", "correo": "ana@x.bo", "password": "-"},
+            {"id_usuario": 20, "id_persona": 2, "usuario": "luis", "correo": "luis@x.bo", "password": "-"},
+        ])
+        sesion.commit()
+        yield sesion
+    nombres_cache.limpiar()
+    engine.dispose()
+
+
+def test_invalidar_nombres_persona_quita_solo_sus_usuarios(db):
+    usuarios_por_id(db, [10, 20])
+    assert nombres_cache.obtener_varios([10, 20])[1] == set()
+
+    db.execute(Persona1.__table__.update().where(Persona1.id_persona == 1).values(nombres="Ana María"))
+    db.commit()
+    invalidar_nombres_persona(db, 1)
+
+    encontrados, faltantes = nombres_cache.obtener_varios([10, 20])
+    assert faltantes == {10}
+    assert encontrados[20] == NombreUsuario("luis", "Luis Rojas Paz")
+    assert usuarios_por_id(db, [10])[10].nombre.nombre_completo == "Ana María Pérez Gil"
@@ -0,0 +1,94 @@
+"""
+tests/test_metrics.py
+Instantáneas multiproceso de /metrics (app/core/metrics.py)
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app.core import metrics
+from app.core.metrics import RegistroMetricas, generar_exposicion, id_proceso, reclamar_muertos, volcar_instantanea
+
+
+@pytest.fixture(autouse=True)
+def registro_limpio(monkeypatch):
+    monkeypatch.setattr(metrics, "metricas", RegistroMetricas())
+
+
+def _pid_muerto() -> int:
+    proceso = subprocess.Popen([sys.executable, "-c", "pass"])
+    proceso.wait()
+    return proceso.pid
+
+
+def _instantanea(pid: int, proceso: str, peticiones: int, en_uso: int = 0) -> dict:
+    return {
+        "pid": pid,
+        "proceso": proceso,
+        "peticiones": [["GET", "/x", "200", peticiones]],
+        "latencias": [],
+        "en_curso": 0,
+        "logins": {},
+        "pool": {"replica_1": {"checkouts": peticiones, "timeouts": 0, "size": 5, "max_overflow": 5, "en_uso": en_uso}},
+        "caches": {},
+    }
+
+
+def _escribir(directorio, datos: dict, antiguedad: float = 0.0) -> str:
+    ruta = os.path.join(directorio, f"metricas_{datos['proceso']}.json")
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(datos, archivo)
+    if antiguedad:
+        momento = time.time() - antiguedad
+        os.utime(ruta, (momento, momento))
+    return ruta
+
+
+def test_nombre_de_archivo_unico_por_arranque(tmp_path):
+    volcar_instantanea(str(tmp_path))
+    assert os.listdir(tmp_path) == [f"metricas_{id_proceso()}.json"]
+    assert id_proceso().startswith(f"{os.getpid()}_")
+
+
+def test_pool_etiquetado_por_engine(tmp_path):
+    _escribir(tmp_path, _instantanea(os.getpid(), "otro", 7, en_uso=2))
+
+    texto = generar_exposicion(str(tmp_path), intervalo=5)
+
+    assert 'db_pool_checkouts_total{engine="replica_1"} 7' in texto
+    assert 'db_pool_en_uso{engine="replica_1"} 2' in texto
+    assert 'db_pool_saturation{engine="replica_1"} 0.2' in texto
+
+
+def test_worker_muerto_se_reclama_y_conserva_contadores(tmp_path):
+    pid = _pid_muerto()
+    ruta = _escribir(tmp_path, _instantanea(pid, f"{pid}_viejo", 4, en_uso=3))
+
+    assert reclamar_muertos(str(tmp_path), intervalo=5) == 1
+
+    assert not os.path.exists(ruta)
+    assert os.listdir(tmp_path) == [f"metricas_{id_proceso()}.json"]
+    texto = generar_exposicion(str(tmp_path), intervalo=5)
+    assert 'http_requests_total{method="GET",route="/x",status="200"} 4' in texto
+    assert 'db_pool_checkouts_total{engine="replica_1"} 4' in texto
+    # Los gauges de un worker muerto no se heredan
+    assert 'db_pool_en_uso{engine="replica_1"} 0' in texto
+    assert "app_workers 1" in texto
+
+
+def test_pid_reutilizado_no_mantiene_vivo_un_archivo_vencido(tmp_path):
+    # El pid existe (este proceso) pero el archivo no se actualiza desde hace rato
+    _escribir(tmp_path, _instantanea(os.getpid(), "anterior", 2), antiguedad=60)
+    _escribir(tmp_path, _instantanea(os.getpid(), "actual", 1))
+
+    assert reclamar_muertos(str(tmp_path), intervalo=5) == 1
+
+    nombres = sorted(os.listdir(tmp_path))
+    assert "metricas_anterior.json" not in nombres
+    assert "metricas_actual.json" in nombres
+    texto = generar_exposicion(str(tmp_path), intervalo=5)
+    assert 'http_requests_total{method="GET",route="/x",status="200"} 3' in texto
@@ -0,0 +1,107 @@
+"""
+tests/test_paginacion.py
+Paginación por cursor (app/shared/paginacion.py) sobre una tabla SQLite
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, create_engine, select
+
+from app.modules.bitacora.controllers.bitacora_controller import obtener_login_logs
+from app.shared.paginacion import (
+    ANTERIOR, SIGUIENTE, Cursor, aplicar_keyset, codificar_cursor, cortar_pagina, decodificar_cursor
+)
+
+_metadata = MetaData()
+eventos = Table(
+    "eventos", _metadata,
+    Column("id", Integer, primary_key=True),
+    Column("fecha_hora", DateTime, nullable=False),
+)
+
+LIMITE = 3
+BASE = datetime(2026, 3, 1, 8, 0)
+
+
+@pytest.fixture(scope="module")
+def conexion():
+    engine = create_engine("sqlite://")
+    _metadata.create_all(engine)
+    with engine.begin() as conexion:
+        # 11 filas; las fechas se repiten de a tres para probar los empates (fecha, id)
+        conexion.execute(eventos.insert(), [
+            {"id": i, "fecha_hora": BASE + timedelta(minutes=i // 3)} for i in range(1, 12)
+        ])
+    with engine.connect() as conexion:
+        yield conexion
+    engine.dispose()
+
+
+def _pagina(conexion, cursor_texto, *condiciones):
+    cursor = decodificar_cursor(cursor_texto) if cursor_texto else None
+    stmt = aplicar_keyset(
+        select(eventos).where(*condiciones), eventos.c.fecha_hora, eventos.c.id, cursor, LIMITE
+    )
+    return cortar_pagina(conexion.execute(stmt).all(), cursor, LIMITE, "fecha_hora", "id")
+
+
+def _esperado(conexion):
+    return [f.id for f in conexion.execute(select(eventos).order_by(eventos.c.fecha_hora.desc(), eventos.c.id.desc()))]
+
+
+def test_cursor_ida_y_vuelta():
+    fecha = datetime(2026, 3, 1, 8, 30, 15)
+    for direccion in (SIGUIENTE, ANTERIOR):
+        assert decodificar_cursor(codificar_cursor(fecha, 42, direccion)) == Cursor(fecha, 42, direccion)
+
+
+@pytest.mark.parametrize("basura", ["", "no-es-base64!", codificar_cursor(BASE, 1, "x"), "eyJmIjoxfQ"])
+def test_cursor_invalido(basura):
+    with pytest.raises(ValueError):
+        decodificar_cursor(basura)
+
+
+def test_adelante_y_atras_sin_duplicados_ni_huecos(conexion):
+    esperado = _esperado(conexion)
+
+    # Hacia adelante desde la primera página
+    paginas = []
+    filas, cursores = _pagina(conexion, None)
+    assert cursores["prev_cursor"] is None
+    while True:
+        paginas.append([f.id for f in filas])
+        if cursores["next_cursor"] is None:
+            assert cursores["has_more"] is False
+            break
+        assert cursores["has_more"] is True
+        filas, cursores = _pagina(conexion, cursores["next_cursor"])
+    assert [i for pagina in paginas for i in pagina] == esperado
+    assert [len(p) for p in paginas] == [3, 3, 3, 2]
+
+    # Hacia atrás desde la última página: las mismas páginas, en orden inverso
+    atras = []
+    while cursores["prev_cursor"] is not None:
+        filas, cursores = _pagina(conexion, cursores["prev_cursor"])
+        atras.append([f.id for f in filas])
+    assert atras == paginas[-2::-1]
+    assert cursores["next_cursor"] is not None
+
+
+def test_empates_en_fecha_hora_se_cortan_por_id(conexion):
+    # Cursor en medio de un grupo de filas con la misma fecha_hora
+    corte = conexion.execute(select(eventos).where(eventos.c.id == 7)).one()
+    filas, _ = _pagina(conexion, codificar_cursor(corte.fecha_hora, corte.id, SIGUIENTE))
+    assert [f.id for f in filas] == [6, 5, 4]
+
+
+def test_pagina_vacia(conexion):
+    filas, cursores = _pagina(conexion, None, eventos.c.id > 100)
+    assert filas == []
+    assert cursores == {"next_cursor": None, "prev_cursor": None, "has_more": False}
+
+
+def test_listado_con_cursor_basura_responde_400():
+    with pytest.raises(HTTPException) as error:
+        obtener_login_logs.__wrapped__(cursor="basura", db=None, current_user=None)
+    assert error.value.status_code == 400
@@ -0,0 +1,44 @@
+"""
+tests/test_permissions.py
+@requires_permission conserva el tipo del endpoint (síncrono -> threadpool)
+"""
+import inspect
+
+import pytest
+from fastapi import HTTPException
+
+from app.modules.administracion.controllers import administrativo_controller
+from app.modules.auth.controllers import auth_controller
+from app.modules.bitacora.controllers import bitacora_controller
+from app.modules.usuarios.controllers import usuario_controller
+from app.shared.permissions import requires_permission
+
+CONTROLADORES = (administrativo_controller, auth_controller, bitacora_controller, usuario_controller)
+
+
+def _endpoints_con_permiso():
+    for modulo in CONTROLADORES:
+        for ruta in modulo.router.routes:
+            original = getattr(ruta.endpoint, "__wrapped__", None)
+            if original is not None:
+                yield ruta.endpoint, original
+
+
+def test_endpoints_sincronos_no_son_corrutinas():
+    endpoints = list(_endpoints_con_permiso())
+    sincronos = [(e, o) for e, o in endpoints if not inspect.iscoroutinefunction(o)]
+
+    assert sincronos
+    for endpoint, original in endpoints:
+        assert inspect.iscoroutinefunction(endpoint) == inspect.iscoroutinefunction(original), endpoint.__name__
+
+
+def test_wrapper_sincrono_valida_usuario():
+    @requires_permission("ver_usuario")
+    def endpoint(current_user=None):
+        return "ok"
+
+    assert not inspect.iscoroutinefunction(endpoint)
+    with pytest.raises(HTTPException) as error:
+        endpoint(current_user=None)
+    assert error.value.status_code == 401
@@ -0,0 +1,74 @@
+"""
+tests/test_reporte_cache.py
+Invalidación del caché de reportes al hacer commit (app/modules/reportes/services/reporte_cache.py)
+"""
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, delete, update
+from sqlalchemy.orm import DeclarativeBase, Session
+
+from app.modules.reportes.services.reporte_cache import clave_reporte, reporte_cache
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Persona(_Base):
+    __tablename__ = "personas"
+    id_persona = Column(Integer, primary_key=True)
+    nombres = Column(String(50))
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    _Base.metadata.create_all(engine)
+    reporte_cache.limpiar()
+    with Session(engine) as sesion:
+        yield sesion
+    reporte_cache.limpiar()
+    engine.dispose()
+
+
+def _cachear(endpoint: str, *tablas: str):
+    clave = clave_reporte(endpoint, {})
+    reporte_cache.guardar(clave, {"ok": True}, tablas)
+    return clave
+
+
+def test_commit_orm_invalida_tablas_escritas(db):
+    personas = _cachear("personas", "personas")
+    otros = _cachear("materias", "materias")
+
+    db.add(_Persona(id_persona=1, nombres="Ana"))
+    db.flush()
+    assert reporte_cache.obtener(personas) is not None  # Aún sin commit
+    db.commit()
+
+    assert reporte_cache.obtener(personas) is None
+    assert reporte_cache.obtener(otros) is not None
+
+
+def test_dml_por_execute_invalida(db):
+    db.add(_Persona(id_persona=1, nombres="Ana"))
+    db.commit()
+
+    clave = _cachear("personas", "personas")
+    db.execute(update(_Persona).where(_Persona.id_persona == 1).values(nombres="Eva"))
+    db.commit()
+    assert reporte_cache.obtener(clave) is None
+
+    clave = _cachear("personas", "personas")
+    db.execute(delete(_Persona))
+    db.commit()
+    assert reporte_cache.obtener(clave) is None
+
+
+def test_rollback_no_invalida(db):
+    clave = _cachear("personas", "personas")
+    db.add(_Persona(id_persona=1, nombres="Ana"))
+    db.flush()
+    db.rollback()
+    db.commit()
+
+    assert reporte_cache.obtener(clave) is not None
@@ -0,0 +1,105 @@
+"""
+tests/test_reporte_esquelas_consultas.py
+Reportes de esquelas: cantidad de sentencias SQL constante (sin N+1)
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.modulos import cargar_modelos
+from app.modules.esquelas.models.esquela_models import CodigoEsquela, Esquela, EsquelaCodigo
+from app.modules.administracion.models.persona_models import Estudiante
+from app.modules.reportes.repositories.reporte_repository import ReporteRepository
+from app.shared.models.persona import Persona
+
+cargar_modelos()
+
+
+def _poblar(db: Session, cantidad: int) -> None:
+    """`cantidad` esquelas repartidas entre 3 profesores, con 1 o 2 códigos cada una"""
+    db.execute(CodigoEsquela.__table__.insert(), [
+        {"id_codigo": 1, "tipo": "reconocimiento", "codigo": "R01", "descripcion": "Colaboración"},
+        {"id_codigo": 2, "tipo": "orientacion", "codigo": "O01", "descripcion": "Puntualidad"},
+    ])
+    db.execute(Persona.__table__.insert(), [
+        {"id_persona": i, "ci": f"P{i}", "nombres": f"Profesor{i}", "apellido_paterno": "Apellido",
+         "tipo_persona": "profesor", "is_active": True}
+        for i in range(1, 5)
+    ])
+    db.execute(Estudiante.__table__.insert(), [
+        {"id_estudiante": i, "ci": f"E{i}", "nombres": f"Estudiante{i}", "apellido_paterno": "Apellido"}
+        for i in range(1, cantidad + 1)
+    ])
+    db.execute(Esquela.__table__.insert(), [
+        {"id_esquela": i, "id_estudiante": i, "id_profesor": i % 3 + 1, "id_registrador": 4,
+         "fecha": date(2026, 3, i % 28 + 1), "observaciones": None}
+        for i in range(1, cantidad + 1)
+    ])
+    db.execute(EsquelaCodigo.__table__.insert(), [
+        {"id_esquela": i, "id_codigo": codigo}
+        for i in range(1, cantidad + 1)
+        for codigo in ((1, 2) if i % 2 else (1,))
+    ])
+    db.commit()
+
+
+@pytest.fixture
+def crear_db():
+    engines = []
+
+    def crear(cantidad: int):
+        engine = create_engine("sqlite://")
+        engines.append(engine)
+        Base.metadata.create_all(engine)
+        db = Session(engine)
+        _poblar(db, cantidad)
+
+        sentencias = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _contar(conn, cursor, statement, parameters, context, executemany):
+            sentencias.append(statement)
+
+        return db, sentencias
+
+    yield crear
+    for engine in engines:
+        engine.dispose()
+
+
+def _sentencias(crear_db, cantidad: int, reporte) -> int:
+    db, sentencias = crear_db(cantidad)
+    try:
+        resultado = reporte(db)
+    finally:
+        db.close()
+    assert resultado
+    return len(sentencias)
+
+
+@pytest.mark.parametrize("reporte", [
+    lambda db: ReporteRepository.get_esquelas_por_profesor(db),
+    lambda db: ReporteRepository.get_esquelas_por_fecha(db)["esquelas"],
+    lambda db: ReporteRepository.get_esquelas_por_fecha(db, tipo="orientacion")["esquelas"],
+], ids=["por_profesor", "por_fecha", "por_fecha_tipo"])
+def test_sentencias_no_dependen_de_las_filas(crear_db, reporte):
+    pocas = _sentencias(crear_db, 3, reporte)
+    muchas = _sentencias(crear_db, 60, reporte)
+
+    assert pocas == muchas == 1
+
+
+def test_esquelas_por_profesor_agrupa_codigos(crear_db):
+    db, _ = crear_db(6)
+    try:
+        profesores = ReporteRepository.get_esquelas_por_profesor(db)
+    finally:
+        db.close()
+
+    assert sum(p["total_esquelas"] for p in profesores) == 6
+    # Esquelas impares llevan R01 y O01; pares solo R01
+    assert sum(p["reconocimientos"] for p in profesores) == 6
+    assert sum(p["orientaciones"] for p in profesores) == 3
@@ -0,0 +1,63 @@
+"""
+tests/test_resumenes.py
+Resúmenes diarios de esquelas: el mantenimiento incremental coincide con reconstruir
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.modulos import cargar_modelos
+from app.modules.esquelas.models.esquela_models import CodigoEsquela, Esquela, EsquelaCodigo
+from app.modules.esquelas.services.codigo_esquela_service import CodigoEsquelaService
+from app.modules.reportes.models.resumen_models import ResumenCodigosDiario, ResumenEsquelasDiario
+from app.modules.reportes.repositories.resumen_repository import ResumenRepository
+
+cargar_modelos()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as sesion:
+        sesion.execute(CodigoEsquela.__table__.insert(), [
+            {"id_codigo": 1, "tipo": "reconocimiento", "codigo": "R01", "descripcion": "Colaboración"},
+            {"id_codigo": 2, "tipo": "orientacion", "codigo": "O01", "descripcion": "Puntualidad"},
+            {"id_codigo": 3, "tipo": "reconocimiento", "codigo": "R02", "descripcion": "Respeto"},
+        ])
+        sesion.execute(Esquela.__table__.insert(), [
+            {"id_esquela": i, "id_estudiante": i % 4 + 1, "id_profesor": 1, "id_registrador": i % 2 + 1,
+             "fecha": date(2026, 3, i % 3 + 1), "observaciones": None}
+            for i in range(1, 13)
+        ])
+        # Esquelas con un solo código (1 o 2) y con dos códigos (1 y 3, 2 y 3)
+        sesion.execute(EsquelaCodigo.__table__.insert(), [
+            {"id_esquela": i, "id_codigo": c}
+            for i in range(1, 13)
+            for c in ((i % 2 + 1,) if i <= 6 else (i % 2 + 1, 3))
+        ])
+        sesion.commit()
+        ResumenRepository.reconstruir(sesion)
+        yield sesion
+    engine.dispose()
+
+
+def _resumenes(db: Session):
+    return (
+        sorted(tuple(f) for f in db.execute(select(ResumenEsquelasDiario.__table__))),
+        sorted(tuple(f) for f in db.execute(select(ResumenCodigosDiario.__table__))),
+    )
+
+
+@pytest.mark.parametrize("id_codigo", [1, 3])
+def test_eliminar_codigo_en_uso_ajusta_resumenes(db, id_codigo):
+    CodigoEsquelaService.eliminar_codigo(db, id_codigo)
+    incremental = _resumenes(db)
+
+    ResumenRepository.reconstruir(db)
+
+    assert incremental == _resumenes(db)
+    assert all(fila[1] != id_codigo for fila in incremental[1])
@@ -0,0 +1,65 @@
+"""
+tests/test_retencion.py
+Índice de archivos de auditoría: sin conexiones desde la sesión de la petición
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from app.modulos import cargar_modelos
+from app.modules.bitacora.services import retencion
+from app.modules.bitacora.services.retencion import cargar_indice_archivos, entidad_auditoria
+from app.modules.usuarios.models.usuario_models import Bitacora
+
+cargar_modelos()
+
+DESDE = datetime(2020, 1, 15)
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(retencion, "indice_archivos", retencion._IndiceArchivos())
+    engine = create_engine(f"sqlite:///{tmp_path / 'auditoria.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _contar_checkouts(engine) -> list:
+    checkouts = []
+    event.listen(engine, "checkout", lambda *args: checkouts.append(1))
+    return checkouts
+
+
+def test_sin_archivos_ni_retencion_no_consulta(engine):
+    cargar_indice_archivos(SimpleNamespace(RETENTION_MONTHS=0), engine)
+    checkouts = _contar_checkouts(engine)
+
+    with Session(engine) as db:
+        for _ in range(3):
+            assert entidad_auditoria(db, Bitacora, DESDE) is Bitacora
+
+    assert checkouts == []
+
+
+def test_archivo_visible_tras_invalidar(engine):
+    cargar_indice_archivos(SimpleNamespace(RETENTION_MONTHS=0), engine)
+    with engine.begin() as conexion:
+        conexion.execute(text("CREATE TABLE bitacora_2020_01 (id_bitacora INTEGER PRIMARY KEY)"))
+
+    with Session(engine) as db:
+        # Decidido al arrancar: no se vuelve a listar
+        assert entidad_auditoria(db, Bitacora, DESDE) is Bitacora
+        retencion.indice_archivos.invalidar()
+        assert entidad_auditoria(db, Bitacora, DESDE) is not Bitacora
+
+
+def test_con_retencion_relee_al_vencer(engine, monkeypatch):
+    monkeypatch.setattr(retencion, "indice_archivos", retencion._IndiceArchivos(ttl_segundos=0))
+    cargar_indice_archivos(SimpleNamespace(RETENTION_MONTHS=6), engine)
+    with engine.begin() as conexion:
+        conexion.execute(text("CREATE TABLE bitacora_2020_01 (id_bitacora INTEGER PRIMARY KEY)"))
+
+    assert retencion.indice_archivos.meses(Bitacora.__tablename__) == [(2020, 1)]
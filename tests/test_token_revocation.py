@@ -0,0 +1,55 @@
+"""
+tests/test_token_revocation.py
+Revocación de tokens con backend de BD: verificar no consulta la BD
+"""
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.modules.auth.services.token_revocation import DatabaseRevocationStore
+from app.modules.usuarios.models.usuario_models import TokenRevocado
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    TokenRevocado.__table__.create(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def _store(engine, intervalo_sync: float = 60.0) -> DatabaseRevocationStore:
+    return DatabaseRevocationStore(sessionmaker(bind=engine), intervalo_sync=intervalo_sync)
+
+
+def test_esta_revocado_no_consulta_la_bd(engine):
+    store = _store(engine)
+    store.iniciar()
+    try:
+        store.revocar("jti-1", time.time() + 3600)
+
+        sentencias = []
+        event.listen(engine, "before_cursor_execute", lambda *args: sentencias.append(args[2]))
+        for _ in range(100):
+            assert store.esta_revocado("jti-1")
+            assert not store.esta_revocado("jti-2")
+        assert sentencias == []
+    finally:
+        store.detener()
+
+
+def test_sincroniza_revocaciones_de_otro_worker(engine):
+    otro_worker = _store(engine)
+    store = _store(engine, intervalo_sync=0.05)
+    store.iniciar()
+    try:
+        otro_worker.revocar("jti-otro", time.time() + 3600)
+        limite = time.monotonic() + 2
+        while not store.esta_revocado("jti-otro") and time.monotonic() < limite:
+            time.sleep(0.02)
+        assert store.esta_revocado("jti-otro")
+    finally:
+        store.detener()
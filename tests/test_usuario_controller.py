@@ -0,0 +1,12 @@
+"""
+tests/test_usuario_controller.py
+Listado de usuarios con respuesta pre-serializada
+"""
+from fastapi.routing import APIRoute
+
+from app.modules.usuarios.controllers.usuario_controller import listar_usuarios, router
+
+
+def test_listar_usuarios_sin_response_model():
+    ruta = next(r for r in router.routes if isinstance(r, APIRoute) and r.endpoint is listar_usuarios)
+    assert ruta.response_model is None